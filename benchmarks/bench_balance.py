@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the balance report.
+Simulates the demo class with every loadout of a generated catalog (three
+items in each of head, chest and main hand, so 64 loadouts) in this
+process and then across a pool of worker processes, and checks that both
+runs agree.
+
+Usage: python benchmarks/bench_balance.py [fights] [workers]
+"""
+
+import sys
+import os
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.balance import BalanceCell, balance_matrix, run_balance
+from src.models.game_state import GameState
+
+
+def make_catalog():
+    catalog = []
+    for tier in range(1, 4):
+        catalog.append({"name": f"Hood {tier}", "item_type": "armor", "description": "", "slot": "head",
+                        "magic_attack": tier, "magic_defense": tier})
+        catalog.append({"name": f"Mail {tier}", "item_type": "armor", "description": "", "slot": "chest",
+                        "physical_defense": 2 * tier})
+        catalog.append({"name": f"Blade {tier}", "item_type": "weapon", "description": "", "slot": "main_hand",
+                        "physical_attack": tier, "attack_dice": [f"1d{4 + 2 * tier}"]})
+    return catalog
+
+
+def run_benchmark(fights=10000, workers=None):
+    demo = GameState.create_demo_state().character
+    adept = demo.character_class.to_dict()
+    cells = balance_matrix([adept], make_catalog())
+    print(f"{len(cells)} builds, {fights} fights each")
+
+    timings = {}
+    reports = {}
+    for name, count in (("serial", 1), ("process pool", workers or os.cpu_count())):
+        start = time.perf_counter()
+        reports[name] = run_balance(cells, demo.to_dict(), BalanceCell(adept), fights, workers=count)
+        timings[name] = time.perf_counter() - start
+        print(f"  {name:<14} {count:3d} workers {timings[name]:8.2f} s  "
+              f"{timings[name] / len(cells) * 1000:8.1f} ms/build")
+    print(f"  speedup {timings['serial'] / timings['process pool']:.1f}x, "
+          f"results identical: {reports['serial'] == reports['process pool']}")
+
+    best = max(reports["serial"], key=lambda result: result.win_rate.mean)
+    print(f"  best loadout: {best.loadout}, win rate {best.win_rate}")
+
+
+if __name__ == "__main__":
+    fights = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    run_benchmark(fights, workers)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark for group turn resolution.
+Fights 50 heroes against 500 monsters, resolving each round with a plain
+Python loop that lets one participant act at a time in speed order and
+then with the batched Battle resolver, and compares the time per round
+with the 16.7 ms of a 60 fps UI frame.
+
+Usage: python benchmarks/bench_battle.py [heroes] [monsters]
+"""
+
+import dataclasses
+import random
+import sys
+import os
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.battle import ALLY_GROUPS, AREA_GROUPS, Battle
+from src.models.character import Character
+from src.models.combat_sim import HEAL_BELOW, ActionEffect, Combatant, SkillAction
+from src.models.dice import parse_dice
+from src.models.game_state import GameState
+
+FRAME = 1 / 60
+
+
+def make_sides(heroes, monsters):
+    adept = Combatant.from_character(GameState.create_demo_state().character)
+    nova = SkillAction("Nova", "mana", 15, (ActionEffect("damage", 6, parse_dice("1d6"), True, "enemies"),))
+    templates = [dataclasses.replace(adept, name=f"Adept {speed}", speed=speed,
+                                     skills=adept.skills + (nova,), max_health=400, health=400)
+                 for speed in (9, 10, 11, 12, 13)]
+    goblin = dataclasses.replace(adept, name="Goblin", skills=(), max_health=30, health=30,
+                                 physical_attack=4, speed=8, attack_dice=parse_dice("1d4"))
+    wolf = dataclasses.replace(goblin, name="Wolf", speed=14, physical_attack=3)
+    shaman = dataclasses.replace(goblin, name="Shaman", speed=7, skills=adept.skills[:2])
+    return ([templates[number % len(templates)] for number in range(heroes)],
+            [(goblin, wolf, shaman)[number % 3] for number in range(monsters)])
+
+
+class LoopedBattle:
+    """The same rules resolved one participant and one target at a time."""
+
+    def __init__(self, allies, enemies, seed):
+        self.rng = random.Random(seed)
+        self.people = [{"template": template, "side": side, "health": template.health,
+                        "mana": template.mana, "stamina": template.stamina, "asleep": 0}
+                       for side, group in enumerate((allies, enemies)) for template in group]
+        self.order = sorted(self.people, key=lambda person: -person["template"].speed)
+
+    def resolve_round(self):
+        for actor in self.order:
+            if actor["health"] <= 0 or actor["asleep"]:
+                continue
+            template = actor["template"]
+            foes = [person for person in self.people if person["side"] != actor["side"] and person["health"] > 0]
+            friends = [person for person in self.people if person["side"] == actor["side"] and person["health"] > 0]
+            if not foes:
+                break
+            usable = [skill for skill in template.skills if actor[skill.resource] >= skill.cost]
+            wounded = any(friend["health"] < HEAL_BELOW * friend["template"].max_health for friend in friends)
+            chosen = None
+            for skill in sorted(usable, key=lambda skill: skill.expected_damage()):
+                if skill.kind == "damage":
+                    chosen = skill
+            if any(foe["asleep"] == 0 for foe in foes):
+                chosen = next((skill for skill in usable if skill.kind == "status"), chosen)
+            if wounded:
+                chosen = next((skill for skill in usable if skill.kind == "heal"), chosen)
+            if chosen is None:
+                self.hit(actor, self.rng.choice(foes), template.attack_dice, 0, False)
+                continue
+            actor[chosen.resource] -= chosen.cost
+            for effect in chosen.effects:
+                group = friends if effect.target_group in ALLY_GROUPS else foes
+                if effect.target_group in AREA_GROUPS:
+                    targets = group
+                elif effect.kind == "heal":
+                    targets = [min(group, key=lambda person: person["health"] / person["template"].max_health)]
+                else:
+                    targets = [self.rng.choice(group)]
+                for target in targets:
+                    if effect.kind == "heal":
+                        target["health"] = min(target["health"] + effect.value + effect.dice.roll(self.rng),
+                                               target["template"].max_health)
+                    elif effect.kind == "status":
+                        target["asleep"] = max(target["asleep"], int(effect.value))
+                    else:
+                        self.hit(actor, target, effect.dice, effect.value, effect.magic)
+        for person in self.people:
+            if person["asleep"]:
+                person["asleep"] -= 1
+
+    def hit(self, actor, target, dice, value, magic):
+        attacker, defender = actor["template"], target["template"]
+        if self.rng.random() < Character.dodge_probability(defender.speed - attacker.speed):
+            return
+        attack, defense = ((attacker.magic_attack, defender.magic_defense) if magic
+                           else (attacker.physical_attack, defender.physical_defense))
+        target["health"] -= max(value + dice.roll(self.rng) + attack - defense, 1)
+
+
+def time_rounds(battle, rounds):
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        battle.resolve_round()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def run_benchmark(heroes=50, monsters=500, rounds=5):
+    allies, enemies = make_sides(heroes, monsters)
+    print(f"{heroes} vs {monsters}, first {rounds} rounds")
+    for name, battle in (("looped", LoopedBattle(allies, enemies, 45)),
+                         ("batched", Battle(allies, enemies, seed=45))):
+        times = time_rounds(battle, rounds)
+        print(f"  {name:<8} mean {sum(times) / len(times) * 1000:7.2f} ms  worst {max(times) * 1000:7.2f} ms  "
+              f"({max(times) / FRAME:.0%} of a frame)")
+
+    battle = Battle(allies, enemies, seed=45)
+    start = time.perf_counter()
+    winner = battle.run()
+    elapsed = time.perf_counter() - start
+    print(f"  full batched battle: side {winner} won in {battle.round} rounds, {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    heroes = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    monsters = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    run_benchmark(heroes, monsters)
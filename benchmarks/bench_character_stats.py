@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark for derived character stats.
+Simulates a combat loop that reads attack, defense and speed many times per
+turn while stats and equipment change only occasionally, comparing cached
+derived stats against recomputing them on every read.
+
+Usage: python benchmarks/bench_character_stats.py [turns] [reads_per_turn]
+"""
+
+import sys
+import os
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.character import Character
+from src.models.game_state import GameState
+
+
+def combat_loop(character, opponent, turns, reads, read_stat):
+    total = 0.0
+    for turn in range(turns):
+        if turn % 10 == 0:
+            character.strength += 1  # An occasional level-up or buff
+        for _ in range(reads):
+            total += read_stat(character, 'physical_attack') - read_stat(opponent, 'physical_defense')
+            total += read_stat(character, 'speed') + read_stat(opponent, 'magic_defense')
+    return total
+
+
+def cached(character, name):
+    return getattr(character, name)
+
+
+def recomputed(character, name):
+    return Character.DERIVED_STATS[name][0](character)
+
+
+def run_benchmark(turns, reads):
+    print(f"{turns:,} turns, {reads:,} reads of four stats per turn")
+    results = {}
+    for label, read_stat in (("recomputed", recomputed), ("cached", cached)):
+        character = GameState.create_demo_state().character
+        opponent = GameState.create_demo_state().character
+        for item in list(character.inventory):
+            if hasattr(item, 'slot'):
+                character.equip_item(item)
+        start = time.perf_counter()
+        results[label] = combat_loop(character, opponent, turns, reads, read_stat)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:10} {elapsed * 1000:10.1f} ms  {elapsed / (turns * reads * 4) * 1e9:8.1f} ns/read")
+    assert abs(results["cached"] - results["recomputed"]) < 1e-6
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000,
+                  int(sys.argv[2]) if len(sys.argv) > 2 else 1_000)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the combat simulator.
+Runs the demo character against a few opponent builds, first with a
+plain Python loop that fights one duel at a time and then with the
+vectorized simulator fighting every duel at once, and prints the win
+rates of the vectorized run.
+
+Usage: python benchmarks/bench_combat_sim.py [fights]
+"""
+
+import dataclasses
+import random
+import sys
+import os
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.character import Character
+from src.models.combat_sim import HEAL_BELOW, Combatant, compare_builds
+from src.models.game_state import GameState
+
+
+def looped_duel(first, second, rng, max_rounds=50):
+    """One duel with the simulator's rules, one combatant and one roll at a time."""
+    sides = (first, second)
+    state = [{"health": side.health, "mana": side.mana, "stamina": side.stamina, "asleep": 0} for side in sides]
+    dodge = [Character.dodge_probability(sides[side].speed - sides[1 - side].speed) for side in (0, 1)]
+    order = (0, 1) if first.speed >= second.speed else (1, 0)
+    for round_number in range(1, max_rounds + 1):
+        for actor in order:
+            me, them, target = state[actor], state[1 - actor], sides[1 - actor]
+            if me["asleep"]:
+                me["asleep"] -= 1
+                continue
+            usable = [skill for skill in sides[actor].skills if me[skill.resource] >= skill.cost]
+            heals = [skill for skill in usable if skill.kind == "heal"]
+            status = [skill for skill in usable if skill.kind == "status"]
+            damaging = [skill for skill in usable if skill.kind == "damage"]
+            if heals and me["health"] < HEAL_BELOW * sides[actor].max_health:
+                skill = heals[-1]
+            elif status and not them["asleep"]:
+                skill = status[-1]
+            elif damaging:
+                skill = max(damaging, key=lambda entry: entry.expected_damage())
+            else:
+                skill = None
+            if skill is None:
+                if rng.random() >= dodge[1 - actor]:
+                    damage = (sides[actor].attack_dice.roll(rng) + sides[actor].physical_attack
+                              - target.physical_defense)
+                    them["health"] -= max(damage, 1)
+            else:
+                me[skill.resource] -= skill.cost
+                hit = not skill.harmful or rng.random() >= dodge[1 - actor]
+                for effect in skill.effects:
+                    if effect.kind == "heal":
+                        me["health"] = min(me["health"] + effect.value + effect.dice.roll(rng),
+                                           sides[actor].max_health)
+                    elif hit and effect.kind == "status":
+                        them["asleep"] = max(them["asleep"], int(effect.value))
+                    elif hit:
+                        attack, defense = ((sides[actor].magic_attack, target.magic_defense) if effect.magic
+                                           else (sides[actor].physical_attack, target.physical_defense))
+                        them["health"] -= max(effect.value + effect.dice.roll(rng) + attack - defense, 1)
+            if them["health"] <= 0:
+                return actor, round_number
+    return -1, max_rounds
+
+
+def run_benchmark(fights=200000):
+    adept = Combatant.from_character(GameState.create_demo_state().character)
+    brute = dataclasses.replace(adept, name="Brute", skills=(), physical_attack=30,
+                                max_health=140, health=140, speed=8)
+    duelist = dataclasses.replace(adept, name="Duelist", skills=(), physical_attack=22, speed=25)
+    opponents = [brute, duelist, adept]
+
+    looped_fights = max(1, fights // 100)
+    rng = random.Random(43)
+    start = time.perf_counter()
+    for opponent in opponents:
+        for _ in range(looped_fights):
+            looped_duel(adept, opponent, rng)
+    looped = (time.perf_counter() - start) / (looped_fights * len(opponents))
+
+    start = time.perf_counter()
+    reports = [compare_builds([adept], opponent, fights, seed=43)[0] for opponent in opponents]
+    vectorized = (time.perf_counter() - start) / (fights * len(opponents))
+
+    for report in reports:
+        print(report.summary())
+    print(f"looped      {looped * 1e6:8.2f} us/fight ({looped_fights} fights per matchup)")
+    print(f"vectorized  {vectorized * 1e6:8.2f} us/fight ({fights} fights per matchup)")
+    print(f"speedup     {looped / vectorized:8.1f}x")
+
+
+if __name__ == "__main__":
+    fights = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    run_benchmark(fights)
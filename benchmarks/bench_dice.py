@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the dice engine.
+Rolls a few common expressions with a naive roller that parses the
+notation on every call and uses random.randint, with the compiled single
+rollers, and with the batched NumPy path, then times the exact
+distribution queries against estimating the mean by sampling.
+
+Usage: python benchmarks/bench_dice.py [rolls]
+"""
+
+import random
+import re
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.dice import Dice, parse_dice
+
+
+NOTATIONS = ("1d10", "2d6+3", "4d6kh3", "1d8!+1d4")
+
+NAIVE_TERM = re.compile(r"([+-]?)(\d*)d(\d+)(!)?(?:kh(\d+))?|([+-]?\d+)")
+
+
+def naive_roll(notation):
+    """Parse and roll in one pass, the way an ad-hoc roller would."""
+    total = 0
+    for match in NAIVE_TERM.finditer(notation.replace(" ", "")):
+        if match.group(6):
+            total += int(match.group(6))
+            continue
+        sides = int(match.group(3))
+        rolls = []
+        for _ in range(int(match.group(2) or 1)):
+            value = random.randint(1, sides)
+            while match.group(4) and value % sides == 0:
+                value += random.randint(1, sides)
+            rolls.append(value)
+        if match.group(5):
+            rolls = sorted(rolls)[-int(match.group(5)):]
+        total += -sum(rolls) if match.group(1) == "-" else sum(rolls)
+    return total
+
+
+def run_benchmark(rolls=100000):
+    rng = np.random.default_rng(42)
+    print(f"{rolls} rolls per expression")
+    for notation in NOTATIONS:
+        dice = parse_dice(notation)
+        start = time.perf_counter()
+        for _ in range(rolls):
+            naive_roll(notation)
+        naive = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(rolls):
+            dice.roll()
+        compiled = time.perf_counter() - start
+
+        start = time.perf_counter()
+        dice.roll_many(rolls * 10, rng)
+        batched = (time.perf_counter() - start) / 10
+
+        dice_per_roll = sum(group.count for group in dice.groups)
+        print(f"  {notation:<10} naive {naive / rolls * 1e6:6.2f} us  compiled {compiled / rolls * 1e6:6.2f} us  "
+              f"batched {batched / rolls * 1e9:6.1f} ns  "
+              f"({rolls * dice_per_roll / batched / 1e6:.0f}M dice/s)")
+
+    print("Mean of 4d6kh3")
+    start = time.perf_counter()
+    mean = Dice("4d6kh3").mean()
+    exact = time.perf_counter() - start
+    start = time.perf_counter()
+    estimate = parse_dice("4d6kh3").roll_many(1000000, rng).mean()
+    sampled = time.perf_counter() - start
+    print(f"  exact    {mean:.6f} in {exact * 1000:.2f} ms")
+    print(f"  sampled  {estimate:.6f} in {sampled * 1000:.2f} ms (1M rolls)")
+
+
+if __name__ == "__main__":
+    rolls = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    run_benchmark(rolls)
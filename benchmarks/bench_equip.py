@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the equip engine.
+Fills the demo character's inventory with equipment, then times equipping
+and unequipping random pieces, whole-loadout changes, and finding the slot
+of a worn item through the reverse index against scanning the slots.
+
+Usage: python benchmarks/bench_equip.py [items] [operations]
+"""
+
+import random
+import sys
+import os
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.character import CharacterEquipment
+from src.models.game_state import GameState
+from src.models.item import EquipmentItem
+
+
+def scan_for_slot(equipment, item):
+    """How the main window used to find an item's slot."""
+    for slot, held in equipment.equipment.items():
+        if held == item or (slot == 'accessories' and item in held):
+            return slot
+    return None
+
+
+def run_benchmark(count=10000, operations=20000, seed=50):
+    rng = random.Random(seed)
+    character = GameState.create_demo_state().character
+    slots = list(CharacterEquipment.DEFAULT_SLOTS)
+    gear = [EquipmentItem(name=f"Piece {number}", item_type="armor", description="", slot=rng.choice(slots),
+                          physical_defense=rng.randint(0, 10)) for number in range(count)]
+    for item in gear:
+        character.add_to_inventory(item)
+    notifications = []
+    character.events.subscribe(notifications.append)
+    print(f"{count} items in the inventory")
+
+    start = time.perf_counter()
+    for _ in range(operations):
+        item = rng.choice(gear)
+        if item in character.equipment:
+            character.unequip(item)
+        else:
+            character.equip_item(item)
+    single = (time.perf_counter() - start) / operations
+
+    start = time.perf_counter()
+    for _ in range(operations // 10):
+        character.change_equipment(equip=rng.sample(gear, 4), unequip=character.equipment.items()[:2])
+    multiple = (time.perf_counter() - start) / (operations // 10)
+
+    worn = character.equipment.items()
+    start = time.perf_counter()
+    for _ in range(operations):
+        character.equipment.slot_of(rng.choice(worn))
+    indexed = (time.perf_counter() - start) / operations
+    start = time.perf_counter()
+    for _ in range(operations):
+        scan_for_slot(character.equipment, rng.choice(worn))
+    scanned = (time.perf_counter() - start) / operations
+
+    print(f"  equip or unequip one    {single * 1e6:8.2f} us")
+    print(f"  change several at once  {multiple * 1e6:8.2f} us")
+    print(f"  slot of an item         {indexed * 1e9:8.1f} ns indexed, {scanned * 1e9:8.1f} ns scanning")
+    print(f"  {len(notifications)} notifications for {operations + operations // 10} changes")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    operations = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    run_benchmark(count, operations)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark for running equipment totals.
+Simulates a combat loop where every attack reads the attacker's attack total
+and dice and the defender's defense totals, with gear swapped now and then,
+comparing the running totals against walking every slot on each read.
+
+Usage: python benchmarks/bench_equipment_totals.py [attacks]
+"""
+
+import random
+import sys
+import os
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.character import CharacterEquipment
+from src.models.item import EquipmentItem
+
+SLOTS = ['head', 'chest', 'legs', 'hands', 'feet', 'main_hand', 'off_hand', 'accessories']
+
+
+def make_items(rng, count):
+    return [
+        EquipmentItem(name=f"Item {i}", item_type="armor", description="", slot=rng.choice(SLOTS),
+                      physical_attack=rng.randint(0, 8), physical_defense=rng.randint(0, 8),
+                      magic_attack=rng.randint(0, 8), magic_defense=rng.randint(0, 8),
+                      attack_dice=["1d6"] if rng.random() < 0.3 else [],
+                      tags={"tags": ["fire"] if rng.random() < 0.2 else []})
+        for i in range(count)
+    ]
+
+
+def walked(equipment):
+    items = equipment.items()
+    return (sum(item.physical_attack for item in items),
+            sum(item.physical_defense for item in items) + sum(item.magic_defense for item in items),
+            [dice for item in items for dice in item.attack_dice])
+
+
+def running(equipment):
+    return (equipment.total_physical_attack,
+            equipment.total_physical_defense + equipment.total_magic_defense,
+            equipment.get_attack_dice())
+
+
+def combat_loop(attacks, read_totals):
+    rng = random.Random(8)
+    items = make_items(rng, 40)
+    attacker, defender = CharacterEquipment(), CharacterEquipment()
+    for item in items:
+        (attacker if rng.random() < 0.5 else defender).equip(item)
+    damage = 0
+    for attack in range(attacks):
+        if attack % 100 == 0:
+            attacker.equip(rng.choice(items))  # Swap gear between fights
+        attack_total, _, dice = read_totals(attacker)
+        _, defense_total, _ = read_totals(defender)
+        damage += max(0, attack_total + len(dice) * 3 - defense_total)
+    return damage
+
+
+def run_benchmark(attacks):
+    print(f"{attacks:,} attacks")
+    results = {}
+    for label, read_totals in (("walk slots", walked), ("running", running)):
+        start = time.perf_counter()
+        results[label] = combat_loop(attacks, read_totals)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:10} {elapsed * 1000:10.1f} ms  {elapsed / attacks * 1e6:8.2f} us/attack")
+    assert results["walk slots"] == results["running"]
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
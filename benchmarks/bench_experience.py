@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark for experience curves.
+Grants experience to a crowd of NPCs three ways: stepping each one through
+its level-ups while recomputing the requirement from the curve's formula,
+one bisect lookup per member against the precomputed thresholds, and a
+single vectorized grant for the whole crowd. The vectorized grant is also
+timed on bare arrays, without writing the results back to characters.
+
+Usage: python benchmarks/bench_experience.py [members]
+"""
+
+import random
+import sys
+import os
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.character import Character, CharacterClass
+from src.models.experience import CHARACTER_CURVE, grant_experience
+from src.models.formulas import compile_formula
+
+
+def make_party(count, seed=41):
+    rng = random.Random(seed)
+    villager = CharacterClass("Villager", "")
+    party = []
+    for number in range(count):
+        level = rng.randint(1, 60)
+        party.append(Character(name=f"NPC {number}", character_class=villager, level=level,
+                               experience=rng.randrange(CHARACTER_CURVE.to_next(level)),
+                               experience_to_next_level=CHARACTER_CURVE.to_next(level)))
+    return party, [rng.randint(0, 20000) for _ in range(count)]
+
+
+def stepped_grant(members, amounts, curve):
+    """Level each member up one requirement at a time, deriving each requirement from the formula."""
+    formula = compile_formula(curve.formula)
+
+    def requirement(level):
+        value = curve.base
+        for next_level in range(2, level + 1):
+            value = formula(value, next_level)
+        return round(value)
+
+    for member, amount in zip(members, amounts):
+        level, experience = member.level, member.experience + amount
+        while level < curve.max_level and experience >= requirement(level):
+            experience -= requirement(level)
+            level += 1
+        member.level, member.experience = level, experience
+        member.experience_to_next_level = requirement(level) if level < curve.max_level else 0
+
+
+def bisect_grant(members, amounts, curve):
+    for member, amount in zip(members, amounts):
+        member.gain_experience(amount, curve)
+
+
+def run_benchmark(count=500):
+    print(f"{count} members")
+    for name, grant in (
+        ("stepped, formula", stepped_grant),
+        ("bisect per member", bisect_grant),
+        ("vectorized", grant_experience),
+    ):
+        members, amounts = make_party(count)
+        start = time.perf_counter()
+        grant(members, amounts, CHARACTER_CURVE)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<20} {elapsed * 1000:9.2f} ms  {elapsed / count * 1e6:8.2f} us/member")
+
+    members, amounts = make_party(count)
+    levels = [member.level for member in members]
+    experience = [member.experience for member in members]
+    start = time.perf_counter()
+    CHARACTER_CURVE.advance(levels, experience, amounts)
+    elapsed = time.perf_counter() - start
+    print(f"  {'arrays only':<20} {elapsed * 1000:9.2f} ms  {elapsed / count * 1e6:8.2f} us/member")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    run_benchmark(count)
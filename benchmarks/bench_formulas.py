@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark for level-up formulas.
+Builds the per-level cost and effect tables of a set of skills up to a
+maximum level three ways: eval-ing the formula string once per level, calling
+the compiled formula once per level, and the vectorized progression that
+computes every level in one NumPy pass.
+
+Usage: python benchmarks/bench_formulas.py [skills] [max_level]
+"""
+
+import sys
+import os
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.character import Skill
+from src.models.formulas import compile_formula, skill_table
+
+
+FORMULAS = ("x*1.1", "x*(1+(0.04*(level-1)))", "x + level*2 - 1", "max(x+1, sqrt(x)*level)")
+
+
+def make_skills(count):
+    return [
+        Skill(
+            name=f"Skill {number}",
+            description="",
+            cost={"resource": "mana", "amount": 5 + number % 20, "level_up_formula": FORMULAS[number % 2]},
+            effects=[{"action": "damage", "value": 10 + number % 30,
+                      "level_up_formula": FORMULAS[number % len(FORMULAS)]}]
+        )
+        for number in range(count)
+    ]
+
+
+def stepped(skill, max_level, step):
+    """Build a skill's table by evaluating its formulas one level at a time."""
+    def column(base, formula):
+        values = [base]
+        for level in range(2, max_level + 1):
+            values.append(step(formula, values[-1], level) if formula else base)
+        return values
+
+    return {
+        "cost": column(skill.cost["amount"], skill.cost.get("level_up_formula")),
+        "effects": [column(effect["value"], effect.get("level_up_formula")) for effect in skill.effects]
+    }
+
+
+def eval_step(formula, x, level):
+    return eval(formula, {"__builtins__": {}, "max": max, "sqrt": __import__("math").sqrt},
+                {"x": x, "level": level})
+
+
+def compiled_step(formula, x, level):
+    return compile_formula(formula)(x, level)
+
+
+def run_benchmark(count=1000, max_level=100):
+    skills = make_skills(count)
+    print(f"{count} skills, levels 1-{max_level}")
+
+    results = {}
+    for name, build in (
+        ("eval per level", lambda skill: stepped(skill, max_level, eval_step)),
+        ("compiled per level", lambda skill: stepped(skill, max_level, compiled_step)),
+        ("vectorized", lambda skill: skill_table(skill, max_level)),
+    ):
+        start = time.perf_counter()
+        tables = [build(skill) for skill in skills]
+        elapsed = time.perf_counter() - start
+        results[name] = tables
+        print(f"  {name:<20} {elapsed * 1000:9.1f} ms  {elapsed / count * 1e6:8.1f} us/skill")
+
+    worst = max(
+        abs(a - b) / abs(a)
+        for slow, fast in zip(results["eval per level"], results["vectorized"])
+        for a, b in zip(slow["effects"][0], fast["effects"][0])
+    )
+    print(f"  largest relative difference from eval: {worst:.2e}")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    max_level = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    run_benchmark(count, max_level)
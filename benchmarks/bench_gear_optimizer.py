@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the best-in-slot optimizer.
+Fills the demo character's inventory with random equipment across every
+slot, then times choosing the best gear for a few stat weightings and
+applying the resulting plan.
+
+Usage: python benchmarks/bench_gear_optimizer.py [items]
+"""
+
+import random
+import sys
+import os
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.character import CharacterEquipment
+from src.models.game_state import GameState
+from src.models.gear_optimizer import best_in_slot
+from src.models.item import EquipmentItem
+
+WEIGHTINGS = {
+    "balanced": None,
+    "caster": {"magic_attack": 1.0, "magic_defense": 0.5},
+    "bruiser": {"physical_attack": 1.0, "attack_dice": 1.0, "physical_defense": 0.5},
+}
+
+
+def make_character(count, seed=47):
+    rng = random.Random(seed)
+    character = GameState.create_demo_state().character
+    slots = list(CharacterEquipment.DEFAULT_SLOTS)
+    for number in range(count):
+        character.add_to_inventory(EquipmentItem(
+            name=f"Item {number}", item_type="armor", description="", slot=rng.choice(slots),
+            level_requirement=rng.randint(1, 3), physical_attack=rng.randint(0, 10),
+            physical_defense=rng.randint(0, 10), magic_attack=rng.randint(0, 10),
+            magic_defense=rng.randint(0, 10),
+            attack_dice=[rng.choice(["1d4", "1d6", "2d6"])] if rng.random() < 0.3 else []
+        ))
+    return character
+
+
+def run_benchmark(count=5000, repeats=20):
+    character = make_character(count)
+    print(f"{count} items in the inventory")
+    for name, weights in WEIGHTINGS.items():
+        best_in_slot(character, weights)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            plan = best_in_slot(character, weights)
+        elapsed = (time.perf_counter() - start) / repeats
+        start = time.perf_counter()
+        applied = plan.apply(character)
+        applying = time.perf_counter() - start
+        print(f"  {name:<9} optimize {elapsed * 1000:7.2f} ms  apply {applying * 1000:6.2f} ms  "
+              f"score {plan.score:7.1f}  {len(plan.items())} items  applied: {applied}")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    run_benchmark(count)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the indexed inventory.
+Fills an inventory with many items, then times membership tests, removals
+from the middle and re-adds, comparing the Inventory container against the
+plain list characters used to hold.
+
+Usage: python benchmarks/bench_inventory.py [items] [operations]
+"""
+
+import random
+import sys
+import os
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.inventory import Inventory
+from src.models.item import Item, EquipmentItem, Effect
+
+
+def make_items(count):
+    items = []
+    for i in range(count):
+        if i % 3 == 0:
+            items.append(Item(name=f"Potion {i % 50}", item_type="consumable", description="",
+                              effects=[Effect(target_group="allies", action="heal", value=30)]))
+        else:
+            items.append(EquipmentItem(name=f"Gear {i}", item_type="armor", description="",
+                                       slot="head", physical_defense=i % 7))
+    return items
+
+
+def churn(container, items, operations, seed):
+    """Check for, remove and re-add random items, as trading or looting would."""
+    rng = random.Random(seed)
+    for _ in range(operations):
+        item = items[rng.randrange(len(items))]
+        if item in container:
+            container.remove(item)
+            container.append(item)
+
+
+def run_benchmark(count, operations):
+    items = make_items(count)
+    print(f"{count:,} items, {operations:,} remove/re-add operations")
+    for label, container in (("list", list(items)), ("Inventory", Inventory(items))):
+        start = time.perf_counter()
+        churn(container, items, operations, seed=5)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:10} {elapsed * 1000:10.1f} ms  {elapsed / operations * 1e6:10.2f} us/op")
+    inventory = Inventory(items)
+    print(f"  {len(inventory.stacks()):,} entries after stacking identical potions")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    operations = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    run_benchmark(count, operations)
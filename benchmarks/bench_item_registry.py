@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark for shared item definitions.
+Loads a loot-heavy inventory of many items drawn from a few dozen kinds and
+measures the memory the loaded items hold, comparing items that refer to
+interned definitions against a copy of the old dataclass that stored every
+field on every item. Also reports the size of the saved inventory with and
+without a definitions table.
+
+Usage: python benchmarks/bench_item_registry.py [items] [kinds]
+"""
+
+import gc
+import json
+import random
+import sys
+import os
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.item import Item, EquipmentItem, Effect, item_from_dict
+
+
+@dataclass
+class PerItemCopy:
+    """Equipment item as it was before definitions were shared."""
+    name: str
+    item_type: str
+    description: str
+    effects: List[Effect] = field(default_factory=list)
+    target_group: str = "single_ally"
+    slot: str = "main_hand"
+    rarity: str = "common"
+    level_requirement: int = 1
+    physical_attack: int = 0
+    physical_defense: int = 0
+    magic_attack: int = 0
+    magic_defense: int = 0
+    attack_dice: List[str] = field(default_factory=list)
+    tags: Dict[str, List[str]] = field(default_factory=lambda: {"tags": []})
+    equipped: bool = False
+    instance_id: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PerItemCopy':
+        return cls(name=data["name"], item_type=data["item_type"], description=data["description"],
+                   effects=[Effect(**effect) for effect in data.get("effects", [])],
+                   target_group=data.get("target_group", "single_ally"),
+                   slot=data.get("slot", "main_hand"), rarity=data.get("rarity", "common"),
+                   physical_attack=data.get("physical_attack", 0),
+                   physical_defense=data.get("physical_defense", 0),
+                   attack_dice=list(data.get("attack_dice", [])),
+                   tags={"tags": list(data.get("tags", {"tags": []})["tags"])},
+                   instance_id=data["instance_id"])
+
+
+def loot(count, kinds, seed=3):
+    rng = random.Random(seed)
+    templates = []
+    for kind in range(kinds):
+        if kind % 2:
+            templates.append(Item(name=f"Potion {kind}", item_type="consumable",
+                                  description="A small vial filled with a glowing liquid. " * 3,
+                                  effects=[Effect(target_group="allies", action="heal", value=kind)]))
+        else:
+            templates.append(EquipmentItem(name=f"Blade {kind}", item_type="weapon",
+                                           description="A finely balanced blade etched with runes. " * 3,
+                                           slot="main_hand", rarity="rare", physical_attack=kind,
+                                           attack_dice=["1d8"], tags={"tags": ["sharp", "metal"]}))
+    return [type(template).from_definition(template.definition) for template in
+            (rng.choice(templates) for _ in range(count))]
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def run_benchmark(count, kinds):
+    items = loot(count, kinds)
+    flat = [item.to_dict() for item in items]
+    definitions = {}
+    compact = [item.to_dict(definitions) for item in items]
+    table = list(definitions)
+
+    print(f"{count:,} items of {kinds} kinds")
+    flat_size = len(json.dumps(flat))
+    compact_size = len(json.dumps(compact)) + len(json.dumps([definition.to_dict() for definition in table]))
+    print(f"  saved inventory: {flat_size / 1e6:8.1f} MB flat, {compact_size / 1e6:8.1f} MB with a definitions table")
+
+    for label, build in (
+        ("per-item copies", lambda: [PerItemCopy.from_dict(entry) for entry in flat]),
+        ("shared (flat)", lambda: [item_from_dict(entry) for entry in flat]),
+        ("shared (table)", lambda: [item_from_dict(entry, table) for entry in compact]),
+    ):
+        loaded, size, elapsed = measure(build)
+        print(f"  {label:16} {size / 1e6:8.1f} MB  {size / count:8.0f} B/item  load {elapsed * 1000:8.1f} ms")
+        del loaded
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    kinds = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    run_benchmark(count, kinds)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark for loot tables.
+Builds a catalog of equipment spread over nested rarity tables, then times
+drops from the alias tables one at a time and in batches against
+random.choices over the same weights followed by building each item from
+its dict, as drops were made before.
+
+Usage: python benchmarks/bench_loot.py [items] [drops]
+"""
+
+import random
+import sys
+import os
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.models.item import EquipmentItem
+from src.models.loot import LootTables, RARITY_WEIGHTS
+
+SLOTS = ["head", "chest", "legs", "hands", "feet", "main_hand", "off_hand", "accessories"]
+
+
+def make_tables(count, seed=49):
+    rng = random.Random(seed)
+    catalog = {rarity: [] for rarity in RARITY_WEIGHTS}
+    for number in range(count):
+        rarity = rng.choice(list(RARITY_WEIGHTS))
+        catalog[rarity].append({"name": f"Loot {number}", "item_type": "armor", "description": "",
+                                "slot": rng.choice(SLOTS), "rarity": rarity,
+                                "physical_defense": rng.randint(0, 10), "magic_defense": rng.randint(0, 10)})
+    tables = [{"name": rarity, "entries": [{"item": item} for item in items]} for rarity, items in catalog.items()]
+    tables.append({"name": "chest", "rolls": 3, "entries": [{"weight": 5}] +
+                   [{"table": rarity, "weight": len(catalog[rarity])} for rarity in catalog]})
+    return LootTables(tables), catalog
+
+
+def run_benchmark(count=1000, drops=100000):
+    tables, catalog = make_tables(count)
+    start = time.perf_counter()
+    compiled = tables.compile("chest")
+    print(f"{count} items, {len(compiled.drops)} outcomes, compiled in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    # The same chances as plain weights over item dicts, for random.choices
+    chances = compiled.probabilities()
+    outcomes = [None if drop is None else drop.to_dict() for drop in chances]
+    weights = list(chances.values())
+    rng = random.Random(49)
+    start = time.perf_counter()
+    naive = [[EquipmentItem(**data) for data in rng.choices(outcomes, weights, k=compiled.rolls) if data is not None]
+             for _ in range(drops // 10)]
+    naive_time = (time.perf_counter() - start) / (drops // 10)
+
+    generator = np.random.default_rng(49)
+    start = time.perf_counter()
+    for _ in range(drops // 10):
+        tables.drop("chest", seed=generator)
+    single_time = (time.perf_counter() - start) / (drops // 10)
+
+    start = time.perf_counter()
+    batch = tables.drop_many("chest", drops, seed=49)
+    batch_time = (time.perf_counter() - start) / drops
+
+    start = time.perf_counter()
+    counts = tables.drop_counts("chest", drops * 10, seed=49)
+    count_time = (time.perf_counter() - start) / (drops * 10)
+
+    print(f"  random.choices + dict  {naive_time * 1e6:8.2f} us/drop")
+    print(f"  alias, one drop        {single_time * 1e6:8.2f} us/drop")
+    print(f"  alias, batched         {batch_time * 1e6:8.2f} us/drop  ({sum(map(len, batch))} items)")
+    print(f"  alias, counts only     {count_time * 1e9:8.2f} ns/drop  ({sum(counts.values())} items)")
+    print(f"  {len(naive)} naive drops made {sum(map(len, naive))} items")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    drops = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    run_benchmark(count, drops)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark for slotted model classes.
+Builds an NPC crowd of characters, skills and effects and measures the
+memory they hold and the cost of reading their attributes, comparing the
+slotted models against equivalent plain dataclasses that keep a __dict__
+per instance and allocate a fresh default container for every instance.
+
+Usage: python benchmarks/bench_models.py [count]
+"""
+
+import gc
+import sys
+import os
+import time
+import tracemalloc
+from dataclasses import MISSING, field, fields, make_dataclass
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.character import Character, CharacterClass, Skill
+from src.models.item import Effect
+
+
+def unslotted(cls, fresh_defaults):
+    """A plain dataclass with the same fields as `cls`, as the models were before."""
+    spec = []
+    for model_field in fields(cls):
+        factory = fresh_defaults.get(model_field.name, model_field.default_factory)
+        if factory is not MISSING:
+            spec.append((model_field.name, model_field.type, field(default_factory=factory, init=model_field.init)))
+        elif model_field.default is not MISSING:
+            spec.append((model_field.name, model_field.type, field(default=model_field.default)))
+        else:
+            spec.append((model_field.name, model_field.type))
+    return make_dataclass(f"Plain{cls.__name__}", spec)
+
+
+PLAIN = {
+    Effect: unslotted(Effect, {'tags': lambda: {"tags": []}}),
+    Skill: unslotted(Skill, {'cost': dict, 'effects': list}),
+    Character: unslotted(Character, {'stat_modifiers': dict}),
+}
+
+ROGUE = CharacterClass("Rogue", "Quick and quiet.")
+
+
+def crowd(kind, count):
+    if kind in (Effect, PLAIN[Effect]):
+        return [kind("enemies", "damage", i % 10) for i in range(count)]
+    if kind in (Skill, PLAIN[Skill]):
+        return [kind(f"Stab {i % 20}", "A quick stab.") for i in range(count)]
+    return [kind(name=f"Bandit {i}", character_class=ROGUE, strength=8 + i % 5) for i in range(count)]
+
+
+def measure(kind, count):
+    gc.collect()
+    tracemalloc.start()
+    instances = crowd(kind, count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return instances, size
+
+
+def read_attributes(instances, names, rounds=5):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for instance in instances:
+            for name in names:
+                getattr(instance, name)
+    return (time.perf_counter() - start) / (rounds * len(instances) * len(names))
+
+
+def run_benchmark(count):
+    print(f"{count:,} instances of each model")
+    for model, names in ((Effect, ('action', 'value')), (Skill, ('name', 'level', 'cost')),
+                         (Character, ('strength', 'agility', 'health', 'level'))):
+        for label, kind in (("dataclass", PLAIN[model]), ("slotted", model)):
+            instances, size = measure(kind, count)
+            access = read_attributes(instances, names)
+            print(f"  {model.__name__:10} {label:10} {size / 1e6:8.1f} MB  {size / count:7.0f} B/each"
+                  f"  {access * 1e9:6.1f} ns/read")
+            del instances
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark for sectioned save files.
+Compares writing and reading a game state as a single JSON document against
+the sectioned format with each compression scheme, and reports how long it
+takes before a lazily loaded game is ready to play.
+
+Usage: python benchmarks/bench_save_file.py [message_count]
+"""
+
+import json
+import sys
+import os
+import tempfile
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.game_state import GameState
+from src.models.save_file import write_save, read_save
+
+
+def build_state(message_count):
+    """Create a demo state with a long history."""
+    state = GameState.create_demo_state()
+    for i in range(message_count):
+        state.add_story_message(f"Message number {i} about the long road north.")
+    return state
+
+
+def timed(function):
+    """Return the result of a call and its duration in milliseconds."""
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run_benchmark(message_count):
+    print(f"{message_count:,} messages")
+    state = build_state(message_count)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "game.json")
+
+        def write_json():
+            with open(path, "w") as handle:
+                json.dump(state.to_dict(), handle)
+
+        def read_json():
+            with open(path) as handle:
+                return GameState.from_dict(json.load(handle))
+
+        _, write_ms = timed(write_json)
+        _, read_ms = timed(read_json)
+        print(f"  {'json':6} write {write_ms:9.1f} ms  load {read_ms:9.1f} ms  "
+              f"size {os.path.getsize(path) / 1024:10.1f} KiB")
+
+        for compression in ("none", "zlib", "lzma"):
+            path = os.path.join(directory, f"game.{compression}.sav")
+            _, write_ms = timed(lambda: write_save(path, state, compression=compression))
+            loaded, load_ms = timed(lambda: read_save(path))
+            _, search_ms = timed(lambda: loaded.search("road north"))
+            print(f"  {compression:6} write {write_ms:9.1f} ms  load {load_ms:9.1f} ms  "
+                  f"size {os.path.getsize(path) / 1024:10.1f} KiB  first search {search_ms:7.1f} ms")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
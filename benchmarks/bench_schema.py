@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark for save schema migration.
+Generates thousands of unversioned saves with varying inventories and
+measures how fast they are upgraded and validated, compared with validating
+saves already at the current version and with the full GameState load.
+
+Usage: python benchmarks/bench_schema.py [save_count]
+"""
+
+import json
+import random
+import sys
+import os
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.game_state import GameState
+from src.models.schema import migrate
+
+
+def historical_saves(count, seed=5):
+    """Serialized unversioned saves with 0-200 extra items and 0-500 messages each."""
+    rng = random.Random(seed)
+    template = GameState.create_demo_state().to_dict()
+    del template["schema_version"], template["search_index"], template["world"]
+    sword = next(item for item in template["character"]["inventory"] if "slot" in item)
+    saves = []
+    for i in range(count):
+        data = json.loads(json.dumps(template))
+        character = data["character"]
+        character["equipment"]["accessories"] = None
+        character["character_class"]["tags"] = ["arcane"]
+        for j in range(rng.randrange(200)):
+            item = dict(sword, name=f"Sword {i}.{j}", tags=["fire"])
+            del item["equipped"]
+            character["inventory"].append(item)
+        data["story_log"] += [{"sender": "GM", "message": f"Event {j}"} for j in range(rng.randrange(500))]
+        saves.append(json.dumps(data))
+    return saves
+
+
+def throughput(saves, function):
+    """Parse and process every save, returning (saves per second, MB per second)."""
+    parsed = [json.loads(save) for save in saves]
+    start = time.perf_counter()
+    for data in parsed:
+        function(data)
+    elapsed = time.perf_counter() - start
+    size = sum(len(save) for save in saves) / 1e6
+    return len(saves) / elapsed, size / elapsed
+
+
+def run_benchmark(count):
+    saves = historical_saves(count)
+    print(f"{count:,} saves, {sum(len(save) for save in saves) / 1e6:.1f} MB of JSON")
+
+    rate, mb = throughput(saves, migrate)
+    print(f"  migrate v0 -> current   {rate:10,.0f} saves/s  {mb:8.1f} MB/s")
+
+    current = [json.dumps(migrate(json.loads(save))) for save in saves]
+    rate, mb = throughput(current, migrate)
+    print(f"  validate current        {rate:10,.0f} saves/s  {mb:8.1f} MB/s")
+
+    rate, mb = throughput(saves[:count // 10], GameState.from_dict)
+    print(f"  full GameState load     {rate:10,.0f} saves/s  {mb:8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the session log search index.
+Fills a game state with synthetic messages, then measures indexing
+throughput and search latency.
+
+Usage: python benchmarks/bench_search_index.py [message_count]
+"""
+
+import random
+import sys
+import os
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.game_state import GameState
+
+
+QUERIES = [
+    "what did the innkeeper say about the dragon",
+    "dragon",
+    '"the old mill"',
+    "sender:Innkeeper dragon gold",
+    "blacksmith sword repair",
+]
+
+
+def make_vocabulary(rng, size=20000):
+    """Create a vocabulary of pronounceable fake words."""
+    syllables = ["ka", "lo", "mir", "tha", "dor", "en", "vi", "sul", "ra", "gon", "el", "ith"]
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def run_benchmark(message_count):
+    """Index message_count messages and time a set of queries."""
+    rng = random.Random(42)
+    vocabulary = make_vocabulary(rng)
+    story_words = ["innkeeper", "dragon", "gold", "old", "mill", "blacksmith", "sword", "repair"]
+    fillers = ["the", "a", "about", "and", "of", "to"]
+    senders = ["GM", "Player", "Innkeeper", "Blacksmith"]
+
+    state = GameState.create_demo_state()
+
+    start = time.perf_counter()
+    for i in range(message_count):
+        words = rng.choices(vocabulary, k=rng.randint(6, 18))
+        words += rng.choices(fillers, k=4)
+        if rng.random() < 0.05:
+            words.append(rng.choice(story_words))
+        rng.shuffle(words)
+        if i % 1000 == 0:
+            words += ["the", "old", "mill"]
+        message = " ".join(words)
+        if i % 3 == 0:
+            state.add_gm_message(message, sender=rng.choice(senders))
+        else:
+            state.add_story_message(message, sender=rng.choice(senders))
+    elapsed = time.perf_counter() - start
+    print(f"Indexed {message_count:,} messages in {elapsed:.2f}s "
+          f"({message_count / elapsed:,.0f} messages/s)")
+
+    for query in QUERIES:
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            hits = state.search(query)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        print(f"{query!r:48} median {timings[2] * 1000:8.2f} ms  "
+              f"best {timings[0] * 1000:8.2f} ms  hits {len(hits)}")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark for generated serializers.
+Round-trips models through to_dict and from_dict, comparing the functions
+generated from the dataclass fields against a generic reflective serializer
+that walks the fields and type hints on every call, the way
+dataclasses.asdict does. Both return detached copies.
+
+Usage: python benchmarks/bench_serializers.py [rounds]
+"""
+
+import copy
+import sys
+import os
+import time
+import typing
+from dataclasses import fields, is_dataclass
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.character import Character, CharacterClass, Skill
+from src.models.game_state import GameState, Location
+from src.models.item import Effect
+
+
+def reflective_to_dict(obj):
+    if is_dataclass(obj):
+        return {model_field.name: reflective_to_dict(getattr(obj, model_field.name))
+                for model_field in fields(obj) if model_field.init}
+    if isinstance(obj, (list, tuple)):
+        return [reflective_to_dict(item) for item in obj]
+    if isinstance(obj, typing.Mapping):
+        return {key: reflective_to_dict(value) for key, value in obj.items()}
+    return copy.deepcopy(obj)
+
+
+def reflective_from_dict(cls, data):
+    hints = typing.get_type_hints(cls)
+    values = {}
+    for model_field in fields(cls):
+        if not model_field.init or model_field.name not in data:
+            continue
+        annotation, value = hints[model_field.name], data[model_field.name]
+        args = typing.get_args(annotation)
+        if is_dataclass(annotation):
+            value = reflective_from_dict(annotation, value)
+        elif args and is_dataclass(args[0]):
+            value = [reflective_from_dict(args[0], item) for item in value]
+        else:
+            value = copy.deepcopy(value)
+        values[model_field.name] = value
+    return cls(**values)
+
+
+def time_round_trip(function, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        function()
+    return (time.perf_counter() - start) / rounds
+
+
+def run_benchmark(rounds):
+    state = GameState.create_demo_state()
+    character = state.character
+    cases = [
+        ("Effect", Effect, Effect("enemies", "damage", 14, {"tags": ["fire"]})),
+        ("Location", Location, state.current_location),
+        ("Skill", Skill, character.skills[0]),
+        ("CharacterClass", CharacterClass, character.character_class),
+    ]
+    print(f"{rounds:,} round trips per model")
+    for label, cls, model in cases:
+        reflective = time_round_trip(lambda: reflective_from_dict(cls, reflective_to_dict(model)), rounds)
+        generated = time_round_trip(lambda: cls.from_dict(model.to_dict()), rounds)
+        print(f"  {label:16} reflective {reflective * 1e6:8.2f} us  generated {generated * 1e6:8.2f} us"
+              f"  {reflective / generated:5.1f}x")
+    whole = time_round_trip(lambda: Character.from_dict(character.to_dict()), max(1, rounds // 10))
+    print(f"  {'Character':16} generated {whole * 1e6:8.2f} us (with {len(character.inventory)} items)")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark for game state snapshots.
+Compares deep-copying the game state against snapshots on plain lists and
+on persistent collections: snapshot latency, restore latency and the memory
+retained by each snapshot.
+
+Usage: python benchmarks/bench_snapshots.py [message_count]
+"""
+
+import copy
+import sys
+import os
+import time
+import tracemalloc
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.game_state import GameState
+from src.models.item import Item
+
+
+def build_state(message_count, persistent):
+    """Create a demo state with a long history and a large inventory."""
+    state = GameState.create_demo_state(persistent=persistent)
+    for i in range(message_count):
+        state.add_story_message(f"Message number {i} about the long road north.")
+    for i in range(message_count // 100):
+        state.character.add_to_inventory(Item(f"Pebble {i}", "junk", "A small pebble."))
+    return state
+
+
+def time_call(function, repeat=20):
+    """Return the median duration of a call in microseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2] * 1e6
+
+
+def retained_bytes(function, count=10):
+    """Measure the average memory kept alive by the objects a call returns."""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    kept = [function() for _ in range(count)]
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del kept
+    return used / count
+
+
+def run_benchmark(message_count):
+    print(f"{message_count:,} messages, {message_count // 100:,} inventory items")
+    for persistent in (False, True):
+        label = "persistent" if persistent else "lists"
+        state = build_state(message_count, persistent)
+        snapshot = state.snapshot()
+        state.add_story_message("One more message.")
+
+        snapshot_us = time_call(state.snapshot)
+        restore_us = time_call(lambda: state.restore(snapshot))
+        snapshot_bytes = retained_bytes(state.snapshot)
+        print(f"  {label:10} snapshot {snapshot_us:10.1f} us  restore {restore_us:10.1f} us  "
+              f"memory/snapshot {snapshot_bytes / 1024:10.1f} KiB")
+
+    state = build_state(message_count, False)
+    deepcopy_us = time_call(lambda: copy.deepcopy(state), repeat=3)
+    print(f"  {'deepcopy':10} snapshot {deepcopy_us:10.1f} us")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
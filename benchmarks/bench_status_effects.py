@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark for status effect scheduling.
+Keeps a battle of characters covered in timed effects (buffs lasting 20
+to 200 turns) for a number of turns, replacing every effect that ends with
+a fresh one, using the per-turn list rebuild from the character reference
+spec and then the heap-scheduled engine. Both apply the same pregenerated
+effects through the characters' stat modifiers.
+
+Usage: python benchmarks/bench_status_effects.py [characters] [effects_per_character] [turns]
+"""
+
+import random
+import sys
+import os
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.character import Character, CharacterClass
+from src.models.status_effects import StatusEffect, StatusEffectEngine
+
+
+STATS = ("strength", "endurance", "focus", "willpower", "agility")
+MIN_DURATION, MAX_DURATION = 20, 200
+
+
+def random_effect(rng):
+    return StatusEffect(
+        "effect", rng.randint(MIN_DURATION, MAX_DURATION), stat=rng.choice(STATS), amount=rng.randint(1, 9),
+        passive=rng.random() < 0.2, blocks_passives=rng.random() < 0.01
+    )
+
+
+class ListedEffects:
+    """The reference spec's approach: one list per character, rebuilt and rescanned every turn."""
+
+    def __init__(self, character):
+        self.character = character
+        self.status_effects = []
+        self.banished = []
+
+    def add(self, effect):
+        effect.expires_at = effect.duration
+        self.status_effects.append(effect)
+        self.character.set_stat_modifier(effect.source, effect.stat, effect.amount)
+
+    def tick(self):
+        for effect in self.status_effects:
+            effect.expires_at -= 1
+        current = [effect for effect in self.status_effects if effect.expires_at > 0]
+        removed = [effect for effect in self.status_effects if effect.expires_at <= 0]
+        for effect in removed:
+            self.character.remove_stat_modifier(effect.source, effect.stat)
+
+        blocked = False
+        for effect in self.status_effects:
+            if effect.blocks_passives:
+                blocked = True
+        if blocked:
+            passives = []
+            for effect in list(current):
+                if effect.passive:
+                    passives.append(effect)
+                    self.character.remove_stat_modifier(effect.source, effect.stat)
+                    current.remove(effect)
+            self.banished += passives
+        elif self.banished:
+            for effect in self.banished:
+                self.character.set_stat_modifier(effect.source, effect.stat, effect.amount)
+            current += self.banished
+            self.banished = []
+        self.status_effects = current
+        return removed
+
+
+def effect_pool(characters, per_character, turns, seed):
+    """Enough fresh effects for the initial ones and every replacement."""
+    rng = random.Random(seed)
+    replacements = len(characters) * per_character * (turns // MIN_DURATION + 1)
+    return iter([random_effect(rng) for _ in range(len(characters) * per_character + replacements)])
+
+
+def run_listed(characters, per_character, turns, pool):
+    battle = [ListedEffects(character) for character in characters]
+    for holder in battle:
+        for _ in range(per_character):
+            holder.add(next(pool))
+    for _ in range(turns):
+        for holder in battle:
+            for _ in holder.tick():
+                holder.add(next(pool))
+
+
+def run_engine(characters, per_character, turns, pool):
+    engine = StatusEffectEngine()
+    for character in characters:
+        for _ in range(per_character):
+            engine.add(character, next(pool))
+    for _ in range(turns):
+        for effect in engine.advance():
+            engine.add(effect.target, next(pool))
+
+
+def run_benchmark(count=100, per_character=40, turns=200):
+    print(f"{count} characters x {per_character} effects = {count * per_character} effects, {turns} turns")
+    for name, run in (("list rebuild", run_listed), ("heap engine", run_engine)):
+        characters = [Character(name=f"Fighter {number}", character_class=CharacterClass("Fighter", ""))
+                      for number in range(count)]
+        pool = effect_pool(characters, per_character, turns, seed=44)
+        start = time.perf_counter()
+        run(characters, per_character, turns, pool)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<14} {elapsed * 1000:9.1f} ms  {elapsed / turns * 1000:7.3f} ms/turn")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    per_character = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    turns = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    run_benchmark(count, per_character, turns)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the tag index.
+Tags a large number of entities with a few random tags each, then times
+boolean tag queries answered by the index against scanning every
+entity's tag list, and against matching each entity's tag bitset.
+
+Usage: python benchmarks/bench_tag_index.py [entities]
+"""
+
+import random
+import sys
+import os
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.tag_index import TagIndex, parse_tag_query
+
+TAG_NAMES = ["fire", "ice", "lightning", "poison", "holy", "shadow", "magic", "physical",
+             "cursed", "blessed", "weapon", "armor", "ring", "potion", "rare", "quest"]
+
+QUERIES = {
+    "fire & magic": lambda tags: "fire" in tags and "magic" in tags,
+    "fire | ice": lambda tags: "fire" in tags or "ice" in tags,
+    "weapon & !cursed": lambda tags: "weapon" in tags and "cursed" not in tags,
+    "(holy | blessed) & rare & !quest": lambda tags: ("holy" in tags or "blessed" in tags)
+                                                      and "rare" in tags and "quest" not in tags,
+}
+
+
+def timed(function, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = function()
+    return result, (time.perf_counter() - start) / repeats
+
+
+def run_benchmark(count=100000, repeats=20, seed=48):
+    rng = random.Random(seed)
+    entities = [{"tags": rng.sample(TAG_NAMES, rng.randint(1, 4))} for _ in range(count)]
+
+    start = time.perf_counter()
+    index = TagIndex()
+    for entity_id, tags in enumerate(entities):
+        index.add(entity_id, tags)
+    print(f"indexed {count} entities in {time.perf_counter() - start:.2f} s")
+
+    for source, predicate in QUERIES.items():
+        query = parse_tag_query(source)
+        bits, selecting = timed(lambda: index.query(query), repeats)
+        ids, listing = timed(lambda: index.ids(query), repeats)
+        scanned, scanning = timed(lambda: [entity_id for entity_id, tags in enumerate(entities)
+                                           if predicate(tags["tags"])], 3)
+        masks = [index.mask_of(entity_id) for entity_id in range(count)]
+        matched, matching = timed(lambda: [entity_id for entity_id, mask in enumerate(masks)
+                                           if query.matches(mask)], 3)
+        assert ids == scanned == matched and bits.bit_count() == len(ids)
+        print(f"  {source:<34} {len(ids):6d} hits  bitset {selecting * 1e6:8.1f} us  "
+              f"ids {listing * 1e3:6.2f} ms  scan {scanning * 1e3:7.2f} ms  "
+              f"per-entity match {matching * 1e3:7.2f} ms")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    run_benchmark(count)
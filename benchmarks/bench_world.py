@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the world graph.
+Builds a procedurally generated world of positioned locations and measures
+construction time, neighbour lookups, BFS and A* route queries, and cached
+route lookups. For comparison, it also times resolving a route by scanning a
+plain list of Location objects for each neighbour.
+
+Usage: python benchmarks/bench_world.py [location_count]
+"""
+
+import math
+import random
+import sys
+import os
+import time
+from collections import deque
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.game_state import Location
+from src.models.world import World
+
+
+def generate_locations(count, seed=1):
+    """Lay locations out on a jittered grid, each connected to its grid neighbours."""
+    rng = random.Random(seed)
+    side = math.isqrt(count)
+    locations = []
+    positions = []
+    for i in range(side * side):
+        x, y = divmod(i, side)
+        connections = [f"Place {j}" for j in (i - side, i + side, i - 1, i + 1)
+                       if 0 <= j < side * side and (j // side == x or j % side == y)]
+        locations.append(Location(f"Place {i}", f"Generated place {i}.", connections))
+        positions.append((x + rng.uniform(-0.3, 0.3), y + rng.uniform(-0.3, 0.3)))
+    return locations, positions
+
+
+def scan_route(locations, start, goal):
+    """Breadth-first search resolving every neighbour by scanning the location list."""
+    parents = {start: None}
+    queue = deque([start])
+    while queue:
+        name = queue.popleft()
+        if name == goal:
+            return True
+        location = next(location for location in locations if location.name == name)
+        for connection in location.connections:
+            if connection not in parents:
+                parents[connection] = name
+                queue.append(connection)
+    return False
+
+
+def run_benchmark(count):
+    locations, positions = generate_locations(count)
+    print(f"{len(locations):,} locations")
+
+    start = time.perf_counter()
+    world = World()
+    for location, position in zip(locations, positions):
+        world.add_location(location, position=position)
+    print(f"  build            {(time.perf_counter() - start) * 1000:10.1f} ms")
+
+    rng = random.Random(2)
+    names = [location.name for location in locations]
+    start = time.perf_counter()
+    for _ in range(10_000):
+        world.neighbours(rng.choice(names))
+    print(f"  neighbours       {(time.perf_counter() - start) / 10_000 * 1e6:10.2f} us")
+
+    pairs = [(rng.choice(names), rng.choice(names)) for _ in range(20)]
+    for label, query in (("bfs route", world.route), ("a* route", world.shortest_route)):
+        start = time.perf_counter()
+        for a, b in pairs:
+            query(a, b)
+        print(f"  {label:16} {(time.perf_counter() - start) / len(pairs) * 1000:10.2f} ms")
+
+    start = time.perf_counter()
+    for a, b in pairs:
+        world.shortest_route(a, b)
+    print(f"  cached route     {(time.perf_counter() - start) / len(pairs) * 1e6:10.2f} us")
+
+    # A short trip, resolving each neighbour by scanning the whole list
+    side = math.isqrt(len(locations))
+    origin, goal = f"Place {len(locations) - 1}", f"Place {len(locations) - 3 * side - 4}"
+    start = time.perf_counter()
+    scan_route(locations, origin, goal)
+    scan_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    world.route(origin, goal)
+    print(f"  short trip       {scan_ms:10.2f} ms by list scan, "
+          f"{(time.perf_counter() - start) * 1000:.2f} ms on the world graph")
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
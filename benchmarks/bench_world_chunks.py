@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark for streaming world chunks.
+Writes a procedurally generated world to disk with several chunk sizes and
+replays the same random walk through each, reporting how often and for how
+long the walk had to wait for a chunk to load, with and without prefetching
+the surrounding regions.
+
+Usage: python benchmarks/bench_world_chunks.py [location_count] [steps]
+"""
+
+import random
+import sys
+import os
+import tempfile
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_world import generate_locations
+from src.models.world import World
+from src.models.world_chunks import StreamingWorld, write_world_chunks
+
+
+def random_walk(world, start, steps, seed=4):
+    """Walk from neighbour to neighbour, pausing briefly as the player would."""
+    rng = random.Random(seed)
+    name = start
+    for _ in range(steps):
+        world.visit(name)
+        world.describe(name)
+        name = rng.choice(world.neighbours(name))
+        time.sleep(0.001)
+
+
+def run_benchmark(count, steps):
+    locations, positions = generate_locations(count)
+    world = World()
+    for location, position in zip(locations, positions):
+        world.add_location(location, position=position)
+    print(f"{len(world):,} locations, {steps:,} steps")
+
+    for chunk_size in (8, 16, 32):
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            write_world_chunks(world, directory, chunk_size=chunk_size)
+            write_ms = (time.perf_counter() - start) * 1000
+            for radius, label in ((0, "no prefetch"), (1, "prefetch")):
+                streaming = StreamingWorld(directory, max_loaded_locations=20_000, prefetch_radius=radius)
+                random_walk(streaming, locations[len(locations) // 2].name, steps)
+                streaming.close()
+                stats = streaming.stats
+                print(f"  chunk {chunk_size:3}  {label:12} stalls {stats.stalls:5}  "
+                      f"stall time {stats.stall_seconds * 1000:8.1f} ms  prefetched {stats.prefetched:4}  "
+                      f"evictions {stats.evictions:4}  resident {streaming.loaded_locations:6,}  "
+                      f"(write {write_ms:.0f} ms)")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+                  int(sys.argv[2]) if len(sys.argv) > 2 else 2_000)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Balance report: DPS and survivability of every character class with every
+combination of gear, simulated across a pool of worker processes.
+
+Classes come from the demo game and any --classes files (JSON, or Python
+modules such as specs/character_class_reference.py); gear from the demo
+game and any --items JSON files. Every build starts from the demo
+character's stats and is measured against the --opponent class, also
+without gear. With --checkpoint, an interrupted run picks up where it
+stopped when started again with the same arguments; a checkpoint left by
+a run with other fights, rounds, seed or opponent is refused.
+
+Usage: python src/balance_report.py [--classes FILE ...] [--items FILE ...]
+                                    [--csv FILE] [--json FILE] [--checkpoint FILE]
+"""
+
+import argparse
+import sys
+import os
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.balance import (BalanceCell, CheckpointError, balance_matrix, load_classes, load_items,
+                                run_balance, write_csv, write_json)
+from src.models.game_state import GameState
+from src.models.item import EquipmentItem
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate every class and gear combination.")
+    parser.add_argument('--classes', nargs='*', default=[], metavar='FILE',
+                        help="class definitions to add to the demo class")
+    parser.add_argument('--items', nargs='*', default=[], metavar='FILE',
+                        help="item catalogs to add to the demo gear")
+    parser.add_argument('--opponent', default="Arcane Adept", help="name of the class fought in duels")
+    parser.add_argument('--fights', type=int, default=10000, help="fights per build and measurement")
+    parser.add_argument('--rounds', type=int, default=50, help="round limit of each fight")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (all CPUs by default)")
+    parser.add_argument('--checkpoint', metavar='FILE', help="file that saves progress for resuming")
+    parser.add_argument('--csv', metavar='FILE', help="write the report as CSV")
+    parser.add_argument('--json', metavar='FILE', help="write the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    demo = GameState.create_demo_state().character
+    template = demo.to_dict()
+
+    # Later definitions replace earlier ones of the same name
+    classes = {demo.character_class.name: demo.character_class.to_dict()}
+    for path in args.classes:
+        classes.update((data["name"], data) for data in load_classes(path))
+    items = {item.name: item.to_dict() for item in demo.inventory if isinstance(item, EquipmentItem)}
+    for path in args.items:
+        items.update((data["name"], data) for data in load_items(path))
+    if args.opponent not in classes:
+        sys.exit(f"Unknown opponent class {args.opponent!r}; known classes: {', '.join(classes)}")
+
+    cells = balance_matrix(classes.values(), items.values())
+    print(f"{len(classes)} classes x {len(cells) // len(classes)} loadouts = {len(cells)} builds, "
+          f"{args.fights} fights each")
+
+    start = time.perf_counter()
+
+    def progress(result, done, total):
+        print(f"[{done}/{total}] {result.class_name} | {result.loadout}: "
+              f"win rate {result.win_rate}, dps {result.dps}, survives {result.survival_rounds} rounds")
+
+    try:
+        results = run_balance(cells, template, BalanceCell(classes[args.opponent]), args.fights, args.rounds,
+                              args.seed, args.workers, args.checkpoint, progress)
+    except CheckpointError as error:
+        sys.exit(str(error))
+    print(f"Done in {time.perf_counter() - start:.1f} s")
+
+    if args.csv:
+        write_csv(results, args.csv)
+    if args.json:
+        write_json(results, args.json, opponent=args.opponent, fights=args.fights,
+                   rounds=args.rounds, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,15 @@
 import sys
 import os
+from contextlib import contextmanager
 
 # Add the project root directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from PyQt6.QtWidgets import QApplication
 
-from src.models import GameState
+from src.models import (GameState, MessageAppended, ItemAdded, ItemRemoved, ItemEquipped,
+                        ItemUnequipped, StatChanged, LocationChanged, TimeOfDayChanged,
+                        StateRestored)
 from src.ui.main_window import MainWindow
 from src.utils.theme_manager import ThemeManager
 from src.models.game_master import GameMaster, StorytellerGM, example_story
@@ -16,13 +19,19 @@ from src.models.llm_game_master import LLMGameMaster
 class GameApp:
     """Main application class for the text adventure game UI."""
     
+    # Messages shown per log; older history is loaded as the player scrolls up
+    LOG_PAGE_SIZE = 200
+    
+    STATUS_BAR_STATS = {'health', 'max_health', 'mana', 'max_mana', 'stamina', 'max_stamina'}
+    EXPERIENCE_STATS = {'level', 'experience', 'experience_to_next_level'}
+    
     def __init__(self, use_llm=False):
         self.app = QApplication(sys.argv)
         self.theme_manager = ThemeManager()
         self.main_window = MainWindow()
         
-        # Create demo game state
-        self.game_state = GameState.create_demo_state()
+        # Create demo game state on persistent collections so undo snapshots are cheap
+        self.game_state = GameState.create_demo_state(persistent=True)
         
         # Create and initialize the game master
         if use_llm:
@@ -44,9 +53,16 @@ class GameApp:
         self.main_window.gm_message_sent.connect(self._on_gm_message_sent)
         self.main_window.gm_message_received.connect(self._on_gm_message_received)
         self.main_window.theme_toggled.connect(self._on_theme_toggled)
+        self.main_window.undo_requested.connect(self.game_state.undo)
+        self.main_window.redo_requested.connect(self.game_state.redo)
+        self.main_window.history_requested.connect(self._on_history_requested)
+        self.main_window.set_world(self.game_state.world)
         
-        # Initialize UI with game state
+        # Initialize UI with game state, then apply later changes incrementally
+        self._log_start = {"story": 0, "gm": 0}
         self._update_ui()
+        self._ui_echo_depth = 0
+        self.game_state.events.subscribe(self._apply_changes)
         
         # Override the main window's _show_character_window method to add debug output
         original_show_character_window = self.main_window._show_character_window
@@ -72,12 +88,23 @@ class GameApp:
         """Handle theme toggle."""
         self.theme_manager.toggle_theme()
     
+    @contextmanager
+    def _ui_echo(self):
+        """Mark messages logged in this block as already displayed by the main window."""
+        self._ui_echo_depth += 1
+        try:
+            with self.game_state.events.batch():
+                yield
+        finally:
+            self._ui_echo_depth -= 1
+    
     def _on_story_message_sent(self, message):
         """Handle story messages sent by the player."""
         # In a real implementation, this would send the message to the backend
         # For now, we'll just add it to the game state
-        self.game_state.add_story_message(message, sender="Player")
-        self._update_ui()
+        self.game_state.checkpoint()
+        with self._ui_echo():
+            self.game_state.add_story_message(message, sender="Player")
     
     def _on_gm_message_sent(self, message):
         """Handle GM messages sent by the player."""
@@ -85,22 +112,74 @@ class GameApp:
         self.game_master.receive_player_message(message)
         
         # Add it to the game state
-        self.game_state.add_gm_message(message, sender="Player")
-        self._update_ui()
+        with self._ui_echo():
+            self.game_state.add_gm_message(message, sender="Player")
     
     def _on_gm_message_received(self, message):
         """Handle GM messages received from the game master."""
-        # Add it to the game state
-        self.game_state.add_gm_message(message, sender="GM")
-        # Note: We don't call _update_ui() here because that would clear and rebuild the chat,
-        # and the message is already displayed by _receive_gm_message
+        # Add it to the game state. The message is already displayed by _receive_gm_message
+        with self._ui_echo():
+            self.game_state.add_gm_message(message, sender="GM")
     
-    def _update_ui(self):
-        """Update the UI with the current game state."""
-        # Update main window
-        self.main_window.update_story_log(self.game_state.story_log)
-        self.main_window.update_gm_log(self.game_state.gm_log)
-        self.main_window.update_inventory(self.game_state.character.inventory)
+    def _apply_changes(self, events):
+        """Apply a coalesced batch of game state changes to the UI."""
+        status_changed = False
+        experience_changed = False
+        equipment_changed = False
+        
+        if any(isinstance(event, StateRestored) for event in events):
+            self._update_ui()
+            return
+        
+        for event in events:
+            if isinstance(event, MessageAppended):
+                if self._ui_echo_depth:
+                    continue
+                if event.log == "story":
+                    self.main_window.append_story_message(event.sender, event.message)
+                else:
+                    self.main_window.append_gm_message(event.sender, event.message)
+            elif isinstance(event, ItemAdded):
+                self.main_window.add_inventory_item(event.item)
+            elif isinstance(event, ItemRemoved):
+                self.main_window.remove_inventory_item(event.item)
+            elif isinstance(event, (ItemEquipped, ItemUnequipped)):
+                self.main_window.refresh_inventory_item(event.item)
+                equipment_changed = True
+            elif isinstance(event, StatChanged):
+                status_changed = status_changed or event.stat in self.STATUS_BAR_STATS
+                experience_changed = experience_changed or event.stat in self.EXPERIENCE_STATS
+            elif isinstance(event, LocationChanged):
+                self.main_window.update_location(event.location)
+                self.game_master.set_world_context(self.game_state.describe_surroundings())
+            elif isinstance(event, TimeOfDayChanged):
+                status_changed = True
+        
+        character = self.game_state.character
+        if status_changed:
+            self._update_status_bar()
+        if experience_changed:
+            self.main_window.update_experience(
+                character.level, character.experience, character.experience_to_next_level
+            )
+        if equipment_changed:
+            self.main_window.update_equipment(character.equipment.equipment)
+    
+    def _on_history_requested(self, log):
+        """Show the next page of older messages for a log."""
+        start = self._log_start[log]
+        if start == 0:
+            return
+        new_start = max(0, start - self.LOG_PAGE_SIZE)
+        messages = self.game_state.story_log if log == "story" else self.game_state.gm_log
+        self._log_start[log] = new_start
+        if log == "story":
+            self.main_window.prepend_story_messages(messages[new_start:start])
+        else:
+            self.main_window.prepend_gm_messages(messages[new_start:start])
+    
+    def _update_status_bar(self):
+        """Update the status bar with the character's current pools."""
         self.main_window.update_status_bar(
             self.game_state.character.health,
             self.game_state.character.max_health,
@@ -110,12 +189,23 @@ class GameApp:
             self.game_state.character.max_stamina,
             self.game_state.time_of_day
         )
+    
+    def _update_ui(self):
+        """Update the UI with the complete current game state."""
+        # Update main window with the most recent page of each log
+        self._log_start["story"] = max(0, len(self.game_state.story_log) - self.LOG_PAGE_SIZE)
+        self._log_start["gm"] = max(0, len(self.game_state.gm_log) - self.LOG_PAGE_SIZE)
+        self.main_window.update_story_log(self.game_state.story_log[self._log_start["story"]:])
+        self.main_window.update_gm_log(self.game_state.gm_log[self._log_start["gm"]:])
+        self.main_window.update_inventory(self.game_state.character.inventory)
+        self._update_status_bar()
         
         # Update character window if it exists
         self.main_window.update_character_window(
             self.game_state.character,
             self.game_state.current_location
         )
+        self.game_master.set_world_context(self.game_state.describe_surroundings())
     
     def run(self):
         """Run the application."""
@@ -1,9 +1,47 @@
-from .item import Item, EquipmentItem, Effect
+from .item import Item, EquipmentItem, Effect, ItemDefinition, ItemRegistry, ITEM_REGISTRY
 from .character import Character, CharacterClass, Skill, CharacterEquipment
-from .game_state import GameState, Location
+from .inventory import Inventory
+from .game_state import GameState, Location, GameSnapshot
+from .persistent import PVector, PersistentList
+from .history import UndoHistory
+from .search_index import SearchIndex, SearchHit
+from .world import World
+from .world_chunks import StreamingWorld, ChunkStats, write_world_chunks
+from .balance import BalanceCell, BalanceResult, CheckpointError, balance_matrix, run_balance
+from .battle import Battle, RoundResult
+from .combat_sim import Combatant, DuelReport, simulate_duels, compare_builds
+from .dice import Dice, DiceError, DiceStreams, parse_dice, dice_pool, roll
+from .experience import ExperienceCurve, CHARACTER_CURVE, SKILL_CURVE, grant_experience
+from .formulas import Formula, FormulaError, compile_formula, skill_table
+from .gear_optimizer import EquipPlan, best_in_slot
+from .loot import AliasTable, LootEntry, LootTable, LootTables, LootTableError, RARITY_WEIGHTS
+from .status_effects import StatusEffect, StatusEffectEngine
+from .tag_index import TAGS, TagIndex, TagQuery, TagQueryError, parse_tag_query, tag_mask
+from .schema import SCHEMA, SCHEMA_VERSION, Schema, Field, SchemaError, migrate
+from .save_file import write_save, read_save, SaveFile, SaveFileError, LazyLog
+from .events import (EventStream, ChangeEvent, MessageAppended, ItemAdded, ItemRemoved,
+                     ItemEquipped, ItemUnequipped, StatChanged, LocationChanged, TimeOfDayChanged,
+                     StateRestored)
 
 __all__ = [
-    'Item', 'EquipmentItem', 'Effect',
-    'Character', 'CharacterClass', 'Skill', 'CharacterEquipment',
-    'GameState', 'Location'
+    'Item', 'EquipmentItem', 'Effect', 'ItemDefinition', 'ItemRegistry', 'ITEM_REGISTRY',
+    'Character', 'CharacterClass', 'Skill', 'CharacterEquipment', 'Inventory',
+    'GameState', 'Location', 'World', 'StreamingWorld', 'ChunkStats', 'write_world_chunks',
+    'SearchIndex', 'SearchHit',
+    'write_save', 'read_save', 'SaveFile', 'SaveFileError', 'LazyLog',
+    'BalanceCell', 'BalanceResult', 'CheckpointError', 'balance_matrix', 'run_balance',
+    'Battle', 'RoundResult',
+    'Combatant', 'DuelReport', 'simulate_duels', 'compare_builds',
+    'Dice', 'DiceError', 'DiceStreams', 'parse_dice', 'dice_pool', 'roll',
+    'ExperienceCurve', 'CHARACTER_CURVE', 'SKILL_CURVE', 'grant_experience',
+    'Formula', 'FormulaError', 'compile_formula', 'skill_table',
+    'EquipPlan', 'best_in_slot',
+    'AliasTable', 'LootEntry', 'LootTable', 'LootTables', 'LootTableError', 'RARITY_WEIGHTS',
+    'StatusEffect', 'StatusEffectEngine',
+    'TAGS', 'TagIndex', 'TagQuery', 'TagQueryError', 'parse_tag_query', 'tag_mask',
+    'SCHEMA', 'SCHEMA_VERSION', 'Schema', 'Field', 'SchemaError', 'migrate',
+    'EventStream', 'ChangeEvent', 'MessageAppended', 'ItemAdded', 'ItemRemoved',
+    'ItemEquipped', 'ItemUnequipped', 'StatChanged', 'LocationChanged', 'TimeOfDayChanged',
+    'StateRestored',
+    'PVector', 'PersistentList', 'UndoHistory', 'GameSnapshot'
 ] 
\ No newline at end of file
@@ -0,0 +1,402 @@
+import ast
+import csv
+import itertools
+import json
+import math
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .character import Character, CharacterClass, CharacterEquipment
+from .combat_sim import Combatant, simulate_duels
+from .dice import parse_dice
+from .item import EquipmentItem, item_from_dict
+
+
+# z score of the two-sided 95% confidence intervals in reports
+CI_Z = 1.96
+
+# Health of the training dummy and of the unkillable opponent in the survival
+# runs, far beyond anything a build deals in one report
+DUMMY_HEALTH = 1e9
+
+# The character stats every build starts from, copied from the template
+TEMPLATE_STATS = ('level', 'max_health', 'max_mana', 'max_stamina', 'strength', 'endurance',
+                  'focus', 'willpower', 'agility', 'luck', 'charisma')
+
+REPORT_COLUMNS = ('class', 'loadout', 'fights',
+                  'win_rate', 'win_rate_low', 'win_rate_high',
+                  'rounds_to_kill', 'rounds_to_kill_low', 'rounds_to_kill_high',
+                  'dps', 'dps_low', 'dps_high',
+                  'survival_rounds', 'survival_rounds_low', 'survival_rounds_high')
+
+
+@dataclass(frozen=True)
+class Estimate:
+    """A simulated value with the bounds of its confidence interval."""
+    mean: float
+    low: float
+    high: float
+
+    def __str__(self) -> str:
+        return f"{self.mean:.3g} [{self.low:.3g}, {self.high:.3g}]"
+
+
+def mean_interval(samples: Sequence[float]) -> Estimate:
+    """Mean of the samples with its normal-approximation confidence interval; NaN when empty."""
+    samples = np.asarray(samples, dtype=float)
+    if not samples.size:
+        return Estimate(math.nan, math.nan, math.nan)
+    mean = float(samples.mean())
+    margin = CI_Z * float(samples.std(ddof=1)) / math.sqrt(samples.size) if samples.size > 1 else 0.0
+    return Estimate(mean, mean - margin, mean + margin)
+
+
+def wilson_interval(successes: int, trials: int) -> Estimate:
+    """A success rate with its Wilson score interval, which stays inside [0, 1] near the edges."""
+    if not trials:
+        return Estimate(math.nan, math.nan, math.nan)
+    rate = successes / trials
+    z2 = CI_Z ** 2
+    centre = (rate + z2 / (2 * trials)) / (1 + z2 / trials)
+    margin = CI_Z * math.sqrt(rate * (1 - rate) / trials + z2 / (4 * trials ** 2)) / (1 + z2 / trials)
+    return Estimate(rate, max(0.0, centre - margin), min(1.0, centre + margin))
+
+
+@dataclass(frozen=True)
+class BalanceCell:
+    """
+    One entry of the simulation matrix: a character class wearing a loadout.
+    Classes and items are kept as the dicts they were loaded from, so cells
+    can be sent to worker processes as they are. Each cell seeds its own
+    random generator from the report seed and its key, so its results do
+    not depend on which worker runs it, or when.
+    """
+    class_data: Dict[str, Any]
+    items: Tuple[Dict[str, Any], ...] = ()
+
+    @property
+    def class_name(self) -> str:
+        return self.class_data["name"]
+
+    @property
+    def loadout(self) -> str:
+        return " + ".join(item["name"] for item in self.items) or "no gear"
+
+    @property
+    def key(self) -> str:
+        return f"{self.class_name}|{self.loadout}"
+
+    @property
+    def digest(self) -> int:
+        """A checksum of the class and item data, which can change without changing the key."""
+        return zlib.crc32(json.dumps([self.class_data, self.items], sort_keys=True).encode())
+
+    def seed(self, seed: int) -> np.random.SeedSequence:
+        return np.random.SeedSequence([seed, zlib.crc32(self.key.encode())])
+
+
+@dataclass(frozen=True)
+class BalanceResult:
+    """
+    Simulated numbers of one cell against the reference opponent: its win
+    rate and the rounds its wins take, the damage it deals per round to a
+    training dummy with the opponent's defenses, and how many rounds it
+    lasts against the opponent without fighting back (capped at the round
+    limit).
+    """
+    class_name: str
+    loadout: str
+    fights: int
+    win_rate: Estimate
+    rounds_to_kill: Estimate
+    dps: Estimate
+    survival_rounds: Estimate
+
+    @property
+    def key(self) -> str:
+        return f"{self.class_name}|{self.loadout}"
+
+    def to_row(self) -> Dict[str, Any]:
+        row = {'class': self.class_name, 'loadout': self.loadout, 'fights': self.fights}
+        for name in ('win_rate', 'rounds_to_kill', 'dps', 'survival_rounds'):
+            estimate = getattr(self, name)
+            row[name], row[f"{name}_low"], row[f"{name}_high"] = estimate.mean, estimate.low, estimate.high
+        return row
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> 'BalanceResult':
+        def estimate(name: str) -> Estimate:
+            return Estimate(float(row[name]), float(row[f"{name}_low"]), float(row[f"{name}_high"]))
+        return cls(
+            class_name=row['class'],
+            loadout=row['loadout'],
+            fights=int(row['fights']),
+            win_rate=estimate('win_rate'),
+            rounds_to_kill=estimate('rounds_to_kill'),
+            dps=estimate('dps'),
+            survival_rounds=estimate('survival_rounds')
+        )
+
+
+def load_classes(path: str) -> List[Dict[str, Any]]:
+    """
+    Character class definitions from a JSON file (one class or a list) or
+    a Python module such as specs/character_class_reference.py, whose
+    top-level dict literals with skills are read without running it.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if not path.endswith('.py'):
+        data = json.loads(text)
+        return data if isinstance(data, list) else [data]
+    classes = []
+    for node in ast.parse(text, path).body:
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.Dict):
+            try:
+                value = ast.literal_eval(node.value)
+            except ValueError:
+                continue
+            if isinstance(value, dict) and "name" in value and "skills" in value:
+                classes.append(value)
+    return classes
+
+
+def load_items(path: str) -> List[Dict[str, Any]]:
+    """Equipment definitions from a JSON file holding one item or a list; items without a slot are skipped."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    items = data if isinstance(data, list) else [data]
+    return [item for item in items if item.get("slot")]
+
+
+def loadouts(items: Iterable[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], ...]]:
+    """
+    Every way to wear the items: at most one per slot (one accessory), and
+    a two-handed weapon only with empty hands. Loadouts keep the order of
+    CharacterEquipment.DEFAULT_SLOTS and start with no gear at all.
+    """
+    by_slot: Dict[str, List[Dict[str, Any]]] = {slot: [] for slot in CharacterEquipment.DEFAULT_SLOTS}
+    for item in items:
+        if item["slot"] in by_slot:
+            by_slot[item["slot"]].append(item)
+    options = [[None] + slot_items for slot_items in by_slot.values()]
+    combinations = []
+    for choice in itertools.product(*options):
+        worn = dict(zip(by_slot, choice))
+        if worn['two_handed'] and (worn['main_hand'] or worn['off_hand']):
+            continue
+        combinations.append(tuple(item for item in choice if item is not None))
+    return combinations
+
+
+def balance_matrix(classes: Iterable[Dict[str, Any]], items: Iterable[Dict[str, Any]]) -> List[BalanceCell]:
+    """Every class crossed with every loadout of the items."""
+    combinations = loadouts(items)
+    return [BalanceCell(class_data, loadout) for class_data in classes for loadout in combinations]
+
+
+def build_character(cell: BalanceCell, template: Dict[str, Any]) -> Character:
+    """A character of the cell's class with the template's stats, at full resources, wearing the loadout."""
+    stats = {stat: template[stat] for stat in TEMPLATE_STATS if stat in template}
+    character = Character(name=cell.class_name, character_class=CharacterClass.from_dict(cell.class_data), **stats)
+    character.health, character.mana, character.stamina = (
+        character.max_health, character.max_mana, character.max_stamina)
+    for data in cell.items:
+        item = item_from_dict(data)
+        if isinstance(item, EquipmentItem):
+            character.add_to_inventory(item)
+            character.equip_item(item)
+    return character
+
+
+def evaluate_cell(cell: BalanceCell, template: Dict[str, Any], opponent: Combatant,
+                  fights: int = 10000, max_rounds: int = 50, seed: int = 0) -> BalanceResult:
+    """Simulate one cell against the opponent; see BalanceResult for what is measured."""
+    build = Combatant.from_character(build_character(cell, template), name=cell.key)
+    duel_seed, dummy_seed, survival_seed = cell.seed(seed).spawn(3)
+
+    duel = simulate_duels(build, opponent, fights, max_rounds, duel_seed)
+
+    # The dummy shares the opponent's defenses and speed but never heals or hurts
+    dummy = replace(opponent, name="Training dummy", health=DUMMY_HEALTH, max_health=DUMMY_HEALTH,
+                    physical_attack=0, magic_attack=0, attack_dice=parse_dice("0"), skills=())
+    training = simulate_duels(build, dummy, fights, max_rounds, dummy_seed)
+    lasted = np.where(training.ended > 0, training.ended, max_rounds)
+    dealt = (DUMMY_HEALTH - training.final_health[1]) / lasted
+
+    # Without attacks or harmful skills, the build only survives; the opponent cannot fall
+    passive = replace(build, physical_attack=0, magic_attack=0, attack_dice=parse_dice("0"),
+                      skills=tuple(skill for skill in build.skills if not skill.harmful))
+    undying = replace(opponent, health=DUMMY_HEALTH, max_health=DUMMY_HEALTH)
+    survival = simulate_duels(passive, undying, fights, max_rounds, survival_seed)
+    survived = np.where(survival.winners == 1, survival.ended, max_rounds)
+
+    return BalanceResult(
+        class_name=cell.class_name,
+        loadout=cell.loadout,
+        fights=fights,
+        win_rate=wilson_interval(int(duel.wins[0]), fights),
+        rounds_to_kill=mean_interval(duel.ended[duel.winners == 0]),
+        dps=mean_interval(dealt),
+        survival_rounds=mean_interval(survived)
+    )
+
+
+# State of a worker process, set once by _start_worker
+_worker: Dict[str, Any] = {}
+
+
+def _start_worker(template: Dict[str, Any], opponent: BalanceCell, fights: int, max_rounds: int, seed: int) -> None:
+    # Combatants hold compiled dice, so each worker builds the opponent itself
+    _worker.update(
+        template=template,
+        opponent=Combatant.from_character(build_character(opponent, template), name=opponent.key),
+        fights=fights, max_rounds=max_rounds, seed=seed
+    )
+
+
+def _run_cell(cell: BalanceCell) -> BalanceResult:
+    return evaluate_cell(cell, _worker['template'], _worker['opponent'],
+                         _worker['fights'], _worker['max_rounds'], _worker['seed'])
+
+
+class CheckpointError(ValueError):
+    """Raised when a checkpoint holds results of a run with other settings."""
+
+
+def checkpoint_settings(template: Dict[str, Any], opponent: BalanceCell, fights: int, max_rounds: int,
+                        seed: int) -> Dict[str, Any]:
+    """
+    What every result of a run depends on besides its own cell: the run
+    settings, and a digest of the opponent and the template stats.
+    """
+    stats = {stat: template[stat] for stat in TEMPLATE_STATS if stat in template}
+    shared = json.dumps([stats, opponent.class_data, opponent.items], sort_keys=True)
+    return {"fights": fights, "max_rounds": max_rounds, "seed": seed, "opponent": opponent.key,
+            "digest": zlib.crc32(shared.encode())}
+
+
+def read_checkpoint(path: str, settings: Optional[Dict[str, Any]] = None) -> Dict[str, BalanceResult]:
+    """
+    Results saved by an earlier run, by cell key. A line cut short by a
+    crash is ignored. With `settings` (see checkpoint_settings), a
+    checkpoint written with other settings raises CheckpointError instead
+    of mixing its results into the run.
+    """
+    saved, results, _, _ = _read_checkpoint(path)
+    if settings is not None:
+        _check_settings(path, saved, results, settings)
+    return results
+
+
+def _read_checkpoint(path: str) -> Tuple[Optional[Dict[str, Any]], Dict[str, BalanceResult],
+                                         Dict[str, Optional[int]], bool]:
+    """
+    The settings line of a checkpoint, if any, its results, the digest of
+    the cell each result was run for, and whether its last line is complete.
+    """
+    saved, results, digests, complete = None, {}, {}, True
+    if not os.path.exists(path):
+        return saved, results, digests, complete
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            complete = line.endswith("\n")
+            try:
+                row = json.loads(line)
+                if "settings" in row:
+                    saved = row["settings"]
+                    continue
+                result = BalanceResult.from_row(row)
+            except (ValueError, KeyError, TypeError):
+                continue
+            results[result.key] = result
+            digests[result.key] = row.get("digest")
+    return saved, results, digests, complete
+
+
+def _check_settings(path: str, saved: Optional[Dict[str, Any]], results: Dict[str, BalanceResult],
+                    settings: Dict[str, Any]) -> None:
+    if (saved is not None or results) and saved != settings:
+        changed = sorted(key for key in settings if (saved or {}).get(key) != settings[key])
+        raise CheckpointError(f"{path} holds results of a run with other settings ({', '.join(changed)}); "
+                              f"delete it or run with the same settings to resume")
+
+
+def run_balance(cells: Sequence[BalanceCell], template: Dict[str, Any], opponent: BalanceCell,
+                fights: int = 10000, max_rounds: int = 50, seed: int = 0, workers: Optional[int] = None,
+                checkpoint: Optional[str] = None,
+                progress: Optional[Callable[[BalanceResult, int, int], None]] = None) -> List[BalanceResult]:
+    """
+    Simulate every cell against the opponent and return the results in cell order.
+    Cells are spread over a pool of `workers` processes (all CPUs by
+    default; 1 runs them in this process). With a `checkpoint` file, each
+    result is appended to it as soon as it is done, and cells already in
+    it are not run again, so an interrupted report resumes where it
+    stopped. The checkpoint starts with the run's settings, and resuming
+    with different ones raises CheckpointError. Each result is saved with
+    the digest of its cell, so a cell whose class or items changed since
+    is run again. `progress` is called with each new result and the count
+    done.
+    """
+    log = None
+    done: Dict[str, BalanceResult] = {}
+    by_key = {cell.key: cell for cell in cells}
+    if checkpoint:
+        settings = checkpoint_settings(template, opponent, fights, max_rounds, seed)
+        saved, done, digests, complete = _read_checkpoint(checkpoint)
+        _check_settings(checkpoint, saved, done, settings)
+        done = {key: result for key, result in done.items()
+                if key in by_key and digests[key] == by_key[key].digest}
+        log = open(checkpoint, 'a', encoding='utf-8')
+        if not complete:
+            # A row cut short by a crash is left on a line of its own
+            log.write("\n")
+        if saved is None:
+            log.write(json.dumps({"settings": settings}) + "\n")
+            log.flush()
+    pending = [cell for cell in cells if cell.key not in done]
+
+    def record(result: BalanceResult) -> None:
+        done[result.key] = result
+        if log is not None:
+            log.write(json.dumps({**result.to_row(), "digest": by_key[result.key].digest}) + "\n")
+            log.flush()
+        if progress is not None:
+            progress(result, len(done), len(cells))
+
+    try:
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(pending) <= 1:
+            _start_worker(template, opponent, fights, max_rounds, seed)
+            for cell in pending:
+                record(_run_cell(cell))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_start_worker,
+                                     initargs=(template, opponent, fights, max_rounds, seed)) as pool:
+                for future in as_completed([pool.submit(_run_cell, cell) for cell in pending]):
+                    record(future.result())
+    finally:
+        if log is not None:
+            log.close()
+    return [done[cell.key] for cell in cells]
+
+
+def write_csv(results: Iterable[BalanceResult], path: str) -> None:
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_COLUMNS)
+        writer.writeheader()
+        for result in results:
+            writer.writerow(result.to_row())
+
+
+def write_json(results: Iterable[BalanceResult], path: str, **settings: Any) -> None:
+    """Write the results as JSON, along with the settings that produced them."""
+    rows = [{key: (None if isinstance(value, float) and math.isnan(value) else value)
+             for key, value in result.to_row().items()} for result in results]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"settings": settings, "results": rows}, f, indent=2)
@@ -0,0 +1,303 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .character import Character
+from .combat_sim import HEAL_BELOW, RESOURCES, ActionEffect, Combatant, SkillAction
+from .status_effects import StatusEffect, StatusEffectEngine
+
+
+ALLIES, ENEMIES = 0, 1
+
+# Stats a status effect may modify during a battle
+STATS = ("speed", "physical_attack", "magic_attack", "physical_defense", "magic_defense")
+
+# Effect target groups that hit every living member of a side at once
+AREA_GROUPS = frozenset({"allies", "enemies", "all_allies", "all_enemies"})
+ALLY_GROUPS = frozenset({"allies", "all_allies", "single_ally", "self"})
+
+
+@dataclass
+class RoundResult:
+    """What one round did, with damage and healing taken per participant."""
+    number: int
+    damage: np.ndarray
+    healing: np.ndarray
+    defeated: np.ndarray
+    alive: Tuple[int, int]
+
+
+class Battle:
+    """
+    Group combat between two sides, resolved a round at a time.
+    Every participant's stats and resources live in NumPy arrays indexed by
+    participant, ALLIES first. Each round, participants act in tiers of
+    descending speed; everyone in a tier acts at once, grouped by combatant
+    template, so a horde of identical enemies costs one batch of array
+    operations rather than one step per enemy. Actions are chosen as in
+    simulate_duels, but for whole groups: heals are cast when any ally is
+    wounded and status skills while any opponent is awake. Single-target
+    effects pick a random living opponent (or the most wounded ally for
+    heals), and area effects hit every living member of the targeted side
+    with one array operation. Damage from a tier lands together and the
+    defeated drop out before the next tier acts.
+    Statuses run on a StatusEffectEngine that advances one turn at the end
+    of every round, so only the effects due that round are touched. Sleep
+    from status skills is one kind of StatusEffect; `add_status` applies
+    any other, whose stat modifiers and per-turn resource changes act on
+    the participant's row of the arrays. Dodge chances stay those of the
+    participant's template.
+    """
+
+    def __init__(self, allies: Sequence[Combatant], enemies: Sequence[Combatant], seed=None):
+        participants = list(allies) + list(enemies)
+        self.rng = np.random.default_rng(seed)
+        self.round = 0
+        self.side = np.array([ALLIES] * len(allies) + [ENEMIES] * len(enemies))
+        self.names = [combatant.name for combatant in participants]
+
+        # Participants built from the same Combatant share a template and act together
+        self.templates: List[Combatant] = []
+        numbers: Dict[int, int] = {}
+        for combatant in participants:
+            if id(combatant) not in numbers:
+                numbers[id(combatant)] = len(self.templates)
+                self.templates.append(combatant)
+        self.template = np.array([numbers[id(combatant)] for combatant in participants], dtype=np.int64)
+
+        def column(name: str) -> np.ndarray:
+            return np.array([getattr(combatant, name) for combatant in participants], dtype=float)
+
+        self.resources = {resource: column(resource) for resource in RESOURCES}
+        self.max_health = column("max_health")
+        self.speed = column("speed")
+        self.physical_attack = column("physical_attack")
+        self.magic_attack = column("magic_attack")
+        self.physical_defense = column("physical_defense")
+        self.magic_defense = column("magic_defense")
+        self.asleep = np.zeros(len(participants), dtype=bool)
+        self.statuses = StatusEffectEngine()
+        self.participants = [_Participant(self, index) for index in range(len(participants))]
+        self._sleep: Dict[int, StatusEffect] = {}
+        self._modifiers: Dict[Tuple[int, str], Tuple[str, float]] = {}
+        self.tiers = np.unique(self.speed)[::-1]
+
+        speeds = [template.speed for template in self.templates]
+        # dodge[attacker template, defender template]
+        self.dodge = np.array([[Character.dodge_probability(defender - attacker) for defender in speeds]
+                               for attacker in speeds])
+
+    @property
+    def health(self) -> np.ndarray:
+        return self.resources["health"]
+
+    @property
+    def alive(self) -> np.ndarray:
+        return self.health > 0
+
+    def survivors(self, side: int) -> int:
+        return int(np.count_nonzero(self.alive & (self.side == side)))
+
+    @property
+    def winner(self) -> Optional[int]:
+        """The side still standing once the other has fallen, or None while both fight."""
+        standing = [side for side in (ALLIES, ENEMIES) if self.survivors(side)]
+        if len(standing) == 2:
+            return None
+        return standing[0] if standing else None
+
+    def add_status(self, index: int, effect: StatusEffect) -> StatusEffect:
+        """Apply a status effect to one participant; it lasts `effect.duration` rounds."""
+        return self.statuses.add(self.participants[index], effect)
+
+    def run(self, max_rounds: int = 100) -> Optional[int]:
+        """Resolve rounds until one side falls or `max_rounds` pass; return the winning side."""
+        while self.survivors(ALLIES) and self.survivors(ENEMIES) and self.round < max_rounds:
+            self.resolve_round()
+        return self.winner
+
+    def resolve_round(self) -> RoundResult:
+        self.round += 1
+        count = len(self.side)
+        damage, healing = np.zeros(count), np.zeros(count)
+        alive_before = self.alive
+        for speed in self.tiers.tolist():
+            alive = self.alive
+            acting = alive & (self.speed == speed) & (self.asleep == 0)
+            if not acting.any():
+                continue
+            tier_damage = np.zeros(count)
+            for template_number in np.unique(self.template[acting]).tolist():
+                actors = np.flatnonzero(acting & (self.template == template_number))
+                self._act(self.templates[template_number], template_number, actors, alive, tier_damage, healing)
+            self.health[:] -= tier_damage
+            damage += tier_damage
+            if not (self.survivors(ALLIES) and self.survivors(ENEMIES)):
+                break
+        # Statuses tick once the round is over; sleepers whose sleep ran out wake up
+        self._clear_statuses(np.flatnonzero(alive_before & ~self.alive))
+        for effect in self.statuses.advance():
+            index = effect.target.index
+            if self._sleep.get(index) is effect:
+                del self._sleep[index]
+                self.asleep[index] = False
+        self._clear_statuses(np.flatnonzero(alive_before & ~self.alive))
+        return RoundResult(
+            number=self.round,
+            damage=damage,
+            healing=healing,
+            defeated=np.flatnonzero(alive_before & ~self.alive),
+            alive=(self.survivors(ALLIES), self.survivors(ENEMIES))
+        )
+
+    def _act(self, template: Combatant, number: int, actors: np.ndarray, alive: np.ndarray,
+             damage: np.ndarray, healing: np.ndarray) -> None:
+        side = self.side[actors[0]]
+        foes = np.flatnonzero(alive & (self.side != side))
+        friends = np.flatnonzero(alive & (self.side == side))
+        choice = self._choose(template, actors, foes)
+
+        basic = actors[choice == -1]
+        if basic.size and foes.size:
+            targets = self.rng.choice(foes, size=basic.size)
+            hits = self._hits(number, basic, targets)
+            rolls = template.attack_dice.roll_many(hits.sum(), self.rng)
+            amounts = rolls + self.physical_attack[basic[hits]] - self.physical_defense[targets[hits]]
+            np.add.at(damage, targets[hits], np.maximum(amounts, 1))
+
+        for index, skill in enumerate(template.skills):
+            users = actors[choice == index]
+            if not users.size:
+                continue
+            self.resources[skill.resource][users] -= skill.cost
+            for effect in skill.effects:
+                group = friends if effect.target_group in ALLY_GROUPS else foes
+                if not group.size:
+                    continue
+                if effect.target_group in AREA_GROUPS:
+                    # One row per user, one column per member of the targeted side
+                    users_grid, targets = np.repeat(users, group.size), np.tile(group, users.size)
+                elif effect.target_group == "self":
+                    users_grid, targets = users, users
+                elif effect.kind == "heal":
+                    ratio = self.health[group] / self.max_health[group]
+                    users_grid, targets = users, np.full(users.size, group[np.argmin(ratio)])
+                else:
+                    users_grid, targets = users, self.rng.choice(group, size=users.size)
+                self._apply(number, effect, users_grid, targets, damage, healing)
+
+    def _apply(self, number: int, effect: ActionEffect, users: np.ndarray, targets: np.ndarray,
+               damage: np.ndarray, healing: np.ndarray) -> None:
+        if effect.kind == "heal":
+            amounts = effect.value + effect.dice.roll_many(targets.size, self.rng)
+            np.add.at(healing, targets, amounts)
+            health = self.health
+            np.add.at(health, targets, amounts)
+            np.minimum(health, self.max_health, out=health)
+            return
+        hits = self._hits(number, users, targets)
+        users, targets = users[hits], targets[hits]
+        if effect.kind == "status":
+            self._put_to_sleep(targets, int(effect.value))
+            return
+        attack, defense = ((self.magic_attack, self.magic_defense) if effect.magic
+                           else (self.physical_attack, self.physical_defense))
+        amounts = effect.value + effect.dice.roll_many(targets.size, self.rng) + attack[users] - defense[targets]
+        np.add.at(damage, targets, np.maximum(amounts, 1))
+
+    def _clear_statuses(self, defeated: np.ndarray) -> None:
+        """End every status on the defeated, so nothing ticks them back to life."""
+        for index in defeated.tolist():
+            for effect in self.statuses.effects_on(self.participants[index]):
+                self.statuses.remove(effect)
+            self._sleep.pop(index, None)
+            self.asleep[index] = False
+
+    def _put_to_sleep(self, targets: np.ndarray, rounds: int) -> None:
+        """Sleep for `rounds` rounds, unless a target already sleeps at least that long."""
+        if rounds < 1:
+            return
+        turn = self.statuses.turn
+        for index in np.unique(targets).tolist():
+            current = self._sleep.get(index)
+            if current is not None:
+                if current.expires_at - turn >= rounds:
+                    continue
+                self.statuses.remove(current)
+            self._sleep[index] = self.add_status(index, StatusEffect("asleep", rounds))
+            self.asleep[index] = True
+
+    def _hits(self, number: int, users: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        """Which actions land: opponents may dodge, allies never do."""
+        if not targets.size or self.side[users[0]] == self.side[targets[0]]:
+            return np.ones(targets.size, dtype=bool)
+        return self.rng.random(targets.size) >= self.dodge[number, self.template[targets]]
+
+    def _choose(self, template: Combatant, actors: np.ndarray, foes: np.ndarray) -> np.ndarray:
+        """Index of the skill each actor uses, or -1 for a basic attack; later rules win."""
+        choice = np.full(actors.size, -1)
+        indexed = list(enumerate(template.skills))
+        damaging = sorted((entry for entry in indexed if entry[1].kind == "damage"),
+                          key=lambda entry: entry[1].expected_damage())
+        for index, skill in damaging:
+            choice[self._affordable(skill, actors)] = index
+        if foes.size and np.any(self.asleep[foes] == 0):
+            for index, skill in indexed:
+                if skill.kind == "status":
+                    choice[self._affordable(skill, actors)] = index
+        own_wounds = self.health[actors] < HEAL_BELOW * self.max_health[actors]
+        friends = np.flatnonzero(self.alive & (self.side == self.side[actors[0]]))
+        any_wounded = bool(np.any(self.health[friends] < HEAL_BELOW * self.max_health[friends]))
+        for index, skill in indexed:
+            if skill.kind == "heal":
+                wounded = own_wounds if skill.effects[0].target_group == "self" else any_wounded
+                choice[self._affordable(skill, actors) & wounded] = index
+        return choice
+
+    def _affordable(self, skill: SkillAction, actors: np.ndarray) -> np.ndarray:
+        pool = self.resources[skill.resource][actors]
+        return pool > skill.cost if skill.resource == "health" else pool >= skill.cost
+
+
+class _Participant:
+    """
+    One participant's row of the battle arrays, as the StatusEffectEngine
+    sees a character: resources are attributes, and stat modifiers add to
+    the participant's stats until they are removed.
+    """
+
+    __slots__ = ('battle', 'index')
+
+    def __init__(self, battle: Battle, index: int):
+        object.__setattr__(self, 'battle', battle)
+        object.__setattr__(self, 'index', index)
+
+    def __getattr__(self, name: str) -> float:
+        battle = self.battle
+        if name in battle.resources:
+            return float(battle.resources[name][self.index])
+        if name == "max_health":
+            return float(battle.max_health[self.index])
+        raise AttributeError(name)
+
+    def __setattr__(self, name: str, value: float) -> None:
+        if name not in self.battle.resources:
+            raise AttributeError(f"Cannot set {name} on a battle participant")
+        self.battle.resources[name][self.index] = value
+
+    def set_stat_modifier(self, source: str, stat: str, amount: float) -> None:
+        if stat not in STATS:
+            raise ValueError(f"Unknown battle stat: {stat}")
+        self.remove_stat_modifier(source, stat)
+        getattr(self.battle, stat)[self.index] += amount
+        self.battle._modifiers[(self.index, source)] = (stat, amount)
+        if stat == "speed":
+            self.battle.tiers = np.unique(self.battle.speed)[::-1]
+
+    def remove_stat_modifier(self, source: str, stat: str) -> None:
+        modifier = self.battle._modifiers.pop((self.index, source), None)
+        if modifier is not None:
+            getattr(self.battle, modifier[0])[self.index] -= modifier[1]
+            if modifier[0] == "speed":
+                self.battle.tiers = np.unique(self.battle.speed)[::-1]
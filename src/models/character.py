@@ -1,73 +1,80 @@
+import math
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any
-from .item import Item, EquipmentItem
+from typing import List, Dict, Optional, Any, Iterable, Mapping, Sequence, Tuple
+from .item import Item, EquipmentItem, ItemDefinition, item_from_dict, EMPTY_MAPPING, NO_TAGS, shared
+from .inventory import Inventory
+from .persistent import freeze
+from .events import EventStream, ItemAdded, ItemRemoved, ItemEquipped, ItemUnequipped, StatChanged
+from .serializers import serializer
+from .formulas import scaled_value
+from .experience import CHARACTER_CURVE, SKILL_CURVE, ExperienceCurve, set_progress
 
 
-@dataclass
+@dataclass(slots=True)
 class Skill:
     name: str
     description: str
     level: int = 1
     experience: int = 0
-    cost: Dict[str, Any] = field(default_factory=dict)
-    effects: List[Dict[str, Any]] = field(default_factory=list)
+    cost: Mapping[str, Any] = shared(EMPTY_MAPPING)
+    effects: Sequence[Dict[str, Any]] = ()
     target_group: str = "enemies"
     
+    def cost_at(self, level: Optional[int] = None) -> float:
+        """Resource cost at `level` (the skill's own by default), scaled by the cost's level_up_formula."""
+        return scaled_value(self.cost.get("amount", 0), self.cost.get("level_up_formula"), level or self.level)
+    
+    def effect_value_at(self, index: int, level: Optional[int] = None) -> float:
+        """Value of one effect at `level` (the skill's own by default), scaled by its level_up_formula."""
+        effect = self.effects[index]
+        return scaled_value(effect.get("value", 0), effect.get("level_up_formula"), level or self.level)
+    
+    def gain_experience(self, amount: int, curve: ExperienceCurve = SKILL_CURVE) -> int:
+        """Add experience, levelling up as many times as it covers; return the levels gained."""
+        level = self.level
+        set_progress(self, *curve.progress(level, self.experience, amount))
+        return self.level - level
+    
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "name": self.name,
-            "description": self.description,
-            "level": self.level,
-            "experience": self.experience,
-            "cost": self.cost,
-            "effects": self.effects,
-            "target_group": self.target_group
-        }
+        return _encode_skill(self)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Skill':
-        return cls(
-            name=data["name"],
-            description=data["description"],
-            level=data.get("level", 1),
-            experience=data.get("experience", 0),
-            cost=data.get("cost", {}),
-            effects=data.get("effects", []),
-            target_group=data.get("target_group", "enemies")
-        )
+        return _decode_skill(data)
 
 
-@dataclass
+_encode_skill, _decode_skill = serializer(Skill)
+
+
+@dataclass(slots=True)
 class CharacterClass:
     name: str
     description: str
     skills: List[Skill] = field(default_factory=list)
     rarity: str = "common"
-    tags: Dict[str, List[str]] = field(default_factory=lambda: {"tags": []})
+    tags: Mapping[str, Sequence[str]] = shared(NO_TAGS)
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "name": self.name,
-            "description": self.description,
-            "skills": [skill.to_dict() for skill in self.skills],
-            "rarity": self.rarity,
-            "tags": self.tags
-        }
+        return _encode_character_class(self)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'CharacterClass':
-        skills = [Skill.from_dict(skill) for skill in data.get("skills", [])]
-        return cls(
-            name=data["name"],
-            description=data["description"],
-            skills=skills,
-            rarity=data.get("rarity", "common"),
-            tags=data.get("tags", {"tags": []})
-        )
+        return _decode_character_class(data)
+
 
+_encode_character_class, _decode_character_class = serializer(CharacterClass)
 
-@dataclass
+
+@dataclass(slots=True)
 class CharacterEquipment:
+    """
+    The items a character wears, by slot, with running totals and a
+    reverse index from each worn item to its slot.
+    The slot rules live here: a two-handed weapon takes off both hands, a
+    one-handed weapon takes off a two-handed one, any other item replaces
+    what its slot held, and accessories fill up to MAX_ACCESSORIES.
+    """
     DEFAULT_SLOTS = {
         'head': None,
         'chest': None,
@@ -80,14 +87,66 @@ class CharacterEquipment:
         'accessories': []
     }
     MAX_ACCESSORIES = 5
+    # Numeric item attributes kept as running totals over the equipped items
+    TOTAL_ATTRIBUTES = ('physical_attack', 'physical_defense', 'magic_attack', 'magic_defense')
     
     equipment: Dict[str, Any] = field(default_factory=lambda: {
         slot: None for slot in CharacterEquipment.DEFAULT_SLOTS
     })
+    _totals: Dict[str, float] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _attack_dice: Counter = field(default_factory=Counter, init=False, repr=False, compare=False)
+    _tags: Counter = field(default_factory=Counter, init=False, repr=False, compare=False)
+    _slot_of: Dict[EquipmentItem, str] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # Counts changes to the worn items, so an owner can tell its cached stats are stale
+    revision: int = field(default=0, init=False, repr=False, compare=False)
     
     def __post_init__(self):
-        if 'accessories' not in self.equipment:
+        if self.equipment.get('accessories') is None:
             self.equipment['accessories'] = []
+        self.recalculate()
+    
+    def recalculate(self) -> None:
+        """Rebuild the running totals and slot index from the slots, e.g. after editing them directly."""
+        self._totals = dict.fromkeys(self.TOTAL_ATTRIBUTES, 0)
+        self._attack_dice = Counter()
+        self._tags = Counter()
+        self._slot_of = {}
+        self.revision += 1
+        for slot, item in self.equipment.items():
+            for worn in (item if slot == 'accessories' else [item] if item else []):
+                self._add_to_totals(worn)
+                self._slot_of[worn] = slot
+    
+    def copy(self) -> 'CharacterEquipment':
+        """An independent copy of the slots, totals and index, sharing the items."""
+        copy = CharacterEquipment.__new__(CharacterEquipment)
+        copy.equipment = {slot: list(item) if slot == 'accessories' else item
+                          for slot, item in self.equipment.items()}
+        copy._totals = dict(self._totals)
+        copy._attack_dice = self._attack_dice.copy()
+        copy._tags = self._tags.copy()
+        copy._slot_of = dict(self._slot_of)
+        copy.revision = self.revision
+        return copy
+    
+    def _add_to_totals(self, item: EquipmentItem) -> None:
+        self.revision += 1
+        totals = self._totals
+        for attribute in self.TOTAL_ATTRIBUTES:
+            totals[attribute] += getattr(item, attribute)
+        self._attack_dice.update(item.attack_dice)
+        self._tags.update(item.tags.get("tags", []))
+    
+    def _remove_from_totals(self, item: EquipmentItem) -> None:
+        self.revision += 1
+        totals = self._totals
+        for attribute in self.TOTAL_ATTRIBUTES:
+            totals[attribute] -= getattr(item, attribute)
+        self._attack_dice.subtract(item.attack_dice)
+        self._tags.subtract(item.tags.get("tags", []))
+        # Keep the multisets free of zero counts so they compare and iterate cleanly
+        self._attack_dice += Counter()
+        self._tags += Counter()
     
     def equip(self, item: EquipmentItem) -> bool:
         slot = item.slot
@@ -100,10 +159,10 @@ class CharacterEquipment:
         if slot == 'two_handed':
             self.unequip('main_hand')
             self.unequip('off_hand')
+            self.unequip('two_handed')
             self.equipment['two_handed'] = item
         elif slot == 'main_hand' or slot == 'off_hand':
-            if self.equipment.get('two_handed'):
-                return False  # Cannot equip one-handed weapons if a two-handed weapon is equipped
+            self.unequip('two_handed')  # A one-handed weapon needs the hands a two-handed one holds
             self.unequip(slot)
             self.equipment[slot] = item
         elif slot == 'accessories':
@@ -114,6 +173,8 @@ class CharacterEquipment:
             self.unequip(slot)
             self.equipment[slot] = item
         
+        self._add_to_totals(item)
+        self._slot_of[item] = slot
         return True
     
     def unequip(self, slot: str) -> bool:
@@ -123,15 +184,77 @@ class CharacterEquipment:
         if slot == 'accessories':
             return False  # Need to specify which accessory to unequip
         
+        if self.equipment[slot] is not None:
+            self._remove_from_totals(self.equipment[slot])
+            del self._slot_of[self.equipment[slot]]
         self.equipment[slot] = None
         return True
     
     def unequip_accessory(self, item: EquipmentItem) -> bool:
-        if item in self.equipment['accessories']:
+        if self._slot_of.get(item) == 'accessories':
             self.equipment['accessories'].remove(item)
+            self._remove_from_totals(item)
+            del self._slot_of[item]
             return True
         return False
     
+    def remove(self, item: EquipmentItem) -> Optional[str]:
+        """Take off this item wherever it is worn; return the slot it was in, or None if not worn."""
+        slot = self._slot_of.get(item)
+        if slot == 'accessories':
+            self.unequip_accessory(item)
+        elif slot is not None:
+            self.unequip(slot)
+        return slot
+    
+    def slot_of(self, item: Any) -> Optional[str]:
+        """The slot an item is worn in, or None if it is not worn."""
+        return self._slot_of.get(item)
+    
+    def __contains__(self, item: Any) -> bool:
+        return item in self._slot_of
+    
+    def items(self) -> List[EquipmentItem]:
+        """All equipped items, accessories included."""
+        items = []
+        for slot, item in self.equipment.items():
+            if slot == 'accessories':
+                items.extend(item)
+            elif item:
+                items.append(item)
+        return items
+    
+    def total(self, attribute: str) -> float:
+        """Sum of a numeric attribute such as `physical_attack` over the equipped items."""
+        return self._totals[attribute]
+    
+    @property
+    def total_physical_attack(self) -> float:
+        return self._totals['physical_attack']
+    
+    @property
+    def total_physical_defense(self) -> float:
+        return self._totals['physical_defense']
+    
+    @property
+    def total_magic_attack(self) -> float:
+        return self._totals['magic_attack']
+    
+    @property
+    def total_magic_defense(self) -> float:
+        return self._totals['magic_defense']
+    
+    def get_attack_dice(self) -> List[str]:
+        """Attack dice contributed by the equipped items."""
+        return list(self._attack_dice.elements())
+    
+    def tag_counts(self) -> Counter:
+        """How many equipped items carry each tag."""
+        return self._tags.copy()
+    
+    def has_tag(self, tag: str) -> bool:
+        return self._tags[tag] > 0
+    
     def to_dict(self) -> Dict[str, Any]:
         result = {}
         for slot, item in self.equipment.items():
@@ -140,10 +263,67 @@ class CharacterEquipment:
             else:
                 result[slot] = item.to_dict() if item else None
         return result
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CharacterEquipment':
+        equipment = cls()
+        for slot, item in data.items():
+            if slot == 'accessories':
+                equipment.equipment[slot] = [EquipmentItem.from_dict(accessory) for accessory in item if accessory]
+            else:
+                equipment.equipment[slot] = EquipmentItem.from_dict(item) if item else None
+        equipment.recalculate()
+        return equipment
+
 
+@dataclass(frozen=True)
+class CharacterSnapshot:
+    """Immutable capture of a character's stats, inventory and equipment."""
+    stats: Tuple[Tuple[str, Any], ...]
+    inventory: Sequence[Item]
+    equipment: Tuple[Tuple[str, Any], ...]
 
-@dataclass
+
+@dataclass(slots=True)
 class Character:
+    # Fields that publish a StatChanged event when assigned
+    STAT_FIELDS = frozenset({
+        'level', 'experience', 'experience_to_next_level',
+        'health', 'max_health', 'mana', 'max_mana', 'stamina', 'max_stamina',
+        'strength', 'endurance', 'focus', 'willpower', 'agility', 'luck', 'charisma'
+    })
+    
+    DEFAULT_ATTACK_DICE = ('1d6',)
+    
+    # Stats computed from the base stats (plus stat modifiers) and equipment,
+    # with the inputs each reads. Values are cached until one of those changes.
+    DERIVED_STATS = {
+        'speed': (
+            lambda c: max(c.effective_stat('agility'), c.effective_stat('strength') / 2) / 2 + 5,
+            ('agility', 'strength')
+        ),
+        'physical_attack': (
+            lambda c: c.effective_stat('strength') * 2 + c.equipment.total('physical_attack'),
+            ('strength', 'equipment')
+        ),
+        'magic_attack': (
+            lambda c: c.effective_stat('focus') * 2 + c.equipment.total('magic_attack'),
+            ('focus', 'equipment')
+        ),
+        'physical_defense': (
+            lambda c: c.effective_stat('endurance') * 0.1 + c.equipment.total('physical_defense'),
+            ('endurance', 'equipment')
+        ),
+        'magic_defense': (
+            lambda c: c.effective_stat('willpower') * 0.1 + c.equipment.total('magic_defense'),
+            ('willpower', 'equipment')
+        ),
+        'basic_attack_dice': (
+            lambda c: c.DEFAULT_ATTACK_DICE + tuple(c.equipment.get_attack_dice()),
+            ('equipment',)
+        ),
+    }
+    
     name: str
     character_class: CharacterClass
     level: int = 1
@@ -163,31 +343,186 @@ class Character:
     luck: int = 10
     charisma: int = 10
     equipment: CharacterEquipment = field(default_factory=CharacterEquipment)
-    inventory: List[Item] = field(default_factory=list)
+    inventory: Inventory = field(default_factory=Inventory)
+    events: EventStream = field(default_factory=EventStream, repr=False, compare=False)
+    # Temporary boosts to base stats by source, e.g. from status effects
+    stat_modifiers: Mapping[str, Dict[str, float]] = field(default_factory=lambda: EMPTY_MAPPING,
+                                                           repr=False, compare=False)
+    _derived: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # The equipment revision the cached derived stats were computed at
+    _equipment_revision: int = field(default=-1, init=False, repr=False, compare=False)
     
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "name": self.name,
-            "character_class": self.character_class.to_dict(),
-            "level": self.level,
-            "experience": self.experience,
-            "experience_to_next_level": self.experience_to_next_level,
-            "health": self.health,
-            "max_health": self.max_health,
-            "mana": self.mana,
-            "max_mana": self.max_mana,
-            "stamina": self.stamina,
-            "max_stamina": self.max_stamina,
-            "strength": self.strength,
-            "endurance": self.endurance,
-            "focus": self.focus,
-            "willpower": self.willpower,
-            "agility": self.agility,
-            "luck": self.luck,
-            "charisma": self.charisma,
-            "equipment": self.equipment.to_dict(),
-            "inventory": [item.to_dict() for item in self.inventory]
-        }
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in Character.STAT_FIELDS:
+            old_value = getattr(self, name, value)
+            object.__setattr__(self, name, value)
+            if old_value != value:
+                self._invalidate(name)
+                events = getattr(self, 'events', None)
+                if events is not None:
+                    events.publish(StatChanged(name, old_value, value))
+        else:
+            if name == 'inventory' and not isinstance(value, Inventory):
+                value = Inventory(value)
+            object.__setattr__(self, name, value)
+            if name == 'equipment':
+                self._invalidate('equipment')
+    
+    def _invalidate(self, source: str) -> None:
+        """Drop the cached derived stats that read `source`."""
+        cache = getattr(self, '_derived', None)
+        if cache:
+            for name in _DERIVED_DEPENDENTS.get(source, ()):
+                cache.pop(name, None)
+    
+    def invalidate_derived_stats(self) -> None:
+        """Drop every cached derived stat, e.g. after editing equipment slots directly."""
+        self.equipment.recalculate()
+        self._derived.clear()
+    
+    def derived_stat(self, name: str) -> Any:
+        """Return a derived stat, computing it only if one of its inputs changed."""
+        cache = self._derived
+        revision = self.equipment.revision
+        if revision != self._equipment_revision:
+            # The equipment changed, possibly through its own methods
+            self._equipment_revision = revision
+            self._invalidate('equipment')
+        try:
+            return cache[name]
+        except KeyError:
+            value = cache[name] = Character.DERIVED_STATS[name][0](self)
+            return value
+    
+    def effective_stat(self, stat: str) -> float:
+        """A base stat plus the largest modifier currently applied to it."""
+        base = getattr(self, stat)
+        modifiers = self.stat_modifiers.get(stat)
+        return base + max(0, max(modifiers.values())) if modifiers else base
+    
+    def set_stat_modifier(self, source: str, stat: str, amount: float) -> None:
+        """Apply or update a modifier to a base stat from the given source."""
+        if self.stat_modifiers is EMPTY_MAPPING:
+            self.stat_modifiers = {}
+        self.stat_modifiers.setdefault(stat, {})[source] = amount
+        self._invalidate(stat)
+    
+    def remove_stat_modifier(self, source: str, stat: str) -> bool:
+        """Remove a source's modifier from a base stat."""
+        modifiers = self.stat_modifiers.get(stat)
+        if not modifiers or source not in modifiers:
+            return False
+        del modifiers[source]
+        if not modifiers:
+            del self.stat_modifiers[stat]
+        self._invalidate(stat)
+        return True
+    
+    @property
+    def speed(self) -> float:
+        return self.derived_stat('speed')
+    
+    @property
+    def physical_attack(self) -> float:
+        return self.derived_stat('physical_attack')
+    
+    @property
+    def magic_attack(self) -> float:
+        return self.derived_stat('magic_attack')
+    
+    @property
+    def physical_defense(self) -> float:
+        return self.derived_stat('physical_defense')
+    
+    @property
+    def magic_defense(self) -> float:
+        return self.derived_stat('magic_defense')
+    
+    @property
+    def basic_attack_dice(self) -> Tuple[str, ...]:
+        return self.derived_stat('basic_attack_dice')
+    
+    def gain_experience(self, amount: int, curve: ExperienceCurve = CHARACTER_CURVE) -> int:
+        """Add experience, levelling up as many times as it covers; return the levels gained."""
+        level = self.level
+        set_progress(self, *curve.progress(level, self.experience, amount))
+        return self.level - level
+    
+    def dodge_chance(self, opponent: 'Character') -> float:
+        """Chance to dodge an opponent's attack, rising with the speed difference."""
+        return Character.dodge_probability(self.speed - opponent.speed)
+    
+    @staticmethod
+    def dodge_probability(speed_difference: float) -> float:
+        """Chance to dodge given how much faster the defender is than the attacker."""
+        scaling_factor = 20  # Flattens the curve
+        bias = -1.75  # Shifts the curve down so even speeds rarely dodge
+        return 1 / (1 + math.exp(-(speed_difference / scaling_factor + bias)))
+    
+    def to_dict(self, definitions: Optional[Dict[ItemDefinition, int]] = None) -> Dict[str, Any]:
+        """Describe the character for saving; see Item.to_dict for `definitions`."""
+        return _encode_character(self, definitions)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any],
+                  definitions: Optional[Sequence[ItemDefinition]] = None) -> 'Character':
+        character = _decode_character(data, definitions)
+        character._hold_worn_items()
+        return character
+    
+    def _hold_worn_items(self) -> None:
+        """
+        Make every worn item the inventory's own object, as equipment and
+        inventory are saved separately. Saves from before worn items stayed
+        in the inventory lack them there, so they are added.
+        """
+        inventory = self.inventory
+        
+        def held(item: EquipmentItem) -> EquipmentItem:
+            own = inventory.held(item)
+            if own is None:
+                inventory.add(item)
+                own = item
+            own.equipped = True
+            return own
+        
+        for slot, item in self.equipment.equipment.items():
+            if slot == 'accessories':
+                self.equipment.equipment[slot] = [held(accessory) for accessory in item]
+            elif item is not None:
+                self.equipment.equipment[slot] = held(item)
+        self.equipment.recalculate()
+    
+    def snapshot(self) -> CharacterSnapshot:
+        """Capture the character's current state; the inventory is captured in O(1)."""
+        return CharacterSnapshot(
+            stats=tuple((stat, getattr(self, stat)) for stat in sorted(Character.STAT_FIELDS)),
+            inventory=freeze(self.inventory),
+            equipment=tuple(
+                (slot, tuple(item) if slot == 'accessories' else item)
+                for slot, item in self.equipment.equipment.items()
+            )
+        )
+    
+    def restore(self, snapshot: CharacterSnapshot) -> None:
+        """Return the character to a previously captured state."""
+        for stat, value in snapshot.stats:
+            setattr(self, stat, value)
+        # Only the items that came or went since the snapshot are re-indexed
+        self.inventory.restore(snapshot.inventory)
+        
+        # Equipped flags live on the items themselves, so bring them in line with the snapshot
+        for item in self._equipped_items():
+            item.equipped = False
+        for slot, item in snapshot.equipment:
+            self.equipment.equipment[slot] = list(item) if slot == 'accessories' else item
+        for item in self._equipped_items():
+            item.equipped = True
+        self.equipment.recalculate()
+        self._invalidate('equipment')
+    
+    def _equipped_items(self) -> List[EquipmentItem]:
+        return self.equipment.items()
     
     @property
     def skills(self) -> List[Skill]:
@@ -195,38 +530,109 @@ class Character:
     
     def add_to_inventory(self, item: Item) -> bool:
         self.inventory.append(item)
+        self.events.publish(ItemAdded(item))
         return True
     
     def remove_from_inventory(self, item: Item) -> bool:
-        if item in self.inventory:
-            self.inventory.remove(item)
-            return True
-        return False
-    
-    def equip_item(self, item: EquipmentItem) -> bool:
+        """Remove an item, taking it off first if it is worn."""
         if item not in self.inventory:
             return False
+        with self.events.batch():
+            if item in self.equipment:
+                self.change_equipment(unequip=[item])
+            self.inventory.discard(item)
+            self.events.publish(ItemRemoved(item))
+        return True
+    
+    def change_equipment(self, equip: Iterable[EquipmentItem] = (),
+                         unequip: Iterable[EquipmentItem] = ()) -> bool:
+        """
+        Take off `unequip` and put on `equip` as one change, or change nothing
+        and return False. Items to put on must be equipment in the inventory or
+        already worn, and items to take off must be worn. Worn items stay in the
+        inventory, flagged `equipped`. The change is first made on a copy of the
+        equipment, so the slot rules are checked before anything moves, and it
+        fails if one item put on would displace another. Every item taken off,
+        including those displaced by the slot rules, and every item put on is
+        published in one batch of events.
+        """
+        equip, unequip = list(equip), list(unequip)
+        equipment = self.equipment
+        if any(item not in equipment for item in unequip):
+            return False
+        if any(not isinstance(item, EquipmentItem) or item not in equipment and item not in self.inventory
+               for item in equip):
+            return False
         
-        if self.equipment.equip(item):
-            self.remove_from_inventory(item)
-            return True
+        trial = equipment.copy()
+        for item in unequip:
+            trial.remove(item)
+        for item in equip:
+            if item not in trial and not trial.equip(item):
+                return False
+        if any(item not in trial for item in equip):
+            return False
         
-        return False
+        taken_off = [item for item in equipment.items() if item not in trial]
+        put_on = [item for item in trial.items() if item not in equipment]
+        if not taken_off and not put_on:
+            return True
+        with self.events.batch():
+            for item in taken_off:
+                slot = equipment.remove(item)
+                item.equipped = False
+                self.events.publish(ItemUnequipped(item, slot))
+                if item not in self.inventory:
+                    self.add_to_inventory(item)
+            for item in put_on:
+                equipment.equip(item)
+                item.equipped = True
+                self.events.publish(ItemEquipped(item, item.slot))
+            self._invalidate('equipment')
+        return True
+    
+    def equip_item(self, item: EquipmentItem) -> bool:
+        """Put on an item from the inventory, taking off whatever it displaces."""
+        return item in self.inventory and self.change_equipment(equip=[item])
+    
+    def unequip(self, item: EquipmentItem) -> bool:
+        """Take off a worn item, whichever slot it is in."""
+        return self.change_equipment(unequip=[item])
     
     def unequip_item(self, slot: str) -> bool:
-        if slot not in self.equipment.equipment:
+        item = self.equipment.equipment.get(slot)
+        if slot == 'accessories' or item is None:
             return False
-        
-        item = self.equipment.equipment[slot]
-        if item:
-            self.equipment.unequip(slot)
-            self.add_to_inventory(item)
-            return True
-        
-        return False
+        return self.change_equipment(unequip=[item])
     
     def unequip_accessory(self, item: EquipmentItem) -> bool:
-        if self.equipment.unequip_accessory(item):
-            self.add_to_inventory(item)
-            return True
-        return False 
\ No newline at end of file
+        if self.equipment.slot_of(item) != 'accessories':
+            return False
+        return self.change_equipment(unequip=[item]) 
+
+
+def _derived_dependents(derived_stats: Dict[str, Any]) -> Dict[str, Tuple[str, ...]]:
+    """Map each input to the derived stats that must be recomputed when it changes."""
+    dependents: Dict[str, List[str]] = {}
+    for name, (_, inputs) in derived_stats.items():
+        for source in inputs:
+            dependents.setdefault(source, []).append(name)
+    return {source: tuple(names) for source, names in dependents.items()}
+
+
+_DERIVED_DEPENDENTS = _derived_dependents(Character.DERIVED_STATS)
+
+
+def _encode_inventory(inventory: Inventory, definitions: Optional[Dict[ItemDefinition, int]]) -> List[Dict[str, Any]]:
+    return [item.to_dict(definitions) for item in inventory]
+
+
+def _decode_inventory(data: List[Dict[str, Any]], definitions: Optional[Sequence[ItemDefinition]]) -> Inventory:
+    return Inventory(item_from_dict(item, definitions) for item in data)
+
+
+# Events and stat modifiers are runtime state and are not saved
+_encode_character, _decode_character = serializer(
+    Character, exclude=('events', 'stat_modifiers'),
+    overrides={'inventory': (_encode_inventory, _decode_inventory)}
+)
\ No newline at end of file
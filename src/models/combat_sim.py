@@ -0,0 +1,271 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .character import Character
+from .dice import Dice, dice_pool
+from .tag_index import Query, parse_tag_query, tag_mask
+
+
+RESOURCES = ("health", "mana", "stamina")
+
+# Effects with this tag hit magic attack against magic defense
+MAGIC = parse_tag_query("magic")
+
+# Combatants heal when they drop below this fraction of their maximum health
+HEAL_BELOW = 0.5
+
+
+@dataclass(frozen=True)
+class ActionEffect:
+    """One effect of a skill as the simulator applies it: damage, heal or status."""
+    kind: str
+    value: float
+    dice: Dice
+    magic: bool = False
+    target_group: str = "single_enemy"
+    # The effect's tags as a bitset, see tag_index
+    tags: int = 0
+
+    def has_tags(self, query: Query) -> bool:
+        """Whether the effect's tags match a tag query such as "fire & !holy"."""
+        return parse_tag_query(query).matches(self.tags) if isinstance(query, str) else query.matches(self.tags)
+
+
+@dataclass(frozen=True)
+class SkillAction:
+    name: str
+    resource: str
+    cost: float
+    effects: Tuple[ActionEffect, ...]
+
+    @property
+    def kind(self) -> str:
+        """What the skill is used for, decided by its first effect."""
+        return self.effects[0].kind
+
+    @property
+    def harmful(self) -> bool:
+        return any(effect.kind != "heal" for effect in self.effects)
+
+    def expected_damage(self) -> float:
+        return sum(effect.value + effect.dice.mean() for effect in self.effects if effect.kind == "damage")
+
+
+@dataclass(frozen=True)
+class Combatant:
+    """
+    The numbers of a character that matter in a fight, frozen at one level.
+    Skill costs and effect values are scaled to each skill's level; effects
+    the simulator does not model are left out.
+    """
+    name: str
+    max_health: float
+    max_mana: float
+    max_stamina: float
+    health: float
+    mana: float
+    stamina: float
+    speed: float
+    physical_attack: float
+    magic_attack: float
+    physical_defense: float
+    magic_defense: float
+    attack_dice: Dice
+    skills: Tuple[SkillAction, ...] = ()
+
+    @classmethod
+    def from_character(cls, character: Character, name: Optional[str] = None) -> 'Combatant':
+        skills = []
+        for skill in character.skills:
+            effects = tuple(
+                ActionEffect(
+                    kind=effect.get("action", ""),
+                    value=skill.effect_value_at(index),
+                    dice=dice_pool(effect.get("dice", ())),
+                    magic=MAGIC.matches(tags),
+                    target_group=effect.get("target_group", skill.target_group),
+                    tags=tags
+                )
+                for index, effect in enumerate(skill.effects)
+                if effect.get("action") in ("damage", "heal", "status")
+                for tags in (tag_mask(effect.get("tags")),)
+            )
+            if effects:
+                skills.append(SkillAction(skill.name, skill.cost.get("resource", "mana"), skill.cost_at(), effects))
+        return cls(
+            name=name or character.name,
+            max_health=character.max_health, max_mana=character.max_mana, max_stamina=character.max_stamina,
+            health=character.health, mana=character.mana, stamina=character.stamina,
+            speed=character.speed,
+            physical_attack=character.physical_attack, magic_attack=character.magic_attack,
+            physical_defense=character.physical_defense, magic_defense=character.magic_defense,
+            attack_dice=dice_pool(character.basic_attack_dice),
+            skills=tuple(skills)
+        )
+
+
+@dataclass
+class DuelReport:
+    """
+    Outcome of many duels between two combatants.
+    Per-side values are indexed 0 for the first combatant and 1 for the
+    second. `curves` holds the mean of each resource after every round,
+    over all fights, with fights that ended keeping their final values.
+    `winners` (-1 for a draw), `ended` (0 for a draw) and `final_health`
+    keep the outcome of every fight, for statistics across fights.
+    """
+    names: Tuple[str, str]
+    fights: int
+    wins: np.ndarray
+    draws: int
+    rounds_to_kill: np.ndarray
+    curves: Dict[str, np.ndarray]
+    winners: Optional[np.ndarray] = field(default=None, repr=False)
+    ended: Optional[np.ndarray] = field(default=None, repr=False)
+    final_health: Optional[np.ndarray] = field(default=None, repr=False)
+
+    @property
+    def win_rates(self) -> np.ndarray:
+        return self.wins / self.fights
+
+    def summary(self) -> str:
+        lines = [f"{self.names[0]} vs {self.names[1]}, {self.fights} fights"]
+        for side, name in enumerate(self.names):
+            lines.append(f"  {name}: {self.win_rates[side]:.1%} wins, "
+                         f"{self.rounds_to_kill[side]:.2f} rounds to kill")
+        lines.append(f"  draws: {self.draws / self.fights:.1%}")
+        return "\n".join(lines)
+
+
+def simulate_duels(first: Combatant, second: Combatant, fights: int = 10000,
+                   max_rounds: int = 50, seed: Any = None) -> DuelReport:
+    """
+    Fight `fights` independent duels at once, up to `max_rounds` rounds each.
+    Every combatant state is a NumPy array with one entry per fight, so each
+    turn resolves all fights together. The faster combatant acts first in
+    each round. On its turn a combatant heals if it is below HEAL_BELOW of
+    its health, otherwise puts an awake opponent to sleep, otherwise uses
+    its most damaging skill, choosing only skills it can pay for and
+    falling back to a basic attack. Harmful actions can be dodged, with
+    the same chance as Character.dodge_chance. Damage is the effect value
+    plus its dice plus the attacker's physical or magic attack, less the
+    matching defense, and at least 1. A sleeping combatant loses its turn
+    and one turn of sleep.
+    """
+    rng = np.random.default_rng(seed)
+    sides = (first, second)
+    state = [{resource: np.full(fights, float(getattr(side, resource))) for resource in RESOURCES}
+             for side in sides]
+    asleep = [np.zeros(fights, dtype=np.int64) for _ in sides]
+    dodge = [Character.dodge_probability(sides[side].speed - sides[1 - side].speed) for side in (0, 1)]
+    order = (0, 1) if first.speed >= second.speed else (1, 0)
+
+    ongoing = np.ones(fights, dtype=bool)
+    winner = np.full(fights, -1)
+    ended = np.zeros(fights, dtype=np.int64)
+    curves = {resource: np.empty((2, max_rounds + 1)) for resource in RESOURCES}
+    _record(curves, state, 0)
+
+    rounds = max_rounds
+    for round_number in range(1, max_rounds + 1):
+        for actor in order:
+            target = 1 - actor
+            sleeping = ongoing & (asleep[actor] > 0)
+            asleep[actor][sleeping] -= 1
+            acting = ongoing & ~sleeping
+            choice = _choose(sides[actor], state[actor], asleep[target], acting)
+            _resolve(sides[actor], sides[target], state[actor], state[target], asleep[target],
+                     choice, acting, dodge[target], rng)
+            killed = ongoing & (state[target]["health"] <= 0)
+            winner[killed] = actor
+            ended[killed] = round_number
+            ongoing &= ~killed
+        _record(curves, state, round_number)
+        if not ongoing.any():
+            rounds = round_number
+            break
+
+    wins = np.array([np.count_nonzero(winner == side) for side in (0, 1)])
+    rounds_to_kill = np.array([ended[winner == side].mean() if wins[side] else np.nan for side in (0, 1)])
+    return DuelReport(
+        names=(first.name, second.name),
+        fights=fights,
+        wins=wins,
+        draws=fights - int(wins.sum()),
+        rounds_to_kill=rounds_to_kill,
+        curves={resource: curve[:, :rounds + 1] for resource, curve in curves.items()},
+        winners=winner,
+        ended=ended,
+        final_health=np.stack([state[side]["health"] for side in (0, 1)])
+    )
+
+
+def compare_builds(builds: Sequence[Combatant], opponent: Combatant, fights: int = 10000,
+                   max_rounds: int = 50, seed: Optional[int] = None) -> List[DuelReport]:
+    """Duel each build against the same opponent, with an independent seed per build."""
+    seeds = np.random.SeedSequence(seed).spawn(len(builds))
+    return [simulate_duels(build, opponent, fights, max_rounds, child)
+            for build, child in zip(builds, seeds)]
+
+
+def _record(curves: Dict[str, np.ndarray], state: List[Dict[str, np.ndarray]], column: int) -> None:
+    for resource, curve in curves.items():
+        for side in (0, 1):
+            curve[side, column] = state[side][resource].mean()
+
+
+def _affordable(skill: SkillAction, resources: Dict[str, np.ndarray]) -> np.ndarray:
+    pool = resources[skill.resource]
+    # Paying with health must leave the user standing
+    return pool > skill.cost if skill.resource == "health" else pool >= skill.cost
+
+
+def _choose(actor: Combatant, resources: Dict[str, np.ndarray], target_asleep: np.ndarray,
+            acting: np.ndarray) -> np.ndarray:
+    """Index of the skill each fight's actor uses, or -1 for a basic attack; later rules win."""
+    choice = np.full(acting.shape, -1)
+    indexed = list(enumerate(actor.skills))
+    damaging = sorted((entry for entry in indexed if entry[1].kind == "damage"),
+                      key=lambda entry: entry[1].expected_damage())
+    for index, skill in damaging:
+        choice[_affordable(skill, resources)] = index
+    for index, skill in indexed:
+        if skill.kind == "status":
+            choice[_affordable(skill, resources) & (target_asleep == 0)] = index
+    wounded = resources["health"] < HEAL_BELOW * actor.max_health
+    for index, skill in indexed:
+        if skill.kind == "heal":
+            choice[_affordable(skill, resources) & wounded] = index
+    return choice
+
+
+def _resolve(actor: Combatant, target: Combatant, resources: Dict[str, np.ndarray],
+             target_resources: Dict[str, np.ndarray], target_asleep: np.ndarray,
+             choice: np.ndarray, acting: np.ndarray, dodge: float, rng: np.random.Generator) -> None:
+    basic = np.flatnonzero(acting & (choice == -1))
+    if basic.size:
+        hits = basic[rng.random(basic.size) >= dodge]
+        damage = (actor.attack_dice.roll_many(hits.size, rng)
+                  + actor.physical_attack - target.physical_defense)
+        target_resources["health"][hits] -= np.maximum(damage, 1)
+
+    for index, skill in enumerate(actor.skills):
+        users = np.flatnonzero(acting & (choice == index))
+        if not users.size:
+            continue
+        resources[skill.resource][users] -= skill.cost
+        hits = users[rng.random(users.size) >= dodge] if skill.harmful else users
+        for effect in skill.effects:
+            if effect.kind == "heal":
+                health = resources["health"]
+                amount = effect.value + effect.dice.roll_many(users.size, rng)
+                health[users] = np.minimum(health[users] + amount, actor.max_health)
+            elif effect.kind == "status":
+                target_asleep[hits] = np.maximum(target_asleep[hits], int(effect.value))
+            else:
+                attack, defense = ((actor.magic_attack, target.magic_defense) if effect.magic
+                                   else (actor.physical_attack, target.physical_defense))
+                damage = effect.value + effect.dice.roll_many(hits.size, rng) + attack - defense
+                target_resources["health"][hits] -= np.maximum(damage, 1)
@@ -0,0 +1,343 @@
+import random
+import re
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from math import comb
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+# One term of a dice expression: an optional sign, then either a dice group
+# such as 3d6, 4d6kh3 or 2d10! or a plain number
+TERM_PATTERN = re.compile(r"\s*([+-])?\s*(?:(\d*)d(\d+)(!)?(?:kh?(\d+))?|(\d+))\s*", re.IGNORECASE)
+
+# An exploding die is rerolled at most this many times, so rolls and
+# distributions are finite and agree with each other
+EXPLOSION_LIMIT = 10
+
+MAX_DICE = 1000
+MAX_SIDES = 10000
+
+# Working a distribution out exactly may take at most this many array steps;
+# costlier expressions estimate theirs from this many seeded rolls instead
+MAX_EXACT_WORK = 2 * 10 ** 8
+SAMPLED_ROLLS = 20000
+
+
+class DiceError(ValueError):
+    """Raised for dice notation that cannot be parsed or is out of range."""
+
+
+@dataclass(frozen=True)
+class DiceGroup:
+    """N dice of M sides, optionally exploding on their maximum and keeping only the highest."""
+    count: int
+    sides: int
+    sign: int = 1
+    explode: bool = False
+    keep: Optional[int] = None
+
+    @property
+    def kept(self) -> int:
+        return self.count if self.keep is None else min(self.keep, self.count)
+
+    @property
+    def highest_face(self) -> int:
+        return self.sides * (EXPLOSION_LIMIT + 1) if self.explode else self.sides
+
+    def exact_work(self) -> int:
+        """Rough number of array steps `distribution` takes."""
+        if self.keep is None or self.keep >= self.count:
+            # Each convolution multiplies the total so far by every face
+            return sum((placed * self.highest_face + 1) * (self.highest_face + 1) for placed in range(self.count))
+        values = self.highest_face - EXPLOSION_LIMIT if self.explode else self.sides
+        return values * self.count * (self.count + 1) // 2 * (self.keep * self.highest_face + 1)
+
+    def face_distribution(self) -> np.ndarray:
+        """Probability of each value of one die, index 0 being a value of 0."""
+        if not self.explode:
+            faces = np.full(self.sides + 1, 1 / self.sides)
+            faces[0] = 0
+            return faces
+        faces = np.zeros((EXPLOSION_LIMIT + 1) * self.sides + 1)
+        for explosions in range(EXPLOSION_LIMIT + 1):
+            chance = self.sides ** -(explosions + 1)
+            start = explosions * self.sides + 1
+            # The last reroll allowed keeps its maximum instead of exploding again
+            end = start + (self.sides if explosions == EXPLOSION_LIMIT else self.sides - 1)
+            faces[start:end] = chance
+        return faces
+
+    def distribution(self) -> np.ndarray:
+        """Probability of each total of the group, index 0 being a total of 0."""
+        faces = self.face_distribution()
+        if self.keep is None or self.keep >= self.count:
+            total = np.ones(1)
+            for _ in range(self.count):
+                total = np.convolve(total, faces)
+            return total
+        return _keep_highest(faces, self.count, self.keep)
+
+
+class Dice:
+    """
+    A parsed dice expression such as "2d6+3", "4d6kh3" or "1d10!+1d4-1".
+    Parsing compiles one function for single rolls; `roll_many` draws
+    whole batches with NumPy instead. The distribution of totals is worked
+    out exactly, by convolving the groups and by counting arrangements of
+    dice for keep-highest, and cached along with the statistics read from
+    it. Expressions whose exact distribution would take more than
+    MAX_EXACT_WORK steps estimate it from SAMPLED_ROLLS rolls seeded by the
+    notation, so repeated calls agree; their minimum and maximum stay exact.
+    Use `parse_dice` to get cached instances.
+    """
+
+    __slots__ = ("notation", "groups", "modifier", "_roll", "_distribution")
+
+    def __init__(self, notation: str):
+        self.notation = notation
+        self.groups, self.modifier = _parse(notation)
+        self._roll = _compile(self.groups, self.modifier, notation)
+        self._distribution: Optional[Tuple[int, np.ndarray]] = None
+
+    def __repr__(self) -> str:
+        return f"Dice({self.notation!r})"
+
+    def roll(self, rng: Optional[random.Random] = None) -> int:
+        """Roll once, with the given random stream or the shared default one."""
+        return self._roll(rng.random if rng is not None else random.random)
+
+    def roll_many(self, count: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """Roll `count` times at once and return the totals as an integer array."""
+        rng = rng if rng is not None else _NUMPY_RNG
+        totals = np.full(count, self.modifier, dtype=np.int64)
+        for group in self.groups:
+            dice = rng.integers(1, group.sides + 1, size=(count, group.count))
+            if group.explode:
+                rerolling = dice == group.sides
+                for _ in range(EXPLOSION_LIMIT):
+                    if not rerolling.any():
+                        break
+                    extra = rng.integers(1, group.sides + 1, size=int(rerolling.sum()))
+                    dice[rerolling] += extra
+                    rerolling[rerolling] = extra == group.sides
+            if group.keep is not None and group.keep < group.count:
+                dice = np.partition(dice, group.count - group.keep, axis=1)[:, group.count - group.keep:]
+            totals += group.sign * dice.sum(axis=1)
+        return totals
+
+    def exact_work(self) -> int:
+        """Rough number of array steps working out the exact distribution takes."""
+        work, width = 0, 1
+        for group in self.groups:
+            size = group.kept * group.highest_face + 1
+            work += group.exact_work() + width * size
+            width += size - 1
+        return work
+
+    def _bounds(self) -> Tuple[int, int]:
+        lowest = highest = self.modifier
+        for group in self.groups:
+            if group.sign < 0:
+                lowest -= group.kept * group.highest_face
+                highest -= group.kept
+            else:
+                lowest += group.kept
+                highest += group.kept * group.highest_face
+        return lowest, highest
+
+    def _sampled_table(self) -> Tuple[int, np.ndarray]:
+        rng = np.random.default_rng(zlib.crc32(self.notation.encode()))
+        # Rolling in batches keeps the array of dice to about a million
+        batch = max(1, 10 ** 6 // sum(group.count for group in self.groups))
+        totals = np.concatenate([self.roll_many(min(batch, SAMPLED_ROLLS - done), rng)
+                                 for done in range(0, SAMPLED_ROLLS, batch)])
+        lowest = int(totals.min())
+        return lowest, np.bincount(totals - lowest) / SAMPLED_ROLLS
+
+    def _table(self) -> Tuple[int, np.ndarray]:
+        if self._distribution is None and self.exact_work() > MAX_EXACT_WORK:
+            self._distribution = self._sampled_table()
+        if self._distribution is None:
+            lowest, probabilities = self.modifier, np.ones(1)
+            for group in self.groups:
+                totals = group.distribution()
+                if group.sign < 0:
+                    totals = totals[::-1]
+                    lowest -= len(totals) - 1
+                probabilities = np.convolve(probabilities, totals)
+            first = int(np.flatnonzero(probabilities)[0])
+            last = int(np.flatnonzero(probabilities)[-1])
+            self._distribution = lowest + first, probabilities[first:last + 1]
+        return self._distribution
+
+    def distribution(self) -> Dict[int, float]:
+        """Probability of every possible total, exact unless it would cost too much to work out."""
+        lowest, probabilities = self._table()
+        return {lowest + offset: float(chance) for offset, chance in enumerate(probabilities) if chance > 0}
+
+    @property
+    def minimum(self) -> int:
+        return self._bounds()[0]
+
+    @property
+    def maximum(self) -> int:
+        return self._bounds()[1]
+
+    def mean(self) -> float:
+        lowest, probabilities = self._table()
+        return float(lowest + np.dot(np.arange(len(probabilities)), probabilities))
+
+    def variance(self) -> float:
+        lowest, probabilities = self._table()
+        offsets = np.arange(len(probabilities))
+        return float(np.dot(offsets ** 2, probabilities) - np.dot(offsets, probabilities) ** 2)
+
+    def chance_at_least(self, target: int) -> float:
+        """Probability that a roll totals `target` or more."""
+        lowest, probabilities = self._table()
+        return float(probabilities[max(0, target - lowest):].sum())
+
+
+@lru_cache(maxsize=1024)
+def parse_dice(notation: str) -> Dice:
+    """Parse and compile dice notation; each distinct string is compiled once."""
+    return Dice(notation)
+
+
+def dice_pool(notations: Iterable[str]) -> Dice:
+    """A single expression rolling every notation together, e.g. a character's attack dice."""
+    return parse_dice(" + ".join(notations) or "0")
+
+
+def roll(notation: str, rng: Optional[random.Random] = None) -> int:
+    """Roll dice notation once."""
+    return parse_dice(notation).roll(rng)
+
+
+class DiceStreams:
+    """
+    Named random streams derived from one seed.
+    Each name gets its own generator, so rolls in one part of the game
+    (combat, loot) never shift the sequence of another, and replaying with
+    the same seed repeats every stream exactly.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2 ** 63)
+        self._streams: Dict[str, random.Random] = {}
+        self._generators: Dict[str, np.random.Generator] = {}
+
+    def stream(self, name: str = "default") -> random.Random:
+        rng = self._streams.get(name)
+        if rng is None:
+            rng = self._streams[name] = random.Random(f"{self.seed}:{name}")
+        return rng
+
+    def generator(self, name: str = "default") -> np.random.Generator:
+        """The NumPy generator of a stream, for batched rolls."""
+        rng = self._generators.get(name)
+        if rng is None:
+            rng = self._generators[name] = np.random.default_rng([self.seed, zlib.crc32(name.encode())])
+        return rng
+
+    def roll(self, notation: str, stream: str = "default") -> int:
+        return parse_dice(notation).roll(self.stream(stream))
+
+    def roll_many(self, notation: str, count: int, stream: str = "default") -> np.ndarray:
+        return parse_dice(notation).roll_many(count, self.generator(stream))
+
+
+_NUMPY_RNG = np.random.default_rng()
+
+
+def _parse(notation: str) -> Tuple[Tuple[DiceGroup, ...], int]:
+    groups: List[DiceGroup] = []
+    modifier = 0
+    position = 0
+    text = notation.strip()
+    if not text:
+        raise DiceError("Empty dice notation")
+    while position < len(text):
+        match = TERM_PATTERN.match(text, position)
+        if match is None or match.end() == position or (match.group(1) is None and position > 0):
+            raise DiceError(f"Invalid dice notation {notation!r} at {text[position:]!r}")
+        position = match.end()
+        sign = -1 if match.group(1) == "-" else 1
+        if match.group(6) is not None:
+            modifier += sign * int(match.group(6))
+            continue
+        count = int(match.group(2) or 1)
+        sides = int(match.group(3))
+        keep = int(match.group(5)) if match.group(5) is not None else None
+        if not 1 <= count <= MAX_DICE or not 1 <= sides <= MAX_SIDES:
+            raise DiceError(f"Invalid dice notation {notation!r}: up to {MAX_DICE} dice of up to {MAX_SIDES} sides")
+        if match.group(4) and sides < 2:
+            raise DiceError(f"Invalid dice notation {notation!r}: a one-sided die cannot explode")
+        if keep is not None and keep < 1:
+            raise DiceError(f"Invalid dice notation {notation!r}: must keep at least one die")
+        groups.append(DiceGroup(count, sides, sign, bool(match.group(4)), keep))
+    return tuple(groups), modifier
+
+
+def _compile(groups: Tuple[DiceGroup, ...], modifier: int, notation: str) -> Callable[[Callable[[], float]], int]:
+    """Generate the single-roll function of an expression, taking a random() function."""
+    namespace: Dict[str, Any] = {"explode": _explode}
+    terms = []
+    for group in groups:
+        die = (f"explode(r, {group.sides})" if group.explode
+               else f"int(r() * {group.sides}) + 1")
+        if group.keep is not None and group.keep < group.count:
+            term = f"sum(sorted([{die} for _ in range({group.count})])[{group.count - group.keep}:])"
+        elif group.count <= 8:
+            term = "(" + " + ".join([die] * group.count) + ")"
+        else:
+            term = f"sum([{die} for _ in range({group.count})])"
+        terms.append(("- " if group.sign < 0 else "+ ") + term)
+    source = f"def roll(r):\n    return {modifier} {' '.join(terms)}\n"
+    exec(source, namespace)
+    function = namespace["roll"]
+    function.__qualname__ = f"roll {notation!r}"
+    return function
+
+
+def _explode(r: Callable[[], float], sides: int) -> int:
+    total = 0
+    for _ in range(EXPLOSION_LIMIT + 1):
+        value = int(r() * sides) + 1
+        total += value
+        if value != sides:
+            break
+    return total
+
+
+def _keep_highest(faces: np.ndarray, count: int, keep: int) -> np.ndarray:
+    """
+    Distribution of the sum of the `keep` highest of `count` dice.
+    Faces are visited from the highest value down, choosing how many dice
+    show each one; the first `keep` dice placed are the ones kept, so the
+    state only needs the number of dice placed and the kept total.
+    """
+    values = np.flatnonzero(faces)[::-1]
+    size = keep * int(values[0]) + 1
+    # states[placed] is the distribution of the kept total so far
+    states = np.zeros((count + 1, size))
+    states[0, 0] = 1.0
+    for value in values.tolist():
+        chance = faces[value]
+        following = states.copy()
+        for placed in range(count):
+            current = states[placed]
+            if not current.any():
+                continue
+            for showing in range(1, count - placed + 1):
+                weight = comb(count - placed, showing) * chance ** showing
+                shift = min(showing, max(0, keep - placed)) * value
+                if shift:
+                    following[placed + showing, shift:] += weight * current[:size - shift]
+                else:
+                    following[placed + showing] += weight * current
+        states = following
+    return states[count]
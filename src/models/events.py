@@ -0,0 +1,168 @@
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """Base class for all game state change events."""
+
+
+@dataclass(frozen=True)
+class MessageAppended(ChangeEvent):
+    log: str
+    index: int
+    sender: str
+    message: str
+
+
+@dataclass(frozen=True)
+class ItemAdded(ChangeEvent):
+    item: Any
+
+
+@dataclass(frozen=True)
+class ItemRemoved(ChangeEvent):
+    item: Any
+
+
+@dataclass(frozen=True)
+class ItemEquipped(ChangeEvent):
+    item: Any
+    slot: str
+
+
+@dataclass(frozen=True)
+class ItemUnequipped(ChangeEvent):
+    item: Any
+    slot: str
+
+
+@dataclass(frozen=True)
+class StatChanged(ChangeEvent):
+    stat: str
+    old_value: Any
+    new_value: Any
+
+
+@dataclass(frozen=True)
+class LocationChanged(ChangeEvent):
+    location: Any
+
+
+@dataclass(frozen=True)
+class TimeOfDayChanged(ChangeEvent):
+    time_of_day: str
+
+
+@dataclass(frozen=True)
+class StateRestored(ChangeEvent):
+    """The whole state was replaced, e.g. by undo, so views should refresh fully."""
+
+
+def coalesce(events: List[ChangeEvent]) -> List[ChangeEvent]:
+    """
+    Collapse a batch of events into the smallest equivalent list.
+    Repeated stat changes become one change from the first old value to the
+    last new value, only the final location and time of day are kept, and an
+    item added and removed again within the batch cancels out. A restore
+    supersedes everything else in the batch.
+    """
+    if any(isinstance(event, StateRestored) for event in events):
+        return [StateRestored()]
+
+    result: List[Any] = []
+    stat_positions: Dict[str, int] = {}
+    added_positions: Dict[int, int] = {}
+    location_position = None
+    time_position = None
+
+    for event in events:
+        if isinstance(event, StatChanged):
+            position = stat_positions.get(event.stat)
+            if position is None:
+                stat_positions[event.stat] = len(result)
+                result.append(event)
+            else:
+                first = result[position]
+                result[position] = StatChanged(event.stat, first.old_value, event.new_value)
+        elif isinstance(event, ItemAdded):
+            added_positions[id(event.item)] = len(result)
+            result.append(event)
+        elif isinstance(event, ItemRemoved) and id(event.item) in added_positions:
+            result[added_positions.pop(id(event.item))] = None
+        elif isinstance(event, LocationChanged):
+            if location_position is not None:
+                result[location_position] = None
+            location_position = len(result)
+            result.append(event)
+        elif isinstance(event, TimeOfDayChanged):
+            if time_position is not None:
+                result[time_position] = None
+            time_position = len(result)
+            result.append(event)
+        else:
+            result.append(event)
+
+    return [
+        event for event in result
+        if event is not None and not (
+            isinstance(event, StatChanged) and event.old_value == event.new_value
+        )
+    ]
+
+
+class EventStream:
+    """
+    Publishes change events from the game state to subscribers.
+    Events published inside a `batch()` block are coalesced and delivered
+    together when the outermost block exits; otherwise they are delivered
+    as soon as they are published.
+    """
+
+    __slots__ = ('_subscribers', '_pending', '_batch_depth')
+
+    def __init__(self):
+        self._subscribers: List[Callable[[List[ChangeEvent]], None]] = []
+        self._pending: List[ChangeEvent] = []
+        self._batch_depth = 0
+
+    def subscribe(self, callback: Callable[[List[ChangeEvent]], None]) -> Callable[[], None]:
+        """Register a callback for event batches and return a function that unsubscribes it."""
+        self._subscribers.append(callback)
+
+        def unsubscribe():
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def publish(self, event: ChangeEvent) -> None:
+        """Queue an event, delivering it immediately when not batching."""
+        if not self._subscribers:
+            return
+        self._pending.append(event)
+        if self._batch_depth == 0:
+            self.flush()
+
+    @contextmanager
+    def batch(self):
+        """Collect events until the block exits, then deliver them coalesced."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+
+    def flush(self) -> None:
+        """Deliver all pending events to the subscribers."""
+        if not self._pending:
+            return
+        events = coalesce(self._pending)
+        self._pending = []
+        if not events:
+            return
+        for callback in list(self._subscribers):
+            callback(events)
@@ -0,0 +1,120 @@
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, List, Sequence, Tuple
+
+import numpy as np
+
+from .formulas import compile_formula
+
+
+@dataclass(frozen=True)
+class ExperienceCurve:
+    """
+    Experience needed per level, as a level-up formula.
+    Going from level 1 to 2 takes `base` experience and every later
+    requirement is `formula` applied to the one before, the same way skill
+    costs scale. The per-level and cumulative tables are built once per
+    curve with a single vectorized progression and shared by every curve
+    with equal fields.
+    """
+    base: int = 100
+    formula: str = "x*1.1"
+    max_level: int = 100
+
+    @property
+    def requirements(self) -> np.ndarray:
+        """Experience from each level to the next, index 0 being level 1; 0 at the maximum level."""
+        return _tables(self)[0]
+
+    @property
+    def thresholds(self) -> np.ndarray:
+        """Total experience at which each level is reached, index 0 being level 1."""
+        return _tables(self)[1]
+
+    def to_next(self, level: int) -> int:
+        """Experience from `level` to the next one."""
+        return int(self.requirements[min(level, self.max_level) - 1])
+
+    def total(self, level: int, experience: int = 0) -> int:
+        """Total experience of someone at `level` with `experience` towards the next one."""
+        return int(self.thresholds[min(level, self.max_level) - 1]) + experience
+
+    def level_for(self, total: int) -> int:
+        """The level reached with `total` experience."""
+        return max(1, bisect_right(_tables(self)[2], total))
+
+    def progress(self, level: int, experience: int, amount: int) -> Tuple[int, int, int]:
+        """Scalar `advance`: the level, experience into it and experience to the next after a gain."""
+        thresholds = _tables(self)[2]
+        total = min(self.total(level, experience) + amount, thresholds[-1])
+        new_level = self.level_for(total)
+        return new_level, total - thresholds[new_level - 1], self.to_next(new_level)
+
+    def advance(self, levels: Any, experience: Any, amounts: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Add experience to whole arrays of levels at once.
+        Returns the new levels, the experience into each new level and the
+        experience each needs for the next one. Experience beyond the
+        maximum level is dropped.
+        """
+        _, thresholds, _ = _tables(self)
+        levels = np.clip(np.asarray(levels, dtype=np.int64), 1, self.max_level)
+        totals = thresholds[levels - 1] + np.asarray(experience, dtype=np.int64) + np.asarray(amounts, dtype=np.int64)
+        totals = np.minimum(totals, thresholds[-1])
+        new_levels = np.maximum(np.searchsorted(thresholds, totals, side="right"), 1)
+        return new_levels, totals - thresholds[new_levels - 1], self.requirements[new_levels - 1]
+
+
+CHARACTER_CURVE = ExperienceCurve()
+SKILL_CURVE = ExperienceCurve(base=100, formula="x*1.25", max_level=20)
+
+
+@lru_cache(maxsize=64)
+def _tables(curve: ExperienceCurve) -> Tuple[np.ndarray, np.ndarray, List[int]]:
+    if curve.max_level < 1:
+        raise ValueError("An experience curve needs at least one level")
+    steps = compile_formula(curve.formula).progression(curve.base, max(curve.max_level - 1, 1))
+    requirements = np.zeros(curve.max_level, dtype=np.int64)
+    requirements[:-1] = np.rint(steps[:curve.max_level - 1])
+    if np.any(requirements[:-1] <= 0):
+        raise ValueError(f"Experience curve {curve.formula!r} must need positive experience at every level")
+    thresholds = np.concatenate(([0], np.cumsum(requirements[:-1])))
+    for table in (requirements, thresholds):
+        table.setflags(write=False)
+    # Scalar lookups bisect a plain list, which beats a NumPy call for one value
+    return requirements, thresholds, thresholds.tolist()
+
+
+def grant_experience(members: Sequence[Any], amounts: Any, curve: ExperienceCurve = CHARACTER_CURVE) -> np.ndarray:
+    """
+    Give experience to many characters or skills in one vectorized step.
+    `amounts` is one number for everyone or one per member. The new levels
+    are found with a single searchsorted over the curve's thresholds and
+    written back member by member, so characters publish their usual stat
+    events. Returns the number of levels each member gained.
+    """
+    levels = np.fromiter((member.level for member in members), dtype=np.int64, count=len(members))
+    experience = np.fromiter((member.experience for member in members), dtype=np.int64, count=len(members))
+    new_levels, new_experience, to_next = curve.advance(levels, experience, amounts)
+    for member, level, progress, needed in zip(members, new_levels.tolist(), new_experience.tolist(),
+                                               to_next.tolist()):
+        set_progress(member, level, progress, needed)
+    return new_levels - levels
+
+
+def set_progress(member: Any, level: int, experience: int, to_next: int) -> None:
+    """Write a character's or skill's level and experience, as one batch of events if it has any."""
+    events = getattr(member, "events", None)
+    if events is None:
+        _write_progress(member, level, experience, to_next)
+        return
+    with events.batch():
+        _write_progress(member, level, experience, to_next)
+
+
+def _write_progress(member: Any, level: int, experience: int, to_next: int) -> None:
+    member.level = level
+    member.experience = experience
+    if hasattr(member, "experience_to_next_level"):
+        member.experience_to_next_level = to_next
@@ -0,0 +1,254 @@
+import ast
+import math
+from functools import lru_cache, reduce
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+
+# A level-up formula computes a value at `level` from `x`, the value at the
+# level before, so "x*1.1" grows a cost by ten percent per level.
+VARIABLES = ("x", "level")
+
+DEFAULT_MAX_LEVEL = 100
+
+SCALAR_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "min": min,
+    "max": max,
+    "abs": abs,
+    "round": round,
+    "floor": math.floor,
+    "ceil": math.ceil,
+    "sqrt": math.sqrt,
+    "log": math.log,
+    "exp": math.exp,
+}
+
+# numpy's two-argument minimum/maximum take a third positional `out`
+# argument, so they are folded instead of called with every argument
+ARRAY_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "min": lambda *values: reduce(np.minimum, values),
+    "max": lambda *values: reduce(np.maximum, values),
+    "abs": np.abs,
+    "round": np.round,
+    "floor": np.floor,
+    "ceil": np.ceil,
+    "sqrt": np.sqrt,
+    "log": np.log,
+    "exp": np.exp,
+}
+
+_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.UAdd, ast.USub)
+
+Number = Union[int, float]
+
+
+class FormulaError(ValueError):
+    """Raised when a formula is not valid Python or uses anything outside the whitelist."""
+
+
+class Formula:
+    """
+    A level-up formula compiled once from its validated syntax tree.
+    Calling it evaluates one step with plain floats; `evaluate` runs the same
+    expression over NumPy arrays, and `progression` computes the value at
+    every level up to a maximum for one or many starting values at once.
+    The per-level coefficients of a progression are worked out once per
+    length and progressions are cached per starting value, so `value_at` is
+    a lookup after the first call.
+    """
+
+    __slots__ = ("source", "affine", "_scalar", "_array", "_tables", "_closed_forms")
+
+    def __init__(self, source: str, code: Any, affine: bool = False):
+        self.source = source
+        # Whether x enters the expression affinely, judged from its syntax tree
+        self.affine = affine
+        self._scalar = _bind(code, SCALAR_FUNCTIONS)
+        self._array = _bind(code, ARRAY_FUNCTIONS)
+        self._tables: Dict[Number, np.ndarray] = {}
+        self._closed_forms: Dict[int, Optional[Tuple[np.ndarray, np.ndarray]]] = {}
+
+    def __call__(self, x: Number, level: Number) -> float:
+        # Floats keep integer powers from growing without bound
+        return self._scalar(float(x), float(level))
+
+    def __repr__(self) -> str:
+        return f"Formula({self.source!r})"
+
+    def evaluate(self, x: Any, level: Any) -> np.ndarray:
+        """One step evaluated element-wise over arrays of values and levels."""
+        x, level = np.asarray(x, dtype=float), np.asarray(level, dtype=float)
+        return np.broadcast_to(self._array(x, level), np.broadcast_shapes(x.shape, level.shape))
+
+    def progression(self, base: Any, max_level: int = DEFAULT_MAX_LEVEL) -> np.ndarray:
+        """
+        Values at levels 1 to `max_level` starting from `base` at level 1.
+        With an array of bases the result has one row per base. Formulas that
+        are affine in x, which covers every formula in the class data, are
+        solved in closed form from their per-level coefficients; others are
+        stepped level by level, still vectorized across the bases.
+        """
+        bases = np.asarray(base, dtype=float)
+        column = bases.reshape(-1, 1)
+        table = np.empty((column.shape[0], max_level))
+        table[:, 0] = column[:, 0]
+        if max_level > 1:
+            levels = np.arange(2, max_level + 1, dtype=float)
+            with np.errstate(all="ignore"):
+                table[:, 1:] = self._steps(column, levels)
+        return table[0] if bases.ndim == 0 else table.reshape(bases.shape + (max_level,))
+
+    def _steps(self, column: np.ndarray, levels: np.ndarray) -> np.ndarray:
+        closed_form = self._closed_form(levels)
+        if closed_form is not None:
+            # v(L) = scale(L) * v(L-1) + offset(L)  =>  v(L) = P(L) * (v(1) + sum offset(k) / P(k))
+            products, sums = closed_form
+            return products * (column + sums)
+        steps = np.empty((column.shape[0], levels.shape[0]))
+        if column.shape[0] == 1:
+            # A single row is cheaper to step with floats than with one-element arrays
+            value = column[0, 0]
+            for index, level in enumerate(levels.tolist()):
+                value = steps[0, index] = self(value, level)
+            return steps
+        current = column[:, 0]
+        for index, level in enumerate(levels):
+            current = steps[:, index] = self.evaluate(current, level)
+        return steps
+
+    def _closed_form(self, levels: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Running products of the per-level scale and sums of the scaled offsets, if x enters affinely."""
+        if not self.affine:
+            return None
+        key = levels.shape[0]
+        if key not in self._closed_forms:
+            offset = self.evaluate(0.0, levels)
+            scale = self.evaluate(1.0, levels) - offset
+            closed_form = None
+            if np.all(np.isfinite(scale)) and np.all(np.isfinite(offset)) and np.all(scale != 0):
+                products = np.cumprod(scale)
+                closed_form = products, np.cumsum(offset / products)
+            self._closed_forms[key] = closed_form
+        return self._closed_forms[key]
+
+    def value_at(self, base: Number, level: int) -> float:
+        """Value at `level` starting from `base` at level 1, from a cached progression."""
+        if level <= 1:
+            return base
+        table = self._tables.get(base)
+        if table is None or level > table.shape[0]:
+            size = max(DEFAULT_MAX_LEVEL, level, 2 * (table.shape[0] if table is not None else 0))
+            table = self._tables[base] = self.progression(base, size)
+        return float(table[level - 1])
+
+
+@lru_cache(maxsize=512)
+def compile_formula(source: str) -> Formula:
+    """Validate and compile a formula; each distinct string is compiled once."""
+    try:
+        tree = ast.parse(source.strip(), mode="eval")
+    except SyntaxError as error:
+        raise FormulaError(f"Invalid formula {source!r}: {error.msg}") from None
+    callees = {id(node.func) for node in ast.walk(tree) if isinstance(node, ast.Call)}
+    for node in ast.walk(tree):
+        _check(node, source, id(node) in callees)
+    _float_constants(tree, source)
+    function = ast.Expression(ast.Lambda(
+        args=ast.arguments(posonlyargs=[], args=[ast.arg(arg=name) for name in VARIABLES],
+                           kwonlyargs=[], kw_defaults=[], defaults=[]),
+        body=tree.body
+    ))
+    code = compile(ast.fix_missing_locations(function), f"<formula {source!r}>", "eval")
+    return Formula(source, code, _degree(tree.body) is not None)
+
+
+def scaled_value(base: Number, formula: Optional[str], level: int) -> Number:
+    """A base value scaled to `level` by its formula, or unchanged without one."""
+    if not formula:
+        return base
+    return compile_formula(formula).value_at(base, level)
+
+
+def skill_table(skill: Any, max_level: int = DEFAULT_MAX_LEVEL) -> Dict[str, Any]:
+    """
+    Per-level cost and effect values of a skill, index 0 being level 1.
+    Values without a formula stay constant across the table.
+    """
+    def column(base: Number, formula: Optional[str]) -> np.ndarray:
+        if not formula:
+            return np.full(max_level, float(base))
+        return compile_formula(formula).progression(base, max_level)
+
+    return {
+        "cost": column(skill.cost.get("amount", 0), skill.cost.get("level_up_formula")),
+        "effects": [column(effect.get("value", 0), effect.get("level_up_formula")) for effect in skill.effects]
+    }
+
+
+def _check(node: ast.AST, source: str, callee: bool) -> None:
+    if isinstance(node, (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Load) + _OPERATORS):
+        return
+    if isinstance(node, ast.Constant):
+        if type(node.value) not in (int, float):
+            raise FormulaError(f"Invalid formula {source!r}: only numeric constants are allowed")
+        return
+    if isinstance(node, ast.Name):
+        if node.id not in (SCALAR_FUNCTIONS if callee else VARIABLES):
+            raise FormulaError(f"Invalid formula {source!r}: unknown name {node.id!r}")
+        return
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in SCALAR_FUNCTIONS:
+            raise FormulaError(f"Invalid formula {source!r}: only {', '.join(SCALAR_FUNCTIONS)} can be called")
+        if node.keywords or not node.args or any(isinstance(arg, ast.Starred) for arg in node.args):
+            raise FormulaError(f"Invalid formula {source!r}: {node.func.id}() takes positional arguments only")
+        return
+    raise FormulaError(f"Invalid formula {source!r}: {type(node).__name__} is not allowed")
+
+
+def _float_constants(tree: ast.AST, source: str) -> None:
+    """
+    Make every numeric constant a float, so powers of constants overflow at
+    once instead of building huge integers: "10**10**8" would otherwise
+    hang on every call. The digits argument of round() stays an int.
+    """
+    digits = {id(node.args[1]) for node in ast.walk(tree)
+              if isinstance(node, ast.Call) and node.func.id == "round" and len(node.args) > 1}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant) and type(node.value) is int and id(node) not in digits:
+            try:
+                node.value = float(node.value)
+            except OverflowError:
+                raise FormulaError(f"Invalid formula {source!r}: {node.value} is too large") from None
+
+
+def _degree(node: ast.AST) -> Optional[int]:
+    """
+    The degree of x in a checked expression: 0 without x, 1 where x enters
+    affinely, None otherwise. x under a function call (min, max, floor, ...),
+    in a power, divisor or modulo, or multiplied by itself is not affine,
+    whatever values it takes.
+    """
+    if isinstance(node, ast.Name):
+        return 1 if node.id == "x" else 0
+    if isinstance(node, ast.Constant):
+        return 0
+    if isinstance(node, ast.UnaryOp):
+        return _degree(node.operand)
+    if isinstance(node, ast.Call):
+        return 0 if all(_degree(arg) == 0 for arg in node.args) else None
+    left, right = _degree(node.left), _degree(node.right)
+    if left is None or right is None:
+        return None
+    if isinstance(node.op, (ast.Add, ast.Sub)):
+        return max(left, right)
+    if isinstance(node.op, ast.Mult):
+        return left + right if left + right <= 1 else None
+    if isinstance(node.op, ast.Div):
+        return left if right == 0 else None
+    return 0 if left == right == 0 else None
+
+
+def _bind(code: Any, functions: Dict[str, Callable[..., Any]]) -> Callable[[Any, Any], Any]:
+    # Only the whitelisted functions are visible; builtins are emptied
+    return eval(code, {"__builtins__": {}, **functions})
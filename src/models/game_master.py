@@ -18,6 +18,7 @@ class GameMaster(QObject):
         self.waiting_for_response = Event()
         self.running = False
         self.conversation_thread = None
+        self.world_context = ""
     
     def start_conversation(self):
         """Start the conversation in a separate thread."""
@@ -36,6 +37,10 @@ class GameMaster(QObject):
             self.waiting_for_response.clear()
             self.response_queue.put("CONVERSATION_TERMINATED")
     
+    def set_world_context(self, context):
+        """Set the summary of the player's surroundings that responses should take into account."""
+        self.world_context = context
+    
     def receive_player_message(self, message):
         """Called by the UI when the player sends a message."""
         if self.waiting_for_response.is_set():
@@ -1,6 +1,13 @@
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any
-from .character import Character
+from typing import List, Dict, Optional, Any, Sequence
+from .character import Character, CharacterSnapshot
+from .search_index import SearchIndex, SearchHit
+from .events import EventStream, MessageAppended, LocationChanged, TimeOfDayChanged, StateRestored
+from .persistent import PersistentList, freeze, thaw
+from .history import UndoHistory
+from .world import World
+from .schema import SCHEMA_VERSION, migrate
+from .serializers import serializer
 
 
 @dataclass
@@ -10,19 +17,43 @@ class Location:
     connections: List[str] = field(default_factory=list)
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "name": self.name,
-            "description": self.description,
-            "connections": self.connections
-        }
+        return _encode_location(self)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Location':
-        return cls(
-            name=data["name"],
-            description=data["description"],
-            connections=data.get("connections", [])
-        )
+        return _decode_location(data)
+
+
+_encode_location, _decode_location = serializer(Location)
+
+
+def _shared_prefix(current: Sequence, target: Sequence) -> int:
+    """
+    Count the leading log entries two versions of a log have in common.
+    Versions of a log share their message objects up to the point where they
+    diverge, so the boundary can be found by binary search on identity.
+    """
+    low, high = 0, min(len(current), len(target))
+    if hasattr(current, 'shared_stored_length'):
+        # Lazily loaded logs know which saved history they share without reading it
+        low = min(current.shared_stored_length(target), high)
+    while low < high:
+        middle = (low + high) // 2
+        if current[middle] is target[middle]:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+@dataclass(frozen=True)
+class GameSnapshot:
+    """Immutable capture of a game state, used for undo/redo and retcons."""
+    character: CharacterSnapshot
+    current_location: 'Location'
+    story_log: Sequence[Dict[str, str]]
+    gm_log: Sequence[Dict[str, str]]
+    time_of_day: str
 
 
 @dataclass
@@ -32,6 +63,44 @@ class GameState:
     story_log: List[Dict[str, str]] = field(default_factory=list)
     gm_log: List[Dict[str, str]] = field(default_factory=list)
     time_of_day: str = "Morning"
+    search_index: SearchIndex = field(default_factory=SearchIndex, repr=False, compare=False)
+    events: EventStream = field(default_factory=EventStream, repr=False, compare=False)
+    history: UndoHistory = field(default_factory=UndoHistory, repr=False, compare=False)
+    world: World = field(default_factory=World, repr=False, compare=False)
+    persistent: bool = field(default=False, repr=False, compare=False)
+    # The SaveFile the logs and search index load from lazily, if any
+    save_file: Any = field(default=None, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # The character publishes its own changes on the same stream
+        self.character.events = self.events
+        if self.persistent:
+            # Structurally shared collections make snapshots O(1)
+            self.story_log = thaw(self.story_log, True)
+            self.gm_log = thaw(self.gm_log, True)
+        self.search_index.attach(self._message_at)
+        if len(self.search_index) != len(self.story_log) + len(self.gm_log):
+            self.rebuild_search_index()
+        if self.current_location.name in self.world:
+            self.current_location = self.world.location(self.current_location.name)
+        else:
+            self.world.add_location(self.current_location)
+        if hasattr(self.world, 'follow'):
+            # Streaming worlds load the regions around the player as they move
+            self.world.follow(self.events, lambda: self.current_location.name)
+            self.world.visit(self.current_location.name)
+    
+    def _message_at(self, log: str, position: int) -> Dict[str, str]:
+        return self.story_log[position] if log == "story" else self.gm_log[position]
+    
+    def rebuild_search_index(self) -> None:
+        """Re-index both logs from scratch."""
+        self.search_index = SearchIndex(self.search_index.k1, self.search_index.b)
+        self.search_index.attach(self._message_at)
+        for position, entry in enumerate(self.story_log):
+            self.search_index.add("story", position, entry["sender"], entry["message"])
+        for position, entry in enumerate(self.gm_log):
+            self.search_index.add("gm", position, entry["sender"], entry["message"])
     
     def add_story_message(self, message: str, sender: str = "GM") -> None:
         """Add a message to the story log."""
@@ -39,6 +108,8 @@ class GameState:
             "sender": sender,
             "message": message
         })
+        self.search_index.add("story", len(self.story_log) - 1, sender, message)
+        self.events.publish(MessageAppended("story", len(self.story_log) - 1, sender, message))
     
     def add_gm_message(self, message: str, sender: str = "Player") -> None:
         """Add a message to the GM log."""
@@ -46,18 +117,120 @@ class GameState:
             "sender": sender,
             "message": message
         })
+        self.search_index.add("gm", len(self.gm_log) - 1, sender, message)
+        self.events.publish(MessageAppended("gm", len(self.gm_log) - 1, sender, message))
+    
+    def move_to(self, location: Location) -> None:
+        """Change the current location."""
+        if location is not self.current_location:
+            if location.name not in self.world:
+                self.world.add_location(location)
+            self.current_location = location
+            self.events.publish(LocationChanged(location))
+    
+    def describe_surroundings(self) -> str:
+        """Summary of the current location and what lies around it, for the GM's prompt."""
+        return self.world.describe(self.current_location.name)
+    
+    def set_time_of_day(self, time_of_day: str) -> None:
+        """Change the time of day."""
+        if time_of_day != self.time_of_day:
+            self.time_of_day = time_of_day
+            self.events.publish(TimeOfDayChanged(time_of_day))
+    
+    def search(self, query: str, sender: Optional[str] = None, log: Optional[str] = None,
+               limit: int = 10) -> List[SearchHit]:
+        """Search the story and GM logs, best matches first."""
+        return self.search_index.search(query, sender=sender, log=log, limit=limit)
+    
+    def snapshot(self) -> GameSnapshot:
+        """Capture the current state. O(1) when running on persistent collections."""
+        return GameSnapshot(
+            character=self.character.snapshot(),
+            current_location=self.current_location,
+            story_log=freeze(self.story_log),
+            gm_log=freeze(self.gm_log),
+            time_of_day=self.time_of_day
+        )
+    
+    def restore(self, snapshot: GameSnapshot) -> None:
+        """Return to a previously captured state."""
+        with self.events.batch():
+            # Only the messages after the point where the logs diverge need re-indexing
+            shared = {}
+            for log, current, target in (("story", self.story_log, snapshot.story_log),
+                                         ("gm", self.gm_log, snapshot.gm_log)):
+                shared[log] = _shared_prefix(current, target)
+                self.search_index.truncate(log, shared[log])
+            
+            self.story_log = thaw(snapshot.story_log, self.persistent)
+            self.gm_log = thaw(snapshot.gm_log, self.persistent)
+            for log, messages in (("story", self.story_log), ("gm", self.gm_log)):
+                for position in range(shared[log], len(messages)):
+                    entry = messages[position]
+                    self.search_index.add(log, position, entry["sender"], entry["message"])
+            
+            self.character.restore(snapshot.character)
+            self.current_location = snapshot.current_location
+            self.time_of_day = snapshot.time_of_day
+            self.events.publish(StateRestored())
+    
+    def close(self) -> None:
+        """Close the save file the game was loaded from; its history stays readable."""
+        if self.save_file is not None:
+            self.save_file.close()
+    
+    def checkpoint(self) -> None:
+        """Record the current state so the next action can be undone."""
+        self.history.push(self.snapshot())
+    
+    def undo(self) -> bool:
+        """Roll back to the last checkpoint."""
+        snapshot = self.history.undo(self.snapshot())
+        if snapshot is None:
+            return False
+        self.restore(snapshot)
+        return True
+    
+    def redo(self) -> bool:
+        """Re-apply the last undone action."""
+        snapshot = self.history.redo(self.snapshot())
+        if snapshot is None:
+            return False
+        self.restore(snapshot)
+        return True
     
     def to_dict(self) -> Dict[str, Any]:
         return {
+            "schema_version": SCHEMA_VERSION,
             "character": self.character.to_dict(),
             "current_location": self.current_location.to_dict(),
-            "story_log": self.story_log,
-            "gm_log": self.gm_log,
-            "time_of_day": self.time_of_day
+            "story_log": list(self.story_log),
+            "gm_log": list(self.gm_log),
+            "time_of_day": self.time_of_day,
+            "search_index": self.search_index.to_dict(),
+            "world": self.world.to_dict()
         }
     
     @classmethod
-    def create_demo_state(cls) -> 'GameState':
+    def from_dict(cls, data: Dict[str, Any], persistent: bool = False) -> 'GameState':
+        # Upgrade older saves and fill in defaults in one pass before reading
+        data = migrate(data)
+        search_index = data["search_index"]
+        world = data["world"]
+        return cls(
+            persistent=persistent,
+            character=Character.from_dict(data["character"]),
+            current_location=Location.from_dict(data["current_location"]),
+            story_log=data["story_log"],
+            gm_log=data["gm_log"],
+            time_of_day=data["time_of_day"],
+            search_index=SearchIndex.from_dict(search_index) if search_index else SearchIndex(),
+            world=World.from_dict(world) if world else World()
+        )
+    
+    @classmethod
+    def create_demo_state(cls, persistent: bool = False) -> 'GameState':
         """Create a demo game state for UI testing."""
         from .character import CharacterClass, Skill, Character, CharacterEquipment
         from .item import Item, EquipmentItem, Effect
@@ -67,31 +240,33 @@ class GameState:
             Skill(
                 name="Blast",
                 description="The Arcane Adept launches a blast of arcane energy at an enemy.",
-                cost={"resource": "mana", "amount": 8},
+                cost={"resource": "mana", "amount": 8, "level_up_formula": "x*1.1"},
                 effects=[{
                     "action": "damage",
                     "value": 14,
                     "dice": ["1d10"],
                     "tags": {"tags": ["magic", "fire"]},
+                    "level_up_formula": "x*(1+(0.04*(level-1)))",
                     "target_group": "single_enemy"
                 }]
             ),
             Skill(
                 name="Heal Pulse",
                 description="The Arcane Adept launches a healing pulse at their allies.",
-                cost={"resource": "mana", "amount": 8},
+                cost={"resource": "mana", "amount": 8, "level_up_formula": "x*1.1"},
                 effects=[{
                     "action": "heal",
                     "value": 20,
                     "dice": ["1d10"],
                     "tags": {"tags": ["magic"]},
+                    "level_up_formula": "x*(1+(0.04*(level-1)))",
                     "target_group": "single_ally"
                 }]
             ),
             Skill(
                 name="Hypnotise",
                 description="The Arcane Adept hypnotizes an enemy, causing them to fall asleep.",
-                cost={"resource": "mana", "amount": 12},
+                cost={"resource": "mana", "amount": 12, "level_up_formula": "x*1.1"},
                 effects=[{
                     "action": "status",
                     "value": 2,
@@ -180,7 +355,7 @@ class GameState:
             character_class=arcane_adept,
             level=2,
             experience=75,
-            experience_to_next_level=150,
+            experience_to_next_level=110,
             health=80,
             max_health=100,
             mana=40,
@@ -210,6 +385,23 @@ class GameState:
             connections=["Forest Path", "Cave Entrance", "Mountain Trail"]
         )
         
+        # Create a small demo world around the clearing
+        world = World()
+        world.add_location(forest_clearing, position=(0.0, 0.0))
+        for name, description, position, connections in [
+            ("Forest Path", "A winding path through tall pines, leading towards the village.",
+             (0.0, 2.0), ["Forest Clearing", "Village Gate"]),
+            ("Cave Entrance", "A dark opening in the hillside. Cold air drifts out of it.",
+             (2.0, 0.5), ["Forest Clearing"]),
+            ("Mountain Trail", "A steep, rocky trail climbing towards the snowy peaks.",
+             (-1.5, -2.0), ["Forest Clearing", "Mountain Pass"]),
+            ("Village Gate", "The wooden gate of a small village at the edge of the kingdom.",
+             (0.5, 4.0), ["Forest Path"]),
+            ("Mountain Pass", "A narrow pass between two peaks, swept by icy winds.",
+             (-2.0, -4.5), ["Mountain Trail"]),
+        ]:
+            world.add_location(Location(name, description, connections), position=position)
+        
         # Create demo story log
         story_log = [
             {"sender": "GM", "message": "You find yourself in a peaceful clearing in the middle of a dense forest. Sunlight filters through the canopy, illuminating a small pond in the center."},
@@ -232,5 +424,7 @@ class GameState:
             current_location=forest_clearing,
             story_log=story_log,
             gm_log=gm_log,
-            time_of_day="Dusk"
+            time_of_day="Dusk",
+            world=world,
+            persistent=persistent
         ) 
\ No newline at end of file
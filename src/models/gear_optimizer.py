@@ -0,0 +1,190 @@
+import weakref
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .character import Character, CharacterEquipment
+from .dice import dice_pool
+from .item import EquipmentItem, ItemDefinition
+
+
+# What an item contributes, in the order of each item's feature vector;
+# attack_dice is the expected total of the item's attack dice
+ATTRIBUTES = CharacterEquipment.TOTAL_ATTRIBUTES + ('attack_dice',)
+
+DEFAULT_WEIGHTS = dict.fromkeys(ATTRIBUTES, 1.0)
+
+# Hands come first: a two-handed weapon decides whether the other two are free
+SEARCH_SLOTS = ('two_handed', 'main_hand', 'off_hand', 'head', 'chest', 'legs', 'hands', 'feet')
+
+_EPSILON = 1e-9
+
+# A choice for one slot: the item, or None to leave the slot empty, and its score
+Option = Tuple[Optional[EquipmentItem], float]
+
+
+_definition_features: 'weakref.WeakKeyDictionary[ItemDefinition, Tuple[float, ...]]' = weakref.WeakKeyDictionary()
+
+
+def _features(definition: ItemDefinition) -> Tuple[float, ...]:
+    """An item definition's feature vector, cached per definition as definitions never change."""
+    features = _definition_features.get(definition)
+    if features is None:
+        features = _definition_features[definition] = (
+            definition.physical_attack, definition.physical_defense, definition.magic_attack,
+            definition.magic_defense, dice_pool(definition.attack_dice).mean() if definition.attack_dice else 0.0)
+    return features
+
+
+@dataclass
+class EquipPlan:
+    """
+    A complete set of equipment chosen for a character: an item or None for
+    every slot, plus the accessories. `score` is the weighted sum of the
+    items' attributes and `totals` the summed attributes themselves.
+    """
+    slots: Dict[str, Optional[EquipmentItem]]
+    accessories: List[EquipmentItem] = field(default_factory=list)
+    score: float = 0.0
+    totals: Dict[str, float] = field(default_factory=dict)
+
+    def items(self) -> List[EquipmentItem]:
+        return [item for item in self.slots.values() if item is not None] + list(self.accessories)
+
+    def apply(self, character: Character) -> bool:
+        """
+        Wear exactly this plan, or change nothing and return False; see
+        Character.change_equipment. Worn items the plan leaves out are taken
+        off.
+        """
+        planned = self.items()
+        return character.change_equipment(
+            equip=planned, unequip=[item for item in character.equipment.items() if item not in planned])
+
+
+def best_in_slot(character: Character, weights: Optional[Mapping[str, float]] = None,
+                 items: Optional[Sequence[EquipmentItem]] = None) -> EquipPlan:
+    """
+    The equipment maximizing the weighted sum of ATTRIBUTES, chosen from the
+    character's inventory and current equipment (or from `items`).
+    Only items the character's level allows are considered, and identical
+    items are scored once. Within a slot, an item is dominated once as
+    many items as the slot holds score at least as much, and only the rest
+    are searched; see _PlanSearch. Ties keep what is already worn, and
+    items that add nothing to the score are left off.
+    """
+    weights = np.array([(weights if weights is not None else DEFAULT_WEIGHTS).get(attribute, 0.0)
+                        for attribute in ATTRIBUTES])
+    if items is None:
+        # Worn items first, so they win ties and stay on
+        items = character.equipment.items() + [item for slot in CharacterEquipment.DEFAULT_SLOTS
+                                               for item in character.inventory.for_slot(slot)
+                                               if item not in character.equipment]
+    by_slot: Dict[str, Dict[ItemDefinition, List[EquipmentItem]]] = {}
+    level = character.level
+    for item in items:
+        definition = item.definition
+        if definition.level_requirement <= level and definition.slot in CharacterEquipment.DEFAULT_SLOTS:
+            by_slot.setdefault(definition.slot, {}).setdefault(definition, []).append(item)
+
+    limit = CharacterEquipment.MAX_ACCESSORIES
+    search = _PlanSearch([_options(by_slot.get(slot, {}), 1, weights) for slot in SEARCH_SLOTS],
+                         [option for option in _options(by_slot.get('accessories', {}), limit, weights)
+                          if option[1] > 0])
+
+    plan = EquipPlan(slots={slot: None for slot in CharacterEquipment.DEFAULT_SLOTS if slot != 'accessories'})
+    totals = np.zeros(len(ATTRIBUTES))
+    for item in search.run():
+        if item.slot == 'accessories':
+            plan.accessories.append(item)
+        else:
+            plan.slots[item.slot] = item
+        totals += _features(item.definition)
+    plan.score = float(np.dot(totals, weights))
+    plan.totals = dict(zip(ATTRIBUTES, totals.tolist()))
+    return plan
+
+
+class _PlanSearch:
+    """
+    Depth-first branch and bound over the choices left after pruning.
+    The slots come first, hands leading, then a take-or-skip decision per
+    accessory while fewer than MAX_ACCESSORIES are taken. Better choices
+    are tried first, and a branch is cut as soon as its score plus the best
+    of every slot left and the best accessories it may still take cannot
+    beat the best plan found.
+    """
+
+    def __init__(self, slot_options: List[List[Option]], accessories: List[Option]):
+        self.slot_options = slot_options
+        self.accessories = accessories
+        self.depth = len(slot_options) + len(accessories)
+        limit = CharacterEquipment.MAX_ACCESSORIES
+        # accessories_left[i][k]: best total of at most k of the accessories from i on
+        self.accessories_left = [[0.0] * (limit + 1)]
+        for _, score in reversed(accessories):
+            after = self.accessories_left[0]
+            self.accessories_left.insert(0, [0.0] + [max(after[k], score + after[k - 1])
+                                                     for k in range(1, limit + 1)])
+        # slots_left[i]: best total of the slots from i on, with every accessory still to take
+        self.slots_left = [self.accessories_left[0][limit]]
+        for options in reversed(slot_options):
+            self.slots_left.insert(0, self.slots_left[0] + max(score for _, score in options))
+        self.best_score = -np.inf
+        self.best: List[EquipmentItem] = []
+        self.chosen: List[EquipmentItem] = []
+
+    def run(self) -> List[EquipmentItem]:
+        self._visit(0, 0.0, 0, False)
+        return self.best
+
+    def _visit(self, depth: int, score: float, taken: int, two_handed: bool) -> None:
+        slots = len(self.slot_options)
+        if depth < slots:
+            left = self.slots_left[depth]
+        else:
+            left = self.accessories_left[depth - slots][CharacterEquipment.MAX_ACCESSORIES - taken]
+        if score + left <= self.best_score + _EPSILON:
+            return
+        if depth == self.depth:
+            self.best_score, self.best = score, list(self.chosen)
+            return
+
+        if depth < slots:
+            # SEARCH_SLOTS starts with two_handed, main_hand and off_hand
+            for item, item_score in self.slot_options[depth]:
+                if item is None:
+                    self._visit(depth + 1, score, taken, two_handed)
+                elif not (two_handed and depth in (1, 2)):
+                    self.chosen.append(item)
+                    self._visit(depth + 1, score + item_score, taken, two_handed or depth == 0)
+                    self.chosen.pop()
+            return
+        item, item_score = self.accessories[depth - slots]
+        if taken < CharacterEquipment.MAX_ACCESSORIES:
+            self.chosen.append(item)
+            self._visit(depth + 1, score + item_score, taken + 1, two_handed)
+            self.chosen.pop()
+        self._visit(depth + 1, score, taken, two_handed)
+
+
+def _options(definitions: Dict[ItemDefinition, List[EquipmentItem]], keep: int,
+             weights: np.ndarray) -> List[Option]:
+    """
+    The undominated choices of a slot holding `keep` items, best first:
+    up to `keep` copies of each kind of item are scored, and the `keep`
+    best kept. Leaving the slot empty is always a choice, e.g. for the
+    hands next to a two-handed weapon, and comes before any item that
+    adds nothing.
+    """
+    items = [item for copies in definitions.values() for item in copies[:keep]]
+    if not items:
+        return [(None, 0.0)]
+    scores = np.array([_features(item.definition) for item in items]) @ weights
+    # A stable sort, so of equal scores the first given (worn items) leads
+    order = np.argsort(-scores, kind='stable')[:keep].tolist()
+    options = [(items[row], float(scores[row])) for row in order]
+    empty = next((position for position, (_, score) in enumerate(options) if score <= 0), len(options))
+    options.insert(empty, (None, 0.0))
+    return options
@@ -0,0 +1,48 @@
+from collections import deque
+from typing import Any, List, Optional
+
+
+class UndoHistory:
+    """
+    Bounded undo/redo stacks of state snapshots.
+    Only the newest `max_depth` undo steps are kept, so memory stays bounded
+    no matter how long the session runs.
+    """
+
+    def __init__(self, max_depth: int = 100):
+        self._undo: deque = deque(maxlen=max_depth)
+        self._redo: List[Any] = []
+
+    def __len__(self) -> int:
+        return len(self._undo)
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def push(self, snapshot: Any) -> None:
+        """Record a snapshot taken before an action. Clears the redo stack."""
+        self._undo.append(snapshot)
+        self._redo.clear()
+
+    def undo(self, current: Any) -> Optional[Any]:
+        """Return the snapshot to go back to, remembering `current` for redo."""
+        if not self._undo:
+            return None
+        self._redo.append(current)
+        return self._undo.pop()
+
+    def redo(self, current: Any) -> Optional[Any]:
+        """Return the snapshot to go forward to, remembering `current` for undo."""
+        if not self._redo:
+            return None
+        self._undo.append(current)
+        return self._redo.pop()
+
+    def clear(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
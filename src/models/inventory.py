@@ -0,0 +1,308 @@
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .item import Item, EquipmentItem, ItemDefinition
+from .persistent import WIDTH, PVector
+from .tag_index import Query, TagIndex, definition_mask
+
+
+class _Stack:
+    """
+    Identical items held under one inventory id, in the order they were added.
+    The type and slot the entry was indexed under are kept, as an item's
+    own can be reassigned while it is held.
+    """
+
+    __slots__ = ('id', 'key', 'items', 'item_type', 'slots')
+
+    def __init__(self, stack_id: int, key: Optional[ItemDefinition], item: Item):
+        self.id = stack_id
+        self.key = key
+        self.items: Dict[str, Item] = {}
+        self.item_type = item.item_type
+        self.slots: Tuple[str, ...] = (item.slot,) if isinstance(item, EquipmentItem) else ()
+
+    def first(self) -> Item:
+        return next(iter(self.items.values()))
+
+    def quantity(self) -> int:
+        return sum(item.count for item in self.items.values())
+
+
+class Inventory(Sequence):
+    """
+    Ordered item container with stable ids and hash indexes.
+    Every entry gets an id that never changes while it is held. Identical
+    consumables share one entry and are counted instead of listed, and
+    entries are also indexed by item type and equipment slot, so adding,
+    removing, membership tests and lookups by id, type or slot never scan
+    the whole inventory. Entries are indexed by tag as well once the first
+    `tagged` query is made. Iteration yields every item, entry by entry in
+    the order each entry was first added. Positional indexing walks the
+    entries and is O(n).
+    The items are also recorded, with their entry ids, in a persistent
+    vector in the order they were added, so `freeze` is O(1) and `restore`
+    only re-indexes the items that differ from the captured contents.
+    """
+
+    __slots__ = ('_stacks', '_stack_of', '_by_key', '_by_type', '_by_slot', '_tags', '_next_id', '_count',
+                 '_entries', '_position')
+
+    STACKABLE_TYPES = frozenset({'consumable'})
+
+    def __init__(self, items: Iterable[Item] = ()):
+        self._stacks: Dict[int, _Stack] = {}
+        self._stack_of: Dict[str, _Stack] = {}
+        self._by_key: Dict[ItemDefinition, _Stack] = {}
+        self._by_type: Dict[str, Dict[int, _Stack]] = {}
+        self._by_slot: Dict[str, Dict[int, _Stack]] = {}
+        self._tags: Optional[TagIndex] = None
+        self._next_id = 1
+        self._count = 0
+        # (entry id, item) pairs in the order items were added, None where one was removed
+        self._entries = PVector()
+        self._position: Dict[str, int] = {}
+        for item in items:
+            self.add(item)
+
+    @classmethod
+    def stack_key(cls, item: Item) -> Optional[ItemDefinition]:
+        """What makes two items interchangeable, or None if the item never stacks."""
+        if type(item) is not Item or item.item_type not in cls.STACKABLE_TYPES:
+            return None
+        return item.definition
+
+    def add(self, item: Item) -> int:
+        """Add an item, stacking it with identical ones, and return its entry id."""
+        if item.instance_id in self._stack_of:
+            raise ValueError(f"{item.name} is already in the inventory")
+        stack = self._store(item)
+        self._position[item.instance_id] = len(self._entries)
+        self._entries = self._entries.append((stack.id, item))
+        return stack.id
+
+    def _store(self, item: Item, stack_id: Optional[int] = None) -> _Stack:
+        """Index an item under its entry, creating the entry (with `stack_id`, if given) when needed."""
+        key = self.stack_key(item)
+        stack = self._by_key.get(key) if key is not None else self._stacks.get(stack_id)
+        if stack is None:
+            if stack_id is None:
+                stack_id = self._next_id
+            self._next_id = max(self._next_id, stack_id + 1)
+            stack = _Stack(stack_id, key, item)
+            self._stacks[stack.id] = stack
+            if key is not None:
+                self._by_key[key] = stack
+            self._by_type.setdefault(stack.item_type, {})[stack.id] = stack
+            for slot in stack.slots:
+                self._by_slot.setdefault(slot, {})[stack.id] = stack
+            if self._tags is not None:
+                self._tags.add(stack.id, definition_mask(item.definition))
+        stack.items[item.instance_id] = item
+        self._stack_of[item.instance_id] = stack
+        self._count += 1
+        return stack
+
+    def append(self, item: Item) -> None:
+        self.add(item)
+
+    def extend(self, items: Iterable[Item]) -> None:
+        for item in items:
+            self.add(item)
+
+    def discard(self, item: Item) -> bool:
+        """Remove this exact item if it is held; return whether it was."""
+        if not self._unstore(item):
+            return False
+        self._entries = self._entries.set(self._position.pop(item.instance_id), None)
+        if len(self._entries) > 2 * self._count + WIDTH:
+            # Mostly holes; close them up (older captures keep their own vectors)
+            live = [entry for entry in self._entries if entry is not None]
+            self._entries = PVector(live)
+            self._position = {entry[1].instance_id: position for position, entry in enumerate(live)}
+        return True
+
+    def _unstore(self, item: Item) -> bool:
+        stack = self._stack_of.pop(item.instance_id, None)
+        if stack is None:
+            return False
+        del stack.items[item.instance_id]
+        if not stack.items:
+            del self._stacks[stack.id]
+            if stack.key is not None:
+                del self._by_key[stack.key]
+            _unindex(self._by_type, stack.item_type, stack.id)
+            for slot in stack.slots:
+                _unindex(self._by_slot, slot, stack.id)
+            if self._tags is not None:
+                self._tags.remove(stack.id)
+        self._count -= 1
+        return True
+
+    def remove(self, item: Item) -> None:
+        if not self.discard(item):
+            raise ValueError(f"{item.name} is not in the inventory")
+
+    def clear(self) -> None:
+        for item in list(self):
+            self.discard(item)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, item: Any) -> bool:
+        return isinstance(item, Item) and item.instance_id in self._stack_of
+
+    def __iter__(self) -> Iterator[Item]:
+        for stack in self._stacks.values():
+            yield from stack.items.values()
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("inventory index out of range")
+        for stack in self._stacks.values():
+            if index < len(stack.items):
+                return list(stack.items.values())[index]
+            index -= len(stack.items)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (Inventory, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Inventory({list(self)!r})"
+
+    def entry_id(self, item: Item) -> int:
+        """Return the id of the entry holding this item."""
+        try:
+            return self._stack_of[item.instance_id].id
+        except KeyError:
+            raise KeyError(f"{item.name} is not in the inventory") from None
+
+    def held(self, item: Item) -> Optional[Item]:
+        """The held item with the same instance id as `item`, e.g. a copy loaded separately, or None."""
+        stack = self._stack_of.get(item.instance_id)
+        return stack.items[item.instance_id] if stack is not None else None
+
+    def get(self, entry_id: int) -> Optional[Item]:
+        """Return the first item of an entry, or None if no entry has that id."""
+        stack = self._stacks.get(entry_id)
+        return stack.first() if stack is not None else None
+
+    def quantity(self, item: Item) -> int:
+        """Total count of the items held in the same entry as this one."""
+        stack = self._stack_of.get(item.instance_id)
+        return stack.quantity() if stack is not None else 0
+
+    def stacks(self) -> List[Tuple[Item, int]]:
+        """One (item, total count) pair per entry, in display order."""
+        return [(stack.first(), stack.quantity()) for stack in self._stacks.values()]
+
+    def of_type(self, item_type: str) -> List[Item]:
+        """Every held item of the given type."""
+        return [item for stack in self._by_type.get(item_type, {}).values()
+                for item in stack.items.values()]
+
+    def for_slot(self, slot: str) -> List[EquipmentItem]:
+        """Every held piece of equipment that fits the given slot."""
+        return [item for stack in self._by_slot.get(slot, {}).values()
+                for item in stack.items.values()]
+
+    def tagged(self, query: Query) -> List[Item]:
+        """Every held item whose tags match a tag query such as "fire & magic", in display order."""
+        if self._tags is None:
+            self._tags = TagIndex()
+            for stack in self._stacks.values():
+                self._tags.add(stack.id, definition_mask(stack.first().definition))
+        stacks = self._stacks
+        return [item for stack_id in self._tags.ids(query) for item in stacks[stack_id].items.values()]
+
+    def freeze(self) -> 'FrozenInventory':
+        """Capture the current contents in O(1); the capture shares structure with the inventory."""
+        return FrozenInventory(self._entries, self._count)
+
+    def restore(self, frozen: Sequence) -> None:
+        """
+        Return to captured contents, keeping the entry ids they had. Only
+        the items added or removed since the capture are re-indexed.
+        """
+        if not isinstance(frozen, FrozenInventory):
+            self.clear()
+            self.extend(frozen)
+            return
+        current, target = self._entries, frozen._entries
+        if current is target:
+            return
+        changed = current.diff(target)
+        for index in changed:
+            entry = current[index] if index < len(current) else None
+            if entry is not None:
+                self._unstore(entry[1])
+                del self._position[entry[1].instance_id]
+        touched = set()
+        reorder = False
+        for index in changed:
+            entry = target[index] if index < len(target) else None
+            if entry is not None:
+                stack_id, item = entry
+                if stack_id not in self._stacks and self._stacks and stack_id < next(reversed(self._stacks)):
+                    reorder = True
+                touched.add(self._store(item, stack_id))
+                self._position[item.instance_id] = index
+        self._entries = target
+        # Keep entries in id order and every entry's items in the order they were added
+        if reorder:
+            self._stacks = dict(sorted(self._stacks.items()))
+        position = self._position
+        for stack in touched:
+            stack.items = dict(sorted(stack.items.items(), key=lambda pair: position[pair[0]]))
+
+
+class FrozenInventory(Sequence):
+    """Immutable capture of an inventory's contents, made by `Inventory.freeze`."""
+
+    __slots__ = ('_entries', '_count')
+
+    def __init__(self, entries: PVector, count: int):
+        self._entries = entries
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Item]:
+        # The inventory's order: entry by entry, each entry's items in the order they were added
+        stacks: Dict[int, List[Item]] = {}
+        for entry in self._entries:
+            if entry is not None:
+                stacks.setdefault(entry[0], []).append(entry[1])
+        for stack_id in sorted(stacks):
+            yield from stacks[stack_id]
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        return list(self)[index]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, FrozenInventory) and other._entries is self._entries:
+            return True
+        if isinstance(other, (FrozenInventory, Inventory, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(tuple(item.instance_id for item in self))
+
+    def __repr__(self) -> str:
+        return f"FrozenInventory({list(self)!r})"
+
+
+def _unindex(index: Dict[str, Dict[int, _Stack]], key: str, stack_id: int) -> None:
+    entries = index[key]
+    del entries[stack_id]
+    if not entries:
+        del index[key]
@@ -1,90 +1,367 @@
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any
+import copyreg
+import uuid
+import weakref
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import List, Dict, Optional, Any, Mapping, Sequence, Tuple
 
+from .serializers import serializer
+from .tag_index import Query, TagIndex, definition_mask
 
-@dataclass
+
+# Read-only empty defaults, shared by every instance instead of allocating
+# a fresh container for each one. Assign a new container to change them.
+EMPTY_MAPPING: Mapping[str, Any] = MappingProxyType({})
+NO_TAGS: Mapping[str, Sequence[str]] = MappingProxyType({"tags": ()})
+
+
+def _reduce_mapping_proxy(proxy: MappingProxyType) -> Any:
+    # The shared defaults copy and pickle as themselves (by name), so
+    # identity checks against them still hold; other proxies copy their dict
+    for name, default in (("EMPTY_MAPPING", EMPTY_MAPPING), ("NO_TAGS", NO_TAGS)):
+        if proxy is default:
+            return name
+    return MappingProxyType, (dict(proxy),)
+
+
+copyreg.pickle(MappingProxyType, _reduce_mapping_proxy)
+
+
+def shared(default: Any) -> Any:
+    """Dataclass field whose default is the given shared, read-only value."""
+    return field(default_factory=lambda: default)
+
+
+@dataclass(frozen=True, slots=True)
 class Effect:
+    """
+    One effect of an item. Effects are frozen and their tags read-only, as
+    they belong to item definitions shared by every item of a kind.
+    """
     target_group: str
     action: str
     value: int = 0
-    tags: Dict[str, List[str]] = field(default_factory=lambda: {"tags": []})
+    tags: Mapping[str, Sequence[str]] = shared(NO_TAGS)
+    
+    def __post_init__(self):
+        if self.tags is not NO_TAGS:
+            object.__setattr__(self, 'tags', MappingProxyType({**self.tags, "tags": tuple(self.tags.get("tags", ()))}))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return _encode_effect(self)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Effect':
+        return _decode_effect(data)
 
 
-@dataclass
-class Item:
+_encode_effect, _decode_effect = serializer(Effect)
+
+
+def new_instance_id() -> str:
+    return uuid.uuid4().hex
+
+
+@dataclass(frozen=True, eq=False)
+class ItemDefinition:
+    """
+    The shared, immutable description of one kind of item.
+    Definitions are interned by an ItemRegistry, so every "Health Potion"
+    refers to the same definition. Plain items leave `slot` as None and the
+    equipment fields at their defaults.
+    """
     name: str
     item_type: str
     description: str
-    effects: List[Effect] = field(default_factory=list)
+    effects: Tuple[Effect, ...] = ()
     target_group: str = "single_ally"
+    slot: Optional[str] = None
+    rarity: str = "common"
+    level_requirement: int = 1
+    physical_attack: float = 0
+    physical_defense: float = 0
+    magic_attack: float = 0
+    magic_defense: float = 0
+    attack_dice: Tuple[str, ...] = ()
+    tags: Tuple[str, ...] = ()
+    
+    def __post_init__(self):
+        # Containers passed in are copied into tuples, so nothing can change a shared definition
+        for name in ('effects', 'attack_dice', 'tags'):
+            value = getattr(self, name)
+            if type(value) is not tuple:
+                object.__setattr__(self, name, tuple(value))
+    
+    def key(self) -> Tuple:
+        """Everything that distinguishes this definition, as a hashable value."""
+        effects = tuple((effect.target_group, effect.action, effect.value, tuple(effect.tags.get("tags", ())))
+                        for effect in self.effects)
+        return (self.name, self.item_type, self.description, effects, self.target_group, self.slot,
+                self.rarity, self.level_requirement, self.physical_attack, self.physical_defense,
+                self.magic_attack, self.magic_defense, self.attack_dice, self.tags)
+    
+    @staticmethod
+    def saved_key(data: Dict[str, Any]) -> Tuple:
+        """The key of the definition described by an item's saved fields, without building it."""
+        get = data.get
+        effects = tuple((effect["target_group"], effect["action"], effect.get("value", 0),
+                         tuple((effect.get("tags") or NO_TAGS)["tags"]))
+                        for effect in get("effects", ()))
+        return (data["name"], data["item_type"], data["description"], effects,
+                get("target_group", "single_ally"), get("slot"), get("rarity", "common"),
+                get("level_requirement", 1), get("physical_attack", 0), get("physical_defense", 0),
+                get("magic_attack", 0), get("magic_defense", 0), tuple(get("attack_dice", ())),
+                tuple((get("tags") or NO_TAGS)["tags"]))
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        data = {
             "name": self.name,
             "item_type": self.item_type,
             "description": self.description,
-            "effects": [vars(effect) for effect in self.effects],
+            "effects": [effect.to_dict() for effect in self.effects],
             "target_group": self.target_group
         }
+        if self.slot is not None:
+            data.update({
+                "slot": self.slot,
+                "rarity": self.rarity,
+                "level_requirement": self.level_requirement,
+                "physical_attack": self.physical_attack,
+                "physical_defense": self.physical_defense,
+                "magic_attack": self.magic_attack,
+                "magic_defense": self.magic_defense,
+                "attack_dice": list(self.attack_dice),
+                "tags": {"tags": list(self.tags)}
+            })
+        return data
     
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'Item':
-        effects = [Effect(**effect) for effect in data.get("effects", [])]
-        return cls(
+    def from_dict(cls, data: Dict[str, Any]) -> 'ItemDefinition':
+        """Return the interned definition described by an item's saved fields."""
+        # Most loaded items are of a kind that is already registered
+        definition = ITEM_REGISTRY.lookup(cls.saved_key(data))
+        if definition is not None:
+            return definition
+        return ITEM_REGISTRY.define(
             name=data["name"],
             item_type=data["item_type"],
             description=data["description"],
-            effects=effects,
-            target_group=data.get("target_group", "single_ally")
+            effects=tuple(Effect.from_dict(effect) for effect in data.get("effects", [])),
+            target_group=data.get("target_group", "single_ally"),
+            slot=data.get("slot"),
+            rarity=data.get("rarity", "common"),
+            level_requirement=data.get("level_requirement", 1),
+            physical_attack=data.get("physical_attack", 0),
+            physical_defense=data.get("physical_defense", 0),
+            magic_attack=data.get("magic_attack", 0),
+            magic_defense=data.get("magic_defense", 0),
+            attack_dice=tuple(data.get("attack_dice", ())),
+            tags=tuple((data.get("tags") or {"tags": []})["tags"])
         )
 
 
-@dataclass
+class ItemRegistry:
+    """
+    Interns item definitions so that equal definitions are one object.
+    Definitions are held weakly and dropped once no item refers to them.
+    Each live definition also has a small number, reused once it is
+    dropped, under which its tags are indexed for `tagged` queries.
+    """
+    
+    def __init__(self):
+        self._definitions: 'weakref.WeakValueDictionary[Tuple, ItemDefinition]' = weakref.WeakValueDictionary()
+        self._numbered: 'weakref.WeakValueDictionary[int, ItemDefinition]' = weakref.WeakValueDictionary()
+        self._tags = TagIndex()
+        self._free_numbers: List[int] = []
+    
+    def __len__(self) -> int:
+        return len(self._definitions)
+    
+    def lookup(self, key: Tuple) -> Optional[ItemDefinition]:
+        """Return the registered definition with the given key, if any."""
+        return self._definitions.get(key)
+    
+    def intern(self, definition: ItemDefinition) -> ItemDefinition:
+        """Return the registered definition equal to this one, registering it if new."""
+        key = definition.key()
+        existing = self._definitions.get(key)
+        if existing is None:
+            self._definitions[key] = existing = definition
+            self._index_tags(definition)
+        return existing
+    
+    def define(self, **fields: Any) -> ItemDefinition:
+        return self.intern(ItemDefinition(**fields))
+    
+    def derive(self, definition: ItemDefinition, **changes: Any) -> ItemDefinition:
+        """Return the interned definition that differs from `definition` by `changes`."""
+        return self.intern(replace(definition, **changes))
+    
+    def tagged(self, query: Query) -> List[ItemDefinition]:
+        """Every registered definition whose tags match a tag query such as "weapon & fire"."""
+        numbered = self._numbered
+        return [numbered[number] for number in self._tags.ids(query) if number in numbered]
+    
+    def _index_tags(self, definition: ItemDefinition) -> None:
+        number = self._free_numbers.pop() if self._free_numbers else len(self._tags)
+        self._numbered[number] = definition
+        self._tags.add(number, definition_mask(definition))
+        weakref.finalize(definition, self._release, number)
+    
+    def _release(self, number: int) -> None:
+        self._tags.remove(number)
+        self._free_numbers.append(number)
+
+
+ITEM_REGISTRY = ItemRegistry()
+
+
+def _definition_property(name: str, load=None, store=None) -> property:
+    """An item attribute read from its definition; assigning it derives a new definition."""
+    def get(self):
+        value = getattr(self.definition, name)
+        return load(value) if load else value
+    
+    def set(self, value):
+        self.definition = ITEM_REGISTRY.derive(self.definition, **{name: store(value) if store else value})
+    
+    return property(get, set)
+
+
+class Item:
+    """
+    A single item: a shared ItemDefinition plus the state of this one copy.
+    The definition's fields read as attributes of the item, and assigning
+    one gives this item its own changed definition. Items are compared by
+    their instance id rather than field by field, so two identical potions
+    are still two different items. The id is saved, so an item keeps its
+    identity across save and load.
+    """
+    
+    __slots__ = ('definition', 'instance_id', 'count', 'durability')
+    
+    # Per-item state saved alongside a reference to the definition
+    INSTANCE_FIELDS = ('instance_id', 'count', 'durability')
+    
+    name = _definition_property('name')
+    item_type = _definition_property('item_type')
+    description = _definition_property('description')
+    effects = _definition_property('effects', store=tuple)
+    target_group = _definition_property('target_group')
+    
+    def __init__(self, name: str, item_type: str, description: str, effects: Sequence[Effect] = (),
+                 target_group: str = "single_ally", *, instance_id: Optional[str] = None,
+                 count: int = 1, durability: Optional[int] = None):
+        definition = ITEM_REGISTRY.define(name=name, item_type=item_type, description=description,
+                                          effects=tuple(effects), target_group=target_group)
+        self._init_instance(definition, instance_id, count, durability)
+    
+    def _init_instance(self, definition: ItemDefinition, instance_id: Optional[str] = None,
+                       count: int = 1, durability: Optional[int] = None) -> None:
+        self.definition = definition
+        self.instance_id = instance_id or new_instance_id()
+        self.count = count
+        self.durability = durability
+    
+    @classmethod
+    def from_definition(cls, definition: ItemDefinition, **state: Any) -> 'Item':
+        """Create a new item of an existing definition, with the given per-item state."""
+        item = cls.__new__(cls)
+        item._init_instance(definition, **state)
+        return item
+    
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Item):
+            return NotImplemented
+        return self.instance_id == other.instance_id
+    
+    def __hash__(self) -> int:
+        return hash(self.instance_id)
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(name={self.name!r}, item_type={self.item_type!r}, count={self.count!r})"
+    
+    def to_dict(self, definitions: Optional[Dict[ItemDefinition, int]] = None) -> Dict[str, Any]:
+        """
+        Describe the item for saving. Given a `definitions` table, the item
+        refers to its definition by position in that table (adding it if
+        needed) instead of repeating the definition's fields.
+        """
+        if definitions is None:
+            data = self.definition.to_dict()
+        else:
+            data = {"definition": definitions.setdefault(self.definition, len(definitions))}
+        data["instance_id"] = self.instance_id
+        data["count"] = self.count
+        data["durability"] = self.durability
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any],
+                  definitions: Optional[Sequence[ItemDefinition]] = None) -> 'Item':
+        if "definition" in data:
+            definition = definitions[data["definition"]]
+        else:
+            definition = ItemDefinition.from_dict(data)
+        state = {name: data[name] for name in cls.INSTANCE_FIELDS if name in data}
+        return cls.from_definition(definition, **state)
+
+
 class EquipmentItem(Item):
-    slot: str = "main_hand"
-    rarity: str = "common"
-    level_requirement: int = 1
-    physical_attack: int = 0
-    physical_defense: int = 0
-    magic_attack: int = 0
-    magic_defense: int = 0
-    attack_dice: List[str] = field(default_factory=list)
-    tags: Dict[str, List[str]] = field(default_factory=lambda: {"tags": []})
-    equipped: bool = False
+    __slots__ = ('equipped',)
     
-    def to_dict(self) -> Dict[str, Any]:
-        item_dict = super().to_dict()
-        item_dict.update({
-            "slot": self.slot,
-            "rarity": self.rarity,
-            "level_requirement": self.level_requirement,
-            "physical_attack": self.physical_attack,
-            "physical_defense": self.physical_defense,
-            "magic_attack": self.magic_attack,
-            "magic_defense": self.magic_defense,
-            "attack_dice": self.attack_dice,
-            "tags": self.tags,
-            "equipped": self.equipped
-        })
+    INSTANCE_FIELDS = Item.INSTANCE_FIELDS + ('equipped',)
+    
+    slot = _definition_property('slot')
+    rarity = _definition_property('rarity')
+    level_requirement = _definition_property('level_requirement')
+    physical_attack = _definition_property('physical_attack')
+    physical_defense = _definition_property('physical_defense')
+    magic_attack = _definition_property('magic_attack')
+    magic_defense = _definition_property('magic_defense')
+    attack_dice = _definition_property('attack_dice', store=tuple)
+    tags = _definition_property('tags', load=lambda tags: MappingProxyType({"tags": tags}),
+                                store=lambda tags: tuple(tags["tags"]))
+    
+    def __init__(self, name: str, item_type: str, description: str, effects: Sequence[Effect] = (),
+                 target_group: str = "single_ally", slot: str = "main_hand", rarity: str = "common",
+                 level_requirement: int = 1, physical_attack: float = 0, physical_defense: float = 0,
+                 magic_attack: float = 0, magic_defense: float = 0, attack_dice: Sequence[str] = (),
+                 tags: Optional[Dict[str, List[str]]] = None, equipped: bool = False, *,
+                 instance_id: Optional[str] = None, count: int = 1, durability: Optional[int] = None):
+        definition = ITEM_REGISTRY.define(
+            name=name, item_type=item_type, description=description, effects=tuple(effects),
+            target_group=target_group, slot=slot, rarity=rarity, level_requirement=level_requirement,
+            physical_attack=physical_attack, physical_defense=physical_defense,
+            magic_attack=magic_attack, magic_defense=magic_defense,
+            attack_dice=tuple(attack_dice), tags=tuple((tags or {"tags": []})["tags"])
+        )
+        self._init_instance(definition, instance_id, count, durability, equipped)
+    
+    def _init_instance(self, definition: ItemDefinition, instance_id: Optional[str] = None,
+                       count: int = 1, durability: Optional[int] = None, equipped: bool = False) -> None:
+        super()._init_instance(definition, instance_id, count, durability)
+        self.equipped = equipped
+    
+    def to_dict(self, definitions: Optional[Dict[ItemDefinition, int]] = None) -> Dict[str, Any]:
+        item_dict = super().to_dict(definitions)
+        item_dict["equipped"] = self.equipped
         return item_dict
     
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'EquipmentItem':
-        item = super().from_dict(data)
-        return cls(
-            name=item.name,
-            item_type=item.item_type,
-            description=item.description,
-            effects=item.effects,
-            target_group=item.target_group,
-            slot=data.get("slot", "main_hand"),
-            rarity=data.get("rarity", "common"),
-            level_requirement=data.get("level_requirement", 1),
-            physical_attack=data.get("physical_attack", 0),
-            physical_defense=data.get("physical_defense", 0),
-            magic_attack=data.get("magic_attack", 0),
-            magic_defense=data.get("magic_defense", 0),
-            attack_dice=data.get("attack_dice", []),
-            tags=data.get("tags", {"tags": []}),
-            equipped=data.get("equipped", False)
-        ) 
\ No newline at end of file
+    def from_dict(cls, data: Dict[str, Any],
+                  definitions: Optional[Sequence[ItemDefinition]] = None) -> 'EquipmentItem':
+        item = super().from_dict(data, definitions)
+        if item.slot is None:
+            item.slot = "main_hand"
+        return item
+
+
+def item_from_dict(data: Dict[str, Any],
+                   definitions: Optional[Sequence[ItemDefinition]] = None) -> Item:
+    """Restore a saved item as an Item or EquipmentItem, whichever its definition describes."""
+    if "definition" in data:
+        is_equipment = definitions[data["definition"]].slot is not None
+    else:
+        is_equipment = "slot" in data
+    return (EquipmentItem if is_equipment else Item).from_dict(data, definitions)
@@ -20,11 +20,23 @@ class LLMGameMaster(GameMaster):
             "npc_relationships": {}
         }
     
-    def _simulate_llm_response(self, prompt):
+    def _build_prompt(self, player_message):
+        """Assemble the prompt from the player's surroundings, recent context and their message."""
+        sections = []
+        if self.world_context:
+            sections.append(self.world_context)
+        sections.extend(self.context[-10:])
+        sections.append(f"Player: {player_message}")
+        return "\n".join(sections)
+    
+    def _simulate_llm_response(self, prompt, player_message=None):
         """
         Simulate an LLM response.
-        In a real implementation, this would call an actual LLM API.
+        In a real implementation, this would call an actual LLM API with the prompt.
+        The simulation only looks for keywords in the player's own message.
         """
+        if player_message is not None:
+            prompt = player_message
         # Add a 7-second delay if "rest" is in the prompt
         if "rest" in prompt.lower():
             time.sleep(7)  # Simulate a long processing time
@@ -114,12 +126,12 @@ class LLMGameMaster(GameMaster):
             if not self.running or player_message == "CONVERSATION_TERMINATED":
                 break
             
+            # Generate response using simulated LLM
+            response = self._simulate_llm_response(self._build_prompt(player_message), player_message)
+            
             # Add to context
             self.context.append(f"Player: {player_message}")
             
-            # Generate response using simulated LLM
-            response = self._simulate_llm_response(player_message)
-            
             # Add to context
             self.context.append(f"GM: {response}")
             
@@ -0,0 +1,257 @@
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .item import EquipmentItem, Item, ItemDefinition
+
+
+# How likely an item of each rarity is, relative to a common one; the
+# weight of an item entry is multiplied by its rarity's factor
+RARITY_WEIGHTS = {"common": 1.0, "uncommon": 0.4, "rare": 0.12, "epic": 0.03, "legendary": 0.01}
+
+# A drop is an item definition, or None for nothing
+Drop = Optional[ItemDefinition]
+
+# Anything np.random.default_rng accepts: None, a seed or a Generator (e.g. DiceStreams.generator("loot"))
+Seed = Union[None, int, np.random.Generator]
+
+
+class LootTableError(ValueError):
+    """Raised for loot tables that are malformed, unknown or contain themselves."""
+
+
+class AliasTable:
+    """
+    Walker's alias method over fixed weights, built in O(n) with Vose's
+    worklists. Every column holds its own outcome with `probability` and
+    its alias otherwise, so a draw is one uniform number, one column and
+    one comparison however many outcomes there are. The whole part of
+    the scaled number picks the column and the fraction decides between
+    the outcome and its alias.
+    """
+
+    __slots__ = ('probability', 'alias', '_probability', '_alias')
+
+    def __init__(self, weights: Sequence[float]):
+        weights = np.asarray(weights, dtype=float)
+        if not len(weights) or not np.isfinite(weights).all() or (weights < 0).any() or weights.sum() <= 0:
+            raise LootTableError("Alias tables need finite, non-negative weights with a positive total")
+        count = len(weights)
+        scaled = (weights * (count / weights.sum())).tolist()
+        probability = [1.0] * count
+        alias = list(range(count))
+        small = [column for column, value in enumerate(scaled) if value < 1.0]
+        large = [column for column, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            probability[less] = scaled[less]
+            alias[less] = more
+            scaled[more] += scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left over is 1 up to rounding and keeps probability 1
+        self.probability = np.array(probability)
+        self.alias = np.array(alias, dtype=np.intp)
+        # Plain lists are faster than arrays for one draw at a time
+        self._probability = probability
+        self._alias = alias
+
+    def __len__(self) -> int:
+        return len(self._alias)
+
+    def pick(self, rng: np.random.Generator) -> int:
+        scaled = rng.random() * len(self._alias)
+        column = int(scaled)
+        return column if scaled - column < self._probability[column] else self._alias[column]
+
+    def sample(self, count: int, rng: np.random.Generator) -> np.ndarray:
+        """`count` draws at once; the same numbers `pick` would give one by one."""
+        scaled = rng.random(count) * len(self._alias)
+        column = scaled.astype(np.intp)
+        return np.where(scaled - column < self.probability[column], column, self.alias[column])
+
+    def probabilities(self) -> np.ndarray:
+        """The exact chance of each outcome, recovered from the columns."""
+        chances = self.probability.copy()
+        np.add.at(chances, self.alias, 1.0 - self.probability)
+        return chances / len(self._alias)
+
+
+@dataclass(frozen=True)
+class LootEntry:
+    """
+    One line of a loot table: an item, another table, or neither for a
+    chance of dropping nothing. The entry only counts between `min_level`
+    and `max_level` (inclusive; None for no upper bound).
+    """
+    weight: float = 1.0
+    item: Drop = None
+    table: Optional[str] = None
+    min_level: int = 1
+    max_level: Optional[int] = None
+
+    def covers(self, level: int) -> bool:
+        return self.min_level <= level and (self.max_level is None or level <= self.max_level)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'LootEntry':
+        """
+        Read an entry such as {"item": {...item fields...}, "weight": 5} or
+        {"table": "gems", "min_level": 10}. Item fields are interned in the
+        item registry here, once, and items or definitions are taken as is.
+        """
+        item = data.get("item")
+        if item is not None and data.get("table") is not None:
+            raise LootTableError(f"A loot entry drops an item or a table, not both: {dict(data)!r}")
+        if isinstance(item, Item):
+            item = item.definition
+        elif isinstance(item, Mapping):
+            item = ItemDefinition.from_dict({"description": "", **item})
+        return cls(weight=data.get("weight", 1.0), item=item, table=data.get("table"),
+                   min_level=data.get("min_level", 1), max_level=data.get("max_level"))
+
+
+@dataclass(frozen=True)
+class LootTable:
+    """A named list of weighted entries; each drop from the table draws `rolls` of them."""
+    name: str
+    entries: Tuple[LootEntry, ...] = ()
+    rolls: int = 1
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'LootTable':
+        return cls(name=data["name"], rolls=data.get("rolls", 1),
+                   entries=tuple(entry if isinstance(entry, LootEntry) else LootEntry.from_dict(entry)
+                                 for entry in data.get("entries", ())))
+
+
+class CompiledLoot:
+    """
+    A loot table flattened for one level: every drop it can give, with
+    nested tables multiplied out, and one alias table over them.
+    """
+
+    __slots__ = ('drops', 'rolls', 'alias', '_makers')
+
+    def __init__(self, distribution: Dict[Drop, float], rolls: int):
+        self.drops: Tuple[Drop, ...] = tuple(distribution)
+        self.rolls = rolls
+        self.alias = AliasTable(list(distribution.values())) if distribution else None
+        self._makers = tuple(None if drop is None else
+                             partial((EquipmentItem if drop.slot is not None else Item).from_definition, drop)
+                             for drop in self.drops)
+
+    def probabilities(self) -> Dict[Drop, float]:
+        if self.alias is None:
+            return {}
+        return dict(zip(self.drops, self.alias.probabilities().tolist()))
+
+    def pick(self, rng: np.random.Generator) -> List[Item]:
+        """The items of one drop."""
+        if self.alias is None:
+            return []
+        makers = self._makers
+        return [makers[index]() for index in (self.alias.pick(rng) for _ in range(self.rolls))
+                if makers[index] is not None]
+
+    def indices(self, count: int, rng: np.random.Generator) -> np.ndarray:
+        """Which drop each roll of `count` drops gave, one row per drop."""
+        if self.alias is None:
+            return np.zeros((count, 0), dtype=np.intp)
+        return self.alias.sample(count * self.rolls, rng).reshape(count, self.rolls)
+
+    def make(self, indices: Iterable[int]) -> List[Item]:
+        makers = self._makers
+        return [makers[index]() for index in indices if makers[index] is not None]
+
+
+class LootTables:
+    """
+    Named loot tables that may draw from each other.
+    A table is compiled once per level: entries outside their level band
+    are left out, item weights are scaled by RARITY_WEIGHTS, and a nested
+    table becomes its own drops with their chances multiplied by the
+    nesting entry's share, so a drop costs the same however deep tables
+    nest. A nested table always gives one roll; its `rolls` applies when
+    it is dropped from directly. A nested table with nothing at the level
+    is skipped and its weight shared out among the other entries.
+    Drops are new items of interned definitions, so nothing is parsed
+    per drop. The same seed always gives the same drops, whether drawn
+    one at a time or in a batch.
+    """
+
+    def __init__(self, tables: Iterable[Union[LootTable, Mapping[str, Any]]] = (),
+                 rarity_weights: Optional[Mapping[str, float]] = None):
+        self.rarity_weights = dict(RARITY_WEIGHTS if rarity_weights is None else rarity_weights)
+        self._tables: Dict[str, LootTable] = {}
+        self._compiled: Dict[Tuple[str, int], CompiledLoot] = {}
+        for table in tables:
+            self.add(table)
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def __contains__(self, name: Any) -> bool:
+        return name in self._tables
+
+    def add(self, table: Union[LootTable, Mapping[str, Any]]) -> LootTable:
+        """Add or replace a table; every compiled table is rebuilt on next use."""
+        if not isinstance(table, LootTable):
+            table = LootTable.from_dict(table)
+        self._tables[table.name] = table
+        self._compiled.clear()
+        return table
+
+    def compile(self, name: str, level: int = 1) -> CompiledLoot:
+        compiled = self._compiled.get((name, level))
+        if compiled is None:
+            compiled = self._compiled[(name, level)] = CompiledLoot(
+                self._distribution(name, level, ()), self._table(name).rolls)
+        return compiled
+
+    def drop(self, name: str, level: int = 1, seed: Seed = None) -> List[Item]:
+        """The items of one drop from a table."""
+        return self.compile(name, level).pick(np.random.default_rng(seed))
+
+    def drop_many(self, name: str, count: int, level: int = 1, seed: Seed = None) -> List[List[Item]]:
+        """The items of `count` drops, e.g. from every enemy of a fight, drawn in one batch."""
+        compiled = self.compile(name, level)
+        return [compiled.make(row) for row in compiled.indices(count, np.random.default_rng(seed)).tolist()]
+
+    def drop_counts(self, name: str, count: int, level: int = 1, seed: Seed = None) -> Dict[ItemDefinition, int]:
+        """How many of each item `count` drops give, without making the items."""
+        compiled = self.compile(name, level)
+        tally = np.bincount(compiled.indices(count, np.random.default_rng(seed)).ravel(),
+                            minlength=len(compiled.drops))
+        return {drop: int(number) for drop, number in zip(compiled.drops, tally.tolist())
+                if drop is not None and number}
+
+    def _table(self, name: str) -> LootTable:
+        try:
+            return self._tables[name]
+        except KeyError:
+            raise LootTableError(f"Unknown loot table {name!r}") from None
+
+    def _distribution(self, name: str, level: int, path: Tuple[str, ...]) -> Dict[Drop, float]:
+        """The chance of every drop of one roll of a table, in entry order."""
+        if name in path:
+            raise LootTableError(f"Loot table {name!r} contains itself: {' -> '.join(path + (name,))}")
+        weighted: List[Tuple[float, Dict[Drop, float]]] = []
+        for entry in self._table(name).entries:
+            if entry.weight <= 0 or not entry.covers(level):
+                continue
+            if entry.table is not None:
+                nested = self._distribution(entry.table, level, path + (name,))
+                if nested:
+                    weighted.append((entry.weight, nested))
+            elif entry.item is None:
+                weighted.append((entry.weight, {None: 1.0}))
+            elif self.rarity_weights.get(entry.item.rarity, 1.0) > 0:
+                weighted.append((entry.weight * self.rarity_weights.get(entry.item.rarity, 1.0), {entry.item: 1.0}))
+        total = sum(weight for weight, _ in weighted)
+        distribution: Dict[Drop, float] = {}
+        for weight, chances in weighted:
+            for drop, chance in chances.items():
+                distribution[drop] = distribution.get(drop, 0.0) + weight / total * chance
+        return {drop: chance for drop, chance in distribution.items() if chance > 0}
@@ -0,0 +1,254 @@
+from collections.abc import MutableSequence, Sequence
+from typing import Any, Iterable, Iterator, List, Tuple, Union
+
+
+BITS = 5
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+
+
+class PVector(Sequence):
+    """
+    Immutable vector with structural sharing.
+    Elements live in a 32-way trie plus a tail buffer, so append and set
+    copy only the O(log32 n) path they touch and every older version
+    stays valid and shares the rest of its structure.
+    """
+
+    __slots__ = ('_count', '_shift', '_root', '_tail')
+
+    def __init__(self, iterable: Iterable[Any] = ()):
+        self._count = 0
+        self._shift = BITS
+        self._root: Tuple = ()
+        self._tail: Tuple = ()
+        items = list(iterable)
+        if items:
+            # Push whole leaves into the trie and keep the remainder as the tail
+            full = ((len(items) - 1) // WIDTH) * WIDTH
+            for start in range(0, full, WIDTH):
+                self._tail = tuple(items[start:start + WIDTH])
+                self._count = start + WIDTH
+                self._root, self._shift = self._push_tail()
+            self._tail = tuple(items[full:])
+            self._count = len(items)
+
+    @classmethod
+    def _make(cls, count: int, shift: int, root: Tuple, tail: Tuple) -> 'PVector':
+        vector = cls.__new__(cls)
+        vector._count = count
+        vector._shift = shift
+        vector._root = root
+        vector._tail = tail
+        return vector
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _tail_offset(self) -> int:
+        return self._count - len(self._tail)
+
+    def _leaf_for(self, index: int) -> Tuple:
+        if index >= self._tail_offset():
+            return self._tail
+        node = self._root
+        for level in range(self._shift, 0, -BITS):
+            node = node[(index >> level) & MASK]
+        return node
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("PVector index out of range")
+        return self._leaf_for(index)[index & MASK]
+
+    def __iter__(self) -> Iterator[Any]:
+        for start in range(0, self._tail_offset(), WIDTH):
+            yield from self._leaf_for(start)
+        yield from self._tail
+
+    def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"PVector({list(self)!r})"
+
+    def append(self, value: Any) -> 'PVector':
+        """Return a new vector with value added at the end."""
+        if len(self._tail) < WIDTH:
+            return PVector._make(self._count + 1, self._shift, self._root, self._tail + (value,))
+        root, shift = self._push_tail()
+        return PVector._make(self._count + 1, shift, root, (value,))
+
+    def set(self, index: int, value: Any) -> 'PVector':
+        """Return a new vector with the element at index replaced."""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("PVector index out of range")
+        if index >= self._tail_offset():
+            position = index & MASK
+            tail = self._tail[:position] + (value,) + self._tail[position + 1:]
+            return PVector._make(self._count, self._shift, self._root, tail)
+        return PVector._make(self._count, self._shift,
+                             self._assoc(self._shift, self._root, index, value), self._tail)
+
+    def _assoc(self, level: int, node: Tuple, index: int, value: Any) -> Tuple:
+        position = (index >> level) & MASK
+        if level == 0:
+            return node[:position] + (value,) + node[position + 1:]
+        child = self._assoc(level - BITS, node[position], index, value)
+        return node[:position] + (child,) + node[position + 1:]
+
+    def _push_tail(self) -> Tuple[Tuple, int]:
+        """Move the full tail into the trie, returning the new root and shift."""
+        count, shift, root, tail = self._count, self._shift, self._root, self._tail
+        if (count >> BITS) > (1 << shift):
+            # The trie is full at this depth, so grow a new root
+            return (root, self._new_path(shift, tail)), shift + BITS
+        return self._push_into(count, shift, root, tail), shift
+
+    @classmethod
+    def _push_into(cls, count: int, level: int, parent: Tuple, tail: Tuple) -> Tuple:
+        position = ((count - 1) >> level) & MASK
+        if level == BITS:
+            child = tail
+        elif position < len(parent):
+            child = cls._push_into(count, level - BITS, parent[position], tail)
+        else:
+            child = cls._new_path(level - BITS, tail)
+        return parent[:position] + (child,) + parent[position + 1:]
+
+    @staticmethod
+    def _new_path(level: int, node: Tuple) -> Tuple:
+        while level > 0:
+            node = (node,)
+            level -= BITS
+        return node
+
+    def diff(self, other: 'PVector') -> List[int]:
+        """
+        Indices at which the two vectors hold different objects, ascending.
+        Subtrees the vectors share are skipped, so comparing a vector with
+        one derived from it by k changes costs about O(k log32 n).
+        """
+        changed: List[int] = []
+        shared = min(self._tail_offset(), other._tail_offset())
+        if self._shift == other._shift:
+            _diff_nodes(self._root, other._root, self._shift, 0, shared, changed)
+        else:
+            for start in range(0, shared, WIDTH):
+                _diff_nodes(self._leaf_for(start), other._leaf_for(start), 0, start, shared, changed)
+        for index in range(shared, max(self._count, other._count)):
+            mine = self._leaf_for(index)[index & MASK] if index < self._count else _MISSING
+            theirs = other._leaf_for(index)[index & MASK] if index < other._count else _MISSING
+            if mine is not theirs:
+                changed.append(index)
+        return changed
+
+
+_MISSING = object()
+
+
+def _diff_nodes(mine: Tuple, theirs: Tuple, level: int, offset: int, limit: int, changed: List[int]) -> None:
+    """Collect the indices below `limit` where two trie nodes at the same level differ."""
+    if mine is theirs:
+        return
+    for position in range(max(len(mine), len(theirs))):
+        start = offset + (position << level)
+        if start >= limit:
+            return
+        child = mine[position] if position < len(mine) else _MISSING
+        other = theirs[position] if position < len(theirs) else _MISSING
+        if level == 0:
+            if child is not other:
+                changed.append(start)
+        else:
+            _diff_nodes(() if child is _MISSING else child, () if other is _MISSING else other,
+                        level - BITS, start, limit, changed)
+
+
+class PersistentList(MutableSequence):
+    """
+    List-compatible wrapper around a PVector.
+    Appends are O(log32 n) and `freeze()` returns the current contents as
+    an immutable PVector in O(1), which makes snapshots free. Removing or
+    inserting in the middle rebuilds the vector and is O(n).
+    """
+
+    __slots__ = ('_vector',)
+
+    def __init__(self, iterable: Iterable[Any] = ()):
+        self._vector = iterable if isinstance(iterable, PVector) else PVector(iterable)
+
+    def freeze(self) -> PVector:
+        """Return the current contents as an immutable vector."""
+        return self._vector
+
+    def __len__(self) -> int:
+        return len(self._vector)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        return self._vector[index]
+
+    def __setitem__(self, index: int, value: Any) -> None:
+        if isinstance(index, slice):
+            items = list(self._vector)
+            items[index] = value
+            self._vector = PVector(items)
+        else:
+            self._vector = self._vector.set(index, value)
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        items = list(self._vector)
+        del items[index]
+        self._vector = PVector(items)
+
+    def insert(self, index: int, value: Any) -> None:
+        if index >= len(self._vector):
+            self.append(value)
+            return
+        items = list(self._vector)
+        items.insert(index, value)
+        self._vector = PVector(items)
+
+    def append(self, value: Any) -> None:
+        self._vector = self._vector.append(value)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._vector)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, PersistentList):
+            other = other._vector
+        return self._vector == other
+
+    def __repr__(self) -> str:
+        return f"PersistentList({list(self._vector)!r})"
+
+
+def freeze(sequence: Sequence) -> Sequence:
+    """
+    Capture a sequence's current contents.
+    Sequences that know how to capture themselves cheaply (persistent or
+    lazily loaded lists) provide a `freeze()` method; anything else is copied.
+    """
+    if hasattr(sequence, 'freeze'):
+        return sequence.freeze()
+    return tuple(sequence)
+
+
+def thaw(frozen: Sequence, persistent: bool) -> MutableSequence:
+    """Turn frozen contents back into a mutable sequence of the requested kind."""
+    if hasattr(frozen, 'thaw'):
+        return frozen.thaw()
+    if persistent:
+        return PersistentList(frozen if isinstance(frozen, PVector) else PVector(frozen))
+    return list(frozen)
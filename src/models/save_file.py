@@ -0,0 +1,362 @@
+import json
+import lzma
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import MutableSequence
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from .character import Character
+from .item import ItemDefinition
+from .game_state import GameState, Location
+from .persistent import PersistentList
+from .search_index import SearchIndex
+from .world import World
+from .schema import SCHEMA_VERSION, migrate
+
+
+# File layout:
+#   header   MAGIC + format version
+#   sections independently compressed JSON blobs, written one after another
+#   table    JSON offset table describing every section (uncompressed)
+#   trailer  table offset + table length + END_MAGIC
+# The table sits at the end so sections can be streamed out without knowing
+# their sizes in advance; readers find it through the fixed-size trailer.
+MAGIC = b"LLMSAVE\0"
+END_MAGIC = b"LLMSEND\0"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sH")
+TRAILER = struct.Struct("<QI8s")
+
+DEFAULT_SEGMENT_SIZE = 1000
+
+COMPRESSORS = {
+    "none": (lambda data: data, lambda data: data),
+    "zlib": (lambda data: zlib.compress(data, 6), zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+
+class SaveFileError(Exception):
+    """Raised when a save file is missing, truncated or not a save file."""
+
+
+def _encode(value: Any, compression: str) -> bytes:
+    raw = json.dumps(value, separators=(",", ":")).encode("utf-8")
+    return COMPRESSORS[compression][0](raw)
+
+
+def write_save(path: str, game_state: GameState, compression: str = "zlib",
+               segment_size: int = DEFAULT_SEGMENT_SIZE) -> None:
+    """
+    Write a game state as a sectioned save file.
+    Logs are split into segments of `segment_size` messages and each section is
+    compressed on its own, so neither writing nor reading needs the whole
+    file in memory. The file is written to a temporary path and moved into
+    place once complete; if writing fails the temporary file is removed and
+    any earlier save is left as it was. A game loaded from `path` closes its
+    handle on the old file first, so the file can be replaced everywhere.
+    """
+    if compression not in COMPRESSORS:
+        raise ValueError(f"Unknown compression: {compression}")
+
+    temp_path = path + ".tmp"
+    try:
+        _write_sections(temp_path, game_state, compression, segment_size)
+        save_file = game_state.save_file
+        if save_file is not None and os.path.abspath(save_file.path) == os.path.abspath(path):
+            # The lazily loaded history still points into the file being replaced
+            game_state.close()
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _write_sections(temp_path: str, game_state: GameState, compression: str, segment_size: int) -> None:
+    table: Dict[str, Any] = {
+        "compression": compression,
+        "schema_version": SCHEMA_VERSION,
+        "sections": {},
+        "logs": {}
+    }
+    with open(temp_path, "wb") as handle:
+        handle.write(HEADER.pack(MAGIC, FORMAT_VERSION))
+
+        def write_section(name: str, value: Any) -> None:
+            data = _encode(value, compression)
+            table["sections"][name] = {"offset": handle.tell(), "length": len(data)}
+            handle.write(data)
+
+        # Inventory items refer to a table of shared definitions instead of
+        # repeating the fields of every identical potion
+        definitions: Dict[ItemDefinition, int] = {}
+        character_data = game_state.character.to_dict(definitions)
+        inventory = character_data.pop("inventory")
+        write_section("character", character_data)
+        write_section("inventory", inventory)
+        write_section("item_definitions", [definition.to_dict() for definition in definitions])
+        write_section("world", {
+            "current_location": game_state.current_location.to_dict(),
+            "time_of_day": game_state.time_of_day
+        })
+        write_section("world_graph", game_state.world.to_dict())
+
+        for log, messages in (("story", game_state.story_log), ("gm", game_state.gm_log)):
+            segments = []
+            for start in range(0, len(messages), segment_size):
+                name = f"{log}_log.{len(segments)}"
+                write_section(name, list(messages[start:start + segment_size]))
+                segments.append(name)
+            table["logs"][log] = {
+                "length": len(messages),
+                "segment_size": segment_size,
+                "segments": segments
+            }
+
+        write_section("search_index", game_state.search_index.to_dict())
+        table["search_index_length"] = len(game_state.search_index)
+
+        table_offset = handle.tell()
+        table_data = json.dumps(table).encode("utf-8")
+        handle.write(table_data)
+        handle.write(TRAILER.pack(table_offset, len(table_data), END_MAGIC))
+
+
+class SaveFile:
+    """
+    Reader for sectioned save files.
+    Only the header and offset table are read when the file is opened; each
+    section is read and decompressed when it is first requested.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # Set once a game state reads from the file lazily, and the file's
+        # bytes once it is closed while such a game still needs them
+        self._lazy = False
+        self._data: Optional[bytes] = None
+        try:
+            self._handle = open(path, "rb")
+        except OSError as error:
+            raise SaveFileError(f"Cannot open save file {path}: {error}") from error
+        try:
+            self._read_table()
+        except SaveFileError:
+            self._handle.close()
+            raise
+        except (struct.error, OSError, ValueError, KeyError, TypeError) as error:
+            self._handle.close()
+            raise SaveFileError(f"{path} is not a valid save file: {error}") from error
+
+    def _read_table(self) -> None:
+        handle, path = self._handle, self.path
+        size = os.fstat(handle.fileno()).st_size
+        if size < HEADER.size + TRAILER.size:
+            raise SaveFileError(f"{path} is too short to be a save file")
+
+        magic, self.format_version = HEADER.unpack(handle.read(HEADER.size))
+        if magic != MAGIC:
+            raise SaveFileError(f"{path} is not a save file")
+
+        handle.seek(size - TRAILER.size)
+        table_offset, table_length, end_magic = TRAILER.unpack(handle.read(TRAILER.size))
+        if end_magic != END_MAGIC or not HEADER.size <= table_offset <= size - TRAILER.size - table_length:
+            raise SaveFileError(f"{path} is truncated")
+        handle.seek(table_offset)
+        self.table = json.loads(handle.read(table_length))
+        self.compression = self.table["compression"]
+        if self.compression not in COMPRESSORS:
+            raise SaveFileError(f"{path} uses an unknown compression: {self.compression}")
+
+    def close(self) -> None:
+        """
+        Close the file. If a game state was loaded from it, the file's bytes
+        are read into memory first so its history keeps loading lazily after
+        the file is replaced or deleted.
+        """
+        with self._lock:
+            if self._handle.closed:
+                return
+            if self._lazy:
+                self._handle.seek(0)
+                self._data = self._handle.read()
+            self._handle.close()
+
+    def __enter__(self) -> 'SaveFile':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def section_names(self) -> List[str]:
+        return list(self.table["sections"])
+
+    def read_section(self, name: str) -> Any:
+        """Read, decompress and decode a single section."""
+        entry = self.table["sections"][name]
+        with self._lock:
+            if self._data is not None:
+                data = self._data[entry["offset"]:entry["offset"] + entry["length"]]
+            elif self._handle.closed:
+                raise SaveFileError(f"Save file {self.path} is closed")
+            else:
+                self._handle.seek(entry["offset"])
+                data = self._handle.read(entry["length"])
+        try:
+            return json.loads(COMPRESSORS[self.compression][1](data))
+        except (zlib.error, lzma.LZMAError, ValueError) as error:
+            raise SaveFileError(f"Section {name} of {self.path} is corrupt: {error}") from error
+
+    def load_game_state(self, persistent: bool = False) -> GameState:
+        """
+        Restore a game state from the file.
+        The character and world sections are decoded immediately; log history
+        and the search index are only read when they are first used, so the
+        file stays open until the game state is closed.
+        """
+        self._lazy = True
+        version = self.table.get("schema_version", 0)
+        definitions = None
+        if "item_definitions" in self.table["sections"]:
+            definitions = [
+                ItemDefinition.from_dict(migrate(entry, "equipment_item" if "slot" in entry else "item", version))
+                for entry in self.read_section("item_definitions")
+            ]
+        character_data = self.read_section("character")
+        character_data["inventory"] = self.read_section("inventory")
+        character_data = migrate(character_data, "character", version)
+        world = self.read_section("world")
+        world["current_location"] = migrate(world["current_location"], "location", version)
+        world_graph = self.read_section("world_graph") if "world_graph" in self.table["sections"] else None
+
+        logs = {
+            log: LazyLog(self, info["segments"], info["length"], info["segment_size"])
+            for log, info in self.table["logs"].items()
+        }
+        search_index = SearchIndex.deferred(
+            lambda: self.read_section("search_index"),
+            self.table["search_index_length"]
+        )
+
+        return GameState(
+            character=Character.from_dict(character_data, definitions),
+            current_location=Location.from_dict(world["current_location"]),
+            story_log=logs["story"],
+            gm_log=logs["gm"],
+            time_of_day=world.get("time_of_day", "Morning"),
+            search_index=search_index,
+            world=World.from_dict(world_graph) if world_graph else World(),
+            persistent=persistent,
+            save_file=self
+        )
+
+
+def read_save(path: str, persistent: bool = False) -> GameState:
+    """Open a save file and restore its game state, loading history lazily."""
+    return SaveFile(path).load_game_state(persistent=persistent)
+
+
+class LazyLog(MutableSequence):
+    """
+    A message log whose saved history is decompressed segment by segment.
+    Messages appended after loading are kept in memory; the saved segments are
+    read on first access and a few recently used ones are cached.
+    """
+
+    CACHED_SEGMENTS = 4
+
+    def __init__(self, save_file: SaveFile, segments: List[str], stored_length: int,
+                 segment_size: int, appended: Optional[PersistentList] = None,
+                 cache: Optional['OrderedDict[int, List[Dict[str, str]]]'] = None):
+        self._save_file = save_file
+        self._segments = segments
+        self._stored_length = stored_length
+        self._segment_size = segment_size
+        self._appended = appended if appended is not None else PersistentList()
+        # Shared between copies made by freeze/thaw, so they hand out the same message objects
+        self._cache = cache if cache is not None else OrderedDict()
+
+    @property
+    def loaded_segments(self) -> int:
+        """Number of saved segments currently held in memory."""
+        return len(self._cache)
+
+    def _segment(self, number: int) -> List[Dict[str, str]]:
+        segment = self._cache.get(number)
+        if segment is None:
+            segment = self._save_file.read_section(self._segments[number])
+            self._cache[number] = segment
+            if len(self._cache) > self.CACHED_SEGMENTS:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(number)
+        return segment
+
+    def __len__(self) -> int:
+        return self._stored_length + len(self._appended)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("log index out of range")
+        if index >= self._stored_length:
+            return self._appended[index - self._stored_length]
+        number, offset = divmod(index, self._segment_size)
+        return self._segment(number)[offset]
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        for number in range(len(self._segments)):
+            yield from self._segment(number)
+        yield from self._appended
+
+    def append(self, value: Dict[str, str]) -> None:
+        self._appended.append(value)
+
+    def _materialize(self) -> None:
+        """Load the whole history into memory, for edits other than appending."""
+        self._appended = PersistentList(list(self))
+        self._segments = []
+        self._stored_length = 0
+        self._cache = OrderedDict()
+
+    def __setitem__(self, index: Union[int, slice], value: Any) -> None:
+        self._materialize()
+        self._appended[index] = value
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        self._materialize()
+        del self._appended[index]
+
+    def insert(self, index: int, value: Dict[str, str]) -> None:
+        if index >= len(self):
+            self.append(value)
+            return
+        self._materialize()
+        self._appended.insert(index, value)
+
+    def shared_stored_length(self, other: Any) -> int:
+        """Number of leading messages known to be identical in `other` without reading them."""
+        if (isinstance(other, LazyLog) and other._save_file is self._save_file
+                and other._segments is self._segments):
+            return min(self._stored_length, other._stored_length)
+        return 0
+
+    def freeze(self) -> 'LazyLog':
+        """Capture the current contents without reading any saved segments."""
+        return LazyLog(self._save_file, self._segments, self._stored_length,
+                       self._segment_size, self._appended.freeze(), self._cache)
+
+    def thaw(self) -> 'LazyLog':
+        return LazyLog(self._save_file, self._segments, self._stored_length,
+                       self._segment_size, PersistentList(self._appended), self._cache)
@@ -0,0 +1,299 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .character import CharacterEquipment
+from .item import new_instance_id
+
+
+# Version written by to_dict and the save file; dicts without a version are 0
+SCHEMA_VERSION = 1
+
+REQUIRED = object()
+
+
+class SchemaError(ValueError):
+    """Raised when saved data does not match the schema after migration."""
+
+
+@dataclass(frozen=True)
+class Field:
+    """
+    One key of a saved object.
+    `types` is checked for plain values; `node` names the shape of a nested
+    object (or a callable choosing it from the object itself) and `many`
+    marks a list of them. Missing optional keys get `default`, called first
+    if it is callable so mutable defaults are never shared.
+    """
+    types: Union[type, Tuple[type, ...]] = object
+    default: Any = REQUIRED
+    node: Union[str, Callable[[Dict[str, Any]], str], None] = None
+    many: bool = False
+    nullable: bool = False
+
+
+Migration = Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
+class Schema:
+    """
+    Shapes of the saved objects plus the migrations between versions.
+    `compile(version)` turns the migrations newer than `version` and the
+    validation of every field into one walker per object shape, so an old
+    dict is upgraded, checked and given its defaults in a single pass no
+    matter how many versions it skips. Compiled walkers are cached.
+    """
+
+    def __init__(self, version: int, root: str):
+        self.version = version
+        self.root = root
+        self._nodes: Dict[str, Dict[str, Field]] = {}
+        self._migrations: List[Tuple[int, str, Migration]] = []
+        self._compiled: Dict[Tuple[int, str], Callable[[Any, str], Dict[str, Any]]] = {}
+
+    def node(self, name: str, fields: Dict[str, Field]) -> None:
+        """Declare the current shape of an object."""
+        self._nodes[name] = fields
+        self._compiled.clear()
+
+    def migration(self, to_version: int, node: str) -> Callable[[Migration], Migration]:
+        """
+        Register a function that upgrades one object from `to_version - 1`.
+        It runs on each object of that shape before its fields are visited,
+        may change the object in place or return a replacement, and can
+        reshape nested objects since those are visited afterwards.
+        """
+        def register(function: Migration) -> Migration:
+            self._migrations.append((to_version, node, function))
+            self._migrations.sort(key=lambda entry: entry[0])
+            self._compiled.clear()
+            return function
+        return register
+
+    def compile(self, from_version: int, node: Optional[str] = None) -> Callable[[Any, str], Dict[str, Any]]:
+        """Return the walker that upgrades and validates objects saved at `from_version`."""
+        node = node or self.root
+        if from_version > self.version:
+            raise SchemaError(f"Saved with schema version {from_version}, newer than {self.version}")
+        key = (from_version, node)
+        if key not in self._compiled:
+            walkers: Dict[str, Callable[[Any, str], Dict[str, Any]]] = {}
+            for name in self._nodes:
+                walkers[name] = self._build(name, from_version, walkers)
+            for name, walker in walkers.items():
+                self._compiled[(from_version, name)] = walker
+        return self._compiled[key]
+
+    def _build(self, name: str, from_version: int,
+               walkers: Dict[str, Callable[[Any, str], Dict[str, Any]]]) -> Callable[[Any, str], Dict[str, Any]]:
+        migrations = tuple(function for version, node, function in self._migrations
+                           if node == name and version > from_version)
+        fields = tuple(self._nodes[name].items())
+
+        def walk(data: Any, path: str) -> Dict[str, Any]:
+            if not isinstance(data, dict):
+                raise SchemaError(f"{path}: expected an object, got {type(data).__name__}")
+            for migration in migrations:
+                data = migration(data) or data
+            for key, spec in fields:
+                value = data.get(key, REQUIRED)
+                if value is REQUIRED:
+                    if spec.default is REQUIRED:
+                        raise SchemaError(f"{path}.{key}: missing")
+                    default = spec.default
+                    data[key] = default() if callable(default) else default
+                    continue
+                if value is None and spec.nullable:
+                    continue
+                if spec.node is None:
+                    if not isinstance(value, spec.types):
+                        raise SchemaError(f"{path}.{key}: expected {_type_name(spec.types)}, "
+                                          f"got {type(value).__name__}")
+                    continue
+                if spec.many:
+                    if not isinstance(value, list):
+                        raise SchemaError(f"{path}.{key}: expected a list, got {type(value).__name__}")
+                    data[key] = [_walk_child(walkers, spec.node, child, f"{path}.{key}[{index}]")
+                                 for index, child in enumerate(value)]
+                else:
+                    data[key] = _walk_child(walkers, spec.node, value, f"{path}.{key}")
+            return data
+
+        return walk
+
+    def migrate(self, data: Dict[str, Any], node: Optional[str] = None,
+                version: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Upgrade and validate saved data in place and return it.
+        The version is read from the data's `schema_version` key unless given.
+        """
+        if version is None:
+            version = data.get("schema_version", 0) if isinstance(data, dict) else 0
+        result = self.compile(version, node)(data, node or self.root)
+        if node is None or node == self.root:
+            result["schema_version"] = self.version
+        return result
+
+
+def _walk_child(walkers, node, value, path):
+    name = node(value) if callable(node) else node
+    return walkers[name](value, path)
+
+
+def _type_name(types: Union[type, Tuple[type, ...]]) -> str:
+    if isinstance(types, tuple):
+        return " or ".join(kind.__name__ for kind in types)
+    return types.__name__
+
+
+def _item_kind(data: Any) -> str:
+    if isinstance(data, dict) and "definition" in data:
+        return "item_instance"
+    return "equipment_item" if isinstance(data, dict) and "slot" in data else "item"
+
+
+def _tags() -> Dict[str, List[str]]:
+    return {"tags": []}
+
+
+NUMBER = (int, float)
+
+SCHEMA = Schema(SCHEMA_VERSION, root="game_state")
+
+SCHEMA.node("game_state", {
+    "character": Field(node="character"),
+    "current_location": Field(node="location"),
+    "story_log": Field(node="message", many=True, default=list),
+    "gm_log": Field(node="message", many=True, default=list),
+    "time_of_day": Field(str, "Morning"),
+    "search_index": Field(dict, None, nullable=True),
+    "world": Field(dict, None, nullable=True)
+})
+
+SCHEMA.node("message", {
+    "sender": Field(str),
+    "message": Field(str)
+})
+
+SCHEMA.node("location", {
+    "name": Field(str),
+    "description": Field(str),
+    "connections": Field(list, list)
+})
+
+SCHEMA.node("character", {
+    "name": Field(str),
+    "character_class": Field(node="character_class"),
+    "level": Field(int, 1),
+    "experience": Field(int, 0),
+    "experience_to_next_level": Field(int, 100),
+    "health": Field(int, 100),
+    "max_health": Field(int, 100),
+    "mana": Field(int, 50),
+    "max_mana": Field(int, 50),
+    "stamina": Field(int, 100),
+    "max_stamina": Field(int, 100),
+    "strength": Field(int, 10),
+    "endurance": Field(int, 10),
+    "focus": Field(int, 10),
+    "willpower": Field(int, 10),
+    "agility": Field(int, 10),
+    "luck": Field(int, 10),
+    "charisma": Field(int, 10),
+    "equipment": Field(node="equipment", default=dict),
+    "inventory": Field(node=_item_kind, many=True, default=list)
+})
+
+SCHEMA.node("character_class", {
+    "name": Field(str),
+    "description": Field(str),
+    "skills": Field(node="skill", many=True, default=list),
+    "rarity": Field(str, "common"),
+    "tags": Field(dict, _tags)
+})
+
+SCHEMA.node("skill", {
+    "name": Field(str),
+    "description": Field(str),
+    "level": Field(int, 1),
+    "experience": Field(int, 0),
+    "cost": Field(dict, dict),
+    "effects": Field(list, list),
+    "target_group": Field(str, "enemies")
+})
+
+SCHEMA.node("effect", {
+    "target_group": Field(str),
+    "action": Field(str),
+    "value": Field(NUMBER, 0),
+    "tags": Field(dict, _tags)
+})
+
+_ITEM_FIELDS = {
+    "name": Field(str),
+    "item_type": Field(str),
+    "description": Field(str),
+    "effects": Field(node="effect", many=True, default=list),
+    "target_group": Field(str, "single_ally"),
+    "instance_id": Field(str, new_instance_id),
+    "count": Field(int, 1),
+    "durability": Field(int, None, nullable=True)
+}
+
+SCHEMA.node("item", _ITEM_FIELDS)
+
+SCHEMA.node("equipment_item", {
+    **_ITEM_FIELDS,
+    "slot": Field(str),
+    "rarity": Field(str, "common"),
+    "level_requirement": Field(int, 1),
+    "physical_attack": Field(NUMBER, 0),
+    "physical_defense": Field(NUMBER, 0),
+    "magic_attack": Field(NUMBER, 0),
+    "magic_defense": Field(NUMBER, 0),
+    "attack_dice": Field(list, list),
+    "tags": Field(dict, _tags),
+    "equipped": Field(bool, False)
+})
+
+# An item saved as a reference into a table of shared definitions
+SCHEMA.node("item_instance", {
+    "definition": Field(int),
+    "instance_id": Field(str, new_instance_id),
+    "count": Field(int, 1),
+    "durability": Field(int, None, nullable=True),
+    "equipped": Field(bool, False)
+})
+
+SCHEMA.node("equipment", {
+    slot: (Field(node="equipment_item", many=True, default=list) if slot == "accessories"
+           else Field(node="equipment_item", default=None, nullable=True))
+    for slot in CharacterEquipment.DEFAULT_SLOTS
+})
+
+
+def _wrap_tag_list(data: Dict[str, Any]) -> None:
+    # Early saves stored tags as a bare list (or None) rather than {"tags": [...]}
+    tags = data.get("tags")
+    if isinstance(tags, list):
+        data["tags"] = {"tags": tags}
+    elif "tags" in data and tags is None:
+        del data["tags"]
+
+
+for _node in ("character_class", "effect", "equipment_item"):
+    SCHEMA.migration(1, _node)(_wrap_tag_list)
+
+
+@SCHEMA.migration(1, "equipment")
+def _accessories_list(data: Dict[str, Any]) -> None:
+    # Unversioned saves could hold None for an empty accessories slot or list
+    accessories = data.get("accessories")
+    if accessories is None:
+        data["accessories"] = []
+    else:
+        data["accessories"] = [accessory for accessory in accessories if accessory]
+
+
+def migrate(data: Dict[str, Any], node: Optional[str] = None, version: Optional[int] = None) -> Dict[str, Any]:
+    """Upgrade and validate saved data against the current schema, in place."""
+    return SCHEMA.migrate(data, node, version)
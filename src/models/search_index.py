@@ -0,0 +1,335 @@
+import heapq
+import math
+import re
+from array import array
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+# Very common words are dropped from the postings. They carry almost no BM25
+# weight but would make up most of the index on long sessions. Phrase queries
+# still match them because phrases are verified against the message text.
+STOPWORDS = frozenset("""
+a about after again all am an and any are as at be because been before being
+but by can could did do does doing for from had has have having he her here
+him his how i if in into is it its itself me my of on or our out over she so
+some than that the their them then there these they this those to too up us
+was we were what when where which while who whom why will with would you your
+""".split())
+
+LOG_NAMES = ("story", "gm")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+@dataclass
+class SearchHit:
+    log: str
+    index: int
+    sender: str
+    message: str
+    score: float
+
+
+class SearchIndex:
+    """
+    Inverted index over the story and GM logs.
+    Messages are added one at a time as they are logged, so the index never
+    needs a full rebuild. Results are ranked with BM25.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        # Per-document columns, indexed by document id
+        self._doc_log = array('B')
+        self._doc_position = array('I')
+        self._doc_sender = array('I')
+        self._doc_length = array('I')
+        self._total_length = 0
+        # Document ids for each log position, and documents removed by a rollback
+        self._log_docs = (array('I'), array('I'))
+        self._deleted = set()
+        # Interned sender names, as first seen, and their ids by lowercase name
+        self._senders: List[str] = []
+        self._sender_ids: Dict[str, int] = {}
+        # term -> (document ids, term frequencies), both ascending by document id
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._resolver: Optional[Callable[[str, int], Dict[str, str]]] = None
+        # Loader and document count for an index that has not been read from a save yet
+        self._pending_load: Optional[Callable[[], Dict[str, Any]]] = None
+        self._pending_length = 0
+
+    @classmethod
+    def deferred(cls, load: Callable[[], Dict[str, Any]], length: int) -> 'SearchIndex':
+        """Create an index of `length` documents that calls `load` for its data on first use."""
+        index = cls()
+        index._pending_load = load
+        index._pending_length = length
+        return index
+
+    def _ensure_loaded(self) -> None:
+        if self._pending_load is None:
+            return
+        load, self._pending_load = self._pending_load, None
+        loaded = SearchIndex.from_dict(load())
+        resolver = self._resolver
+        self.__dict__.update(loaded.__dict__)
+        self._resolver = resolver
+
+    def __len__(self) -> int:
+        if self._pending_load is not None:
+            return self._pending_length
+        return len(self._doc_log) - len(self._deleted)
+
+    def attach(self, resolver: Callable[[str, int], Dict[str, str]]) -> None:
+        """Set the callback used to fetch a logged message by log name and position."""
+        self._resolver = resolver
+
+    def add(self, log: str, position: int, sender: str, message: str) -> int:
+        """Index a single message and return its document id."""
+        self._ensure_loaded()
+        doc_id = len(self._doc_log)
+        tokens = tokenize(message)
+
+        sender_id = self._sender_ids.get(sender.lower())
+        if sender_id is None:
+            sender_id = len(self._senders)
+            self._senders.append(sender)
+            self._sender_ids[sender.lower()] = sender_id
+
+        self._doc_log.append(LOG_NAMES.index(log))
+        self._doc_position.append(position)
+        self._doc_sender.append(sender_id)
+        self._doc_length.append(len(tokens))
+        self._total_length += len(tokens)
+        self._log_docs[LOG_NAMES.index(log)].append(doc_id)
+
+        counts: Dict[str, int] = {}
+        for token in tokens:
+            if token not in STOPWORDS:
+                counts[token] = counts.get(token, 0) + 1
+
+        postings = self._postings
+        for term, count in counts.items():
+            entry = postings.get(term)
+            if entry is None:
+                entry = postings[term] = (array('I'), array('I'))
+            entry[0].append(doc_id)
+            entry[1].append(count)
+
+        return doc_id
+
+    def truncate(self, log: str, length: int) -> None:
+        """Drop every document at or after position `length` of a log."""
+        self._ensure_loaded()
+        log_docs = self._log_docs[LOG_NAMES.index(log)]
+        for doc_id in log_docs[length:]:
+            self._deleted.add(doc_id)
+            self._total_length -= self._doc_length[doc_id]
+        del log_docs[length:]
+        if len(self._deleted) > len(self):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rewrite the postings without the deleted documents."""
+        live = [doc_id for doc_id in range(len(self._doc_log)) if doc_id not in self._deleted]
+        new_ids = {doc_id: i for i, doc_id in enumerate(live)}
+        self._doc_log = array('B', (self._doc_log[doc_id] for doc_id in live))
+        self._doc_position = array('I', (self._doc_position[doc_id] for doc_id in live))
+        self._doc_sender = array('I', (self._doc_sender[doc_id] for doc_id in live))
+        self._doc_length = array('I', (self._doc_length[doc_id] for doc_id in live))
+        self._log_docs = tuple(array('I', (new_ids[doc_id] for doc_id in log_docs))
+                               for log_docs in self._log_docs)
+        postings = {}
+        for term, (doc_ids, frequencies) in self._postings.items():
+            kept = [(new_ids[doc_id], tf) for doc_id, tf in zip(doc_ids, frequencies)
+                    if doc_id in new_ids]
+            if kept:
+                postings[term] = (array('I', (doc_id for doc_id, _ in kept)),
+                                  array('I', (tf for _, tf in kept)))
+        self._postings = postings
+        self._deleted = set()
+
+    def search(self, query: str, sender: Optional[str] = None, log: Optional[str] = None,
+               limit: int = 10) -> List[SearchHit]:
+        """
+        Search the indexed messages.
+        Quoted parts of the query must appear as exact phrases, and a
+        `sender:<name>` term restricts results to one sender. Sender names
+        match regardless of case. Stopwords are not indexed, so a query of
+        stopwords alone finds nothing, while a phrase of stopwords alone
+        ("in the") is matched literally by reading the messages, newest
+        first, with every hit scored 0.
+        """
+        self._ensure_loaded()
+        phrases = [tokenize(phrase) for phrase in re.findall(r'"([^"]*)"', query)]
+        phrases = [phrase for phrase in phrases if phrase]
+        remainder = re.sub(r'"[^"]*"', " ", query)
+
+        sender_match = re.search(r'\bsender:(\S+)', remainder, re.IGNORECASE)
+        if sender_match:
+            sender = sender or sender_match.group(1)
+            remainder = remainder[:sender_match.start()] + remainder[sender_match.end():]
+
+        terms = [token for token in tokenize(remainder) if token not in STOPWORDS]
+        for phrase in phrases:
+            terms.extend(token for token in phrase if token not in STOPWORDS)
+        terms = list(dict.fromkeys(terms))
+
+        if not terms and not phrases:
+            return []
+
+        sender_id = None
+        if sender is not None:
+            sender_id = self._sender_ids.get(sender.lower())
+            if sender_id is None:
+                return []
+        log_id = LOG_NAMES.index(log) if log is not None else None
+        if not terms:
+            return self._scan_phrases(phrases, sender_id, log_id, limit)
+
+        candidates = None
+        if phrases:
+            # Phrases are required, so only documents holding every phrase term can match
+            required = [self._postings.get(term) for phrase in phrases
+                        for term in phrase if term not in STOPWORDS]
+            if any(entry is None for entry in required):
+                return []
+            for doc_ids, _ in sorted(required, key=lambda entry: len(entry[0])):
+                candidates = set(doc_ids) if candidates is None else candidates.intersection(doc_ids)
+                if not candidates:
+                    return []
+
+        scores = self._score(terms, sender_id, log_id, candidates)
+        if phrases:
+            ranked = sorted(scores.items(), key=lambda pair: (-pair[1], pair[0]))
+        else:
+            ranked = heapq.nlargest(limit, scores.items(), key=lambda pair: (pair[1], -pair[0]))
+        hits = []
+        for doc_id, score in ranked:
+            hit = self._make_hit(doc_id, score)
+            if phrases and not all(self._contains_phrase(tokenize(hit.message), phrase)
+                                   for phrase in phrases):
+                continue
+            hits.append(hit)
+            if len(hits) >= limit:
+                break
+        return hits
+
+    def _score(self, terms: List[str], sender_id: Optional[int], log_id: Optional[int],
+               candidates: Optional[set] = None) -> Dict[int, float]:
+        """Accumulate BM25 scores for every document containing a query term."""
+        doc_count = len(self)
+        if doc_count == 0:
+            return {}
+        average_length = self._total_length / doc_count or 1.0
+        k1 = self.k1
+        norm_base = k1 * (1 - self.b)
+        norm_scale = k1 * self.b / average_length
+        doc_length = self._doc_length
+        doc_sender = self._doc_sender
+        doc_log = self._doc_log
+        deleted = self._deleted
+
+        scores: Dict[int, float] = {}
+        for term in terms:
+            entry = self._postings.get(term)
+            if entry is None:
+                continue
+            doc_ids, frequencies = entry
+            df = len(doc_ids) if not deleted else sum(1 for doc_id in doc_ids if doc_id not in deleted)
+            idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+            for doc_id, tf in zip(doc_ids, frequencies):
+                if candidates is not None and doc_id not in candidates:
+                    continue
+                if deleted and doc_id in deleted:
+                    continue
+                if sender_id is not None and doc_sender[doc_id] != sender_id:
+                    continue
+                if log_id is not None and doc_log[doc_id] != log_id:
+                    continue
+                weight = idf * tf * (k1 + 1) / (tf + norm_base + norm_scale * doc_length[doc_id])
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight
+        return scores
+
+    def _scan_phrases(self, phrases: List[List[str]], sender_id: Optional[int], log_id: Optional[int],
+                      limit: int) -> List[SearchHit]:
+        """Hits for phrases of stopwords, which have no postings, read newest first."""
+        hits = []
+        for doc_id in range(len(self._doc_log) - 1, -1, -1):
+            if doc_id in self._deleted:
+                continue
+            if sender_id is not None and self._doc_sender[doc_id] != sender_id:
+                continue
+            if log_id is not None and self._doc_log[doc_id] != log_id:
+                continue
+            hit = self._make_hit(doc_id, 0.0)
+            tokens = tokenize(hit.message)
+            if all(self._contains_phrase(tokens, phrase) for phrase in phrases):
+                hits.append(hit)
+                if len(hits) >= limit:
+                    break
+        return hits
+
+    def _make_hit(self, doc_id: int, score: float) -> SearchHit:
+        log = LOG_NAMES[self._doc_log[doc_id]]
+        position = self._doc_position[doc_id]
+        message = ""
+        if self._resolver is not None:
+            message = self._resolver(log, position)["message"]
+        return SearchHit(
+            log=log,
+            index=position,
+            sender=self._senders[self._doc_sender[doc_id]],
+            message=message,
+            score=score
+        )
+
+    @staticmethod
+    def _contains_phrase(tokens: List[str], phrase: List[str]) -> bool:
+        width = len(phrase)
+        return any(tokens[i:i + width] == phrase for i in range(len(tokens) - width + 1))
+
+    def to_dict(self) -> Dict[str, Any]:
+        self._ensure_loaded()
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "senders": list(self._senders),
+            "doc_log": self._doc_log.tolist(),
+            "doc_position": self._doc_position.tolist(),
+            "doc_sender": self._doc_sender.tolist(),
+            "doc_length": self._doc_length.tolist(),
+            "deleted": sorted(self._deleted),
+            "postings": {
+                term: [doc_ids.tolist(), frequencies.tolist()]
+                for term, (doc_ids, frequencies) in self._postings.items()
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SearchIndex':
+        index = cls(k1=data.get("k1", 1.2), b=data.get("b", 0.75))
+        index._senders = list(data.get("senders", []))
+        index._sender_ids = {sender.lower(): i for i, sender in enumerate(index._senders)}
+        index._doc_log = array('B', data.get("doc_log", []))
+        index._doc_position = array('I', data.get("doc_position", []))
+        index._doc_sender = array('I', data.get("doc_sender", []))
+        index._doc_length = array('I', data.get("doc_length", []))
+        index._deleted = set(data.get("deleted", []))
+        index._total_length = sum(length for doc_id, length in enumerate(index._doc_length)
+                                  if doc_id not in index._deleted)
+        for doc_id, log_id in enumerate(index._doc_log):
+            if doc_id not in index._deleted:
+                index._log_docs[log_id].append(doc_id)
+        index._postings = {
+            term: (array('I', doc_ids), array('I', frequencies))
+            for term, (doc_ids, frequencies) in data.get("postings", {}).items()
+        }
+        return index
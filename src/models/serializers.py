@@ -0,0 +1,130 @@
+import typing
+from collections.abc import Sequence as SequenceABC
+from dataclasses import MISSING, fields
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+
+
+Encoder = Callable[[Any, Any], Any]
+Decoder = Callable[[Any, Any], Any]
+
+SCALARS = (str, int, float, bool, type(None))
+_ATOMIC = frozenset(SCALARS)
+_MAPPINGS = frozenset({dict, MappingProxyType})
+_SEQUENCES = frozenset({list, tuple})
+
+_SERIALIZERS: Dict[type, Tuple[Encoder, Decoder]] = {}
+
+
+def detach(value: Any) -> Any:
+    """Deep copy of JSON-like data. Mappings become dicts and sequences lists."""
+    kind = type(value)
+    # Scalars are kept inline so leaves never cost a call
+    if kind in _MAPPINGS:
+        return {key: item if type(item) in _ATOMIC else detach(item) for key, item in value.items()}
+    if kind in _SEQUENCES:
+        return [item if type(item) in _ATOMIC else detach(item) for item in value]
+    return value
+
+
+def serializer(cls: type, exclude: Iterable[str] = (),
+               overrides: Optional[Dict[str, Tuple[Encoder, Decoder]]] = None) -> Tuple[Encoder, Decoder]:
+    """
+    Generate the encode and decode functions of a dataclass from its fields.
+    Each field is converted according to its annotation: scalars are copied
+    as they are, registered models and classes with to_dict/from_dict are
+    nested, sequences of those are mapped, and anything else is treated as
+    JSON-like data and deep-copied, so neither function ever shares a
+    mutable container with its input. Missing keys fall back to the field
+    defaults. `overrides` maps a field name to its own (encode, decode)
+    pair; every function takes the value and a context that is passed down
+    unchanged. The generated pair is registered for nesting in later models.
+    """
+    overrides = overrides or {}
+    exclude = set(exclude)
+    hints = typing.get_type_hints(cls)
+    namespace: Dict[str, Any] = {"cls": cls, "MISSING": MISSING, "detach": detach}
+    encoded, decoded = [], []
+
+    for number, model_field in enumerate(fields(cls)):
+        name = model_field.name
+        if not model_field.init or name in exclude:
+            continue
+        if name in overrides:
+            namespace[f"enc_{number}"], namespace[f"dec_{number}"] = overrides[name]
+            encode = f"enc_{number}({{v}}, context)"
+            decode = f"dec_{number}({{v}}, context)"
+        else:
+            encode, decode = _conversions(hints[name], namespace, str(number))
+        encoded.append(f"        {name!r}: {encode.format(v=f'obj.{name}')},")
+
+        value = decode.format(v="v")
+        if model_field.default_factory is not MISSING:
+            namespace[f"factory_{number}"] = model_field.default_factory
+            # Empty containers fall back to the default, which may be a shared empty value
+            decoded.append(f"        {name}=({value} if v else factory_{number}()) "
+                           f"if (v := get({name!r}, MISSING)) is not MISSING else factory_{number}(),")
+        elif model_field.default is not MISSING:
+            namespace[f"default_{number}"] = model_field.default
+            if not isinstance(model_field.default, SCALARS):
+                value = f"({value} if v else default_{number})"
+            decoded.append(f"        {name}={value} if (v := get({name!r}, MISSING)) is not MISSING "
+                           f"else default_{number},")
+        else:
+            decoded.append(f"        {name}={decode.format(v=f'data[{name!r}]')},")
+
+    source = "\n".join([
+        "def encode(obj, context=None):",
+        "    return {",
+        *encoded,
+        "    }",
+        "",
+        "def decode(data, context=None):",
+        "    get = data.get",
+        "    return cls(",
+        *decoded,
+        "    )",
+    ])
+    exec(source, namespace)
+    pair = namespace["encode"], namespace["decode"]
+    pair[0].__qualname__ = f"encode_{cls.__name__}"
+    pair[1].__qualname__ = f"decode_{cls.__name__}"
+    _SERIALIZERS[cls] = pair
+    return pair
+
+
+def _conversions(annotation: Any, namespace: Dict[str, Any], suffix: str) -> Tuple[str, str]:
+    """Encode and decode expression templates for one annotation, with `{v}` as the value."""
+    origin, args = typing.get_origin(annotation), typing.get_args(annotation)
+
+    if origin is Union:
+        inner = [arg for arg in args if arg is not type(None)]
+        if len(inner) == 1:
+            encode, decode = _conversions(inner[0], namespace, suffix)
+            return (f"(None if {{v}} is None else {encode})",
+                    f"(None if {{v}} is None else {decode})")
+        return "detach({v})", "detach({v})"
+
+    if annotation in SCALARS:
+        return "{v}", "{v}"
+
+    if annotation in _SERIALIZERS:
+        namespace[f"enc_{suffix}"], namespace[f"dec_{suffix}"] = _SERIALIZERS[annotation]
+        return f"enc_{suffix}({{v}}, context)", f"dec_{suffix}({{v}}, context)"
+
+    if isinstance(annotation, type) and hasattr(annotation, "from_dict"):
+        namespace[f"type_{suffix}"] = annotation
+        return "{v}.to_dict()", f"type_{suffix}.from_dict({{v}})"
+
+    if origin in (list, tuple, SequenceABC) and args:
+        item = args[0]
+        container = "tuple" if origin is tuple else "list"
+        if item in SCALARS:
+            return "list({v})", f"{container}({{v}})"
+        if item in _SERIALIZERS or hasattr(item, "from_dict"):
+            encode, decode = _conversions(item, namespace, suffix + "_item")
+            return (f"[{encode.format(v='item')} for item in {{v}}]",
+                    f"{container}({decode.format(v='item')} for item in {{v}})"
+                    if container == "tuple" else f"[{decode.format(v='item')} for item in {{v}}]")
+
+    return "detach({v})", "detach({v})"
@@ -0,0 +1,205 @@
+import heapq
+import itertools
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+
+# Within one turn, periodic ticks run before expiries so an effect's last tick lands
+_TICK, _EXPIRE = 0, 1
+
+_ids = itertools.count(1)
+
+
+@dataclass(eq=False, slots=True)
+class StatusEffect:
+    """
+    A timed effect on a character.
+    While active, an effect with a `stat` adds `amount` to that stat through
+    the character's stat modifiers, and one with a `resource` changes that
+    resource by `per_turn` every turn, within 0 and its maximum. A
+    resource held as an int, such as a character's health, changes by
+    whole points, with the fraction carried to the next tick. Effects
+    from passive skills are banished (no modifier, no ticks) while any
+    `blocks_passives` effect is active on the same character, and come back
+    when the last one ends; their duration keeps running meanwhile.
+    """
+    name: str
+    duration: int
+    stat: Optional[str] = None
+    amount: float = 0
+    resource: Optional[str] = None
+    per_turn: float = 0
+    passive: bool = False
+    blocks_passives: bool = False
+    id: int = field(default_factory=lambda: next(_ids), init=False)
+    target: Any = field(default=None, init=False, repr=False)
+    expires_at: int = field(default=0, init=False, repr=False)
+    active: bool = field(default=False, init=False, repr=False)
+    banished: bool = field(default=False, init=False, repr=False)
+    carried: float = field(default=0, init=False, repr=False)
+
+    @property
+    def source(self) -> str:
+        """The stat modifier source this effect applies under."""
+        return f"{self.name}#{self.id}"
+
+
+class _Target:
+    """Active effects of one character, with its passives and blockers indexed."""
+
+    __slots__ = ('character', 'effects', 'passives', 'blockers')
+
+    def __init__(self, character: Any):
+        self.character = character
+        self.effects: Dict[int, StatusEffect] = {}
+        self.passives: Set[StatusEffect] = set()
+        self.blockers = 0
+
+
+class StatusEffectEngine:
+    """
+    Scheduler for the status effects of every character in a battle.
+    Expiries and periodic ticks sit in one heap keyed by the turn they are
+    due, so `advance` only touches the effects whose turn has come instead
+    of rebuilding effect lists every turn. Removing an effect early leaves
+    its heap entries behind; they are skipped when they come up. Passive
+    effects are kept in a set per character, so a passive block banishes
+    exactly those without scanning the rest.
+    """
+
+    __slots__ = ('turn', '_queue', '_targets', '_sequence')
+
+    def __init__(self):
+        self.turn = 0
+        self._queue: List[Tuple[int, int, int, StatusEffect]] = []
+        self._targets: Dict[int, _Target] = {}
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return sum(len(target.effects) for target in self._targets.values())
+
+    def add(self, character: Any, effect: StatusEffect) -> StatusEffect:
+        """Apply an effect to a character now; it lasts `effect.duration` turns."""
+        if effect.active:
+            raise ValueError(f"{effect.name} is already applied")
+        if effect.duration < 1:
+            raise ValueError(f"{effect.name} must last at least one turn")
+        target = self._targets.get(id(character))
+        if target is None:
+            target = self._targets[id(character)] = _Target(character)
+        effect.target = character
+        effect.expires_at = self.turn + effect.duration
+        effect.active = True
+        effect.banished = False
+        target.effects[effect.id] = effect
+
+        if effect.blocks_passives:
+            target.blockers += 1
+            if target.blockers == 1:
+                for passive in target.passives:
+                    self._banish(passive)
+        if effect.passive:
+            target.passives.add(effect)
+            if target.blockers:
+                effect.banished = True
+        if not effect.banished:
+            self._apply(effect)
+
+        self._schedule(effect.expires_at, _EXPIRE, effect)
+        if effect.resource is not None and effect.per_turn:
+            self._schedule(self.turn + 1, _TICK, effect)
+        return effect
+
+    def remove(self, effect: StatusEffect) -> bool:
+        """End an effect before it expires; return whether it was active."""
+        if not effect.active:
+            return False
+        self._end(effect)
+        return True
+
+    def advance(self, turns: int = 1) -> List[StatusEffect]:
+        """Move time forward, running due ticks and expiries; return the effects that ended."""
+        ended = []
+        queue = self._queue
+        for _ in range(turns):
+            self.turn += 1
+            while queue and queue[0][0] <= self.turn:
+                _, kind, _, effect = heapq.heappop(queue)
+                if not effect.active:
+                    continue
+                if kind == _EXPIRE:
+                    if effect.expires_at <= self.turn:
+                        self._end(effect)
+                        ended.append(effect)
+                    continue
+                if not effect.banished:
+                    self._tick(effect)
+                if self.turn < effect.expires_at:
+                    self._schedule(self.turn + 1, _TICK, effect)
+        return ended
+
+    def effects_on(self, character: Any) -> List[StatusEffect]:
+        """Active effects on a character, banished passives included, in the order applied."""
+        target = self._targets.get(id(character))
+        return list(target.effects.values()) if target is not None else []
+
+    def passives_blocked(self, character: Any) -> bool:
+        target = self._targets.get(id(character))
+        return target is not None and target.blockers > 0
+
+    def __iter__(self) -> Iterator[StatusEffect]:
+        for target in self._targets.values():
+            yield from target.effects.values()
+
+    def _schedule(self, turn: int, kind: int, effect: StatusEffect) -> None:
+        heapq.heappush(self._queue, (turn, kind, next(self._sequence), effect))
+
+    def _end(self, effect: StatusEffect) -> None:
+        target = self._targets[id(effect.target)]
+        effect.active = False
+        del target.effects[effect.id]
+        if not effect.banished:
+            self._unapply(effect)
+        effect.banished = False
+        if effect.passive:
+            target.passives.discard(effect)
+        if effect.blocks_passives:
+            target.blockers -= 1
+            if target.blockers == 0:
+                for passive in target.passives:
+                    passive.banished = False
+                    self._apply(passive)
+        if not target.effects:
+            del self._targets[id(effect.target)]
+
+    def _banish(self, effect: StatusEffect) -> None:
+        if not effect.banished:
+            effect.banished = True
+            self._unapply(effect)
+
+    @staticmethod
+    def _apply(effect: StatusEffect) -> None:
+        if effect.stat is not None:
+            effect.target.set_stat_modifier(effect.source, effect.stat, effect.amount)
+
+    @staticmethod
+    def _unapply(effect: StatusEffect) -> None:
+        if effect.stat is not None:
+            effect.target.remove_stat_modifier(effect.source, effect.stat)
+
+    @staticmethod
+    def _tick(effect: StatusEffect) -> None:
+        character = effect.target
+        current = getattr(character, effect.resource)
+        change = effect.per_turn
+        if isinstance(current, int):
+            change += effect.carried
+            effect.carried = change - math.trunc(change)
+            change = math.trunc(change)
+        value = current + change
+        maximum = getattr(character, f"max_{effect.resource}", None)
+        if maximum is not None:
+            value = min(value, maximum)
+        # A drain stops at 0 but leaves a value already below it alone
+        setattr(character, effect.resource, max(min(current, 0), value))
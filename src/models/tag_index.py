@@ -0,0 +1,349 @@
+import re
+import weakref
+from functools import lru_cache, reduce
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union
+
+import numpy as np
+
+
+# A tag is a word, possibly with inner dashes, e.g. "fire" or "two-handed"
+TOKEN_PATTERN = re.compile(r"\s*(?:([()!~&|+,])|([A-Za-z0-9_][A-Za-z0-9_\-]*))")
+
+OPERATOR_WORDS = {"and": "&", "or": "|", "not": "!"}
+
+# Results with at most this many entities are decoded bit by bit, larger ones with NumPy
+_SPARSE_RESULT = 32
+
+# How deeply parentheses and nots may nest in a query
+MAX_QUERY_DEPTH = 50
+
+
+class TagQueryError(ValueError):
+    """Raised for tag queries that cannot be parsed."""
+
+
+class TagInterner:
+    """
+    Gives every tag name a bit number, once, so a set of tags is one int.
+    Bits are handed out in the order tags are first seen and never reused.
+    """
+
+    __slots__ = ('_bits', '_names')
+
+    def __init__(self):
+        self._bits: Dict[str, int] = {}
+        self._names: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def bit(self, tag: str) -> int:
+        bit = self._bits.get(tag)
+        if bit is None:
+            bit = self._bits[tag] = len(self._names)
+            self._names.append(tag)
+        return bit
+
+    def find(self, tag: str) -> Optional[int]:
+        """The bit of a tag, or None if nothing has carried it yet; never interns."""
+        return self._bits.get(tag)
+
+    def mask(self, tags: Iterable[str]) -> int:
+        mask = 0
+        for tag in tags:
+            mask |= 1 << self.bit(tag)
+        return mask
+
+    def names(self, mask: int) -> List[str]:
+        return [self._names[bit] for bit in _positions(mask)]
+
+
+TAGS = TagInterner()
+
+
+def tag_names(tags: Any) -> Tuple[str, ...]:
+    """Tag names from any of the forms tags are stored in: {"tags": [...]}, a sequence, or None."""
+    if not tags:
+        return ()
+    if isinstance(tags, Mapping):
+        tags = tags.get("tags", ())
+    return (tags,) if isinstance(tags, str) else tuple(tags)
+
+
+def tag_mask(tags: Any) -> int:
+    """The bitset of the given tags, in any form tag_names accepts."""
+    return _mask(tag_names(tags))
+
+
+@lru_cache(maxsize=4096)
+def _mask(names: Tuple[str, ...]) -> int:
+    return TAGS.mask(names)
+
+
+_definition_masks: 'weakref.WeakKeyDictionary[Any, int]' = weakref.WeakKeyDictionary()
+
+
+def definition_mask(definition: Any) -> int:
+    """
+    Tags of an item definition: its own (equipment) tags and those of its
+    effects. Cached per definition, as definitions never change.
+    """
+    mask = _definition_masks.get(definition)
+    if mask is None:
+        mask = tag_mask(definition.tags)
+        for effect in definition.effects:
+            mask |= tag_mask(effect.tags)
+        _definition_masks[definition] = mask
+    return mask
+
+
+class TagQuery:
+    """
+    A parsed boolean tag query such as "fire & magic", "fire | ice" or
+    "weapon & !(cursed | broken)". `and`, `or` and `not` may be written as
+    words, and `+` or `,` also mean and. Use `parse_tag_query` to get
+    cached instances.
+    Tags nothing has carried yet are not interned: they match nothing
+    until some entity is tagged with them, when the query is compiled
+    again.
+    """
+
+    __slots__ = ('source', '_tree', '_matches', '_unknown', '_interned')
+
+    def __init__(self, source: str):
+        self.source = source
+        self._compile()
+
+    def _compile(self) -> None:
+        parser = _Parser(self.source)
+        self._tree = parser.parse()
+        self._unknown = parser.unknown
+        self._interned = len(TAGS)
+        code = compile(f"lambda mask: bool({_expression(self._tree)})", f"<tag query {self.source!r}>", "eval")
+        self._matches = eval(code, {"__builtins__": {}, "bool": bool})
+
+    def _refresh(self) -> None:
+        """Compile again if a tag that was unknown has since been interned."""
+        if len(TAGS) != self._interned:
+            if any(TAGS.find(tag) is not None for tag in self._unknown):
+                self._compile()
+            else:
+                self._interned = len(TAGS)
+
+    def __repr__(self) -> str:
+        return f"TagQuery({self.source!r})"
+
+    def matches(self, mask: int) -> bool:
+        """Whether an entity with this tag bitset matches."""
+        if self._unknown:
+            self._refresh()
+        return self._matches(mask)
+
+    def select(self, index: 'TagIndex') -> int:
+        """The bitset of the ids in `index` that match."""
+        if self._unknown:
+            self._refresh()
+        return _select(self._tree, index._postings, index._live)
+
+
+@lru_cache(maxsize=1024)
+def parse_tag_query(source: str) -> TagQuery:
+    """Parse a tag query; each distinct string is parsed once."""
+    return TagQuery(source)
+
+
+Query = Union[str, TagQuery]
+
+
+class TagIndex:
+    """
+    Inverted index from tags to the ids of tagged entities.
+    Each entity keeps a bitset of its tags, and each tag a bitset of the
+    entities carrying it, indexed by entity id, so a boolean query is a few
+    big-int ANDs and ORs however many entities there are. Entity ids are
+    chosen by the owner of the index, e.g. inventory entry ids, and are
+    best kept small and dense.
+    """
+
+    __slots__ = ('_masks', '_postings', '_live')
+
+    def __init__(self):
+        self._masks: Dict[int, int] = {}
+        self._postings: Dict[int, int] = {}
+        self._live = 0
+
+    def __len__(self) -> int:
+        return len(self._masks)
+
+    def __contains__(self, entity_id: Any) -> bool:
+        return entity_id in self._masks
+
+    def add(self, entity_id: int, tags: Any) -> None:
+        """Index an entity under its tags (a bitset, or any form tag_names accepts), replacing earlier ones."""
+        if entity_id in self._masks:
+            self.remove(entity_id)
+        mask = tags if isinstance(tags, int) else tag_mask(tags)
+        self._masks[entity_id] = mask
+        entity = 1 << entity_id
+        self._live |= entity
+        postings = self._postings
+        for bit in _positions(mask):
+            postings[bit] = postings.get(bit, 0) | entity
+
+    def remove(self, entity_id: int) -> bool:
+        mask = self._masks.pop(entity_id, None)
+        if mask is None:
+            return False
+        entity = 1 << entity_id
+        self._live &= ~entity
+        postings = self._postings
+        for bit in _positions(mask):
+            postings[bit] &= ~entity
+        return True
+
+    def mask_of(self, entity_id: int) -> int:
+        return self._masks.get(entity_id, 0)
+
+    def query(self, query: Query) -> int:
+        """The bitset of the matching entity ids."""
+        return _as_query(query).select(self)
+
+    def ids(self, query: Query) -> List[int]:
+        """The matching entity ids, ascending."""
+        return _positions(self.query(query))
+
+    def count(self, query: Query) -> int:
+        return self.query(query).bit_count()
+
+    def matches(self, entity_id: int, query: Query) -> bool:
+        return entity_id in self._masks and _as_query(query).matches(self._masks[entity_id])
+
+
+def _as_query(query: Query) -> TagQuery:
+    return query if isinstance(query, TagQuery) else parse_tag_query(query)
+
+
+def _positions(bits: int) -> List[int]:
+    """The set bits of an int, ascending."""
+    if bits.bit_count() <= _SPARSE_RESULT:
+        positions = []
+        while bits:
+            lowest = bits & -bits
+            positions.append(lowest.bit_length() - 1)
+            bits ^= lowest
+        return positions
+    raw = np.frombuffer(bits.to_bytes((bits.bit_length() + 7) // 8, 'little'), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(raw, bitorder='little')).tolist()
+
+
+# Query trees are nested tuples: ("tag", bit), ("none",) for a tag nobody
+# carries, ("not", node), ("and", nodes) or ("or", nodes)
+
+def _expression(node: Tuple) -> str:
+    """Python source testing a tag bitset named `mask` against the tree."""
+    kind = node[0]
+    if kind == "tag":
+        return f"mask >> {node[1]} & 1"
+    if kind == "none":
+        return "0"
+    if kind == "not":
+        return f"not ({_expression(node[1])})"
+    return f" {kind} ".join(f"({_expression(child)})" for child in node[1])
+
+
+def _select(node: Tuple, postings: Dict[int, int], live: int) -> int:
+    kind = node[0]
+    if kind == "tag":
+        return postings.get(node[1], 0)
+    if kind == "none":
+        return 0
+    if kind == "not":
+        return live & ~_select(node[1], postings, live)
+    children = (_select(child, postings, live) for child in node[1])
+    if kind == "and":
+        return reduce(lambda left, right: left & right, children, live)
+    return reduce(lambda left, right: left | right, children, 0)
+
+
+class _Parser:
+    """Recursive descent over the query tokens; NOT binds tightest, then AND, then OR."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.tokens = self._tokenize(source)
+        self.position = 0
+        self.depth = 0
+        # Tags of the query that nothing carries yet
+        self.unknown: Set[str] = set()
+
+    def _tokenize(self, source: str) -> List[Tuple[str, str]]:
+        tokens = []
+        position = 0
+        while position < len(source):
+            if source[position:].strip() == "":
+                break
+            match = TOKEN_PATTERN.match(source, position)
+            if match is None:
+                raise TagQueryError(f"Invalid tag query {source!r} at {source[position:]!r}")
+            position = match.end()
+            operator, word = match.group(1), match.group(2)
+            if word is not None and word.lower() in OPERATOR_WORDS:
+                operator, word = OPERATOR_WORDS[word.lower()], None
+            if operator in ("+", ","):
+                operator = "&"
+            elif operator == "~":
+                operator = "!"
+            tokens.append(("op", operator) if operator is not None else ("tag", word))
+        return tokens
+
+    def _peek(self) -> Tuple[str, str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else ("end", "")
+
+    def _take(self) -> Tuple[str, str]:
+        token = self._peek()
+        self.position += 1
+        return token
+
+    def parse(self) -> Tuple:
+        if not self.tokens:
+            raise TagQueryError("Empty tag query")
+        tree = self._any()
+        if self._peek()[0] != "end":
+            raise TagQueryError(f"Invalid tag query {self.source!r}: unexpected {self._peek()[1]!r}")
+        return tree
+
+    def _any(self) -> Tuple:
+        children = [self._all()]
+        while self._peek() == ("op", "|"):
+            self._take()
+            children.append(self._all())
+        return children[0] if len(children) == 1 else ("or", tuple(children))
+
+    def _all(self) -> Tuple:
+        children = [self._one()]
+        while self._peek() == ("op", "&"):
+            self._take()
+            children.append(self._one())
+        return children[0] if len(children) == 1 else ("and", tuple(children))
+
+    def _one(self) -> Tuple:
+        kind, value = self._take()
+        if kind == "tag":
+            bit = TAGS.find(value)
+            if bit is None:
+                self.unknown.add(value)
+                return ("none",)
+            return ("tag", bit)
+        if (kind, value) in (("op", "!"), ("op", "(")):
+            self.depth += 1
+            if self.depth > MAX_QUERY_DEPTH:
+                raise TagQueryError(f"Invalid tag query: nested more than {MAX_QUERY_DEPTH} deep")
+            if value == "!":
+                tree = ("not", self._one())
+            else:
+                tree = self._any()
+                if self._take() != ("op", ")"):
+                    raise TagQueryError(f"Invalid tag query {self.source!r}: missing ')'")
+            self.depth -= 1
+            return tree
+        raise TagQueryError(f"Invalid tag query {self.source!r}: expected a tag, got {value or 'the end'!r}")
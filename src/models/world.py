@@ -0,0 +1,294 @@
+import heapq
+import math
+from array import array
+from collections import OrderedDict, deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .game_state import Location
+
+
+def describe_surroundings(world: Any, name: str, max_steps: int = 2) -> str:
+    """
+    Summarise a location, its exits and what lies a few steps further.
+    Works on any world that provides `location`, `neighbours` and `nearby`.
+    """
+    location = world.location(name)
+    lines = [f"Current location: {name}"]
+    if location is not None and location.description:
+        lines.append(location.description)
+    try:
+        exits = world.neighbours(name)
+        further = [f"{other} ({steps} steps)"
+                   for other, steps in world.nearby(name, max_steps) if steps > 1]
+    except KeyError:
+        exits, further = [], []
+    lines.append(f"Exits: {', '.join(exits) if exits else 'none'}")
+    if further:
+        lines.append(f"Further away: {', '.join(further)}")
+    return "\n".join(lines)
+
+
+class World:
+    """
+    Registry and connection graph of every known location.
+    Location names are interned to integer ids; each id has an adjacency
+    array of neighbour ids, so resolving a neighbour is a list lookup and
+    route queries never scan the whole world. Routes are cached until the
+    graph is next edited.
+    """
+
+    ROUTE_CACHE_SIZE = 256
+
+    def __init__(self):
+        self._names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        # None for places that are only known as someone's connection so far
+        self._locations: List[Optional['Location']] = []
+        self._adjacency: List[array] = []
+        self._x = array('d')
+        self._y = array('d')
+        self._positioned = 0
+        self._routes: 'OrderedDict[Tuple[str, int, int], Optional[Tuple[int, ...]]]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        location_id = self._ids.get(name)
+        return location_id is not None and self._locations[location_id] is not None
+
+    def __iter__(self) -> Iterator['Location']:
+        return (location for location in self._locations if location is not None)
+
+    def _intern(self, name: str) -> int:
+        location_id = self._ids.get(name)
+        if location_id is None:
+            location_id = len(self._names)
+            self._ids[name] = location_id
+            self._names.append(name)
+            self._locations.append(None)
+            self._adjacency.append(array('I'))
+            self._x.append(math.nan)
+            self._y.append(math.nan)
+        return location_id
+
+    def _edited(self) -> None:
+        self._routes.clear()
+
+    def location_id(self, name: str) -> int:
+        """Return the interned id of a location name."""
+        try:
+            return self._ids[name]
+        except KeyError:
+            raise KeyError(f"Unknown location: {name}") from None
+
+    def name_of(self, location_id: int) -> str:
+        return self._names[location_id]
+
+    def location(self, name: str) -> Optional['Location']:
+        """Return the location with the given name, or None if it has not been added."""
+        location_id = self._ids.get(name)
+        return None if location_id is None else self._locations[location_id]
+
+    def add_location(self, location: 'Location',
+                     position: Optional[Tuple[float, float]] = None) -> int:
+        """
+        Register a location and its outgoing connections.
+        Connections to places that have not been added yet are interned as
+        well, so the location can be filled in later.
+        """
+        location_id = self._intern(location.name)
+        self._locations[location_id] = location
+        neighbours = self._adjacency[location_id]
+        for connection in location.connections:
+            neighbour_id = self._intern(connection)
+            if neighbour_id not in neighbours:
+                neighbours.append(neighbour_id)
+        if position is not None:
+            self.set_position(location.name, position)
+        self._edited()
+        return location_id
+
+    def set_position(self, name: str, position: Tuple[float, float]) -> None:
+        """Give a location map coordinates, used as the distance metric for A*."""
+        location_id = self._intern(name)
+        if math.isnan(self._x[location_id]):
+            self._positioned += 1
+        self._x[location_id], self._y[location_id] = position
+        self._edited()
+
+    def position(self, name: str) -> Optional[Tuple[float, float]]:
+        location_id = self.location_id(name)
+        if math.isnan(self._x[location_id]):
+            return None
+        return self._x[location_id], self._y[location_id]
+
+    def connect(self, source: str, target: str, both_ways: bool = True) -> None:
+        """Connect two locations, by default in both directions."""
+        pairs = [(source, target), (target, source)] if both_ways else [(source, target)]
+        for start, end in pairs:
+            start_id, end_id = self._intern(start), self._intern(end)
+            if end_id not in self._adjacency[start_id]:
+                self._adjacency[start_id].append(end_id)
+                location = self._locations[start_id]
+                if location is not None and end not in location.connections:
+                    location.connections.append(end)
+        self._edited()
+
+    def disconnect(self, source: str, target: str, both_ways: bool = True) -> None:
+        """Remove the connection between two locations."""
+        pairs = [(source, target), (target, source)] if both_ways else [(source, target)]
+        for start, end in pairs:
+            start_id, end_id = self.location_id(start), self.location_id(end)
+            neighbours = self._adjacency[start_id]
+            if end_id in neighbours:
+                neighbours.remove(end_id)
+                location = self._locations[start_id]
+                if location is not None and end in location.connections:
+                    location.connections.remove(end)
+        self._edited()
+
+    def neighbours(self, name: str) -> List[str]:
+        """Names of the locations directly reachable from `name`."""
+        names = self._names
+        return [names[neighbour_id] for neighbour_id in self._adjacency[self.location_id(name)]]
+
+    def _cached_route(self, kind: str, start: str, goal: str, search) -> Optional[List[str]]:
+        key = (kind, self.location_id(start), self.location_id(goal))
+        if key in self._routes:
+            self._routes.move_to_end(key)
+            path = self._routes[key]
+        else:
+            path = search(*key[1:])
+            self._routes[key] = path
+            if len(self._routes) > self.ROUTE_CACHE_SIZE:
+                self._routes.popitem(last=False)
+        return None if path is None else [self._names[location_id] for location_id in path]
+
+    def route(self, start: str, goal: str) -> Optional[List[str]]:
+        """Return the route with the fewest steps from start to goal, or None if unreachable."""
+        return self._cached_route("steps", start, goal, self._breadth_first)
+
+    def shortest_route(self, start: str, goal: str) -> Optional[List[str]]:
+        """
+        Return the route with the shortest travelled distance, or None if unreachable.
+        Steps between positioned locations cost their map distance and any
+        other step costs 1. The search is A* guided by straight-line distance
+        once every location has a position, and plain Dijkstra otherwise.
+        """
+        return self._cached_route("distance", start, goal, self._a_star)
+
+    def route_length(self, route: List[str]) -> float:
+        """Total travelled distance along a route, as measured by `shortest_route`."""
+        ids = [self.location_id(name) for name in route]
+        return sum(self._step_cost(a, b) for a, b in zip(ids, ids[1:]))
+
+    def _path_to(self, parents: array, goal: int) -> Tuple[int, ...]:
+        path = [goal]
+        while parents[path[-1]] != path[-1]:
+            path.append(parents[path[-1]])
+        return tuple(reversed(path))
+
+    def _breadth_first(self, start: int, goal: int) -> Optional[Tuple[int, ...]]:
+        parents = array('i', [-1]) * len(self._names)
+        parents[start] = start
+        queue = deque([start])
+        adjacency = self._adjacency
+        while queue:
+            current = queue.popleft()
+            if current == goal:
+                return self._path_to(parents, goal)
+            for neighbour in adjacency[current]:
+                if parents[neighbour] < 0:
+                    parents[neighbour] = current
+                    queue.append(neighbour)
+        return None
+
+    def _step_cost(self, a: int, b: int) -> float:
+        distance = math.hypot(self._x[a] - self._x[b], self._y[a] - self._y[b])
+        return 1.0 if math.isnan(distance) else distance
+
+    def _a_star(self, start: int, goal: int) -> Optional[Tuple[int, ...]]:
+        x, y = self._x, self._y
+        if self._positioned == len(self._names):
+            goal_x, goal_y = x[goal], y[goal]
+            heuristic = lambda node: math.hypot(x[node] - goal_x, y[node] - goal_y)
+        else:
+            heuristic = lambda node: 0.0
+
+        parents = array('i', [-1]) * len(self._names)
+        costs = array('d', [math.inf]) * len(self._names)
+        parents[start] = start
+        costs[start] = 0.0
+        frontier = [(heuristic(start), 0.0, start)]
+        adjacency = self._adjacency
+        while frontier:
+            _, reached_cost, current = heapq.heappop(frontier)
+            if current == goal:
+                return self._path_to(parents, goal)
+            if reached_cost > costs[current]:
+                continue  # Stale entry for a node already reached more cheaply
+            for neighbour in adjacency[current]:
+                cost = costs[current] + self._step_cost(current, neighbour)
+                if cost < costs[neighbour]:
+                    costs[neighbour] = cost
+                    parents[neighbour] = current
+                    heapq.heappush(frontier, (cost + heuristic(neighbour), cost, neighbour))
+        return None
+
+    def nearby(self, name: str, max_steps: int = 2, limit: int = 10) -> List[Tuple[str, int]]:
+        """Locations within `max_steps` of `name`, closest first, with their step counts."""
+        start = self.location_id(name)
+        steps = {start: 0}
+        queue = deque([start])
+        result = []
+        while queue and len(result) < limit:
+            current = queue.popleft()
+            if steps[current] == max_steps:
+                continue
+            for neighbour in self._adjacency[current]:
+                if neighbour not in steps:
+                    steps[neighbour] = steps[current] + 1
+                    queue.append(neighbour)
+                    result.append((self._names[neighbour], steps[neighbour]))
+        return result[:limit]
+
+    def describe(self, name: str, max_steps: int = 2) -> str:
+        """Summarise a location and its surroundings for the game master's prompt."""
+        return describe_surroundings(self, name, max_steps)
+
+    def to_dict(self) -> Dict[str, Any]:
+        locations = []
+        for location_id, name in enumerate(self._names):
+            location = self._locations[location_id]
+            data = {
+                "name": name,
+                "description": location.description if location is not None else None,
+                "connections": self.neighbours(name)
+            }
+            if not math.isnan(self._x[location_id]):
+                data["position"] = [self._x[location_id], self._y[location_id]]
+            locations.append(data)
+        return {"locations": locations}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'World':
+        from .game_state import Location
+
+        if "chunk_directory" in data:
+            from .world_chunks import StreamingWorld
+            return StreamingWorld.from_dict(data)
+
+        world = cls()
+        for entry in data.get("locations", []):
+            if entry.get("description") is None:
+                # Only known as a connection; keep its id and edges without a location
+                location_id = world._intern(entry["name"])
+                for connection in entry.get("connections", []):
+                    world._adjacency[location_id].append(world._intern(connection))
+            else:
+                world.add_location(Location.from_dict(entry))
+            if "position" in entry:
+                world.set_position(entry["name"], tuple(entry["position"]))
+        return world
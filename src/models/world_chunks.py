@@ -0,0 +1,467 @@
+import json
+import math
+import os
+import queue
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .events import EventStream, LocationChanged, StateRestored
+from .game_state import Location
+from .world import World, describe_surroundings
+
+
+INDEX_FILE = "world.json"
+UNPLACED = "unplaced"
+DEFAULT_CHUNK_SIZE = 16.0
+
+
+def chunk_key(position: Optional[Tuple[float, float]], chunk_size: float) -> str:
+    """Name of the region chunk that holds a map position."""
+    if position is None:
+        return UNPLACED
+    return f"{math.floor(position[0] / chunk_size)}_{math.floor(position[1] / chunk_size)}"
+
+
+def _chunk_path(directory: str, key: str) -> str:
+    return os.path.join(directory, f"chunk_{key}.json.z")
+
+
+def _write_file(path: str, data: bytes) -> None:
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as handle:
+        handle.write(data)
+    os.replace(temp_path, path)
+
+
+def write_world_chunks(world: World, directory: str, chunk_size: float = DEFAULT_CHUNK_SIZE) -> None:
+    """
+    Partition a world into region chunks on disk.
+    Locations are grouped by the square of the map their position falls in;
+    locations without a position share one chunk. An index mapping every
+    location name to its chunk is written alongside.
+    """
+    os.makedirs(directory, exist_ok=True)
+    chunks: Dict[str, List[Dict[str, Any]]] = {}
+    for location in world:
+        position = world.position(location.name)
+        entry = {
+            "name": location.name,
+            "description": location.description,
+            "connections": world.neighbours(location.name)
+        }
+        if position is not None:
+            entry["position"] = list(position)
+        chunks.setdefault(chunk_key(position, chunk_size), []).append(entry)
+
+    for key, entries in chunks.items():
+        _write_file(_chunk_path(directory, key), zlib.compress(json.dumps(entries).encode("utf-8")))
+    _write_file(os.path.join(directory, INDEX_FILE), json.dumps({
+        "chunk_size": chunk_size,
+        "chunks": {key: len(entries) for key, entries in chunks.items()},
+        "locations": {entry["name"]: key for key, entries in chunks.items() for entry in entries}
+    }).encode("utf-8"))
+
+
+@dataclass
+class ChunkStats:
+    """Counters for tuning chunk size and prefetch radius."""
+    hits: int = 0
+    stalls: int = 0
+    stall_seconds: float = 0.0
+    prefetched: int = 0
+    evictions: int = 0
+    write_backs: int = 0
+
+
+class _Chunk:
+    __slots__ = ('locations', 'positions', 'dirty')
+
+    def __init__(self, entries: List[Dict[str, Any]] = ()):
+        self.locations: Dict[str, Location] = {}
+        self.positions: Dict[str, Tuple[float, float]] = {}
+        self.dirty = False
+        for entry in entries:
+            self.locations[entry["name"]] = Location.from_dict(entry)
+            if "position" in entry:
+                self.positions[entry["name"]] = tuple(entry["position"])
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        entries = []
+        for name, location in self.locations.items():
+            entry = location.to_dict()
+            if name in self.positions:
+                entry["position"] = list(self.positions[name])
+            entries.append(entry)
+        return entries
+
+
+class StreamingWorld:
+    """
+    A world whose locations live in region chunks on disk.
+    Only the name-to-chunk index is kept in memory permanently. Chunks are
+    loaded on first access and evicted least recently used once more than
+    `max_loaded_locations` are resident; the chunk holding the player is
+    never evicted. When the player moves, the surrounding chunks are
+    prefetched on a background thread so walking rarely waits on disk.
+    Accesses that do have to wait are counted in `stats`.
+
+    Apart from the prefetch thread, the world is used from a single thread.
+    """
+
+    ROUTE_CACHE_SIZE = 256
+
+    def __init__(self, directory: str, max_loaded_locations: int = 50_000, prefetch_radius: int = 1):
+        self.directory = directory
+        self.max_loaded_locations = max_loaded_locations
+        self.prefetch_radius = prefetch_radius
+        with open(os.path.join(directory, INDEX_FILE), "rb") as handle:
+            index = json.load(handle)
+        self.chunk_size: float = index["chunk_size"]
+        self._chunk_sizes: Dict[str, int] = index["chunks"]
+        self._chunk_of: Dict[str, str] = index["locations"]
+        self._index_dirty = False
+
+        self._lock = threading.Lock()
+        self._resident: 'OrderedDict[str, _Chunk]' = OrderedDict()
+        self._loaded_locations = 0
+        self._in_flight: Dict[str, threading.Event] = {}
+        self._current_chunk: Optional[str] = None
+        self._stats = ChunkStats()
+        self._routes: 'OrderedDict[Tuple[str, str], Optional[Tuple[str, ...]]]' = OrderedDict()
+
+        self._requests: 'queue.Queue[Optional[str]]' = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._chunk_of)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._chunk_of
+
+    @property
+    def stats(self) -> ChunkStats:
+        """A copy of the chunk counters."""
+        with self._lock:
+            return replace(self._stats)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = ChunkStats()
+
+    @property
+    def loaded_locations(self) -> int:
+        return self._loaded_locations
+
+    @property
+    def resident_chunks(self) -> List[str]:
+        with self._lock:
+            return list(self._resident)
+
+    def _read_chunk(self, key: str) -> _Chunk:
+        with open(_chunk_path(self.directory, key), "rb") as handle:
+            return _Chunk(json.loads(zlib.decompress(handle.read())))
+
+    def _fetch(self, key: str) -> Tuple[_Chunk, bool]:
+        """Make a chunk resident, returning it and whether this call read it from disk."""
+        while True:
+            with self._lock:
+                chunk = self._resident.get(key)
+                if chunk is not None:
+                    return chunk, False
+                event = self._in_flight.get(key)
+                owner = event is None
+                if owner:
+                    event = self._in_flight[key] = threading.Event()
+            if not owner:
+                # Someone else is already reading it
+                event.wait()
+                continue
+            try:
+                chunk = self._read_chunk(key)
+            except BaseException:
+                with self._lock:
+                    del self._in_flight[key]
+                event.set()
+                raise
+            # Resident and no longer in flight in one step, so an eviction never sees both
+            with self._lock:
+                self._resident[key] = chunk
+                self._loaded_locations += len(chunk.locations)
+                del self._in_flight[key]
+            event.set()
+            return chunk, True
+
+    def _chunk(self, key: str) -> _Chunk:
+        """Return a resident chunk, loading it now if it is not in memory."""
+        with self._lock:
+            chunk = self._resident.get(key)
+            if chunk is not None:
+                self._resident.move_to_end(key)
+                self._stats.hits += 1
+        if chunk is not None:
+            if self._loaded_locations > self.max_loaded_locations:
+                # Background prefetches may have pushed the world over its cap
+                self._evict()
+            return chunk
+        start = time.perf_counter()
+        chunk, _ = self._fetch(key)
+        with self._lock:
+            self._resident.move_to_end(key)
+            self._stats.stalls += 1
+            self._stats.stall_seconds += time.perf_counter() - start
+        self._evict()
+        return chunk
+
+    def _evict(self) -> None:
+        """Drop least recently used chunks until the world fits its memory cap."""
+        while True:
+            with self._lock:
+                if self._loaded_locations <= self.max_loaded_locations:
+                    return
+                key = next((key for key in self._resident if key != self._current_chunk), None)
+                if key is None or key == next(reversed(self._resident)):
+                    return  # Never drop the chunk that was just used
+                chunk = self._resident.pop(key)
+                self._loaded_locations -= len(chunk.locations)
+                self._stats.evictions += 1
+                writing = None
+                if chunk.dirty:
+                    # Until the edits are on disk, a fetch of the chunk waits instead of reading the old file
+                    writing = self._in_flight[key] = threading.Event()
+            if writing is not None:
+                try:
+                    self._write_chunk(key, chunk)
+                finally:
+                    with self._lock:
+                        del self._in_flight[key]
+                    writing.set()
+
+    def _write_chunk(self, key: str, chunk: _Chunk) -> None:
+        _write_file(_chunk_path(self.directory, key),
+                    zlib.compress(json.dumps(chunk.to_list()).encode("utf-8")))
+        chunk.dirty = False
+        with self._lock:
+            self._stats.write_backs += 1
+
+    def _run_prefetch(self) -> None:
+        while True:
+            key = self._requests.get()
+            if key is None:
+                return
+            try:
+                _, loaded = self._fetch(key)
+            except OSError:
+                continue  # The access that needs it will report the error
+            if loaded:
+                with self._lock:
+                    self._stats.prefetched += 1
+
+    def prefetch(self, keys: List[str]) -> None:
+        """Queue chunks to be loaded in the background."""
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run_prefetch, daemon=True)
+            self._worker.start()
+        with self._lock:
+            wanted = [key for key in keys if key not in self._resident and key not in self._in_flight]
+        for key in wanted:
+            self._requests.put(key)
+
+    def visit(self, name: str) -> None:
+        """Note that the player is at `name`: keep its chunk resident and prefetch around it."""
+        key = self._chunk_of.get(name)
+        if key is None:
+            return
+        self._current_chunk = key
+        location = self._chunk(key).locations[name]
+
+        nearby = []
+        if key != UNPLACED:
+            x, y = (int(part) for part in key.split("_"))
+            radius = self.prefetch_radius
+            nearby = [f"{x + dx}_{y + dy}"
+                      for dx in range(-radius, radius + 1) for dy in range(-radius, radius + 1)]
+        nearby.extend(self._chunk_of[connection] for connection in location.connections
+                      if connection in self._chunk_of)
+        self.prefetch([other for other in dict.fromkeys(nearby)
+                       if other != key and other in self._chunk_sizes])
+
+    def follow(self, events: EventStream, current_location: Callable[[], str]) -> Callable[[], None]:
+        """Visit the player's location whenever a game state reports it may have changed."""
+        def on_changes(changes):
+            if any(isinstance(change, (LocationChanged, StateRestored)) for change in changes):
+                self.visit(current_location())
+
+        return events.subscribe(on_changes)
+
+    def close(self) -> None:
+        """Stop the prefetch thread."""
+        if self._worker is not None:
+            self._requests.put(None)
+            self._worker.join()
+            self._worker = None
+
+    def location(self, name: str) -> Optional[Location]:
+        """Return the location with the given name, or None if the world has no such place."""
+        key = self._chunk_of.get(name)
+        return None if key is None else self._chunk(key).locations[name]
+
+    def position(self, name: str) -> Optional[Tuple[float, float]]:
+        return self._chunk(self._chunk_of[name]).positions.get(name)
+
+    def neighbours(self, name: str) -> List[str]:
+        """Names of the locations directly reachable from `name`."""
+        location = self.location(name)
+        if location is None:
+            raise KeyError(f"Unknown location: {name}")
+        return list(location.connections)
+
+    def _edited(self, chunk: _Chunk) -> None:
+        chunk.dirty = True
+        self._routes.clear()
+
+    def add_location(self, location: Location, position: Optional[Tuple[float, float]] = None) -> None:
+        """Add or replace a location, placing it in the chunk for its position."""
+        old_key = self._chunk_of.get(location.name)
+        key = chunk_key(position, self.chunk_size) if position is not None or old_key is None else old_key
+        if old_key is not None and old_key != key:
+            old_chunk = self._chunk(old_key)
+            del old_chunk.locations[location.name]
+            old_chunk.positions.pop(location.name, None)
+            self._chunk_sizes[old_key] -= 1
+            with self._lock:
+                self._loaded_locations -= 1
+            self._edited(old_chunk)
+
+        if key in self._chunk_sizes:
+            chunk = self._chunk(key)
+        else:
+            chunk = _Chunk()
+            with self._lock:
+                self._resident[key] = chunk
+            self._chunk_sizes[key] = 0
+        if location.name not in chunk.locations:
+            self._chunk_sizes[key] += 1
+            with self._lock:
+                self._loaded_locations += 1
+        chunk.locations[location.name] = location
+        if position is not None:
+            chunk.positions[location.name] = tuple(position)
+        self._chunk_of[location.name] = key
+        self._index_dirty = True
+        self._edited(chunk)
+        self._evict()
+
+    def connect(self, source: str, target: str, both_ways: bool = True) -> None:
+        """Connect two locations, by default in both directions."""
+        pairs = [(source, target), (target, source)] if both_ways else [(source, target)]
+        for start, end in pairs:
+            key = self._chunk_of.get(start)
+            if key is None:
+                continue  # Unexplored places only exist as someone's connection
+            chunk = self._chunk(key)
+            if end not in chunk.locations[start].connections:
+                chunk.locations[start].connections.append(end)
+                self._edited(chunk)
+
+    def disconnect(self, source: str, target: str, both_ways: bool = True) -> None:
+        """Remove the connection between two locations."""
+        pairs = [(source, target), (target, source)] if both_ways else [(source, target)]
+        for start, end in pairs:
+            key = self._chunk_of.get(start)
+            if key is None:
+                continue
+            chunk = self._chunk(key)
+            if end in chunk.locations[start].connections:
+                chunk.locations[start].connections.remove(end)
+                self._edited(chunk)
+
+    def route(self, start: str, goal: str) -> Optional[List[str]]:
+        """
+        Return the route with the fewest steps from start to goal, or None if unreachable.
+        Chunks along the way are loaded as the search reaches them.
+        """
+        if start not in self._chunk_of:
+            raise KeyError(f"Unknown location: {start}")
+        key = (start, goal)
+        if key in self._routes:
+            self._routes.move_to_end(key)
+            path = self._routes[key]
+            return None if path is None else list(path)
+
+        parents: Dict[str, Optional[str]] = {start: None}
+        pending = deque([start])
+        path = None
+        while pending:
+            current = pending.popleft()
+            if current == goal:
+                path = [current]
+                while parents[path[-1]] is not None:
+                    path.append(parents[path[-1]])
+                path = tuple(reversed(path))
+                break
+            if current not in self._chunk_of:
+                continue  # Known only as a connection, so it leads nowhere yet
+            for neighbour in self.location(current).connections:
+                if neighbour not in parents:
+                    parents[neighbour] = current
+                    pending.append(neighbour)
+
+        self._routes[key] = path
+        if len(self._routes) > self.ROUTE_CACHE_SIZE:
+            self._routes.popitem(last=False)
+        return None if path is None else list(path)
+
+    def nearby(self, name: str, max_steps: int = 2, limit: int = 10) -> List[Tuple[str, int]]:
+        """Locations within `max_steps` of `name`, closest first, with their step counts."""
+        steps = {name: 0}
+        pending = deque([name])
+        result = []
+        while pending and len(result) < limit:
+            current = pending.popleft()
+            if steps[current] == max_steps or current not in self._chunk_of:
+                continue
+            for neighbour in self.location(current).connections:
+                if neighbour not in steps:
+                    steps[neighbour] = steps[current] + 1
+                    pending.append(neighbour)
+                    result.append((neighbour, steps[neighbour]))
+        return result[:limit]
+
+    def describe(self, name: str, max_steps: int = 2) -> str:
+        """Summarise a location and its surroundings for the game master's prompt."""
+        return describe_surroundings(self, name, max_steps)
+
+    def save(self) -> None:
+        """Write edited chunks and the index back to disk."""
+        with self._lock:
+            dirty = [(key, chunk) for key, chunk in self._resident.items() if chunk.dirty]
+        for key, chunk in dirty:
+            self._write_chunk(key, chunk)
+        if self._index_dirty:
+            _write_file(os.path.join(self.directory, INDEX_FILE), json.dumps({
+                "chunk_size": self.chunk_size,
+                "chunks": self._chunk_sizes,
+                "locations": self._chunk_of
+            }).encode("utf-8"))
+            self._index_dirty = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Save pending edits and refer to the chunk directory."""
+        self.save()
+        return {
+            "chunk_directory": self.directory,
+            "max_loaded_locations": self.max_loaded_locations,
+            "prefetch_radius": self.prefetch_radius
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'StreamingWorld':
+        return cls(
+            data["chunk_directory"],
+            max_loaded_locations=data.get("max_loaded_locations", 50_000),
+            prefetch_radius=data.get("prefetch_radius", 1)
+        )
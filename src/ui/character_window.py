@@ -318,15 +318,15 @@ class ClassPanel(QWidget):
             
             # Add cost information if available
             if skill.cost:
-                cost_text = f"<p><b>Cost:</b> {skill.cost.get('amount', 0)} {skill.cost.get('resource', 'mana')}</p>"
+                cost_text = f"<p><b>Cost:</b> {skill.cost_at():g} {skill.cost.get('resource', 'mana')}</p>"
                 tooltip += cost_text
             
             # Add effects information if available
             if skill.effects:
                 effects_text = "<p><b>Effects:</b></p><ul>"
-                for effect in skill.effects:
+                for index, effect in enumerate(skill.effects):
                     action = effect.get("action", "")
-                    value = effect.get("value", 0)
+                    value = f"{skill.effect_value_at(index):g}"
                     target = effect.get("target_group", "")
                     effects_text += f"<li>{action.capitalize()} {value} to {target}</li>"
                 effects_text += "</ul>"
@@ -404,16 +404,24 @@ class WorldPanel(QWidget):
         
         self.setLayout(layout)
     
-    def update_location(self, location):
+    def update_location(self, location, world=None):
         """Update the world panel with new location information."""
         # Set location name and description with explicit styling
         self.location_name.setText(f"<h3>{location.name}</h3>")
         self.location_description.setText(f"<p>{location.description}</p>")
         
-        # Update connections list
+        # Update connections list, resolving neighbours through the world graph when available
         self.connections_list.clear()
-        for connection in location.connections:
-            self.connections_list.addItem(connection)
+        if world is None or location.name not in world:
+            for connection in location.connections:
+                self.connections_list.addItem(connection)
+            return
+        for connection in world.neighbours(location.name):
+            list_item = QListWidgetItem(connection)
+            neighbour = world.location(connection)
+            if neighbour is not None:
+                list_item.setToolTip(neighbour.description)
+            self.connections_list.addItem(list_item)
 
 
 class CharacterWindow(QWidget):
@@ -503,6 +511,6 @@ class CharacterWindow(QWidget):
             character.experience_to_next_level
         )
     
-    def update_location(self, location):
+    def update_location(self, location, world=None):
         """Update the world panel with new location information."""
-        self.world_panel.update_location(location) 
\ No newline at end of file
+        self.world_panel.update_location(location, world) 
\ No newline at end of file
@@ -123,14 +123,46 @@ class InventoryPanel(QWidget):
         self.inventory_list.clear()
         
         for item in items:
-            list_item = QListWidgetItem(item.name)
-            list_item.setData(Qt.ItemDataRole.UserRole, item)
-            
-            # Gray out equipped items
-            if hasattr(item, 'equipped') and item.equipped:
-                list_item.setForeground(Qt.GlobalColor.gray)
-            
-            self.inventory_list.addItem(list_item)
+            self.add_item(item)
+    
+    def add_item(self, item):
+        """Append a single item to the inventory list."""
+        list_item = QListWidgetItem(item.name)
+        list_item.setData(Qt.ItemDataRole.UserRole, item)
+        self._style_list_item(list_item, item)
+        self.inventory_list.addItem(list_item)
+    
+    def remove_item(self, item):
+        """Remove a single item from the inventory list."""
+        list_item = self._find_list_item(item)
+        if list_item:
+            if self.current_item is list_item:
+                self._hide_tooltip()
+            self.inventory_list.takeItem(self.inventory_list.row(list_item))
+    
+    def refresh_item(self, item):
+        """Redraw a single item after its state (e.g. equipped) changed."""
+        list_item = self._find_list_item(item)
+        if list_item:
+            list_item.setText(item.name)
+            self._style_list_item(list_item, item)
+    
+    def _find_list_item(self, item):
+        """Find the list entry holding this exact item object."""
+        # Search from the end, since recently added items change most often
+        for row in range(self.inventory_list.count() - 1, -1, -1):
+            list_item = self.inventory_list.item(row)
+            if list_item.data(Qt.ItemDataRole.UserRole) is item:
+                return list_item
+        return None
+    
+    def _style_list_item(self, list_item, item):
+        """Apply the styling for an item's state."""
+        # Gray out equipped items
+        if hasattr(item, 'equipped') and item.equipped:
+            list_item.setForeground(Qt.GlobalColor.gray)
+        else:
+            list_item.setData(Qt.ItemDataRole.ForegroundRole, None)
     
     def _show_context_menu(self, position):
         """Show the context menu for an item."""
@@ -2,7 +2,7 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTe
                              QLineEdit, QPushButton, QSplitter, QDialog, QSpacerItem, QSizePolicy, QListWidgetItem, QLabel, QMenu, QMenuBar,
                              QStatusBar, QApplication)
 from PyQt6.QtCore import Qt, pyqtSignal, QSize, QTimer
-from PyQt6.QtGui import QAction, QIcon, QFont, QTextCursor
+from PyQt6.QtGui import QAction, QIcon, QFont, QTextCursor, QKeySequence
 
 from src.ui.status_bar import StatusBar
 from src.ui.inventory_panel import InventoryPanel
@@ -90,12 +90,16 @@ class MainWindow(QMainWindow):
     gm_message_sent = pyqtSignal(str)
     gm_message_received = pyqtSignal(str)
     theme_toggled = pyqtSignal()
+    undo_requested = pyqtSignal()
+    redo_requested = pyqtSignal()
+    history_requested = pyqtSignal(str)
     
     def __init__(self):
         super().__init__()
         self.setWindowTitle("AI-Driven Text Adventure Game")
         self.resize(1200, 800)
         self.character_window = None
+        self._world = None
         
         # Initialize theme manager
         self.theme_manager = ThemeManager()
@@ -146,6 +150,9 @@ class MainWindow(QMainWindow):
         self.story_text_edit = QTextEdit()
         self.story_text_edit.setObjectName("mainStoryTextEdit")
         self.story_text_edit.setReadOnly(True)
+        self.story_text_edit.verticalScrollBar().actionTriggered.connect(
+            lambda action: self._on_log_scrolled("story", self.story_text_edit)
+        )
         left_layout.addWidget(self.story_text_edit)
         
         # Story input area
@@ -183,6 +190,9 @@ class MainWindow(QMainWindow):
         self.gm_text_edit = QTextEdit()
         self.gm_text_edit.setObjectName("gmLogTextEdit")
         self.gm_text_edit.setReadOnly(True)
+        self.gm_text_edit.verticalScrollBar().actionTriggered.connect(
+            lambda action: self._on_log_scrolled("gm", self.gm_text_edit)
+        )
         
         # GM input area
         gm_input_layout = QHBoxLayout()
@@ -270,6 +280,19 @@ class MainWindow(QMainWindow):
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
         
+        # Edit menu
+        edit_menu = menu_bar.addMenu("Edit")
+        
+        undo_action = QAction("Undo Last Action", self)
+        undo_action.setShortcut(QKeySequence.StandardKey.Undo)
+        undo_action.triggered.connect(self.undo_requested)
+        edit_menu.addAction(undo_action)
+        
+        redo_action = QAction("Redo", self)
+        redo_action.setShortcut(QKeySequence.StandardKey.Redo)
+        redo_action.triggered.connect(self.redo_requested)
+        edit_menu.addAction(redo_action)
+        
         # Character menu
         character_menu = menu_bar.addMenu("Character")
         
@@ -357,35 +380,67 @@ class MainWindow(QMainWindow):
         # This ensures the character class and location information is displayed
         if hasattr(self, '_character') and hasattr(self, '_location'):
             self.character_window.update_character(self._character)
-            self.character_window.update_location(self._location)
+            self.character_window.update_location(self._location, self._world)
     
     def _toggle_theme(self):
         """Toggle between light and dark themes."""
         self.theme_toggled.emit()
     
+    def _format_message(self, sender, text):
+        """Format a log message for display."""
+        if sender == "GM":
+            return f"<span style='color:#89b4fa;'>GM:</span> {text}"
+        return f"<span style='color:#a6e3a1;'>You:</span> {text}"
+    
     def update_story_log(self, messages):
         """Update the story log with new messages."""
         self.story_text_edit.clear()
         for message in messages:
-            sender = message["sender"]
-            text = message["message"]
-            
-            if sender == "GM":
-                self.story_text_edit.append(f"<span style='color:#89b4fa;'>GM:</span> {text}")
-            else:
-                self.story_text_edit.append(f"<span style='color:#a6e3a1;'>You:</span> {text}")
+            self.append_story_message(message["sender"], message["message"])
     
     def update_gm_log(self, messages):
         """Update the GM log with new messages."""
         self.gm_text_edit.clear()
         for message in messages:
-            sender = message["sender"]
-            text = message["message"]
-            
-            if sender == "GM":
-                self.gm_text_edit.append(f"<span style='color:#89b4fa;'>GM:</span> {text}")
-            else:
-                self.gm_text_edit.append(f"<span style='color:#a6e3a1;'>You:</span> {text}")
+            self.append_gm_message(message["sender"], message["message"])
+    
+    def append_story_message(self, sender, text):
+        """Append a single message to the story log."""
+        self.story_text_edit.append(self._format_message(sender, text))
+    
+    def append_gm_message(self, sender, text):
+        """Append a single message to the GM log."""
+        self.gm_text_edit.append(self._format_message(sender, text))
+    
+    def prepend_story_messages(self, messages):
+        """Insert older messages at the top of the story log."""
+        self._prepend_messages(self.story_text_edit, messages)
+    
+    def prepend_gm_messages(self, messages):
+        """Insert older messages at the top of the GM log."""
+        self._prepend_messages(self.gm_text_edit, messages)
+    
+    def _prepend_messages(self, text_edit, messages):
+        """Insert messages above the current content, keeping the visible text in place."""
+        if not messages:
+            return
+        scroll_bar = text_edit.verticalScrollBar()
+        old_maximum = scroll_bar.maximum()
+        old_value = scroll_bar.value()
+        
+        cursor = QTextCursor(text_edit.document())
+        cursor.movePosition(QTextCursor.MoveOperation.Start)
+        for message in messages:
+            cursor.insertHtml(self._format_message(message["sender"], message["message"]))
+            cursor.insertBlock()
+        
+        scroll_bar.setValue(old_value + scroll_bar.maximum() - old_maximum)
+    
+    def _on_log_scrolled(self, log, text_edit):
+        """Ask for older history when the user scrolls to the top of a log."""
+        scroll_bar = text_edit.verticalScrollBar()
+        if scroll_bar.sliderPosition() == scroll_bar.minimum():
+            self.history_requested.emit(log)
     
     def update_inventory(self, items):
         """Update the inventory panel with new items."""
@@ -395,6 +450,44 @@ class MainWindow(QMainWindow):
         if self.character_window:
             self.character_window.inventory_panel.update_inventory(items)
     
+    def add_inventory_item(self, item):
+        """Add a single item to the inventory panels."""
+        self.inventory_panel.add_item(item)
+        if self.character_window:
+            self.character_window.inventory_panel.add_item(item)
+    
+    def remove_inventory_item(self, item):
+        """Remove a single item from the inventory panels."""
+        self.inventory_panel.remove_item(item)
+        if self.character_window:
+            self.character_window.inventory_panel.remove_item(item)
+    
+    def refresh_inventory_item(self, item):
+        """Redraw a single item in the inventory panels."""
+        self.inventory_panel.refresh_item(item)
+        if self.character_window:
+            self.character_window.inventory_panel.refresh_item(item)
+    
+    def update_equipment(self, equipment):
+        """Update the equipment slots in the character window."""
+        if self.character_window:
+            self.character_window.equipment_panel.update_equipment(equipment)
+    
+    def update_experience(self, level, experience, experience_to_next_level):
+        """Update the level and experience display in the character window."""
+        if self.character_window:
+            self.character_window.class_panel.update_experience(level, experience, experience_to_next_level)
+    
+    def set_world(self, world):
+        """Set the world graph used to resolve the connections of locations."""
+        self._world = world
+    
+    def update_location(self, location):
+        """Update the current location in the character window."""
+        self._location = location
+        if self.character_window:
+            self.character_window.update_location(location, self._world)
+    
     def update_status_bar(self, health, max_health, mana, max_mana, stamina, max_stamina, time_of_day):
         """Update the status bar with new stats."""
         self.status_bar.update_stats(health, max_health, mana, max_mana, stamina, max_stamina, time_of_day)
@@ -408,7 +501,7 @@ class MainWindow(QMainWindow):
         # Update character window if it exists
         if self.character_window:
             self.character_window.update_character(character)
-            self.character_window.update_location(location)
+            self.character_window.update_location(location, self._world)
             
             # Ensure inventory is synced
             if hasattr(self, 'inventory_panel') and self.inventory_panel:
@@ -437,114 +530,23 @@ class MainWindow(QMainWindow):
     
     def _handle_item_equipped(self, item):
         """Handle item equipping."""
-        # This would typically send a message to the backend
-        self.story_text_edit.append(f"<span style='color:#a6e3a1;'>You:</span> I equip the {item.name}.")
-        
-        # Actually equip the item in the character's equipment
-        if hasattr(self, '_character'):
-            # Mark the item as equipped first
-            item.equipped = True
-            
-            # Add to equipment
-            if item.slot == 'two_handed':
-                # Unequip main_hand and off_hand if equipping a two-handed weapon
-                if self._character.equipment.equipment['main_hand']:
-                    self._character.equipment.equipment['main_hand'].equipped = False
-                if self._character.equipment.equipment['off_hand']:
-                    self._character.equipment.equipment['off_hand'].equipped = False
-                self._character.equipment.equipment['main_hand'] = None
-                self._character.equipment.equipment['off_hand'] = None
-                self._character.equipment.equipment['two_handed'] = item
-            elif item.slot in ['main_hand', 'off_hand']:
-                # Unequip two_handed if equipping a one-handed weapon
-                if self._character.equipment.equipment['two_handed']:
-                    self._character.equipment.equipment['two_handed'].equipped = False
-                self._character.equipment.equipment['two_handed'] = None
-                if self._character.equipment.equipment[item.slot]:
-                    self._character.equipment.equipment[item.slot].equipped = False
-                self._character.equipment.equipment[item.slot] = item
-            elif item.slot == 'accessories':
-                # Add to accessories list
-                if 'accessories' not in self._character.equipment.equipment:
-                    self._character.equipment.equipment['accessories'] = []
-                if len(self._character.equipment.equipment['accessories']) < self._character.equipment.MAX_ACCESSORIES:
-                    self._character.equipment.equipment['accessories'].append(item)
-            else:
-                # Regular equipment slot
-                if self._character.equipment.equipment[item.slot]:
-                    self._character.equipment.equipment[item.slot].equipped = False
-                self._character.equipment.equipment[item.slot] = item
-            
-            # Update both inventory panels with the current inventory
-            current_inventory = self._get_inventory_items()
-            self.inventory_panel.update_inventory(current_inventory)
-            
-            # Update character window if it exists
-            if self.character_window:
-                self.character_window.equipment_panel.update_equipment(self._character.equipment.equipment)
-                self.character_window.inventory_panel.update_inventory(current_inventory)
+        # The character applies the slot rules and publishes the change, which refreshes the panels
+        if hasattr(self, '_character') and self._character.equip_item(item):
+            # This would typically send a message to the backend
+            self.story_text_edit.append(f"<span style='color:#a6e3a1;'>You:</span> I equip the {item.name}.")
     
     def _handle_item_unequipped_from_inventory(self, item):
         """Handle item unequipping from the inventory panel."""
-        # This would typically send a message to the backend
-        self.story_text_edit.append(f"<span style='color:#a6e3a1;'>You:</span> I unequip the {item.name}.")
-        
-        # Actually unequip the item from the character's equipment
-        if hasattr(self, '_character'):
-            # Find the slot that contains this item
-            slot = None
-            for slot_name, equipped_item in self._character.equipment.equipment.items():
-                if equipped_item == item:
-                    slot = slot_name
-                    break
-            
-            if slot:
-                # Remove from equipment
-                if slot == 'accessories':
-                    if 'accessories' in self._character.equipment.equipment:
-                        if item in self._character.equipment.equipment['accessories']:
-                            self._character.equipment.equipment['accessories'].remove(item)
-                            item.equipped = False
-                else:
-                    self._character.equipment.equipment[slot] = None
-                    item.equipped = False
-                
-                # Update both inventory panels with the current inventory
-                current_inventory = self._get_inventory_items()
-                self.inventory_panel.update_inventory(current_inventory)
-                
-                # Update character window if it exists
-                if self.character_window:
-                    self.character_window.equipment_panel.update_equipment(self._character.equipment.equipment)
-                    self.character_window.inventory_panel.update_inventory(current_inventory)
+        # The equipment knows which slot holds the item
+        if hasattr(self, '_character') and self._character.unequip(item):
+            # This would typically send a message to the backend
+            self.story_text_edit.append(f"<span style='color:#a6e3a1;'>You:</span> I unequip the {item.name}.")
     
     def _handle_item_unequipped(self, slot, item):
         """Handle item unequipping from equipment slots."""
-        # This would typically send a message to the backend
-        self.story_text_edit.append(f"<span style='color:#a6e3a1;'>You:</span> I unequip the {item.name}.")
-        
-        # Actually unequip the item from the character's equipment
-        if hasattr(self, '_character'):
-            # Remove from equipment
-            if slot == 'accessories':
-                if 'accessories' in self._character.equipment.equipment:
-                    if item in self._character.equipment.equipment['accessories']:
-                        self._character.equipment.equipment['accessories'].remove(item)
-                        item.equipped = False
-            else:
-                self._character.equipment.equipment[slot] = None
-                item.equipped = False
-            
-            # Update both inventory panels with the current inventory
-            # Note: We don't need to add the item back to inventory manually
-            # because it's already in the character's inventory list, just marked as equipped
-            current_inventory = self._get_inventory_items()
-            self.inventory_panel.update_inventory(current_inventory)
-            
-            # Update character window if it exists
-            if self.character_window:
-                self.character_window.equipment_panel.update_equipment(self._character.equipment.equipment)
-                self.character_window.inventory_panel.update_inventory(current_inventory)
+        if hasattr(self, '_character') and self._character.unequip(item):
+            # This would typically send a message to the backend
+            self.story_text_edit.append(f"<span style='color:#a6e3a1;'>You:</span> I unequip the {item.name}.")
     
     def _create_inventory_item(self, item):
         """Create a QListWidgetItem for an inventory item."""
@@ -552,15 +554,6 @@ class MainWindow(QMainWindow):
         list_item.setData(Qt.ItemDataRole.UserRole, item)
         return list_item
     
-    def _get_inventory_items(self):
-        """Get all items from the inventory panel."""
-        items = []
-        for i in range(self.inventory_panel.inventory_list.count()):
-            item = self.inventory_panel.inventory_list.item(i)
-            if item:
-                items.append(item.data(Qt.ItemDataRole.UserRole))
-        return items
-    
     def closeEvent(self, event):
         """Handle the window close event."""
         # Stop the game master conversation
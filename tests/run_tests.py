@@ -11,14 +11,64 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from tests.test_ui import TestUI
+from tests.test_search_index import TestSearchIndex
+from tests.test_events import TestEvents
+from tests.test_history import TestHistory
+from tests.test_save_file import TestSaveFile
+from tests.test_world import TestWorld
+from tests.test_world_chunks import TestWorldChunks
+from tests.test_schema import TestSchema
+from tests.test_character_stats import TestCharacterStats
+from tests.test_equipment_totals import TestEquipmentTotals
+from tests.test_inventory import TestInventory
+from tests.test_item_identity import TestItemIdentity
+from tests.test_item_registry import TestItemRegistry
+from tests.test_models import TestModels
+from tests.test_serializers import TestSerializers
+from tests.test_formulas import TestFormulas
+from tests.test_experience import TestExperience
+from tests.test_dice import TestDice
+from tests.test_combat_sim import TestCombatSim
+from tests.test_status_effects import TestStatusEffects
+from tests.test_battle import TestBattle
+from tests.test_balance import TestBalance
+from tests.test_gear_optimizer import TestGearOptimizer
+from tests.test_tag_index import TestTagIndex
+from tests.test_loot import TestLoot
+from tests.test_equip import TestEquip
 
 def run_tests():
-    """Run all UI tests."""
+    """Run all UI and model tests."""
     # Create test suite
     test_suite = unittest.TestSuite()
     
     # Add test cases
     test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestUI))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSearchIndex))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestEvents))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestHistory))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSaveFile))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestWorld))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestWorldChunks))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSchema))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestCharacterStats))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestEquipmentTotals))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestInventory))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestItemIdentity))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestItemRegistry))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestModels))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSerializers))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestFormulas))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestExperience))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestDice))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestCombatSim))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestStatusEffects))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestBattle))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestBalance))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestGearOptimizer))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestTagIndex))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestLoot))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestEquip))
     
     # Run tests
     runner = unittest.TextTestRunner(verbosity=2)
@@ -0,0 +1,105 @@
+import sys
+import os
+import tempfile
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.balance import (BalanceCell, CheckpointError, balance_matrix, load_classes, loadouts,
+                                read_checkpoint, run_balance, wilson_interval)
+from src.models.game_state import GameState
+
+
+SPECS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'specs')
+
+
+def item(name, slot, **stats):
+    return {"name": name, "item_type": "weapon", "description": "", "slot": slot, **stats}
+
+
+class TestBalance(unittest.TestCase):
+    """Test suite for the balance report."""
+
+    def test_enumerates_classes_and_loadouts(self):
+        """Test that class specs are read without running them and loadouts respect the slots."""
+        classes = load_classes(os.path.join(SPECS, 'character_class_reference.py'))
+        self.assertEqual([data["name"] for data in classes], ["Arcane Adept"])
+
+        items = [item("Sword", "main_hand"), item("Shield", "off_hand"), item("Greatsword", "two_handed"),
+                 item("Ring", "accessories"), item("Amulet", "accessories")]
+        names = {" + ".join(entry["name"] for entry in loadout) for loadout in loadouts(items)}
+        # Hands: empty, sword, shield, both or the greatsword alone; then no accessory or one of two
+        self.assertEqual(len(names), 5 * 3)
+        self.assertIn("Sword + Shield + Ring", names)
+        self.assertIn("Greatsword + Amulet", names)
+        self.assertNotIn("Sword + Greatsword", names)
+        self.assertEqual(len(balance_matrix(classes * 2, items)), 2 * 15)
+
+    def test_wilson_interval(self):
+        """Test that win rate intervals contain the rate, narrow with more fights and stay in [0, 1]."""
+        small, large = wilson_interval(8, 10), wilson_interval(800, 1000)
+        self.assertTrue(small.low < 0.8 < small.high)
+        self.assertLess(large.high - large.low, small.high - small.low)
+        never = wilson_interval(0, 50)
+        self.assertEqual((never.mean, never.low), (0, 0))
+        self.assertGreater(never.high, 0)
+
+    def test_resumes_from_checkpoint(self):
+        """Test that a resumed or parallel report repeats the results of a single uninterrupted run."""
+        demo = GameState.create_demo_state().character
+        template = demo.to_dict()
+        adept = demo.character_class.to_dict()
+        cells = balance_matrix([adept], [item("Sword", "main_hand", attack_dice=["1d8"]),
+                                         item("Hat", "head", magic_attack=3)])
+        opponent = BalanceCell(adept)
+        expected = run_balance(cells, template, opponent, fights=300, seed=5, workers=1)
+        self.assertEqual([result.loadout for result in expected], ["no gear", "Sword", "Hat", "Hat + Sword"])
+        self.assertGreater(expected[1].dps.mean, expected[0].dps.mean)
+
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, 'balance.jsonl')
+            run_balance(cells[:2], template, opponent, fights=300, seed=5, workers=1, checkpoint=checkpoint)
+            with open(checkpoint, 'a', encoding='utf-8') as f:
+                f.write('{"class": "Arcane Ad')  # Cut short by a crash
+            self.assertEqual(len(read_checkpoint(checkpoint)), 2)
+
+            ran = []
+            resumed = run_balance(cells, template, opponent, fights=300, seed=5, workers=2,
+                                  checkpoint=checkpoint, progress=lambda result, done, total: ran.append(done))
+            self.assertEqual(ran, [3, 4])
+            self.assertEqual(len(read_checkpoint(checkpoint)), 4)
+
+            # Results of other fights, seeds or opponents are never mixed in
+            for changes in ({"fights": 200}, {"seed": 6}, {"max_rounds": 20},
+                            {"opponent": BalanceCell(adept, cells[1].items)}):
+                settings = {"fights": 300, "seed": 5, "opponent": opponent, **changes}
+                with self.assertRaises(CheckpointError, msg=str(changes)):
+                    run_balance(cells, template, settings.pop("opponent"), workers=1, checkpoint=checkpoint,
+                                **settings)
+        self.assertEqual(resumed, expected)
+
+    def test_changed_cells_run_again(self):
+        """Test that resuming re-runs cells whose class or items changed since they were saved."""
+        demo = GameState.create_demo_state().character
+        template = demo.to_dict()
+        adept = demo.character_class.to_dict()
+        opponent = BalanceCell(adept)
+        cells = balance_matrix([adept], [item("Sword", "main_hand", physical_attack=2)])
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, 'balance.jsonl')
+            first = run_balance(cells, template, opponent, fights=200, seed=5, workers=1, checkpoint=checkpoint)
+
+            ran = []
+            sharper = balance_matrix([adept], [item("Sword", "main_hand", physical_attack=40)])
+            resumed = run_balance(sharper, template, opponent, fights=200, seed=5, workers=1, checkpoint=checkpoint,
+                                  progress=lambda result, done, total: ran.append(result.loadout))
+            self.assertEqual(ran, ["Sword"])
+            self.assertEqual(resumed[0], first[0])
+            self.assertGreater(resumed[1].dps.mean, first[1].dps.mean)
+            self.assertEqual(run_balance(sharper, template, opponent, fights=200, seed=5, workers=1,
+                                         checkpoint=checkpoint), resumed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import sys
+import os
+import unittest
+
+import numpy as np
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.battle import ALLIES, ENEMIES, Battle
+from src.models.combat_sim import ActionEffect, Combatant, SkillAction
+from src.models.dice import parse_dice
+from src.models.status_effects import StatusEffect
+
+
+def combatant(name, health=100, attack=0, speed=10, skills=()):
+    """A combatant with fixed basic attack damage and plenty of mana."""
+    return Combatant(name=name, max_health=health, max_mana=100, max_stamina=0, health=health, mana=100,
+                     stamina=0, speed=speed, physical_attack=attack, magic_attack=5, physical_defense=0,
+                     magic_defense=0, attack_dice=parse_dice("0"), skills=skills)
+
+
+def skill(kind, value, target_group, cost=10):
+    return SkillAction(kind.title(), "mana", cost,
+                       (ActionEffect(kind, value, parse_dice("0"), magic=True, target_group=target_group),))
+
+
+class TestBattle(unittest.TestCase):
+    """Test suite for the group turn resolver."""
+
+    def test_area_effects_hit_every_living_opponent(self):
+        """Test that an area effect reaches the whole opposing side in one action and costs once."""
+        # Far slower targets practically never dodge
+        mage = combatant("Mage", speed=1000, skills=(skill("damage", 20, "enemies"),))
+        horde = combatant("Goblin", health=40, speed=1)
+        battle = Battle([mage], [horde] * 300, seed=45)
+        result = battle.resolve_round()
+        np.testing.assert_allclose(result.damage[1:], 25)
+        self.assertEqual(battle.resources["mana"][0], 90)
+        battle.resolve_round()
+        self.assertEqual(battle.run(), ALLIES)
+        self.assertEqual(battle.survivors(ENEMIES), 0)
+
+    def test_faster_tiers_act_first(self):
+        """Test that a faster side can finish a fight before the slower side acts."""
+        quick = combatant("Quick", attack=200, speed=1000)
+        slow = combatant("Slow", attack=200, speed=1)
+        battle = Battle([slow, slow], [quick, quick, quick], seed=45)
+        while battle.winner is None:
+            result = battle.resolve_round()
+            self.assertEqual(result.damage[2:].tolist(), [0, 0, 0])
+        self.assertEqual(battle.winner, ENEMIES)
+        self.assertEqual(battle.survivors(ENEMIES), 3)
+
+    def test_sleep_and_healing(self):
+        """Test that sleep skips turns and ticks for everyone, and heals go to the most wounded ally."""
+        sleeper = combatant("Sleeper", speed=1000, skills=(skill("status", 1, "enemies"),))
+        healer = combatant("Healer", speed=999, skills=(skill("heal", 30, "single_ally"),))
+        brute = combatant("Brute", attack=10, speed=1)
+        battle = Battle([sleeper, healer], [brute] * 4, seed=45)
+        battle.health[0] = 20
+        first = battle.resolve_round()
+        self.assertEqual(first.damage.sum(), 0)
+        self.assertEqual(battle.health[0], 50)
+        self.assertEqual(battle.asleep.tolist(), [0] * 6)
+        self.assertEqual(battle.resources["mana"][:2].tolist(), [90, 90])
+
+    def test_statuses_run_on_the_engine(self):
+        """Test that sleep, stat and per-round resource effects tick through the status effect engine."""
+        sleeper = combatant("Sleeper", speed=1000, skills=(skill("status", 2, "enemies", cost=100),))
+        target = combatant("Target", health=500, attack=10, speed=1)
+        battle = Battle([sleeper], [target, target], seed=45)
+        battle.add_status(1, StatusEffect("Poison", 3, resource="health", per_turn=-15))
+        battle.add_status(2, StatusEffect("Rage", 1, stat="physical_attack", amount=40))
+        battle.resolve_round()
+        self.assertEqual(battle.asleep.tolist(), [False, True, True])
+        self.assertEqual(battle.health[1:].tolist(), [485, 500])
+        self.assertEqual(battle.physical_attack[2], 10)
+
+        # Out of mana, the sleeper lands a 1 point basic attack on one of them
+        battle.resolve_round()
+        self.assertEqual(battle.asleep.tolist(), [False] * 3)
+        self.assertEqual(battle.health[0], 100)
+        self.assertEqual(battle.health[1:].sum(), 1000 - 30 - 1)
+        battle.resolve_round()
+        self.assertEqual(battle.health[1:].sum(), 1000 - 45 - 2)
+        self.assertEqual(len(battle.statuses), 0)
+
+    def test_the_defeated_stay_down(self):
+        """Test that statuses end with their target's defeat, so regeneration cannot revive it."""
+        killer = combatant("Killer", attack=30, speed=1000)
+        weak = combatant("Weak", health=5, speed=1)
+        battle = Battle([killer], [weak, weak], seed=45)
+        for index in (1, 2):
+            battle.add_status(index, StatusEffect("Regeneration", 5, resource="health", per_turn=10))
+        first = battle.resolve_round()
+        self.assertEqual(len(first.defeated), 1)
+        self.assertEqual(battle.health[first.defeated[0]], -25)
+        self.assertEqual(battle.survivors(ENEMIES), 1)
+        self.assertEqual(len(battle.statuses), 1)
+        self.assertEqual(battle.run(), ALLIES)
+        self.assertEqual(battle.health[1:].tolist(), [-25, -25])
+        self.assertEqual(len(battle.statuses), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
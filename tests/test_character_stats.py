@@ -0,0 +1,121 @@
+import sys
+import os
+import random
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.game_state import GameState
+from src.models.item import EquipmentItem
+
+
+def expected_stats(character):
+    """Recompute the derived stats from scratch, following the reference spec."""
+    def stat(name):
+        modifiers = character.stat_modifiers.get(name, {})
+        return getattr(character, name) + max([0, *modifiers.values()])
+
+    items = character.equipment.items()
+    return {
+        'speed': max(stat('agility'), stat('strength') / 2) / 2 + 5,
+        'physical_attack': stat('strength') * 2 + sum(item.physical_attack for item in items),
+        'magic_attack': stat('focus') * 2 + sum(item.magic_attack for item in items),
+        'physical_defense': stat('endurance') * 0.1 + sum(item.physical_defense for item in items),
+        'magic_defense': stat('willpower') * 0.1 + sum(item.magic_defense for item in items),
+        'basic_attack_dice': ('1d6',) + tuple(dice for item in items for dice in item.attack_dice),
+    }
+
+
+class TestCharacterStats(unittest.TestCase):
+    """Test suite for cached derived character stats."""
+
+    def setUp(self):
+        self.state = GameState.create_demo_state()
+        self.character = self.state.character
+
+    def assert_stats_current(self):
+        for name, value in expected_stats(self.character).items():
+            if isinstance(value, tuple):
+                self.assertEqual(sorted(getattr(self.character, name)), sorted(value))
+            else:
+                self.assertAlmostEqual(getattr(self.character, name), value, msg=name)
+
+    def test_only_affected_stats_are_invalidated(self):
+        """Test that changing an input drops only the stats that read it."""
+        for name in expected_stats(self.character):
+            getattr(self.character, name)
+        self.character.luck += 5
+        self.assertEqual(len(self.character._derived), 6)
+
+        self.character.focus += 1
+        self.assertNotIn('magic_attack', self.character._derived)
+        self.assertIn('physical_attack', self.character._derived)
+        self.assert_stats_current()
+
+    def test_random_changes_match_recomputation(self):
+        """Test cached values against a full recomputation after random edits."""
+        rng = random.Random(11)
+        gear = [
+            EquipmentItem(name=f"Gear {i}", item_type="armor", description="", slot=slot,
+                          physical_attack=rng.randint(0, 5), magic_defense=rng.randint(0, 5),
+                          attack_dice=["1d4"] if slot == "main_hand" else [])
+            for i, slot in enumerate(["head", "chest", "main_hand", "accessories", "accessories"])
+        ]
+        for item in gear:
+            self.character.add_to_inventory(item)
+
+        for _ in range(300):
+            action = rng.randrange(5)
+            if action == 0:
+                setattr(self.character, rng.choice(['strength', 'focus', 'endurance', 'willpower', 'agility']),
+                        rng.randint(1, 30))
+            elif action == 1:
+                self.character.equip_item(rng.choice(gear))
+            elif action == 2:
+                self.character.unequip_item(rng.choice(["head", "chest", "main_hand"]))
+            elif action == 3 and self.character.equipment.equipment["accessories"]:
+                self.character.unequip_accessory(self.character.equipment.equipment["accessories"][0])
+            elif action == 4:
+                stat = rng.choice(['strength', 'agility', 'willpower'])
+                if not self.character.remove_stat_modifier("blessing", stat):
+                    self.character.set_stat_modifier("blessing", stat, rng.randint(1, 8))
+            self.assert_stats_current()
+
+    def test_restore_and_direct_edits(self):
+        """Test that undo and direct slot edits do not leave stale values."""
+        sword = next(item for item in self.character.inventory if item.name == "Fire Elemental Sword")
+        self.state.checkpoint()
+        self.character.equip_item(sword)
+        self.assertEqual(self.character.basic_attack_dice, ('1d6', '1d6'))
+        self.state.undo()
+        self.assertEqual(self.character.basic_attack_dice, ('1d6',))
+
+        self.character.equipment.equipment['main_hand'] = sword
+        self.character.invalidate_derived_stats()
+        self.assert_stats_current()
+
+    def test_equipment_methods_invalidate(self):
+        """Test that equipping through the equipment itself drops the stats that read it."""
+        hat = next(item for item in self.character.inventory if item.name == "Wizard Hat")
+        self.assert_stats_current()
+        self.assertTrue(self.character.equipment.equip(hat))
+        self.assert_stats_current()
+        self.character.equipment.remove(hat)
+        self.assert_stats_current()
+        self.assertTrue(self.character.equipment.equip(hat))
+        self.character.equipment.unequip('head')
+        self.assert_stats_current()
+
+    def test_dodge_chance(self):
+        """Test that faster characters dodge more often, within probability bounds."""
+        opponent = GameState.create_demo_state().character
+        even = self.character.dodge_chance(opponent)
+        self.character.set_stat_modifier("haste", "agility", 40)
+        self.assertGreater(self.character.dodge_chance(opponent), even)
+        self.assertLess(opponent.dodge_chance(self.character), even)
+        self.assertTrue(0 < opponent.dodge_chance(self.character) < self.character.dodge_chance(opponent) < 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
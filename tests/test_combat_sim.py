@@ -0,0 +1,67 @@
+import sys
+import os
+import dataclasses
+import unittest
+
+import numpy as np
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.character import Character
+from src.models.combat_sim import Combatant, compare_builds, simulate_duels
+from src.models.dice import parse_dice
+from src.models.game_state import GameState
+
+
+def dummy(name, health=100, attack=0, speed=10):
+    """A combatant with no skills and fixed basic attack damage."""
+    return Combatant(name=name, max_health=health, max_mana=0, max_stamina=0, health=health, mana=0,
+                     stamina=0, speed=speed, physical_attack=attack, magic_attack=0, physical_defense=0,
+                     magic_defense=0, attack_dice=parse_dice("0"))
+
+
+class TestCombatSim(unittest.TestCase):
+    """Test suite for the vectorized combat simulator."""
+
+    def test_converts_characters(self):
+        """Test that combatants take the character's derived stats and scaled skills."""
+        character = GameState.create_demo_state().character
+        character.skills[0].level = 3
+        combatant = Combatant.from_character(character)
+        self.assertEqual(combatant.physical_attack, character.physical_attack)
+        self.assertEqual(combatant.attack_dice.notation, " + ".join(character.basic_attack_dice))
+        blast = combatant.skills[0]
+        self.assertEqual((blast.kind, blast.resource), ("damage", "mana"))
+        self.assertAlmostEqual(blast.cost, character.skills[0].cost_at())
+        self.assertTrue(blast.effects[0].magic)
+        self.assertEqual([skill.kind for skill in combatant.skills], ["damage", "heal", "status"])
+
+    def test_time_to_kill_matches_dodge_odds(self):
+        """Test that rounds to kill follow the number of hits needed and the chance to land one."""
+        hunter, target = dummy("Hunter", health=1000, attack=10), dummy("Target", health=30)
+        report = simulate_duels(hunter, target, fights=200000, seed=43)
+        hit = 1 - Character.dodge_probability(0)
+        self.assertEqual(report.wins.tolist(), [200000, 0])
+        self.assertAlmostEqual(report.rounds_to_kill[0], 3 / hit, delta=0.02)
+        # Harmless attacks still deal the minimum of 1 damage
+        self.assertLess(report.curves["health"][0, -1], 1000)
+        self.assertLessEqual(report.curves["health"][1, -1], 0)
+
+    def test_reports_are_reproducible(self):
+        """Test that seeded runs repeat exactly and resources stay within their bounds."""
+        adept = Combatant.from_character(GameState.create_demo_state().character)
+        brute = dataclasses.replace(dummy("Brute", health=140, attack=30), speed=8)
+        first = compare_builds([adept, brute], brute, fights=5000, seed=7)
+        second = compare_builds([adept, brute], brute, fights=5000, seed=7)
+        for a, b in zip(first, second):
+            self.assertEqual(a.wins.tolist(), b.wins.tolist())
+            np.testing.assert_array_equal(a.curves["mana"], b.curves["mana"])
+        mana = first[0].curves["mana"][0]
+        self.assertTrue(np.all(np.diff(mana) <= 0) and mana[-1] >= 0)
+        self.assertTrue(np.all(first[0].curves["health"][0] <= adept.max_health))
+        self.assertEqual(first[0].wins.sum() + first[0].draws, 5000)
+
+
+if __name__ == '__main__':
+    unittest.main()
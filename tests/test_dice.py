@@ -0,0 +1,88 @@
+import sys
+import os
+import itertools
+import random
+import time
+import unittest
+
+import numpy as np
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.dice import MAX_EXACT_WORK, Dice, DiceError, DiceStreams, dice_pool, parse_dice
+
+
+class TestDice(unittest.TestCase):
+    """Test suite for the dice notation engine."""
+
+    def test_parses_notation(self):
+        """Test that groups, keep, explode and modifiers are parsed and bad notation is refused."""
+        dice = parse_dice("4d6kh3 + 1d10! - 2")
+        self.assertEqual([(group.count, group.sides, group.explode, group.keep) for group in dice.groups],
+                         [(4, 6, False, 3), (1, 10, True, None)])
+        self.assertEqual(dice.modifier, -2)
+        self.assertIs(parse_dice("2d6"), parse_dice("2d6"))
+        self.assertEqual(dice_pool(["1d6", "1d10"]).notation, "1d6 + 1d10")
+        for notation in ("", "d", "2d0", "1d1!", "4d6kh0", "2d6 3", "2d6++1", "1d6; import os"):
+            with self.assertRaises(DiceError, msg=notation):
+                parse_dice(notation)
+
+    def test_distributions_are_exact(self):
+        """Test that analytic distributions match enumerating every outcome."""
+        exact = {}
+        for faces in itertools.product(range(1, 7), repeat=4):
+            total = sum(sorted(faces)[1:]) + 1
+            exact[total] = exact.get(total, 0) + 1 / 6 ** 4
+        distribution = parse_dice("4d6kh3+1").distribution()
+        self.assertEqual(set(distribution), set(exact))
+        for total, chance in exact.items():
+            self.assertAlmostEqual(distribution[total], chance, places=12)
+
+        dice = parse_dice("2d6-1d4")
+        self.assertAlmostEqual(dice.mean(), 7 - 2.5)
+        self.assertAlmostEqual(dice.variance(), 2 * 35 / 12 + 15 / 12)
+        self.assertEqual((dice.minimum, dice.maximum), (-2, 11))
+        # 1d6! shows 6 then 1-5 with chance 1/36 each
+        self.assertAlmostEqual(parse_dice("1d6!").distribution()[9], 1 / 36)
+        self.assertAlmostEqual(parse_dice("1d20").chance_at_least(15), 6 / 20)
+
+    def test_rolls_follow_the_distribution(self):
+        """Test that single and batched rolls are seeded per stream and match the analytic moments."""
+        random.seed(42)
+        first, second = DiceStreams(7), DiceStreams(7)
+        self.assertEqual([first.roll("3d6!kh2", "combat") for _ in range(20)],
+                         [second.roll("3d6!kh2", "combat") for _ in range(20)])
+        self.assertEqual(first.roll_many("1d20", 10, "loot").tolist(),
+                         second.roll_many("1d20", 10, "loot").tolist())
+
+        for notation in ("1d10", "4d6kh3", "2d8!+3", "3d6!kh2-1d4"):
+            dice = parse_dice(notation)
+            batch = dice.roll_many(200000, np.random.default_rng(42))
+            singles = [dice.roll() for _ in range(20000)]
+            spread = dice.variance() ** 0.5
+            self.assertTrue(dice.minimum <= batch.min() and batch.max() <= dice.maximum, notation)
+            self.assertAlmostEqual(batch.mean(), dice.mean(), delta=5 * spread / 200000 ** 0.5)
+            self.assertAlmostEqual(sum(singles) / len(singles), dice.mean(), delta=5 * spread / 20000 ** 0.5)
+
+
+    def test_costly_distributions_are_sampled(self):
+        """Test that expressions too costly to work out exactly are estimated quickly and repeatably."""
+        self.assertLess(parse_dice("4d6kh3+1").exact_work(), MAX_EXACT_WORK)
+        for notation in ("20d1000kh10", "1000d10000!kh500 + 1000d100 - 3"):
+            dice = Dice(notation)
+            self.assertGreater(dice.exact_work(), MAX_EXACT_WORK)
+            started = time.perf_counter()
+            distribution = dice.distribution()
+            self.assertLess(time.perf_counter() - started, 1.5, notation)
+            self.assertAlmostEqual(sum(distribution.values()), 1.0)
+            self.assertEqual(Dice(notation).distribution(), distribution)
+            self.assertTrue(dice.minimum <= min(distribution) and max(distribution) <= dice.maximum)
+            batch = dice.roll_many(20000, np.random.default_rng(42))
+            self.assertAlmostEqual(batch.mean(), dice.mean(), delta=5 * dice.variance() ** 0.5 / 20000 ** 0.5)
+        self.assertEqual((Dice("20d1000kh10").minimum, Dice("20d1000kh10").maximum), (10, 10000))
+        self.assertEqual(Dice("2d6! - 1d4").maximum, 2 * 66 - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
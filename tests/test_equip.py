@@ -0,0 +1,140 @@
+import sys
+import os
+import random
+import unittest
+
+from PyQt6.QtWidgets import QApplication
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.character import CharacterEquipment
+from src.models.game_state import GameState
+from src.models.item import EquipmentItem
+from src.ui.main_window import MainWindow
+
+SLOTS = ['head', 'chest', 'main_hand', 'off_hand', 'two_handed', 'accessories', 'accessories']
+
+
+def gear(name, slot, **stats):
+    return EquipmentItem(name=name, item_type="armor", description="", slot=slot, **stats)
+
+
+class TestEquip(unittest.TestCase):
+    """Test suite for the transactional equip engine shared by the model and the UI."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create the application once, unless another suite already did."""
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.state = GameState.create_demo_state()
+        self.character = self.state.character
+        self.notifications = []
+        self.character.events.subscribe(self.notifications.append)
+
+    def assert_consistent(self, owned):
+        """Every item is in the inventory, and worn ones are also in the slot the index says and flagged."""
+        equipment = self.character.equipment
+        worn = equipment.items()
+        for slot, item in equipment.equipment.items():
+            for held in (item if slot == 'accessories' else [item] if item else []):
+                self.assertEqual(equipment.slot_of(held), slot)
+        self.assertEqual(len(worn), len(set(worn)))
+        self.assertEqual({item for item in self.character.inventory if getattr(item, 'equipped', False)},
+                         set(worn))
+        self.assertEqual(set(self.character.inventory), owned)
+        self.assertLessEqual(len(equipment.equipment['accessories']), CharacterEquipment.MAX_ACCESSORIES)
+        self.assertFalse(equipment.equipment['two_handed'] and
+                         (equipment.equipment['main_hand'] or equipment.equipment['off_hand']))
+
+    def test_random_changes_never_lose_items(self):
+        """Test that equips, unequips and multi-item changes keep the index, flags and inventory in step."""
+        rng = random.Random(50)
+        for number in range(12):
+            self.character.add_to_inventory(gear(f"Piece {number}", rng.choice(SLOTS), physical_defense=number))
+        owned = set(self.character.inventory) | set(self.character.equipment.items())
+        for _ in range(300):
+            action = rng.randrange(4)
+            if action == 0:
+                self.character.equip_item(rng.choice(list(self.character.inventory)))
+            elif action == 1 and self.character.equipment.items():
+                self.character.unequip(rng.choice(self.character.equipment.items()))
+            elif action == 2:
+                self.character.unequip_item(rng.choice(SLOTS))
+            else:
+                everything = sorted(owned, key=lambda item: item.name)
+                self.character.change_equipment(equip=rng.sample(everything, 3),
+                                                unequip=rng.sample(self.character.equipment.items(),
+                                                                   min(1, len(self.character.equipment.items()))))
+            self.assert_consistent(owned)
+            self.assertEqual(self.character.physical_defense,
+                             self.character.endurance * 0.1 + sum(item.physical_defense
+                                                                   for item in self.character.equipment.items()))
+
+    def test_changes_are_atomic(self):
+        """Test that a change moves every item in one notification, or nothing at all."""
+        sword, shield = gear("Sword", "main_hand", physical_attack=5), gear("Shield", "off_hand", physical_defense=4)
+        maul = gear("Maul", "two_handed", physical_attack=12)
+        for item in (sword, shield, maul):
+            self.character.add_to_inventory(item)
+        self.notifications.clear()
+
+        self.assertTrue(self.character.change_equipment(equip=[sword, shield]))
+        self.assertEqual(len(self.notifications), 1)
+        self.assertEqual((self.character.equipment.slot_of(sword), self.character.equipment.slot_of(shield)),
+                         ('main_hand', 'off_hand'))
+
+        # The maul displaces both hands, which stay in the inventory
+        self.assertTrue(self.character.equip_item(maul))
+        self.assertEqual(self.character.equipment.slot_of(maul), 'two_handed')
+        self.assertIn(sword, self.character.inventory)
+        self.assertIn(shield, self.character.inventory)
+        self.assertFalse(sword.equipped or shield.equipped)
+
+        before = self.character.snapshot()
+        self.notifications.clear()
+        stranger = gear("Borrowed Helm", "head")
+        self.assertFalse(self.character.change_equipment(equip=[sword, stranger]))
+        self.assertFalse(self.character.change_equipment(equip=[sword, maul]))
+        self.assertFalse(self.character.change_equipment(unequip=[sword]))
+        self.assertFalse(self.character.unequip_item('accessories'))
+        self.assertEqual(self.character.snapshot(), before)
+        self.assertEqual(self.notifications, [])
+
+        # A one-handed weapon takes the hands back from the maul
+        self.assertTrue(self.character.equip_item(sword))
+        self.assertIsNone(self.character.equipment.equipment['two_handed'])
+        self.assertIn(maul, self.character.inventory)
+
+    def test_main_window_uses_the_engine(self):
+        """Test that the main window's equip handlers change the character through the model."""
+        window = MainWindow()
+        window.update_character_window(self.character, self.state.current_location)
+        owned = set(self.character.inventory) | set(self.character.equipment.items())
+        hat = next(item for item in self.character.inventory if item.name == "Wizard Hat")
+
+        window._handle_item_equipped(hat)
+        self.assertEqual(self.character.equipment.slot_of(hat), 'head')
+        self.assertTrue(hat.equipped)
+        window._handle_item_unequipped_from_inventory(hat)
+        self.assertIsNone(self.character.equipment.slot_of(hat))
+        window._handle_item_equipped(hat)
+        window._handle_item_unequipped('head', hat)
+        self.assertIn(hat, self.character.inventory)
+        self.assert_consistent(owned)
+        self.assertEqual(len(self.notifications), 4)
+
+        # Only changes the character accepts are told in the story
+        story = window.story_text_edit.toPlainText()
+        potion = next(item for item in self.character.inventory if item.item_type == "consumable")
+        window._handle_item_equipped(potion)
+        window._handle_item_unequipped_from_inventory(hat)
+        self.assertEqual(window.story_text_edit.toPlainText(), story)
+        self.assertEqual(len(self.notifications), 4)
+        window.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import sys
+import os
+import random
+import unittest
+from collections import Counter
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.character import CharacterEquipment
+from src.models.item import EquipmentItem
+
+SLOTS = ['head', 'chest', 'legs', 'hands', 'feet', 'main_hand', 'off_hand', 'two_handed', 'accessories']
+DICE = ['1d4', '1d6', '2d6', '1d8']
+TAGS = ['fire', 'ice', 'shield', 'heavy', 'magic']
+
+
+def random_item(rng, index):
+    return EquipmentItem(
+        name=f"Item {index}",
+        item_type="armor",
+        description="",
+        slot=rng.choice(SLOTS),
+        physical_attack=rng.randint(0, 10),
+        physical_defense=rng.randint(0, 10),
+        magic_attack=rng.randint(0, 10),
+        magic_defense=rng.choice([0, 1.5, 2.25, 7]),
+        attack_dice=rng.sample(DICE, rng.randint(0, 2)),
+        tags={"tags": rng.sample(TAGS, rng.randint(0, 3))}
+    )
+
+
+def brute_force(equipment):
+    """Totals recomputed by walking every slot, as the running totals should report."""
+    items = equipment.items()
+    totals = {attribute: sum(getattr(item, attribute) for item in items)
+              for attribute in CharacterEquipment.TOTAL_ATTRIBUTES}
+    dice = Counter(dice for item in items for dice in item.attack_dice)
+    tags = Counter(tag for item in items for tag in item.tags["tags"])
+    return totals, dice, tags
+
+
+class TestEquipmentTotals(unittest.TestCase):
+    """Property tests for the running equipment totals."""
+
+    def assert_totals_match(self, equipment):
+        totals, dice, tags = brute_force(equipment)
+        self.assertAlmostEqual(equipment.total_physical_attack, totals['physical_attack'])
+        self.assertAlmostEqual(equipment.total_physical_defense, totals['physical_defense'])
+        self.assertAlmostEqual(equipment.total_magic_attack, totals['magic_attack'])
+        self.assertAlmostEqual(equipment.total_magic_defense, totals['magic_defense'])
+        self.assertEqual(Counter(equipment.get_attack_dice()), dice)
+        self.assertEqual(equipment.tag_counts(), tags)
+        for tag in TAGS:
+            self.assertEqual(equipment.has_tag(tag), tags[tag] > 0)
+
+    def test_random_operation_sequences(self):
+        """Test that totals match a recomputation after every equip and unequip."""
+        for seed in range(25):
+            rng = random.Random(seed)
+            equipment = CharacterEquipment()
+            items = [random_item(rng, i) for i in range(30)]
+            for _ in range(200):
+                action = rng.random()
+                if action < 0.5:
+                    equipment.equip(rng.choice(items))
+                elif action < 0.8:
+                    equipment.unequip(rng.choice(SLOTS))
+                elif equipment.equipment['accessories']:
+                    equipment.unequip_accessory(rng.choice(equipment.equipment['accessories']))
+                self.assert_totals_match(equipment)
+
+    def test_rebuilt_equipment(self):
+        """Test that loading and direct slot edits followed by recalculate() agree."""
+        rng = random.Random(99)
+        equipment = CharacterEquipment()
+        for i in range(20):
+            equipment.equip(random_item(rng, i))
+        loaded = CharacterEquipment.from_dict(equipment.to_dict())
+        self.assert_totals_match(loaded)
+        self.assertAlmostEqual(loaded.total_magic_defense, equipment.total_magic_defense)
+
+        loaded.equipment['head'] = random_item(rng, 100)
+        loaded.recalculate()
+        self.assert_totals_match(loaded)
+
+    def test_two_handed_replaces_weapons(self):
+        """Test that a two-handed weapon removes both hands and a previous two-hander."""
+        equipment = CharacterEquipment()
+        sword = EquipmentItem(name="Sword", item_type="weapon", description="", slot="main_hand",
+                              physical_attack=5, attack_dice=["1d6"])
+        shield = EquipmentItem(name="Shield", item_type="armor", description="", slot="off_hand",
+                               physical_defense=4, tags={"tags": ["shield"]})
+        axe = EquipmentItem(name="Axe", item_type="weapon", description="", slot="two_handed",
+                            physical_attack=9, attack_dice=["2d6"])
+        maul = EquipmentItem(name="Maul", item_type="weapon", description="", slot="two_handed",
+                             physical_attack=12, attack_dice=["2d8"])
+        equipment.equip(sword)
+        equipment.equip(shield)
+        self.assertTrue(equipment.has_tag("shield"))
+        equipment.equip(axe)
+        equipment.equip(maul)
+        self.assertEqual(equipment.total_physical_attack, 12)
+        self.assertEqual(equipment.total_physical_defense, 0)
+        self.assertEqual(equipment.get_attack_dice(), ["2d8"])
+        self.assertFalse(equipment.has_tag("shield"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import sys
+import os
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.game_state import GameState, Location
+from src.models.item import Item
+from src.models.events import (EventStream, MessageAppended, ItemAdded, ItemRemoved, ItemEquipped,
+                               StatChanged, LocationChanged, TimeOfDayChanged)
+
+
+class TestEvents(unittest.TestCase):
+    """Test suite for game state change events."""
+
+    def setUp(self):
+        """Create a demo game state and record every delivered batch."""
+        self.state = GameState.create_demo_state()
+        self.batches = []
+        self.unsubscribe = self.state.events.subscribe(self.batches.append)
+
+    def test_message_events(self):
+        """Test that logged messages are published immediately outside a batch."""
+        self.state.add_story_message("The door creaks open.")
+        self.state.add_gm_message("What's behind it?")
+        self.assertEqual(self.batches, [
+            [MessageAppended("story", 4, "GM", "The door creaks open.")],
+            [MessageAppended("gm", 4, "Player", "What's behind it?")]
+        ])
+
+    def test_character_events(self):
+        """Test inventory, equipment and stat events from the character."""
+        character = self.state.character
+        sword = character.inventory[2]
+        character.equip_item(sword)
+        character.health = 55
+        self.assertEqual(self.batches[0], [ItemEquipped(sword, "main_hand")])
+        self.assertEqual(self.batches[1], [StatChanged("health", 80, 55)])
+
+        character.health = 55
+        self.assertEqual(len(self.batches), 2)
+
+    def test_batch_coalescing(self):
+        """Test that a batch is delivered once with redundant events collapsed."""
+        character = self.state.character
+        rope = Item("Rope", "tool", "Fifty feet of rope.")
+        cave = Location("Cave Entrance", "A dark cave.")
+        with self.state.events.batch():
+            character.mana = 10
+            character.mana = 20
+            character.stamina = 1
+            character.stamina = 60
+            character.add_to_inventory(rope)
+            character.remove_from_inventory(rope)
+            self.state.move_to(cave)
+            self.state.set_time_of_day("Night")
+            self.state.set_time_of_day("Midnight")
+            self.assertEqual(self.batches, [])
+
+        self.assertEqual(self.batches, [[
+            StatChanged("mana", 40, 20),
+            LocationChanged(cave),
+            TimeOfDayChanged("Midnight")
+        ]])
+
+    def test_unsubscribe(self):
+        """Test that unsubscribed callbacks receive nothing."""
+        self.unsubscribe()
+        self.state.add_story_message("Silence.")
+        self.assertEqual(self.batches, [])
+
+    def test_stream_without_subscribers(self):
+        """Test that publishing without subscribers queues nothing."""
+        stream = EventStream()
+        stream.publish(ItemAdded(object()))
+        received = []
+        stream.subscribe(received.append)
+        stream.flush()
+        self.assertEqual(received, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import sys
+import os
+import random
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.character import Character, CharacterClass
+from src.models.events import StatChanged
+from src.models.experience import CHARACTER_CURVE, ExperienceCurve, grant_experience
+
+
+def level_by_steps(curve, level, experience, amount):
+    """Level up one requirement at a time, as a reference."""
+    experience += amount
+    while level < curve.max_level and experience >= curve.to_next(level):
+        experience -= curve.to_next(level)
+        level += 1
+    if level == curve.max_level:
+        experience = 0
+    return level, experience
+
+
+class TestExperience(unittest.TestCase):
+    """Test suite for experience curves and levelling."""
+
+    def test_tables_follow_the_formula(self):
+        """Test that requirements grow by the curve's formula and thresholds add them up."""
+        curve = ExperienceCurve(base=100, formula="x*1.1", max_level=5)
+        self.assertEqual(curve.requirements.tolist(), [100, 110, 121, 133, 0])
+        self.assertEqual(curve.thresholds.tolist(), [0, 100, 210, 331, 464])
+        self.assertEqual([curve.level_for(total) for total in (0, 99, 100, 463, 464, 10**9)],
+                         [1, 1, 2, 4, 5, 5])
+        with self.assertRaises(ValueError):
+            ExperienceCurve(base=100, formula="x - 60").requirements
+
+    def test_scalar_and_bulk_gains_agree_with_stepping(self):
+        """Test that single and vectorized grants match levelling one requirement at a time."""
+        random.seed(41)
+        curve = ExperienceCurve(base=50, formula="x*1.2 + level", max_level=30)
+        members = [Character(name=f"NPC {number}", character_class=CharacterClass("Villager", ""),
+                             level=random.randint(1, 30), experience=0) for number in range(200)]
+        for member in members:
+            member.experience = random.randrange(curve.to_next(member.level) or 1)
+        amounts = [random.randint(0, 5000) for _ in members]
+        expected = [level_by_steps(curve, member.level, member.experience, amount)
+                    for member, amount in zip(members, amounts)]
+        before = [member.level for member in members]
+        solo = [Character.from_dict(member.to_dict()) for member in members[:20]]
+
+        gained = grant_experience(members, amounts, curve)
+        self.assertEqual([(member.level, member.experience) for member in members], expected)
+        self.assertEqual(gained.tolist(), [level - old for (level, _), old in zip(expected, before)])
+        for member, amount, (level, experience) in zip(solo, amounts, expected):
+            member.gain_experience(amount, curve)
+            self.assertEqual((member.level, member.experience), (level, experience))
+            self.assertEqual(member.experience_to_next_level, curve.to_next(level))
+
+    def test_level_up_publishes_one_batch(self):
+        """Test that a level-up delivers its stat changes together."""
+        character = Character(name="Hero", character_class=CharacterClass("Adept", ""))
+        deliveries = []
+        character.events.subscribe(deliveries.append)
+        self.assertEqual(character.gain_experience(CHARACTER_CURVE.total(3) + 5), 2)
+        self.assertEqual(len(deliveries), 1)
+        self.assertIn(StatChanged('level', 1, 3), deliveries[0])
+        self.assertEqual((character.experience, character.experience_to_next_level),
+                         (5, CHARACTER_CURVE.to_next(3)))
+
+
+if __name__ == '__main__':
+    unittest.main()
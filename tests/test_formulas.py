@@ -0,0 +1,77 @@
+import sys
+import os
+import random
+import time
+import unittest
+
+import numpy as np
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.formulas import FormulaError, compile_formula, skill_table
+from src.models.game_state import GameState
+
+
+class TestFormulas(unittest.TestCase):
+    """Test suite for compiled level-up formulas."""
+
+    def test_rejects_anything_outside_the_whitelist(self):
+        """Test that names, attributes, calls and literals outside the whitelist are refused."""
+        for source in ('__import__("os").system("true")', 'x.real', '(1).__class__', 'open',
+                       'eval("1")', 'min(x, key=abs)', '"text"', 'True', '[x]', 'x if level else 1',
+                       'lambda: 1', 'y * 2', 'x *'):
+            with self.assertRaises(FormulaError, msg=source):
+                compile_formula(source)
+        self.assertIs(compile_formula("x*1.1"), compile_formula("x*1.1"))
+
+    def test_huge_powers_fail_fast(self):
+        """Test that powers of large constants overflow at once instead of hanging."""
+        start = time.perf_counter()
+        for source in ("(10**10**8)+x", "floor(x)**10**9", "x + 9**9**9"):
+            with self.assertRaises(OverflowError, msg=source):
+                compile_formula(source)(2, 2)
+        with self.assertRaises(FormulaError):
+            compile_formula("x + 1" + "0" * 400)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(compile_formula("round(x/3, 2)")(10, 2), 3.33)
+
+    def test_vectorized_progression_matches_stepping(self):
+        """Test that whole-range progressions agree with evaluating one level at a time."""
+        random.seed(40)
+        for source in ("x*1.1", "x*(1+(0.04*(level-1)))", "x + level*2 - 1",
+                       "max(x+1, sqrt(x)*level)", "floor(x*1.5) + 1", "min(x, 3, level)",
+                       "min(x*1.1, 5000)", "x*x/100 + 1", "x/(level+1)*2"):
+            formula = compile_formula(source)
+            bases = [random.uniform(1, 50) for _ in range(5)]
+            table = formula.progression(bases, 30)
+            for row, base in zip(table, bases):
+                value, expected = base, [base]
+                for level in range(2, 31):
+                    value = formula(value, level)
+                    expected.append(value)
+                np.testing.assert_allclose(row, expected, rtol=1e-9, err_msg=source)
+            self.assertAlmostEqual(formula.value_at(bases[-1], 17), expected[16])
+
+        # A cap looks affine at a few probe points but is not, so it is stepped
+        capped = compile_formula("min(x*1.1, 5000)")
+        self.assertFalse(capped.affine)
+        self.assertEqual(capped.value_at(1000, 40), 5000.0)
+        self.assertTrue(compile_formula("x*(1+(0.04*(level-1)))").affine)
+
+    def test_skill_values_scale_with_level(self):
+        """Test that skill costs and effects follow their formulas and stay put at level 1."""
+        blast = GameState.create_demo_state().character.skills[0]
+        self.assertEqual(blast.cost_at(), 8)
+        self.assertAlmostEqual(blast.cost_at(3), 8 * 1.1 * 1.1)
+        self.assertAlmostEqual(blast.effect_value_at(0, 3), 14 * 1.04 * 1.08)
+        blast.level = 3
+        self.assertAlmostEqual(blast.cost_at(), 8 * 1.1 * 1.1)
+
+        table = skill_table(blast, 10)
+        self.assertAlmostEqual(table["cost"][9], blast.cost_at(10))
+        self.assertAlmostEqual(table["effects"][0][9], blast.effect_value_at(0, 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import sys
+import os
+import gc
+import itertools
+import random
+import unittest
+import weakref
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.character import CharacterEquipment
+from src.models.game_state import GameState
+from src.models.gear_optimizer import EquipPlan, best_in_slot
+from src.models.item import EquipmentItem
+
+
+def gear(name, slot, level=1, **stats):
+    return EquipmentItem(name=name, item_type="armor", description="", slot=slot, level_requirement=level, **stats)
+
+
+def brute_force(items, weights):
+    """The best score over every way to wear the items, found by trying them all."""
+    def score(item):
+        equipment = CharacterEquipment()
+        equipment.equip(item)
+        return sum(weights.get(attribute, 0) * equipment.total(attribute)
+                   for attribute in CharacterEquipment.TOTAL_ATTRIBUTES)
+
+    by_slot = {slot: [None] + [item for item in items if item.slot == slot] for slot in CharacterEquipment.DEFAULT_SLOTS}
+    hands = [(two_handed, None, None) for two_handed in by_slot['two_handed'] if two_handed is not None]
+    hands += [(None, main, off) for main in by_slot['main_hand'] for off in by_slot['off_hand']]
+    accessories = [combination for count in range(CharacterEquipment.MAX_ACCESSORIES + 1)
+                   for combination in itertools.combinations(by_slot['accessories'][1:], count)]
+    best = 0
+    for head, chest in itertools.product(by_slot['head'], by_slot['chest']):
+        for held in hands:
+            for worn in accessories:
+                chosen = [item for item in (head, chest, *held, *worn) if item is not None]
+                best = max(best, sum(score(item) for item in chosen))
+    return best
+
+
+class TestGearOptimizer(unittest.TestCase):
+    """Test suite for the best-in-slot equipment optimizer."""
+
+    def test_matches_brute_force(self):
+        """Test that the optimizer finds the best score of an exhaustive search."""
+        rng = random.Random(47)
+        for trial in range(5):
+            items = [gear(f"Item {trial}.{index}", rng.choice(['head', 'chest', 'main_hand', 'off_hand', 'two_handed',
+                                                               'accessories', 'accessories']),
+                          physical_attack=rng.randint(-3, 10), physical_defense=rng.randint(-3, 10),
+                          magic_attack=rng.randint(0, 10), magic_defense=rng.randint(0, 10))
+                     for index in range(14)]
+            weights = {"physical_attack": rng.random(), "physical_defense": rng.random(),
+                       "magic_attack": rng.random() - 0.5, "magic_defense": rng.random()}
+            character = GameState.create_demo_state().character
+            plan = best_in_slot(character, weights, items)
+            self.assertAlmostEqual(plan.score, brute_force(items, weights))
+            self.assertLessEqual(len(plan.accessories), CharacterEquipment.MAX_ACCESSORIES)
+            self.assertFalse(plan.slots['two_handed'] and (plan.slots['main_hand'] or plan.slots['off_hand']))
+
+    def test_respects_slot_rules_and_level(self):
+        """Test that two-handed weapons compete with both hands and items above the character's level are left out."""
+        character = GameState.create_demo_state().character
+        sword, shield = gear("Sword", "main_hand", physical_attack=6), gear("Shield", "off_hand", physical_defense=5)
+        greatsword = gear("Greatsword", "two_handed", physical_attack=10)
+        relic = gear("Relic", "head", level=character.level + 1, magic_attack=50)
+        rings = [gear(f"Ring {bonus}", "accessories", magic_defense=bonus) for bonus in range(1, 8)]
+        items = [sword, shield, greatsword, relic] + rings
+
+        plan = best_in_slot(character, items=items)
+        self.assertEqual((plan.slots['main_hand'], plan.slots['off_hand'], plan.slots['two_handed']),
+                         (sword, shield, None))
+        self.assertIsNone(plan.slots['head'])
+        self.assertEqual(plan.accessories, rings[:1:-1])
+        self.assertEqual(plan.totals['magic_defense'], 3 + 4 + 5 + 6 + 7)
+
+        plan = best_in_slot(character, {"physical_attack": 1}, items)
+        self.assertEqual((plan.slots['main_hand'], plan.slots['two_handed']), (None, greatsword))
+        self.assertEqual(plan.accessories, [])
+
+        # Scoring an item does not keep its definition alive
+        lance = gear("Collected Lance", "two_handed", physical_attack=3)
+        self.assertEqual(best_in_slot(character, items=[lance]).slots['two_handed'], lance)
+        definition = weakref.ref(lance.definition)
+        del lance
+        gc.collect()
+        self.assertIsNone(definition())
+
+    def test_applies_plans_atomically(self):
+        """Test that a plan is worn in one notification and that an unusable plan changes nothing."""
+        character = GameState.create_demo_state().character
+        notifications = []
+        character.events.subscribe(notifications.append)
+        plan = best_in_slot(character)
+        self.assertEqual({item.name for item in plan.items()}, {"Fire Elemental Sword", "Leather Armor", "Wizard Hat"})
+        self.assertTrue(plan.apply(character))
+        self.assertEqual(len(notifications), 1)
+        self.assertEqual(set(character.equipment.items()), set(plan.items()))
+        self.assertTrue(all(item.equipped for item in plan.items()))
+        self.assertEqual(character.magic_attack, character.focus * 2 + 2)
+
+        # Swapping to a better chest piece takes the old one off, leaving it in the inventory
+        armor = plan.slots['chest']
+        plate = gear("Plate", "chest", physical_defense=9)
+        character.add_to_inventory(plate)
+        self.assertTrue(best_in_slot(character).apply(character))
+        self.assertIs(character.equipment.equipment['chest'], plate)
+        self.assertIn(armor, character.inventory)
+        self.assertFalse(armor.equipped)
+
+        before = character.snapshot()
+        notifications.clear()
+        stranger = gear("Borrowed Helm", "head", physical_defense=20)
+        self.assertFalse(EquipPlan(slots={'head': stranger}).apply(character))
+        clash = EquipPlan(slots={'two_handed': gear("Pike", "two_handed"), 'main_hand': character.equipment.equipment['main_hand']})
+        self.assertFalse(clash.apply(character))
+        self.assertEqual(character.snapshot(), before)
+        self.assertEqual(notifications, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import sys
+import os
+import random
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.game_state import GameState, Location
+from src.models.item import Item
+from src.models.persistent import PVector, PersistentList
+from src.models.events import StateRestored
+
+
+class TestHistory(unittest.TestCase):
+    """Test suite for persistent collections, snapshots and undo/redo."""
+
+    def test_pvector_matches_list(self):
+        """Test PVector against a plain list across trie depth boundaries."""
+        rng = random.Random(7)
+        for size in (0, 1, 32, 33, 1024, 1025, 33000):
+            vector = PVector()
+            for i in range(size):
+                vector = vector.append(i)
+            self.assertEqual(list(vector), list(range(size)))
+            self.assertEqual(list(PVector(range(size))), list(range(size)))
+            for index in rng.sample(range(size), min(size, 20)):
+                changed = vector.set(index, "x")
+                self.assertEqual(changed[index], "x")
+                self.assertEqual(vector[index], index)
+
+    def test_persistent_list_api(self):
+        """Test that PersistentList behaves like a list."""
+        items = PersistentList(["a", "b", "c"])
+        frozen = items.freeze()
+        items.append("d")
+        items.remove("b")
+        items.insert(0, "z")
+        self.assertEqual(items, ["z", "a", "c", "d"])
+        self.assertIn("c", items)
+        self.assertEqual(list(frozen), ["a", "b", "c"])
+
+    def test_undo_redo(self):
+        """Test rolling back and re-applying a player action."""
+        for persistent in (False, True):
+            state = GameState.create_demo_state(persistent=persistent)
+            before = state.to_dict()
+            rope = Item("Rope", "tool", "Fifty feet of rope.")
+
+            state.checkpoint()
+            state.add_story_message("I climb down the well.", sender="Player")
+            state.character.add_to_inventory(rope)
+            state.character.health = 10
+            state.current_location = Location("Well", "A deep, dark well.")
+            after = state.to_dict()
+
+            self.assertTrue(state.undo())
+            self.assertEqual(state.to_dict()["story_log"], before["story_log"])
+            self.assertEqual(state.character.health, 80)
+            self.assertNotIn(rope, state.character.inventory)
+            self.assertEqual(state.current_location.name, "Forest Clearing")
+            self.assertEqual(state.search("well"), [])
+
+            self.assertTrue(state.redo())
+            self.assertEqual(state.to_dict()["character"], after["character"])
+            self.assertEqual(state.search("well")[0].message, "I climb down the well.")
+            self.assertFalse(state.redo())
+
+    def test_branching_restore_reindexes(self):
+        """Test that restoring across diverged logs keeps the search index in sync."""
+        state = GameState.create_demo_state(persistent=True)
+        base = state.snapshot()
+        state.add_story_message("The dragon sleeps.")
+        dragon_branch = state.snapshot()
+        state.restore(base)
+        state.add_story_message("The troll sleeps.")
+
+        self.assertEqual([hit.message for hit in state.search("sleeps")], ["The troll sleeps."])
+        state.restore(dragon_branch)
+        self.assertEqual([hit.message for hit in state.search("sleeps")], ["The dragon sleeps."])
+        self.assertEqual(len(state.search_index), len(state.story_log) + len(state.gm_log))
+
+    def test_restore_event_and_bounded_history(self):
+        """Test that restores publish one event and the undo stack is bounded."""
+        state = GameState.create_demo_state(persistent=True)
+        state.history = type(state.history)(max_depth=3)
+        batches = []
+        state.events.subscribe(batches.append)
+        for i in range(10):
+            state.checkpoint()
+            state.add_story_message(f"Step {i}")
+        self.assertEqual(len(state.history), 3)
+
+        batches.clear()
+        state.undo()
+        self.assertEqual(batches, [[StateRestored()]])
+        self.assertEqual(state.story_log[-1]["message"], "Step 8")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import sys
+import os
+import random
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.game_state import GameState
+from src.models.inventory import Inventory
+from src.models.item import Item, EquipmentItem, Effect
+
+
+def potion(name="Health Potion"):
+    return Item(name=name, item_type="consumable", description="A red vial.",
+                effects=[Effect(target_group="allies", action="heal", value=30)])
+
+
+def sword(name="Sword", slot="main_hand"):
+    return EquipmentItem(name=name, item_type="weapon", description="", slot=slot)
+
+
+class TestInventory(unittest.TestCase):
+    """Test suite for the indexed, stacking inventory."""
+
+    def test_stacking_and_ids(self):
+        """Test that identical consumables share an entry and equipment never stacks."""
+        inventory = Inventory()
+        first, second, other = potion(), potion(), potion("Mana Potion")
+        blade, spare = sword(), sword()
+        entry = inventory.add(first)
+        self.assertEqual(inventory.add(second), entry)
+        inventory.extend([other, blade, spare])
+
+        self.assertEqual(len(inventory), 5)
+        self.assertEqual(inventory.quantity(first), 2)
+        self.assertEqual([(item.name, count) for item, count in inventory.stacks()],
+                         [("Health Potion", 2), ("Mana Potion", 1), ("Sword", 1), ("Sword", 1)])
+        self.assertNotEqual(inventory.entry_id(blade), inventory.entry_id(spare))
+
+        inventory.remove(first)
+        self.assertEqual(inventory.entry_id(second), entry)
+        self.assertIs(inventory.get(entry), second)
+        self.assertNotIn(first, inventory)
+        with self.assertRaises(ValueError):
+            inventory.remove(first)
+
+    def test_items_changed_while_held(self):
+        """Test that an item whose type or slot changed while held is still removed from its old indexes."""
+        inventory = Inventory()
+        blade, tonic = sword(), potion()
+        inventory.extend([blade, tonic])
+        blade.slot, blade.item_type = "off_hand", "shield"
+        tonic.item_type = "ingredient"
+        inventory.remove(blade)
+        inventory.remove(tonic)
+        self.assertEqual((inventory.for_slot("main_hand"), inventory.of_type("weapon")), ([], []))
+        self.assertEqual(inventory.of_type("consumable"), [])
+        self.assertEqual(len(inventory), 0)
+
+    def test_matches_list_model(self):
+        """Test random adds and removes against a plain list, including indexes."""
+        for seed in range(10):
+            rng = random.Random(seed)
+            inventory, model, pool = Inventory(), [], []
+            for step in range(300):
+                if model and rng.random() < 0.4:
+                    item = model.pop(rng.randrange(len(model)))
+                    inventory.remove(item)
+                else:
+                    item = rng.choice([potion, potion, sword])(rng.choice(["A", "B"]))
+                    model.append(item)
+                    inventory.add(item)
+
+                self.assertEqual(len(inventory), len(model))
+                self.assertCountEqual(map(id, inventory), map(id, model))
+                for item in model[-3:]:
+                    self.assertIn(item, inventory)
+                self.assertCountEqual(map(id, inventory.of_type("consumable")),
+                                      [id(item) for item in model if item.item_type == "consumable"])
+                self.assertCountEqual(map(id, inventory.for_slot("main_hand")),
+                                      [id(item) for item in model if item.item_type == "weapon"])
+
+    def test_freeze_and_restore(self):
+        """Test that captures are O(1) and restoring brings back the items, their order and their ids."""
+        rng = random.Random(35)
+        inventory, captures = Inventory(), []
+        held = []
+        for step in range(400):
+            if held and rng.random() < 0.45:
+                inventory.remove(held.pop(rng.randrange(len(held))))
+            else:
+                item = rng.choice([potion, sword])(rng.choice(["A", "B", "C"]))
+                held.append(item)
+                inventory.add(item)
+            frozen = inventory.freeze()
+            self.assertEqual(frozen, inventory.freeze())
+            captures.append((frozen, list(inventory), [inventory.entry_id(item) for item in inventory]))
+            if step % 25 == 24:
+                frozen, items, ids = rng.choice(captures)
+                inventory.restore(frozen)
+                held = list(items)
+                self.assertEqual(list(inventory), items)
+                self.assertEqual(list(frozen), items)
+                self.assertEqual([inventory.entry_id(item) for item in inventory], ids)
+                self.assertEqual(inventory.freeze(), frozen)
+                self.assertCountEqual(map(id, inventory.of_type("consumable")),
+                                      [id(item) for item in items if item.item_type == "consumable"])
+                self.assertCountEqual(map(id, inventory.tagged("!cursed")), map(id, items))
+
+    def test_character_inventory(self):
+        """Test that characters hold an Inventory through saves, equips and undo."""
+        state = GameState.create_demo_state(persistent=True)
+        character = state.character
+        self.assertIsInstance(character.inventory, Inventory)
+
+        state.checkpoint()
+        blade = character.inventory.for_slot("main_hand")[0]
+        self.assertTrue(character.equip_item(blade))
+        self.assertIn(blade, character.inventory)
+        self.assertTrue(blade.equipped)
+        character.add_to_inventory(potion())
+        self.assertTrue(state.undo())
+        character = state.character
+        self.assertIsInstance(character.inventory, Inventory)
+        self.assertIn(blade, character.inventory)
+
+        self.assertTrue(character.equip_item(character.inventory.for_slot("main_hand")[0]))
+        restored = GameState.from_dict(state.to_dict())
+        self.assertIsInstance(restored.character.inventory, Inventory)
+        self.assertEqual([item.name for item in restored.character.inventory],
+                         [item.name for item in character.inventory])
+        # Worn items are the inventory's own objects again after a load
+        worn = restored.character.equipment.equipment["main_hand"]
+        self.assertIs(restored.character.inventory.held(worn), worn)
+        self.assertTrue(worn.equipped)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import sys
+import os
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.character import Character, CharacterClass
+from src.models.item import Item, EquipmentItem, Effect
+from src.models.schema import migrate
+
+
+def potion():
+    return Item(name="Health Potion", item_type="consumable", description="A red vial.",
+                effects=[Effect(target_group="allies", action="heal", value=30)])
+
+
+class TestItemIdentity(unittest.TestCase):
+    """Test suite for item instance ids and identity-based equality."""
+
+    def test_identical_items_are_distinct(self):
+        """Test that items with the same fields are different items."""
+        first, second = potion(), potion()
+        self.assertNotEqual(first, second)
+        self.assertEqual(len({first, second}), 2)
+        self.assertEqual(first, first)
+
+        character = Character(name="Test", character_class=CharacterClass("Rogue", ""),
+                              inventory=[first, second])
+        self.assertTrue(character.remove_from_inventory(second))
+        self.assertIs(character.inventory[0], first)
+
+    def test_identity_survives_save_and_load(self):
+        """Test that saved items come back equal to the originals."""
+        sword = EquipmentItem(name="Sword", item_type="weapon", description="", physical_attack=4)
+        for item in (potion(), sword):
+            loaded = type(item).from_dict(item.to_dict())
+            self.assertEqual(loaded, item)
+            self.assertEqual(hash(loaded), hash(item))
+            self.assertEqual(loaded.to_dict(), item.to_dict())
+
+    def test_old_saves_get_fresh_ids(self):
+        """Test that items saved without an id are each given a different one."""
+        data = [potion().to_dict(), potion().to_dict()]
+        for entry in data:
+            del entry["instance_id"]
+        items = [Item.from_dict(migrate(entry, "item")) for entry in data]
+        self.assertNotEqual(items[0].instance_id, items[1].instance_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
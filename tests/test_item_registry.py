@@ -0,0 +1,95 @@
+import sys
+import os
+import tempfile
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.game_state import GameState
+from src.models.item import Item, EquipmentItem, Effect, ItemDefinition, item_from_dict
+from src.models.save_file import write_save, read_save, SaveFile
+
+
+def potion():
+    return Item(name="Health Potion", item_type="consumable", description="A red vial.",
+                effects=[Effect(target_group="allies", action="heal", value=30)])
+
+
+class TestItemRegistry(unittest.TestCase):
+    """Test suite for shared item definitions."""
+
+    def test_identical_items_share_a_definition(self):
+        """Test that equal items share one definition and edits only affect one item."""
+        first, second = potion(), potion()
+        self.assertIs(first.definition, second.definition)
+        self.assertIs(item_from_dict(first.to_dict()).definition, first.definition)
+
+        helm = EquipmentItem(name="Helm", item_type="armor", description="", slot="head",
+                             physical_defense=3, tags={"tags": ["heavy"]})
+        self.assertEqual(helm.tags, {"tags": ("heavy",)})
+        other = EquipmentItem(name="Helm", item_type="armor", description="", slot="head",
+                              physical_defense=3, tags={"tags": ["heavy"]})
+        other.physical_defense = 5
+        self.assertEqual(helm.physical_defense, 3)
+        self.assertEqual(other.physical_defense, 5)
+        self.assertIsNot(other.definition, helm.definition)
+
+    def test_definitions_cannot_be_changed_in_place(self):
+        """Test that tags and effects read through an item are read-only, so shared definitions stay intact."""
+        helm = EquipmentItem(name="Helm", item_type="armor", description="", slot="head", tags={"tags": ["heavy"]})
+        with self.assertRaises(AttributeError):
+            helm.tags["tags"].append("cursed")
+        with self.assertRaises(TypeError):
+            helm.tags["tags"] = ["cursed"]
+        helm.tags = {"tags": ["heavy", "cursed"]}
+        self.assertEqual(helm.tags, {"tags": ("heavy", "cursed")})
+
+        tags = {"tags": ["fire"]}
+        bomb = Item("Bomb", "consumable", "", [Effect("enemies", "damage", 20, tags=tags)])
+        tags["tags"].append("ice")
+        effect = bomb.effects[0]
+        self.assertEqual(effect.tags, {"tags": ("fire",)})
+        with self.assertRaises(AttributeError):
+            effect.value = 99
+        with self.assertRaises(TypeError):
+            effect.tags["tags"] = ("ice",)
+        self.assertIs(Item("Bomb", "consumable", "", [Effect("enemies", "damage", 20, tags={"tags": ["fire"]})])
+                      .definition, bomb.definition)
+
+    def test_instance_state(self):
+        """Test that per-item state is kept apart from the definition and saved."""
+        item = potion()
+        item.count = 4
+        item.durability = 12
+        loaded = Item.from_dict(item.to_dict())
+        self.assertEqual((loaded.count, loaded.durability), (4, 12))
+        self.assertEqual(potion().count, 1)
+
+        definitions = {}
+        compact = item.to_dict(definitions)
+        self.assertNotIn("name", compact)
+        table = list(definitions)
+        self.assertEqual(Item.from_dict(compact, table), item)
+        self.assertIsInstance(ItemDefinition.from_dict(table[0].to_dict()), ItemDefinition)
+
+    def test_save_file_writes_definitions_once(self):
+        """Test that a loot-heavy save stores each definition once and shares it on load."""
+        state = GameState.create_demo_state()
+        for _ in range(200):
+            state.character.add_to_inventory(potion())
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "game.sav")
+            write_save(path, state)
+            with SaveFile(path) as save_file:
+                self.assertEqual(len(save_file.read_section("item_definitions")), 6)
+            loaded = read_save(path)
+
+        self.assertEqual(loaded.to_dict(), state.to_dict())
+        potions = [item for item in loaded.character.inventory if item.description == "A red vial."]
+        self.assertEqual(len({id(item.definition) for item in potions}), 1)
+        self.assertEqual(loaded.character.inventory.quantity(potions[0]), 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import sys
+import os
+import random
+import unittest
+
+import numpy as np
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.item import ITEM_REGISTRY, EquipmentItem, Item, ItemDefinition
+from src.models.loot import AliasTable, LootTables, LootTableError
+
+SWORD = {"name": "Loot Test Sword", "item_type": "weapon", "slot": "main_hand", "rarity": "rare", "physical_attack": 5}
+AXE = {"name": "Loot Test Axe", "item_type": "weapon", "slot": "main_hand", "physical_attack": 3}
+POTION = {"name": "Loot Test Potion", "item_type": "consumable"}
+
+
+def make_tables():
+    return LootTables([
+        {"name": "goblin", "rolls": 2, "entries": [
+            {"weight": 3},
+            {"item": POTION, "weight": 2},
+            {"table": "weapons", "weight": 1, "min_level": 3, "max_level": 9},
+        ]},
+        {"name": "weapons", "entries": [{"item": SWORD}, {"item": AXE}]},
+    ], rarity_weights={"common": 1.0, "rare": 0.25})
+
+
+class TestLoot(unittest.TestCase):
+    """Test suite for alias tables and loot tables."""
+
+    def test_alias_tables_keep_the_weights(self):
+        """Test that alias tables give each outcome its share of the weights, one draw or many at a time."""
+        rng = random.Random(49)
+        for size in (1, 2, 7, 50):
+            weights = [rng.choice([0, rng.random(), rng.randint(1, 100)]) for _ in range(size)]
+            weights[0] = weights[0] or 1
+            table = AliasTable(weights)
+            np.testing.assert_allclose(table.probabilities(), np.array(weights) / sum(weights), atol=1e-12)
+
+        table = AliasTable([1, 2, 3, 4, 0])
+        counts = np.bincount(table.sample(200000, np.random.default_rng(1)), minlength=5) / 200000
+        np.testing.assert_allclose(counts, [0.1, 0.2, 0.3, 0.4, 0.0], atol=0.005)
+        one_by_one = np.random.default_rng(5)
+        self.assertEqual([table.pick(one_by_one) for _ in range(50)],
+                         table.sample(50, np.random.default_rng(5)).tolist())
+        for weights in ([], [0, 0], [1, -1], [1, float("nan")]):
+            with self.assertRaises(LootTableError):
+                AliasTable(weights)
+
+    def test_nesting_rarity_and_level_bands(self):
+        """Test that nested tables, rarity weights and level bands decide the chance of every drop."""
+        tables = make_tables()
+        names = lambda level: {getattr(drop, "name", None): chance
+                               for drop, chance in tables.compile("goblin", level).probabilities().items()}
+        self.assertEqual(names(1), {None: 0.6, "Loot Test Potion": 0.4})
+        chances = names(5)
+        self.assertAlmostEqual(chances[None], 0.5)
+        self.assertAlmostEqual(chances["Loot Test Potion"], 2 / 6)
+        self.assertAlmostEqual(chances["Loot Test Sword"], 1 / 6 * 0.25 / 1.25)
+        self.assertAlmostEqual(chances["Loot Test Axe"], 1 / 6 * 1.0 / 1.25)
+        self.assertEqual(names(10), names(1))
+        self.assertIs(tables.compile("goblin", 5), tables.compile("goblin", 5))
+
+        tables.add({"name": "weapons", "entries": [{"table": "goblin"}]})
+        with self.assertRaises(LootTableError):
+            tables.compile("goblin", 5)
+        self.assertEqual(names(1), {None: 0.6, "Loot Test Potion": 0.4})
+        with self.assertRaises(LootTableError):
+            tables.drop("dragon")
+        with self.assertRaises(LootTableError):
+            tables.add({"name": "broken", "entries": [{"item": AXE, "table": "weapons"}]})
+
+    def test_drops_are_seeded_registry_items(self):
+        """Test that drops repeat for a seed, share registry definitions and agree between the batched calls."""
+        tables = make_tables()
+        first = tables.drop_many("goblin", 500, level=5, seed=49)
+        again = tables.drop_many("goblin", 500, level=5, seed=49)
+        self.assertEqual([[item.definition for item in drop] for drop in first],
+                         [[item.definition for item in drop] for drop in again])
+        self.assertEqual([item.definition for item in tables.drop("goblin", 5, seed=49)],
+                         [item.definition for item in first[0]])
+        self.assertTrue(all(len(drop) <= 2 for drop in first))
+
+        dropped = [item for drop in first for item in drop]
+        swords = [item for item in dropped if item.name == "Loot Test Sword"]
+        self.assertTrue(swords and all(type(item) is EquipmentItem for item in swords))
+        self.assertIs(swords[0].definition, ITEM_REGISTRY.lookup(ItemDefinition.saved_key({"description": "", **SWORD})))
+        self.assertTrue(all(type(item) is Item for item in dropped if item.name == "Loot Test Potion"))
+        self.assertEqual(len({item.instance_id for item in dropped}), len(dropped))
+
+        counts = tables.drop_counts("goblin", 500, level=5, seed=49)
+        self.assertEqual({definition.name: number for definition, number in counts.items()},
+                         {name: sum(item.name == name for item in dropped) for name in {item.name for item in dropped}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import sys
+import os
+import copy
+import json
+import pickle
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.character import Character, CharacterClass, Skill
+from src.models.game_state import GameState
+from src.models.item import Effect, Item
+
+
+class TestModels(unittest.TestCase):
+    """Test suite for slotted models and their shared empty defaults."""
+
+    def test_models_are_slotted(self):
+        """Test that model instances carry no per-instance __dict__."""
+        character = GameState.create_demo_state().character
+        for instance in (character, character.character_class, character.skills[0],
+                         character.equipment, character.inventory, character.events,
+                         Effect("enemies", "damage"), Item("Rope", "tool", "")):
+            self.assertFalse(hasattr(instance, '__dict__'), type(instance).__name__)
+
+    def test_shared_defaults_stay_empty(self):
+        """Test that empty defaults are shared but never changed through one instance."""
+        first, second = Effect("enemies", "damage"), Effect("allies", "heal")
+        self.assertIs(first.tags, second.tags)
+        with self.assertRaises(TypeError):
+            first.tags["tags"] = ["fire"]
+
+        rogue = CharacterClass("Rogue", "")
+        bandit, guard = Character("Bandit", rogue), Character("Guard", rogue)
+        bandit.set_stat_modifier("rage", "strength", 4)
+        self.assertEqual(bandit.effective_stat("strength"), 14)
+        self.assertEqual(guard.effective_stat("strength"), 10)
+        self.assertEqual(guard.stat_modifiers, {})
+
+        skill = Skill("Stab", "A quick stab.")
+        self.assertEqual(Skill.from_dict(json.loads(json.dumps(skill.to_dict()))), skill)
+        json.dumps(bandit.to_dict())
+
+    def test_shared_defaults_survive_copies(self):
+        """Test that copied and pickled models keep sharing the empty defaults."""
+        guard = Character("Guard", CharacterClass("Rogue", ""))
+        for copied in (copy.deepcopy(guard), pickle.loads(pickle.dumps(guard))):
+            self.assertIs(copied.stat_modifiers, guard.stat_modifiers)
+            copied.set_stat_modifier("rage", "strength", 4)
+            self.assertEqual(copied.effective_stat("strength"), 14)
+            self.assertEqual(guard.stat_modifiers, {})
+        state = GameState.create_demo_state()
+        self.assertEqual(copy.deepcopy(state).to_dict(), state.to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import sys
+import os
+import gc
+import tempfile
+import unittest
+import warnings
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.game_state import GameState
+from src.models.item import Item
+from src.models.save_file import write_save, read_save, SaveFile, SaveFileError, LazyLog
+
+
+class TestSaveFile(unittest.TestCase):
+    """Test suite for sectioned save files and lazily loaded logs."""
+
+    def setUp(self):
+        """Create a game state with a few segments of history."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "game.sav")
+        self.state = GameState.create_demo_state()
+        for i in range(250):
+            self.state.add_story_message(f"Day {i}: the caravan moves on.")
+        self.state.add_gm_message("Where is the hidden shrine?", sender="Player")
+        self.state.character.add_to_inventory(Item("Lantern", "tool", "A brass lantern."))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_roundtrip(self):
+        """Test that every compression scheme restores the same state."""
+        for compression in ("none", "zlib", "lzma"):
+            write_save(self.path, self.state, compression=compression, segment_size=100)
+            loaded = read_save(self.path)
+            self.assertEqual(loaded.to_dict(), self.state.to_dict())
+
+    def test_logs_load_lazily(self):
+        """Test that only the segments that are read get decompressed."""
+        write_save(self.path, self.state, segment_size=100)
+        with SaveFile(self.path) as save_file:
+            loaded = save_file.load_game_state()
+            self.assertIsInstance(loaded.story_log, LazyLog)
+            self.assertEqual(loaded.story_log.loaded_segments, 0)
+            self.assertEqual(len(loaded.story_log), len(self.state.story_log))
+
+            self.assertEqual(loaded.story_log[-1], self.state.story_log[-1])
+            self.assertEqual(loaded.story_log.loaded_segments, 1)
+            self.assertEqual(loaded.character.name, self.state.character.name)
+
+    def test_append_undo_and_resave(self):
+        """Test that a loaded game can be played, undone and saved again."""
+        write_save(self.path, self.state, segment_size=100)
+        with SaveFile(self.path) as save_file:
+            loaded = save_file.load_game_state(persistent=True)
+            loaded.checkpoint()
+            loaded.add_story_message("The shrine door creaks open.")
+            self.assertEqual(loaded.search('"shrine door"')[0].message, "The shrine door creaks open.")
+            self.assertEqual(loaded.story_log.loaded_segments, 0)
+
+            self.assertTrue(loaded.undo())
+            self.assertEqual(loaded.search('"shrine door"'), [])
+            self.assertEqual(len(loaded.story_log), len(self.state.story_log))
+
+            loaded.add_story_message("The caravan makes camp.")
+            second_path = self.path + ".2"
+            write_save(second_path, loaded, segment_size=100)
+
+        reloaded = read_save(second_path)
+        self.assertEqual(reloaded.story_log[-1]["message"], "The caravan makes camp.")
+        self.assertEqual(len(reloaded.story_log), len(self.state.story_log) + 1)
+        self.assertEqual(reloaded.search("camp")[0].index, len(self.state.story_log))
+
+    def test_resave_over_the_loaded_file(self):
+        """Test that a loaded game can be saved over its own file and a failed save leaves nothing behind."""
+        write_save(self.path, self.state, segment_size=100)
+        loaded = read_save(self.path)
+        loaded.add_story_message("The caravan reaches the coast.")
+        write_save(self.path, loaded, segment_size=100)
+        self.assertTrue(loaded.save_file._handle.closed)
+        self.assertEqual(loaded.story_log[0], self.state.story_log[0])
+        self.assertEqual(loaded.search("coast")[0].message, "The caravan reaches the coast.")
+
+        reloaded = read_save(self.path)
+        reloaded.close()
+        os.remove(self.path)
+        self.assertEqual(reloaded.to_dict(), loaded.to_dict())
+
+        # Replacing a directory fails after the temporary file is written
+        blocked = os.path.join(self.directory.name, "blocked")
+        os.mkdir(blocked)
+        with self.assertRaises(OSError):
+            write_save(blocked, self.state)
+        self.assertFalse(os.path.exists(blocked + ".tmp"))
+
+    def test_invalid_files(self):
+        """Test that missing, foreign and truncated files raise SaveFileError."""
+        with self.assertRaises(SaveFileError):
+            read_save(self.path)
+
+        with open(self.path, "wb") as handle:
+            handle.write(b"not a save file at all")
+        with self.assertRaises(SaveFileError):
+            read_save(self.path)
+
+        write_save(self.path, self.state)
+        with open(self.path, "rb") as handle:
+            data = handle.read()
+        with open(self.path, "wb") as handle:
+            handle.write(data[:len(data) // 2])
+        with self.assertRaises(SaveFileError):
+            read_save(self.path)
+
+    def test_damaged_files_close_their_handle(self):
+        """Test that empty, header-only and corrupt files raise SaveFileError without leaking the file."""
+        write_save(self.path, self.state)
+        with open(self.path, "rb") as handle:
+            data = handle.read()
+        with SaveFile(self.path) as save_file:
+            table_offset = data.rindex(b'{"compression"')
+            section = save_file.table["sections"]["character"]
+        damaged = [
+            b"",
+            data[:10],
+            data[:table_offset] + b"{" * (len(data) - table_offset - 20) + data[-20:],
+        ]
+        gc.collect()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", ResourceWarning)
+            for contents in damaged:
+                with open(self.path, "wb") as handle:
+                    handle.write(contents)
+                with self.assertRaises(SaveFileError):
+                    read_save(self.path)
+            gc.collect()
+        self.assertEqual([warning for warning in caught if warning.category is ResourceWarning], [])
+
+        start = section["offset"]
+        with open(self.path, "wb") as handle:
+            handle.write(data[:start] + b"\0" * section["length"] + data[start + section["length"]:])
+        with SaveFile(self.path) as save_file:
+            with self.assertRaises(SaveFileError):
+                save_file.read_section("character")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import sys
+import os
+import json
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.game_state import GameState
+from src.models.item import EquipmentItem
+from src.models.schema import SCHEMA_VERSION, Schema, Field, SchemaError, migrate
+
+
+def legacy_save():
+    """A save from before schema versions, with the quirks older code wrote."""
+    data = GameState.create_demo_state().to_dict()
+    del data["schema_version"]
+    del data["search_index"]
+    del data["world"]
+    character = data["character"]
+    character["character_class"]["tags"] = ["arcane"]
+    character["equipment"] = {"head": None, "accessories": None}
+    del character["charisma"]
+    for item in character["inventory"]:
+        item.pop("equipped", None)
+        if "slot" in item:
+            item["tags"] = item["tags"]["tags"]
+    return data
+
+
+class TestSchema(unittest.TestCase):
+    """Test suite for save schema versions, migrations and validation."""
+
+    def test_legacy_save_loads(self):
+        """Test that an unversioned save is upgraded, defaulted and loaded."""
+        state = GameState.from_dict(legacy_save())
+        character = state.character
+        self.assertEqual(character.character_class.tags, {"tags": ["arcane"]})
+        self.assertEqual(character.charisma, 10)
+        self.assertEqual(character.equipment.equipment["accessories"], [])
+        self.assertIsNone(character.equipment.equipment["chest"])
+        sword = next(item for item in character.inventory if item.name == "Fire Elemental Sword")
+        self.assertIsInstance(sword, EquipmentItem)
+        self.assertEqual(sword.tags, {"tags": ("fire",)})
+        self.assertFalse(sword.equipped)
+        self.assertEqual(state.to_dict()["schema_version"], SCHEMA_VERSION)
+
+    def test_current_save_is_unchanged(self):
+        """Test that migrating a current save only validates it."""
+        data = GameState.create_demo_state().to_dict()
+        self.assertEqual(migrate(json.loads(json.dumps(data))), data)
+
+    def test_validation_errors_name_the_field(self):
+        """Test that bad data is rejected with the path of the offending field."""
+        data = legacy_save()
+        del data["character"]["inventory"][1]["name"]
+        with self.assertRaisesRegex(SchemaError, r"character\.inventory\[1\]\.name: missing"):
+            migrate(data)
+
+        data = GameState.create_demo_state().to_dict()
+        data["character"]["level"] = "two"
+        with self.assertRaisesRegex(SchemaError, r"character\.level: expected int, got str"):
+            migrate(data)
+
+        data["schema_version"] = SCHEMA_VERSION + 1
+        with self.assertRaises(SchemaError):
+            migrate(data)
+
+    def test_migration_chain(self):
+        """Test that migrations across several versions run in order in one walk."""
+        schema = Schema(3, root="save")
+        schema.node("save", {"hero": Field(node="hero"), "gold": Field(int, 0)})
+        schema.node("hero", {"name": Field(str), "hp": Field(int)})
+        calls = []
+
+        @schema.migration(2, "save")
+        def nest_hero(data):
+            calls.append(2)
+            data["hero"] = {"name": data.pop("hero_name"), "health": data.pop("hero_health")}
+
+        @schema.migration(3, "hero")
+        def rename_health(data):
+            calls.append(3)
+            data["hp"] = data.pop("health")
+
+        old = schema.migrate({"hero_name": "Ayla", "hero_health": 12}, version=1)
+        self.assertEqual(old, {"hero": {"name": "Ayla", "hp": 12}, "gold": 0, "schema_version": 3})
+        self.assertEqual(calls, [2, 3])
+
+        calls.clear()
+        middle = schema.migrate({"hero": {"name": "Bo", "health": 5}, "schema_version": 2})
+        self.assertEqual(middle["hero"], {"name": "Bo", "hp": 5})
+        self.assertEqual(calls, [3])
+        self.assertIs(schema.compile(2), schema.compile(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
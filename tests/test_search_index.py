@@ -0,0 +1,86 @@
+import sys
+import os
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.game_state import GameState
+from src.models.search_index import SearchIndex
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Test suite for the session log search index."""
+
+    def setUp(self):
+        """Create a demo game state with a few extra messages."""
+        self.state = GameState.create_demo_state()
+        self.state.add_story_message("The innkeeper leans in and whispers about a dragon in the hills.", sender="Innkeeper")
+        self.state.add_story_message("A dragon roars somewhere far away.", sender="GM")
+        self.state.add_gm_message("Is the innkeeper lying about the dragon?", sender="Player")
+
+    def test_index_covers_existing_and_new_messages(self):
+        """Test that the demo logs and appended messages are all indexed."""
+        self.assertEqual(len(self.state.search_index),
+                         len(self.state.story_log) + len(self.state.gm_log))
+
+    def test_ranked_search(self):
+        """Test that messages matching every query term outrank partial matches."""
+        hits = self.state.search("what did the innkeeper say about the dragon")
+        self.assertTrue(len(hits) >= 2)
+        self.assertEqual({hit.sender for hit in hits[:2]}, {"Innkeeper", "Player"})
+        self.assertGreaterEqual(hits[0].score, hits[1].score)
+        self.assertGreater(hits[1].score, hits[2].score)
+
+    def test_phrase_query(self):
+        """Test that quoted phrases must match exactly, stopwords included."""
+        hits = self.state.search('"about a dragon"')
+        self.assertEqual(len(hits), 1)
+        self.assertEqual(hits[0].log, "story")
+        self.assertIn("about a dragon", hits[0].message)
+        self.assertEqual(self.state.search('"dragon about"'), [])
+
+    def test_stopword_queries(self):
+        """Test that stopwords alone find nothing unless quoted, when the phrase is matched literally."""
+        self.assertEqual(self.state.search("in the"), [])
+        hits = self.state.search('"in the"')
+        self.assertTrue(hits)
+        self.assertTrue(all(" in the " in f" {hit.message.lower()} " for hit in hits))
+        self.assertEqual([hit.score for hit in hits], [0.0] * len(hits))
+        self.assertEqual([hit.sender for hit in self.state.search('"in the"', sender="innkeeper")], ["Innkeeper"])
+        self.assertEqual(self.state.search('"in the" "of"', limit=1)[0].score, 0.0)
+
+    def test_sender_and_log_filters(self):
+        """Test filtering by sender and by log."""
+        hits = self.state.search("dragon", sender="GM")
+        self.assertEqual([hit.sender for hit in hits], ["GM"])
+        self.assertEqual(self.state.search("dragon sender:Player")[0].log, "gm")
+        hits = self.state.search("dragon", log="gm")
+        self.assertEqual([hit.log for hit in hits], ["gm"])
+        hits = self.state.search("dragon sender:gm")
+        self.assertEqual([hit.sender for hit in hits], ["GM"])
+        self.assertEqual(self.state.search("dragon", sender="player")[0].log, "gm")
+
+    def test_persistence(self):
+        """Test that the index survives a save round trip without a rebuild."""
+        data = self.state.to_dict()
+        restored = GameState.from_dict(data)
+        self.assertEqual(restored.search_index.to_dict(), data["search_index"])
+        self.assertEqual(
+            [(hit.log, hit.index) for hit in restored.search("innkeeper dragon")],
+            [(hit.log, hit.index) for hit in self.state.search("innkeeper dragon")]
+        )
+
+    def test_standalone_index(self):
+        """Test the index without a game state attached."""
+        index = SearchIndex()
+        index.add("story", 0, "GM", "A quiet forest")
+        index.add("story", 1, "GM", "A noisy forest full of birds")
+        hits = index.search("birds")
+        self.assertEqual(len(hits), 1)
+        self.assertEqual(hits[0].index, 1)
+        self.assertEqual(index.search("nothing"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import sys
+import os
+import unittest
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.character import Character, Skill
+from src.models.game_state import GameState, Location
+from src.models.item import EMPTY_MAPPING, NO_TAGS
+from src.models.serializers import serializer
+
+
+@dataclass
+class Waypoint:
+    name: str
+    notes: Dict[str, List[str]] = field(default_factory=dict)
+
+
+@dataclass
+class Route:
+    start: Waypoint
+    stops: List[Waypoint] = field(default_factory=list)
+    end: Optional[Waypoint] = None
+    length: float = 0.0
+
+
+_encode_waypoint, _decode_waypoint = serializer(Waypoint)
+_encode_route, _decode_route = serializer(Route)
+
+
+class TestSerializers(unittest.TestCase):
+    """Test suite for serializers generated from dataclass fields."""
+
+    def test_nested_models_and_defaults(self):
+        """Test nested, listed and optional models and defaults for missing keys."""
+        route = Route(Waypoint("Gate", {"sights": ["tower"]}), [Waypoint("Bridge")], None, 3.5)
+        data = _encode_route(route)
+        self.assertEqual(data, {
+            "start": {"name": "Gate", "notes": {"sights": ["tower"]}},
+            "stops": [{"name": "Bridge", "notes": {}}],
+            "end": None,
+            "length": 3.5
+        })
+        self.assertEqual(_decode_route(data), route)
+        self.assertEqual(_decode_route({"start": {"name": "Gate"}}), Route(Waypoint("Gate")))
+
+    def test_copies_are_detached(self):
+        """Test that neither direction shares mutable containers with its input."""
+        skill = Skill.from_dict({"name": "Blast", "description": "",
+                                 "cost": {"resource": "mana", "amount": 8},
+                                 "effects": [{"action": "damage", "tags": {"tags": ["fire"]}}]})
+        data = skill.to_dict()
+        data["cost"]["amount"] = 0
+        data["effects"][0]["tags"]["tags"].append("ice")
+        self.assertEqual(skill.cost["amount"], 8)
+        self.assertEqual(skill.effects[0]["tags"]["tags"], ["fire"])
+
+        location = Location("Camp", "", ["Forest"])
+        location.to_dict()["connections"].append("Cave")
+        self.assertEqual(location.connections, ["Forest"])
+
+        source = {"name": "Camp", "description": "", "connections": ["Forest"]}
+        Location.from_dict(source).connections.append("Cave")
+        self.assertEqual(source["connections"], ["Forest"])
+
+    def test_character_round_trip(self):
+        """Test that characters round-trip, leaving runtime state out and empty defaults shared."""
+        character = GameState.create_demo_state().character
+        character.set_stat_modifier("rage", "strength", 3)
+        data = character.to_dict()
+        self.assertNotIn("events", data)
+        self.assertNotIn("stat_modifiers", data)
+        self.assertEqual(Character.from_dict(data).to_dict(), data)
+
+        definitions = {}
+        compact = character.to_dict(definitions)
+        self.assertEqual(Character.from_dict(compact, list(definitions)).to_dict(), data)
+
+        plain = Character.from_dict({"name": "Guard", "character_class": {
+            "name": "Soldier", "description": "", "skills": [{"name": "Block", "description": "", "cost": {}}]}})
+        self.assertIs(plain.character_class.tags, NO_TAGS)
+        self.assertIs(plain.skills[0].cost, EMPTY_MAPPING)
+
+
+if __name__ == "__main__":
+    unittest.main()
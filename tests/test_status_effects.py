@@ -0,0 +1,102 @@
+import sys
+import os
+import random
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.character import Character, CharacterClass
+from src.models.game_state import GameState
+from src.models.status_effects import StatusEffect, StatusEffectEngine
+
+
+def make_character(name="Hero"):
+    return Character(name=name, character_class=CharacterClass("Adept", ""))
+
+
+class TestStatusEffects(unittest.TestCase):
+    """Test suite for the status effect scheduler."""
+
+    def test_modifiers_and_ticks_follow_durations(self):
+        """Test that modifiers last their duration and periodic effects tick every turn until then."""
+        engine, hero = StatusEffectEngine(), make_character()
+        hero.health = 50
+        engine.add(hero, StatusEffect("might", 2, stat="strength", amount=5))
+        engine.add(hero, StatusEffect("regeneration", 3, resource="health", per_turn=10))
+        self.assertEqual(hero.effective_stat("strength"), 15)
+
+        self.assertEqual(engine.advance(), [])
+        self.assertEqual((hero.health, hero.effective_stat("strength")), (60, 15))
+        self.assertEqual([effect.name for effect in engine.advance()], ["might"])
+        self.assertEqual((hero.health, hero.effective_stat("strength")), (70, 10))
+        engine.advance(5)
+        self.assertEqual((hero.health, len(engine)), (80, 0))
+
+        poison = engine.add(hero, StatusEffect("poison", 10, resource="health", per_turn=-100))
+        engine.advance()
+        self.assertEqual(hero.health, 0)
+        self.assertTrue(engine.remove(poison))
+        self.assertFalse(engine.remove(poison))
+
+    def test_fractional_ticks_keep_saves_loadable(self):
+        """Test that fractional ticks change a character's resources by whole points, so saves still load."""
+        engine, state = StatusEffectEngine(), GameState.create_demo_state()
+        hero = state.character
+        hero.health, hero.mana = 50, 50
+        engine.add(hero, StatusEffect("regeneration", 4, resource="health", per_turn=2.5))
+        engine.add(hero, StatusEffect("drain", 4, resource="mana", per_turn=-1.5))
+        engine.advance()
+        self.assertEqual((hero.health, hero.mana), (52, 49))
+        engine.advance()
+        self.assertEqual((hero.health, hero.mana), (55, 47))
+        self.assertIs(type(hero.health), int)
+        self.assertEqual(GameState.from_dict(state.to_dict()).character.health, 55)
+
+    def test_passive_block_banishes_and_restores(self):
+        """Test that passive effects are suspended while a block is active and return afterwards."""
+        engine, hero, other = StatusEffectEngine(), make_character(), make_character("Other")
+        aura = engine.add(hero, StatusEffect("aura", 10, stat="focus", amount=4, passive=True))
+        engine.add(other, StatusEffect("aura", 10, stat="focus", amount=4, passive=True))
+        silence = engine.add(hero, StatusEffect("silence", 2, blocks_passives=True))
+        self.assertTrue(engine.passives_blocked(hero) and aura.banished)
+        self.assertEqual((hero.effective_stat("focus"), other.effective_stat("focus")), (10, 14))
+
+        late = engine.add(hero, StatusEffect("ward", 10, stat="willpower", amount=3, passive=True))
+        self.assertEqual(hero.effective_stat("willpower"), 10)
+        self.assertEqual(engine.advance(2), [silence])
+        self.assertFalse(engine.passives_blocked(hero))
+        self.assertEqual((hero.effective_stat("focus"), hero.effective_stat("willpower")), (14, 13))
+        self.assertIn(late, engine.effects_on(hero))
+
+    def test_matches_turn_by_turn_reference(self):
+        """Test that random schedules end the same effects on the same turns as a per-turn scan."""
+        random.seed(44)
+        engine, heroes = StatusEffectEngine(), [make_character(f"Hero {n}") for n in range(5)]
+        remaining = {}
+        for turn in range(60):
+            for _ in range(random.randint(0, 6)):
+                effect = StatusEffect("buff", random.randint(1, 8), stat=random.choice(["strength", "luck"]),
+                                      amount=random.randint(1, 9), passive=random.random() < 0.3,
+                                      blocks_passives=random.random() < 0.05)
+                engine.add(random.choice(heroes), effect)
+                remaining[effect] = effect.duration
+            if remaining and random.random() < 0.2:
+                cancelled = random.choice(list(remaining))
+                engine.remove(cancelled)
+                del remaining[cancelled]
+
+            ended = engine.advance()
+            expected = [effect for effect in remaining if remaining[effect] == 1]
+            remaining = {effect: left - 1 for effect, left in remaining.items() if left > 1}
+            self.assertEqual(set(ended), set(expected))
+            for hero in heroes:
+                blocked = any(effect.blocks_passives for effect in engine.effects_on(hero))
+                for stat in ("strength", "luck"):
+                    amounts = [effect.amount for effect in engine.effects_on(hero)
+                               if effect.stat == stat and not (effect.passive and blocked)]
+                    self.assertEqual(hero.effective_stat(stat), 10 + max(amounts, default=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import sys
+import os
+import gc
+import random
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.combat_sim import Combatant
+from src.models.game_state import GameState
+from src.models.inventory import Inventory
+from src.models.item import ITEM_REGISTRY, Effect, EquipmentItem, Item
+from src.models.tag_index import TAGS, TagIndex, TagQueryError, parse_tag_query
+
+WORDS = ["fire", "ice", "magic", "cursed", "holy"]
+
+QUERIES = {
+    "fire": lambda tags: "fire" in tags,
+    "fire & magic": lambda tags: "fire" in tags and "magic" in tags,
+    "fire+magic": lambda tags: "fire" in tags and "magic" in tags,
+    "fire | ice": lambda tags: "fire" in tags or "ice" in tags,
+    "!cursed": lambda tags: "cursed" not in tags,
+    "magic and not (fire or ice)": lambda tags: "magic" in tags and not ("fire" in tags or "ice" in tags),
+    "holy | fire & !cursed": lambda tags: "holy" in tags or ("fire" in tags and "cursed" not in tags),
+    "~~ice, magic": lambda tags: "ice" in tags and "magic" in tags,
+}
+
+
+class TestTagIndex(unittest.TestCase):
+    """Test suite for the tag interner, tag queries and the tag index."""
+
+    def test_queries_match_scanning(self):
+        """Test that index queries and single-entity matches agree with checking every tag list."""
+        rng = random.Random(48)
+        tags = {entity: rng.sample(WORDS, rng.randint(0, 3)) for entity in range(500)}
+        index = TagIndex()
+        for entity, names in tags.items():
+            index.add(entity, {"tags": names})
+        # Removing and re-tagging entities keeps the postings exact
+        for entity in rng.sample(range(500), 100):
+            index.remove(entity)
+            del tags[entity]
+        for entity in rng.sample(sorted(tags), 50):
+            tags[entity] = rng.sample(WORDS, 2)
+            index.add(entity, tags[entity])
+
+        for source, predicate in QUERIES.items():
+            expected = [entity for entity in sorted(tags) if predicate(tags[entity])]
+            self.assertEqual(index.ids(source), expected, source)
+            self.assertEqual(index.count(source), len(expected))
+            self.assertTrue(all(parse_tag_query(source).matches(index.mask_of(entity)) == predicate(tags[entity])
+                                for entity in tags))
+        self.assertEqual(len(index), 400)
+        self.assertEqual(TAGS.names(TAGS.mask(["ice", "fire"])), ["fire", "ice"])
+        self.assertIs(parse_tag_query("fire & magic"), parse_tag_query("fire & magic"))
+        for source in ("", "fire &", "(fire | ice", "fire ice", "fire $ ice", "& magic"):
+            with self.assertRaises(TagQueryError):
+                parse_tag_query(source)
+
+    def test_deep_and_unknown_queries(self):
+        """Test that deeply nested queries are refused and unknown tags match nothing without being interned."""
+        for source in ("!" * 3000 + "fire", "(" * 1000 + "fire" + ")" * 1000):
+            with self.assertRaises(TagQueryError):
+                parse_tag_query(source)
+        self.assertTrue(parse_tag_query("(" * 20 + "!fire" + ")" * 20).matches(0))
+
+        interned = len(TAGS)
+        query = parse_tag_query("tag-index-test-unseen | fire")
+        negated = parse_tag_query("!tag-index-test-unseen")
+        index = TagIndex()
+        index.add(0, ["fire"])
+        self.assertEqual((index.ids(query), index.ids(negated)), ([0], [0]))
+        self.assertEqual(len(TAGS), interned)
+
+        # Once something carries the tag, cached queries see it
+        index.add(1, ["tag-index-test-unseen"])
+        self.assertEqual((index.ids(query), index.ids(negated)), ([0, 1], [0]))
+        self.assertTrue(query.matches(index.mask_of(1)))
+
+    def test_inventory_and_registry_queries(self):
+        """Test that the inventory and item registry answer tag queries and keep them current."""
+        inventory = Inventory()
+        sword = EquipmentItem(name="Tag Test Flame Sword", item_type="weapon", description="", slot="main_hand",
+                              tags={"tags": ["fire", "metal"]})
+        staff = EquipmentItem(name="Tag Test Frost Staff", item_type="weapon", description="", slot="two_handed",
+                              tags={"tags": ["ice", "magic"]})
+        potion = Item("Tag Test Fire Tonic", "consumable", "", [Effect("self", "heal", 5, tags={"tags": ["fire", "magic"]})])
+        inventory.extend([sword, staff, potion, Item.from_definition(potion.definition)])
+
+        self.assertEqual(inventory.tagged("fire"), [sword, potion, inventory[3]])
+        self.assertEqual(inventory.tagged("magic & !ice"), [potion, inventory[3]])
+        inventory.remove(sword)
+        helm = EquipmentItem(name="Tag Test Ember Helm", item_type="armor", description="", slot="head",
+                             tags={"tags": ["fire"]})
+        inventory.add(helm)
+        self.assertEqual(inventory.tagged("fire & !magic"), [helm])
+        inventory.clear()
+        self.assertEqual(inventory.tagged("fire | ice | magic"), [])
+
+        frosty = ITEM_REGISTRY.tagged("ice & magic & !fire")
+        self.assertIn(staff.definition, frosty)
+        self.assertNotIn(potion.definition, frosty)
+        self.assertIn(helm.definition, ITEM_REGISTRY.tagged("fire"))
+        del sword, helm
+        gc.collect()
+        self.assertFalse({"Tag Test Flame Sword", "Tag Test Ember Helm"}
+                         & {definition.name for definition in ITEM_REGISTRY.tagged("fire")})
+
+    def test_combat_effects_carry_tags(self):
+        """Test that simulated skill effects keep their tags and take magic from them."""
+        combatant = Combatant.from_character(GameState.create_demo_state().character)
+        blast = next(skill for skill in combatant.skills if skill.name == "Blast")
+        effect = blast.effects[0]
+        self.assertTrue(effect.magic)
+        self.assertTrue(effect.has_tags("fire & magic"))
+        self.assertFalse(effect.has_tags("ice | !magic"))
+        self.assertEqual(TAGS.names(effect.tags), sorted(["magic", "fire"], key=TAGS.bit))
+
+
+if __name__ == '__main__':
+    unittest.main()
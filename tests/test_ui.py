@@ -341,6 +341,50 @@ class TestUI(unittest.TestCase):
         self.assertIn(test_message, chat_text)
         self.assertIn("GM:", chat_text)  # Should show "GM:" prefix
     
+    def test_incremental_updates(self):
+        """Test that single messages and items can be added without a full refresh."""
+        self.window.update_story_log([{"sender": "GM", "message": "First message"}])
+        self.window.append_story_message("GM", "Second message")
+        self.window.append_gm_message("Player", "A question")
+        QTest.qWait(50)
+        
+        story_text = self.window.story_text_edit.toPlainText()
+        self.assertIn("First message", story_text)
+        self.assertIn("GM: Second message", story_text)
+        self.assertIn("You: A question", self.window.gm_text_edit.toPlainText())
+        
+        # Add, restyle and remove a single item
+        test_sword = EquipmentItem(
+            name="Test Sword",
+            item_type="weapon",
+            description="A test sword for UI testing",
+            slot="main_hand"
+        )
+        self.window.add_inventory_item(test_sword)
+        self.assertEqual(self.window.inventory_panel.inventory_list.count(), 1)
+        
+        test_sword.equipped = True
+        self.window.refresh_inventory_item(test_sword)
+        item = self.window.inventory_panel.inventory_list.item(0)
+        self.assertEqual(item.foreground(), Qt.GlobalColor.gray)
+        
+        self.window.remove_inventory_item(test_sword)
+        self.assertEqual(self.window.inventory_panel.inventory_list.count(), 0)
+    
+    def test_prepend_history(self):
+        """Test that older messages are inserted above the current log."""
+        self.window.update_story_log([{"sender": "GM", "message": "Latest message"}])
+        self.window.prepend_story_messages([
+            {"sender": "GM", "message": "Oldest message"},
+            {"sender": "Player", "message": "Older reply"}
+        ])
+        QTest.qWait(50)
+        
+        lines = self.window.story_text_edit.toPlainText().splitlines()
+        self.assertEqual(lines[0], "GM: Oldest message")
+        self.assertEqual(lines[1], "You: Older reply")
+        self.assertIn("GM: Latest message", lines)
+    
     def tearDown(self):
         """Clean up after each test."""
         if hasattr(self.window, 'character_window') and self.window.character_window:
@@ -0,0 +1,105 @@
+import sys
+import os
+import random
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.game_state import GameState, Location
+from src.models.world import World
+
+
+def grid_world(width, height):
+    """Build a grid of positioned locations connected to their four neighbours."""
+    world = World()
+    for x in range(width):
+        for y in range(height):
+            world.add_location(Location(f"{x},{y}", f"Square {x},{y}"), position=(x, y))
+    for x in range(width):
+        for y in range(height):
+            if x + 1 < width:
+                world.connect(f"{x},{y}", f"{x + 1},{y}")
+            if y + 1 < height:
+                world.connect(f"{x},{y}", f"{x},{y + 1}")
+    return world
+
+
+class TestWorld(unittest.TestCase):
+    """Test suite for the world graph and route queries."""
+
+    def test_registry_and_neighbours(self):
+        """Test that names resolve to locations and connections to neighbours."""
+        state = GameState.create_demo_state()
+        world = state.world
+        self.assertIs(world.location("Forest Clearing"), state.current_location)
+        self.assertEqual(world.neighbours("Forest Clearing"),
+                         ["Forest Path", "Cave Entrance", "Mountain Trail"])
+        self.assertEqual(world.name_of(world.location_id("Cave Entrance")), "Cave Entrance")
+
+        # Connections to unexplored places are known before the place itself
+        world.add_location(Location("Cave Entrance", "A dark opening.", ["Deep Cave"]))
+        self.assertNotIn("Deep Cave", world)
+        self.assertEqual(world.route("Forest Clearing", "Deep Cave"),
+                         ["Forest Clearing", "Cave Entrance", "Deep Cave"])
+
+    def test_routes_match_reference(self):
+        """Test BFS and A* against known shortest paths on a grid with walls."""
+        world = grid_world(12, 12)
+        route = world.route("0,0", "11,11")
+        self.assertEqual(len(route), 23)
+        self.assertAlmostEqual(world.route_length(world.shortest_route("0,0", "11,11")), 22)
+
+        # Wall off column 5 except for a gap at the top, forcing a detour
+        for y in range(11):
+            world.disconnect(f"5,{y}", f"6,{y}")
+        detour = world.shortest_route("5,0", "6,0")
+        self.assertEqual(len(detour), 24)
+        self.assertIn("5,11", detour)
+        self.assertEqual(len(world.route("5,0", "6,0")), len(detour))
+
+    def test_cache_invalidated_on_edit(self):
+        """Test that cached routes are dropped when the graph changes."""
+        world = grid_world(3, 1)
+        self.assertEqual(world.route("0,0", "2,0"), ["0,0", "1,0", "2,0"])
+        world.disconnect("1,0", "2,0")
+        self.assertIsNone(world.route("0,0", "2,0"))
+        self.assertIsNone(world.shortest_route("0,0", "2,0"))
+        world.connect("0,0", "2,0")
+        self.assertEqual(world.route("0,0", "2,0"), ["0,0", "2,0"])
+
+    def test_random_graph_astar_matches_dijkstra(self):
+        """Test that A* finds routes as short as an uninformed search."""
+        rng = random.Random(3)
+        informed = World()
+        uninformed = World()
+        for i in range(300):
+            position = (rng.uniform(0, 100), rng.uniform(0, 100))
+            for world in (informed, uninformed):
+                world.add_location(Location(str(i), ""), position=position)
+        for _ in range(900):
+            a, b = str(rng.randrange(300)), str(rng.randrange(300))
+            informed.connect(a, b)
+            uninformed.connect(a, b)
+        uninformed.add_location(Location("unplaced", ""))  # Disables the A* heuristic
+        for _ in range(30):
+            a, b = str(rng.randrange(300)), str(rng.randrange(300))
+            fast, slow = informed.shortest_route(a, b), uninformed.shortest_route(a, b)
+            self.assertEqual(fast is None, slow is None)
+            if fast is not None:
+                self.assertAlmostEqual(informed.route_length(fast), uninformed.route_length(slow))
+
+    def test_serialization_and_prompt(self):
+        """Test that the world round-trips and summarises the surroundings."""
+        state = GameState.create_demo_state()
+        restored = GameState.from_dict(state.to_dict())
+        self.assertEqual(restored.world.to_dict(), state.world.to_dict())
+        self.assertEqual(restored.world.position("Village Gate"), (0.5, 4.0))
+
+        summary = state.describe_surroundings()
+        self.assertIn("Exits: Forest Path, Cave Entrance, Mountain Trail", summary)
+        self.assertIn("Village Gate (2 steps)", summary)
+
+
+if __name__ == "__main__":
+    unittest.main()
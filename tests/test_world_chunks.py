@@ -0,0 +1,128 @@
+import sys
+import os
+import tempfile
+import threading
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.game_state import GameState, Location
+from src.models.world_chunks import StreamingWorld, write_world_chunks
+from tests.test_world import grid_world
+
+
+class TestWorldChunks(unittest.TestCase):
+    """Test suite for region chunks streamed from disk."""
+
+    def setUp(self):
+        """Write a 20x20 grid world as 4x4 chunks of 25 locations."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.world = grid_world(20, 20)
+        write_world_chunks(self.world, self.directory.name, chunk_size=5)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def open_world(self, **options):
+        world = StreamingWorld(self.directory.name, **options)
+        self.addCleanup(world.close)
+        return world
+
+    def test_matches_in_memory_world(self):
+        """Test that chunked locations, connections and routes match the original world."""
+        streaming = self.open_world()
+        self.assertEqual(len(streaming), len(self.world))
+        self.assertEqual(streaming.resident_chunks, [])
+        for name in ("0,0", "7,13", "19,19"):
+            self.assertEqual(streaming.location(name).description, self.world.location(name).description)
+            self.assertEqual(sorted(streaming.neighbours(name)), sorted(self.world.neighbours(name)))
+            self.assertEqual(streaming.position(name), self.world.position(name))
+        self.assertEqual(len(streaming.route("0,0", "19,19")), len(self.world.route("0,0", "19,19")))
+        self.assertEqual(streaming.describe("0,0"), self.world.describe("0,0"))
+
+    def test_memory_cap_and_stall_counters(self):
+        """Test that chunks are evicted LRU while the player's chunk stays resident."""
+        streaming = self.open_world(max_loaded_locations=60)
+        streaming.visit("0,0")
+        streaming.close()
+        for x in range(0, 20, 5):
+            for y in range(0, 20, 5):
+                streaming.location(f"{x},{y}")
+                self.assertLessEqual(streaming.loaded_locations, 60)
+        self.assertIn("0_0", streaming.resident_chunks)
+
+        stats = streaming.stats
+        self.assertGreater(stats.evictions, 0)
+        self.assertGreater(stats.stalls, 0)
+        self.assertGreater(stats.stall_seconds, 0)
+
+    def test_prefetch_around_player(self):
+        """Test that visiting a location loads the neighbouring chunks in the background."""
+        streaming = self.open_world()
+        streaming.visit("7,7")
+        streaming.close()  # Waits for queued prefetches
+        self.assertEqual(len(streaming.resident_chunks), 9)
+        self.assertEqual(streaming.stats.prefetched, 8)
+
+        streaming.reset_stats()
+        streaming.location("12,12")
+        self.assertEqual(streaming.stats.stalls, 0)
+        self.assertEqual(streaming.stats.hits, 1)
+
+    def test_edits_are_written_back(self):
+        """Test that edited chunks survive eviction and reopening."""
+        streaming = self.open_world(max_loaded_locations=30)
+        streaming.add_location(Location("Hidden Grove", "A quiet grove."), position=(1.5, 1.5))
+        streaming.connect("0,0", "Hidden Grove")
+        for x in range(5, 20, 5):
+            streaming.location(f"{x},0")
+        self.assertGreater(streaming.stats.write_backs, 0)
+        streaming.save()
+
+        reopened = self.open_world()
+        self.assertEqual(reopened.location("Hidden Grove").description, "A quiet grove.")
+        self.assertIn("Hidden Grove", reopened.neighbours("0,0"))
+        self.assertEqual(reopened.route("1,0", "Hidden Grove"), ["1,0", "0,0", "Hidden Grove"])
+
+    def test_fetch_waits_for_write_back(self):
+        """Test that a chunk fetched while its edits are being written back is read with the edits."""
+        streaming = self.open_world(max_loaded_locations=30)
+        streaming.add_location(Location("Hidden Grove", "A quiet grove."), position=(1.5, 1.5))
+        write_chunk, fetched, prefetches = streaming._write_chunk, [], []
+
+        def slow_write(key, chunk):
+            # A prefetch of the chunk starts in the middle of the write-back
+            prefetch = threading.Thread(target=lambda: fetched.append(streaming._fetch(key)[0]), daemon=True)
+            prefetch.start()
+            prefetch.join(0.1)
+            prefetches.append((prefetch, prefetch.is_alive()))
+            write_chunk(key, chunk)
+
+        streaming._write_chunk = slow_write
+        streaming.location("5,0")
+        prefetch, waited = prefetches[0]
+        prefetch.join(5)
+        self.assertTrue(waited)
+        self.assertEqual(len(fetched), 1)
+        self.assertIn("Hidden Grove", fetched[0].locations)
+
+    def test_game_state_follows_player(self):
+        """Test that a game state on a streaming world prefetches as the player moves."""
+        state = GameState.create_demo_state()
+        data = state.to_dict()
+        data["world"] = {"chunk_directory": self.directory.name}
+        data["current_location"] = self.world.location("2,2").to_dict()
+        restored = GameState.from_dict(data)
+        self.addCleanup(restored.world.close)
+        self.assertIsInstance(restored.world, StreamingWorld)
+        self.assertIs(restored.current_location, restored.world.location("2,2"))
+
+        restored.move_to(restored.world.location("17,17"))
+        restored.world.close()
+        self.assertIn("2_2", restored.world.resident_chunks)
+        self.assertIn("Exits:", restored.describe_surroundings())
+
+
+if __name__ == "__main__":
+    unittest.main()